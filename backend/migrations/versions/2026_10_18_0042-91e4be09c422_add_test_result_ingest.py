@@ -0,0 +1,69 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Add test result ingest
+
+Revision ID: 91e4be09c422
+Revises: 8d3276e336be
+Create Date: 2026-10-18 00:42:25.982331+00:00
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "91e4be09c422"
+down_revision = "8d3276e336be"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "test_result_ingest",
+        sa.Column("test_execution_id", sa.Integer(), nullable=False),
+        sa.Column("kind", sa.Enum("TEST_RESULTS", "END_TEST", name="testresultingestkind"), nullable=False),
+        sa.Column("payload", sa.LargeBinary(), nullable=False),
+        sa.Column("test_results_count", sa.Integer(), nullable=False),
+        # The job status type was created along with attachment rule jobs
+        sa.Column("status", postgresql.ENUM(name="jobstatus", create_type=False), nullable=False),
+        sa.Column("error", sa.String(), nullable=True),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["test_execution_id"],
+            ["test_execution.id"],
+            name=op.f("test_result_ingest_test_execution_id_fkey"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("test_result_ingest_pkey")),
+    )
+    op.create_index(op.f("test_result_ingest_status_id_ix"), "test_result_ingest", ["status", "id"], unique=False)
+    op.create_index(
+        op.f("test_result_ingest_test_execution_id_ix"),
+        "test_result_ingest",
+        ["test_execution_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("test_result_ingest_test_execution_id_ix"), table_name="test_result_ingest")
+    op.drop_index(op.f("test_result_ingest_status_id_ix"), table_name="test_result_ingest")
+    op.drop_table("test_result_ingest")
+    op.execute("DROP TYPE IF EXISTS testresultingestkind")
@@ -0,0 +1,56 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Add unique test result per test case
+
+Revision ID: 548533f76d9d
+Revises: 91e4be09c422
+Create Date: 2026-10-18 00:49:12.311842+00:00
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "548533f76d9d"
+down_revision = "91e4be09c422"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # End-test used to store repeated test cases as separate results,
+    # keep the last one like posting results does
+    op.execute(
+        """
+        DELETE FROM test_result
+        USING test_result AS later
+        WHERE later.test_execution_id = test_result.test_execution_id
+            AND later.test_case_id = test_result.test_case_id
+            AND later.id > test_result.id
+        """
+    )
+    op.create_unique_constraint(
+        op.f("test_result_test_execution_id_test_case_id_key"),
+        "test_result",
+        ["test_execution_id", "test_case_id"],
+    )
+    # Covered by the unique constraint
+    op.drop_index("test_result_test_execution_id_ix", table_name="test_result")
+
+
+def downgrade() -> None:
+    op.create_index("test_result_test_execution_id_ix", "test_result", ["test_execution_id"], unique=False)
+    op.drop_constraint(op.f("test_result_test_execution_id_test_case_id_key"), "test_result", type_="unique")
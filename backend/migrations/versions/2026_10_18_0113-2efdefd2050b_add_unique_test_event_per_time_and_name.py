@@ -0,0 +1,61 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Add unique test event per time and name
+
+Revision ID: 2efdefd2050b
+Revises: 548533f76d9d
+Create Date: 2026-10-18 01:13:10.148303+00:00
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "2efdefd2050b"
+down_revision = "548533f76d9d"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Status updates used to be able to store the same event more than once,
+    # keep the last one
+    op.execute(
+        """
+        DELETE FROM test_event
+        USING test_event AS later
+        WHERE later.test_execution_id = test_event.test_execution_id
+            AND later.timestamp = test_event.timestamp
+            AND later.event_name = test_event.event_name
+            AND later.id > test_event.id
+        """
+    )
+    op.create_unique_constraint(
+        op.f("test_event_test_execution_id_timestamp_event_name_key"),
+        "test_event",
+        ["test_execution_id", "timestamp", "event_name"],
+    )
+    # Covered by the unique constraint
+    op.drop_index("test_event_test_execution_id_ix", table_name="test_event")
+
+
+def downgrade() -> None:
+    op.create_index("test_event_test_execution_id_ix", "test_event", ["test_execution_id"], unique=False)
+    op.drop_constraint(
+        op.f("test_event_test_execution_id_timestamp_event_name_key"),
+        "test_event",
+        type_="unique",
+    )
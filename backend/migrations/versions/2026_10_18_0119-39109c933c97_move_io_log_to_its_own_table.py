@@ -0,0 +1,69 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Move io_log to its own table
+
+Revision ID: 39109c933c97
+Revises: 2efdefd2050b
+Create Date: 2026-10-18 01:19:36.083114+00:00
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "39109c933c97"
+down_revision = "2efdefd2050b"
+branch_labels = None
+depends_on = None
+
+
+# The io_logs are moved by dcf741d3677c and the old column dropped by
+# 9a21e5fea975, so that test_result is only locked for short DDL statements
+def upgrade() -> None:
+    op.create_table(
+        "io_log",
+        sa.Column("digest", sa.LargeBinary(), nullable=False),
+        sa.Column("content", sa.LargeBinary(), nullable=False),
+        sa.Column("size", sa.Integer(), nullable=False),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id", name=op.f("io_log_pkey")),
+        sa.UniqueConstraint("digest", name=op.f("io_log_digest_key")),
+    )
+    # Neither column rewrites the table, and results written meanwhile get an empty preview
+    op.add_column("test_result", sa.Column("io_log_id", sa.Integer(), nullable=True))
+    op.add_column("test_result", sa.Column("io_log_preview", sa.String(), nullable=False, server_default=""))
+    # Results written without the old column until it's dropped
+    op.alter_column("test_result", "io_log", server_default="")
+    # Validated once the io_logs are moved, without blocking writes
+    op.create_foreign_key(
+        op.f("test_result_io_log_id_fkey"),
+        "test_result",
+        "io_log",
+        ["io_log_id"],
+        ["id"],
+        postgresql_not_valid=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint(op.f("test_result_io_log_id_fkey"), "test_result", type_="foreignkey")
+    op.drop_column("test_result", "io_log_preview")
+    op.drop_column("test_result", "io_log_id")
+    op.drop_table("io_log")
+    op.alter_column("test_result", "io_log", server_default=None)  # type: ignore[arg-type]
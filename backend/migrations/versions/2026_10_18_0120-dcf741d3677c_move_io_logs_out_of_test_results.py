@@ -0,0 +1,155 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Move io_logs out of test results
+
+Revision ID: dcf741d3677c
+Revises: 39109c933c97
+Create Date: 2026-10-18 01:20:12.511207+00:00
+
+"""
+
+import hashlib
+import zlib
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "dcf741d3677c"
+down_revision = "39109c933c97"
+branch_labels = None
+depends_on = None
+
+# Number of test results moved by every transaction
+BATCH_SIZE = 5000
+
+# Kept here rather than imported so that the migration doesn't change along with the app
+IO_LOG_PREVIEW_LENGTH = 200
+IO_LOG_COMPRESSION_LEVEL = 6
+
+
+# Every statement commits on its own so that test_result is never locked for
+# long, and an interrupted migration resumes with the results left to move
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        _end_implicit_transaction()
+        _move_io_logs_out()
+        op.create_index(
+            op.f("test_result_io_log_id_ix"),
+            "test_result",
+            ["io_log_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        _end_implicit_transaction()
+        op.drop_index(op.f("test_result_io_log_id_ix"), table_name="test_result", postgresql_concurrently=True)
+        _move_io_logs_back()
+
+
+def _end_implicit_transaction() -> None:
+    # pg8000 begins a transaction when alembic reads the isolation level on
+    # entering the block, which would hold every statement of the block
+    op.execute("COMMIT")
+
+
+def _move_io_logs_out() -> None:
+    conn = op.get_bind()
+    last_id = 0
+    while rows := conn.execute(
+        sa.text(
+            """
+            SELECT id, io_log FROM test_result
+            WHERE id > :last_id AND io_log != '' AND io_log_id IS NULL
+            ORDER BY id
+            LIMIT :batch_size
+            """
+        ),
+        {"last_id": last_id, "batch_size": BATCH_SIZE},
+    ).all():
+        last_id = rows[-1].id
+
+        digests = {hashlib.sha256(row.io_log.encode()).digest(): row.io_log for row in rows}
+        conn.execute(
+            sa.text(
+                """
+                INSERT INTO io_log (digest, content, size, created_at, updated_at)
+                SELECT digest, content, size, NOW(), NOW()
+                FROM unnest(CAST(:digests AS bytea[]), CAST(:contents AS bytea[]), CAST(:sizes AS integer[]))
+                    AS new (digest, content, size)
+                ORDER BY digest
+                ON CONFLICT (digest) DO NOTHING
+                """
+            ),
+            {
+                "digests": list(digests),
+                "contents": [zlib.compress(io_log.encode(), IO_LOG_COMPRESSION_LEVEL) for io_log in digests.values()],
+                "sizes": [len(io_log.encode()) for io_log in digests.values()],
+            },
+        )
+        conn.execute(
+            sa.text(
+                """
+                UPDATE test_result
+                SET io_log_id = io_log.id, io_log_preview = moved.io_log_preview
+                FROM unnest(CAST(:ids AS integer[]), CAST(:digests AS bytea[]), CAST(:previews AS text[]))
+                    AS moved (id, digest, io_log_preview)
+                JOIN io_log ON io_log.digest = moved.digest
+                WHERE test_result.id = moved.id
+                """
+            ),
+            {
+                "ids": [row.id for row in rows],
+                "digests": [hashlib.sha256(row.io_log.encode()).digest() for row in rows],
+                "previews": [row.io_log[:IO_LOG_PREVIEW_LENGTH] for row in rows],
+            },
+        )
+
+
+def _move_io_logs_back() -> None:
+    conn = op.get_bind()
+    last_id = 0
+    while rows := conn.execute(
+        sa.text(
+            """
+            SELECT test_result.id, io_log.content FROM test_result
+            JOIN io_log ON io_log.id = test_result.io_log_id
+            WHERE test_result.id > :last_id
+            ORDER BY test_result.id
+            LIMIT :batch_size
+            """
+        ),
+        {"last_id": last_id, "batch_size": BATCH_SIZE},
+    ).all():
+        last_id = rows[-1].id
+
+        conn.execute(
+            sa.text(
+                """
+                UPDATE test_result
+                SET io_log = moved.io_log
+                FROM unnest(CAST(:ids AS integer[]), CAST(:io_logs AS text[])) AS moved (id, io_log)
+                WHERE test_result.id = moved.id
+                """
+            ),
+            {
+                "ids": [row.id for row in rows],
+                "io_logs": [zlib.decompress(row.content).decode() for row in rows],
+            },
+        )
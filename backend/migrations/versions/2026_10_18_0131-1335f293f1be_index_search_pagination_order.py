@@ -0,0 +1,43 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Index search pagination order
+
+Revision ID: 1335f293f1be
+Revises: dcf741d3677c
+Create Date: 2026-10-18 01:31:49.498771+00:00
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "1335f293f1be"
+down_revision = "dcf741d3677c"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f("test_execution_created_at_id_ix"), "test_execution", ["created_at", "id"], unique=False)
+    # The composite index also serves the filters on created_at alone
+    op.drop_index("test_result_created_at_ix", table_name="test_result")
+    op.create_index(op.f("test_result_created_at_id_ix"), "test_result", ["created_at", "id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("test_result_created_at_id_ix"), table_name="test_result")
+    op.create_index("test_result_created_at_ix", "test_result", ["created_at"], unique=False)
+    op.drop_index(op.f("test_execution_created_at_id_ix"), table_name="test_execution")
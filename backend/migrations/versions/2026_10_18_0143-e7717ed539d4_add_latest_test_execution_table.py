@@ -0,0 +1,99 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+
+"""Add latest test execution table
+
+Revision ID: e7717ed539d4
+Revises: 1335f293f1be
+Create Date: 2026-10-18 01:43:28.280300+00:00
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e7717ed539d4"
+down_revision = "1335f293f1be"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "latest_test_execution",
+        sa.Column("test_plan_id", sa.Integer(), nullable=False),
+        sa.Column("artefact_build_id", sa.Integer(), nullable=False),
+        sa.Column("environment_id", sa.Integer(), nullable=False),
+        sa.Column("test_execution_id", sa.Integer(), nullable=False),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["artefact_build_id"],
+            ["artefact_build.id"],
+            name=op.f("latest_test_execution_artefact_build_id_fkey"),
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["environment_id"],
+            ["environment.id"],
+            name=op.f("latest_test_execution_environment_id_fkey"),
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["test_execution_id"],
+            ["test_execution.id"],
+            name=op.f("latest_test_execution_test_execution_id_fkey"),
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["test_plan_id"],
+            ["test_plan.id"],
+            name=op.f("latest_test_execution_test_plan_id_fkey"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("latest_test_execution_pkey")),
+        sa.UniqueConstraint("test_execution_id", name=op.f("latest_test_execution_test_execution_id_key")),
+        sa.UniqueConstraint(
+            "test_plan_id",
+            "artefact_build_id",
+            "environment_id",
+            name=op.f("latest_test_execution_test_plan_id_artefact_build_id_environment_id_key"),
+        ),
+    )
+    op.create_index(
+        op.f("latest_test_execution_artefact_build_id_ix"), "latest_test_execution", ["artefact_build_id"], unique=False
+    )
+    op.create_index(
+        op.f("latest_test_execution_environment_id_ix"), "latest_test_execution", ["environment_id"], unique=False
+    )
+
+    op.execute(
+        """
+        INSERT INTO latest_test_execution
+            (test_plan_id, artefact_build_id, environment_id, test_execution_id, created_at, updated_at)
+        SELECT test_plan_id, artefact_build_id, environment_id, max(id), now(), now()
+        FROM test_execution
+        GROUP BY test_plan_id, artefact_build_id, environment_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("latest_test_execution_environment_id_ix"), table_name="latest_test_execution")
+    op.drop_index(op.f("latest_test_execution_artefact_build_id_ix"), table_name="latest_test_execution")
+    op.drop_table("latest_test_execution")
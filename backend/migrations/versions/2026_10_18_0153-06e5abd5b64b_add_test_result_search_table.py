@@ -0,0 +1,122 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+
+"""Add test result search table
+
+Revision ID: 06e5abd5b64b
+Revises: e7717ed539d4
+Create Date: 2026-10-18 01:53:55.646432+00:00
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "06e5abd5b64b"
+down_revision = "e7717ed539d4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "test_result_search",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("test_execution_id", sa.Integer(), nullable=False),
+        sa.Column("test_case_id", sa.Integer(), nullable=False),
+        sa.Column("artefact_id", sa.Integer(), nullable=False),
+        sa.Column("family", postgresql.ENUM(name="familyname", create_type=False), nullable=False),
+        sa.Column("artefact_name", sa.String(length=200), nullable=False),
+        sa.Column("artefact_version", sa.String(), nullable=False),
+        sa.Column("artefact_stage", sa.String(length=100), nullable=False),
+        sa.Column("artefact_track", sa.String(), nullable=False),
+        sa.Column("artefact_archived", sa.Boolean(), nullable=False),
+        sa.Column("environment_name", sa.String(), nullable=False),
+        sa.Column("test_case_name", sa.String(), nullable=False),
+        sa.Column("template_id", sa.String(), nullable=False),
+        sa.Column("status", postgresql.ENUM(name="testresultstatus", create_type=False), nullable=False),
+        sa.Column("execution_status", postgresql.ENUM(name="testexecutionstatus", create_type=False), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["id"], ["test_result.id"], name=op.f("test_result_search_id_fkey"), ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("test_result_search_pkey")),
+    )
+
+    # Filled before creating the indexes, which is faster than maintaining them
+    op.execute(
+        """
+        INSERT INTO test_result_search (
+            id, created_at, test_execution_id, test_case_id, artefact_id, family, artefact_name,
+            artefact_version, artefact_stage, artefact_track, artefact_archived, environment_name,
+            test_case_name, template_id, status, execution_status, updated_at
+        )
+        SELECT
+            test_result.id, test_result.created_at, test_result.test_execution_id, test_result.test_case_id,
+            artefact.id, artefact.family, artefact.name, artefact.version, artefact.stage, artefact.track,
+            artefact.archived, environment.name, test_case.name, test_case.template_id, test_result.status,
+            test_execution.status, now()
+        FROM test_result
+        JOIN test_execution ON test_execution.id = test_result.test_execution_id
+        JOIN artefact_build ON artefact_build.id = test_execution.artefact_build_id
+        JOIN artefact ON artefact.id = artefact_build.artefact_id
+        JOIN environment ON environment.id = test_execution.environment_id
+        JOIN test_case ON test_case.id = test_result.test_case_id
+        """
+    )
+
+    op.create_index(
+        op.f("test_result_search_artefact_name_created_at_id_ix"),
+        "test_result_search",
+        ["artefact_name", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("test_result_search_created_at_id_ix"), "test_result_search", ["created_at", "id"], unique=False
+    )
+    op.create_index(
+        op.f("test_result_search_environment_name_created_at_id_ix"),
+        "test_result_search",
+        ["environment_name", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "test_result_search_failed_created_at_id_ix",
+        "test_result_search",
+        ["created_at", "id"],
+        unique=False,
+        postgresql_where=sa.text("status = 'FAILED'"),
+    )
+    op.create_index(
+        op.f("test_result_search_template_id_created_at_id_ix"),
+        "test_result_search",
+        ["template_id", "created_at", "id"],
+        unique=False,
+        postgresql_where=sa.text("template_id <> ''"),
+    )
+    op.create_index(
+        op.f("test_result_search_test_case_name_created_at_id_ix"),
+        "test_result_search",
+        ["test_case_name", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("test_result_search")
@@ -0,0 +1,66 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+
+"""Add trigram indexes on names
+
+Revision ID: 8f2aa7904c61
+Revises: 06e5abd5b64b
+Create Date: 2026-10-18 02:12:31.204518+00:00
+
+The indexes need the pg_trgm extension, so they're only created where it's
+available. Searches work without them, scanning the tables instead.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8f2aa7904c61"
+down_revision = "06e5abd5b64b"
+branch_labels = None
+depends_on = None
+
+TRIGRAM_INDEXED_COLUMNS = [
+    ("artefact", "name"),
+    ("test_case", "name"),
+    ("environment", "name"),
+    ("app_user", "name"),
+    ("app_user", "email"),
+    ("app_user", "launchpad_handle"),
+]
+
+
+def upgrade() -> None:
+    available = op.get_bind().scalar(
+        sa.text("SELECT EXISTS (SELECT FROM pg_available_extensions WHERE name = 'pg_trgm')")
+    )
+    if not available:
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table, column in TRIGRAM_INDEXED_COLUMNS:
+        op.create_index(
+            f"{table}_{column}_trgm_ix",
+            table,
+            [column],
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    for table, column in TRIGRAM_INDEXED_COLUMNS:
+        op.execute(f"DROP INDEX IF EXISTS {table}_{column}_trgm_ix")
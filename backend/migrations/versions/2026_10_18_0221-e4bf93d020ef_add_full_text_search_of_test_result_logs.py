@@ -0,0 +1,129 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+
+"""Add full-text search of test result logs
+
+Revision ID: e4bf93d020ef
+Revises: 8f2aa7904c61
+Create Date: 2026-10-18 02:21:47.512604+00:00
+
+"""
+
+import zlib
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "e4bf93d020ef"
+down_revision = "8f2aa7904c61"
+branch_labels = None
+depends_on = None
+
+# Number of io_logs indexed at a time, to bound memory use
+BATCH_SIZE = 100
+
+# Kept here rather than imported so that the migration doesn't change along with the app
+IO_LOG_SEARCHED_LENGTH = 500_000
+IO_LOG_SEARCH_CHUNK_LENGTH = 30_000
+IO_LOG_SEARCH_CHUNK_OVERLAP = 1_000
+
+
+def upgrade() -> None:
+    op.create_table(
+        "io_log_search_chunk",
+        sa.Column("io_log_id", sa.Integer(), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("search_vector", postgresql.TSVECTOR(), nullable=False),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["io_log_id"], ["io_log.id"], name=op.f("io_log_search_chunk_io_log_id_fkey"), ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("io_log_search_chunk_pkey")),
+    )
+
+    _index_io_logs()
+
+    op.create_index(op.f("io_log_search_chunk_io_log_id_ix"), "io_log_search_chunk", ["io_log_id"], unique=False)
+    op.create_index(
+        op.f("io_log_search_chunk_search_vector_ix"),
+        "io_log_search_chunk",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+    op.create_index(
+        "test_result_comment_search_ix",
+        "test_result",
+        [sa.literal_column("to_tsvector('simple'::regconfig, comment)")],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("test_result_comment_search_ix", table_name="test_result", postgresql_using="gin")
+    op.drop_index(
+        op.f("io_log_search_chunk_search_vector_ix"), table_name="io_log_search_chunk", postgresql_using="gin"
+    )
+    op.drop_index(op.f("io_log_search_chunk_io_log_id_ix"), table_name="io_log_search_chunk")
+    op.drop_table("io_log_search_chunk")
+
+
+def _search_chunks(io_log: str) -> list[str]:
+    io_log = io_log.replace("\x00", "")
+    parts = [io_log]
+    if len(io_log) > 2 * IO_LOG_SEARCHED_LENGTH:
+        parts = [io_log[:IO_LOG_SEARCHED_LENGTH], io_log[-IO_LOG_SEARCHED_LENGTH:]]
+    return [
+        part[start : start + IO_LOG_SEARCH_CHUNK_LENGTH + IO_LOG_SEARCH_CHUNK_OVERLAP]
+        for part in parts
+        for start in range(0, len(part), IO_LOG_SEARCH_CHUNK_LENGTH)
+    ]
+
+
+def _index_io_logs() -> None:
+    conn = op.get_bind()
+    last_id = 0
+    while rows := conn.execute(
+        sa.text("SELECT id, content FROM io_log WHERE id > :last_id ORDER BY id LIMIT :batch_size"),
+        {"last_id": last_id, "batch_size": BATCH_SIZE},
+    ).all():
+        last_id = rows[-1].id
+
+        chunks = [
+            (row.id, position, chunk)
+            for row in rows
+            for position, chunk in enumerate(_search_chunks(zlib.decompress(row.content).decode()))
+        ]
+        conn.execute(
+            sa.text(
+                """
+                INSERT INTO io_log_search_chunk (io_log_id, position, search_vector, created_at, updated_at)
+                SELECT io_log_id, position, to_tsvector('simple'::regconfig, searched_text), NOW(), NOW()
+                FROM unnest(CAST(:io_log_ids AS integer[]), CAST(:positions AS integer[]), CAST(:texts AS text[]))
+                    AS chunk (io_log_id, position, searched_text)
+                """
+            ),
+            {
+                "io_log_ids": [io_log_id for io_log_id, _, _ in chunks],
+                "positions": [position for _, position, _ in chunks],
+                "texts": [chunk for _, _, chunk in chunks],
+            },
+        )
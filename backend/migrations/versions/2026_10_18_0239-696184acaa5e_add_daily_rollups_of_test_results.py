@@ -0,0 +1,162 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+
+"""Add daily rollups of test results
+
+Revision ID: 696184acaa5e
+Revises: e4bf93d020ef
+Create Date: 2026-10-18 02:39:55.361474+00:00
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "696184acaa5e"
+down_revision = "e4bf93d020ef"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The rollups start empty and the periodic job counts existing results
+    # from the first one, a day of them per transaction
+    op.create_table(
+        "rollup_watermark",
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("watermark", sa.DateTime(), nullable=False),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id", name=op.f("rollup_watermark_pkey")),
+        sa.UniqueConstraint("name", name=op.f("rollup_watermark_name_key")),
+    )
+    op.create_table(
+        "test_result_daily_rollup",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("family", postgresql.ENUM(name="familyname", create_type=False), nullable=False),
+        sa.Column("artefact_id", sa.Integer(), nullable=False),
+        sa.Column("environment_id", sa.Integer(), nullable=False),
+        sa.Column("test_case_id", sa.Integer(), nullable=False),
+        sa.Column("status", postgresql.ENUM(name="testresultstatus", create_type=False), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["artefact_id"],
+            ["artefact.id"],
+            name=op.f("test_result_daily_rollup_artefact_id_fkey"),
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["environment_id"],
+            ["environment.id"],
+            name=op.f("test_result_daily_rollup_environment_id_fkey"),
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["test_case_id"],
+            ["test_case.id"],
+            name=op.f("test_result_daily_rollup_test_case_id_fkey"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("test_result_daily_rollup_pkey")),
+        sa.UniqueConstraint(
+            "day",
+            "artefact_id",
+            "environment_id",
+            "test_case_id",
+            "status",
+            name=op.f("test_result_daily_rollup_day_artefact_id_environment_id_test_case_id_status_key"),
+        ),
+    )
+    op.create_index(
+        op.f("test_result_daily_rollup_artefact_id_day_ix"),
+        "test_result_daily_rollup",
+        ["artefact_id", "day"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("test_result_daily_rollup_environment_id_day_ix"),
+        "test_result_daily_rollup",
+        ["environment_id", "day"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("test_result_daily_rollup_family_day_ix"), "test_result_daily_rollup", ["family", "day"], unique=False
+    )
+    op.create_index(
+        op.f("test_result_daily_rollup_test_case_id_day_ix"),
+        "test_result_daily_rollup",
+        ["test_case_id", "day"],
+        unique=False,
+    )
+    op.create_table(
+        "test_result_daily_summary",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("family", postgresql.ENUM(name="familyname", create_type=False), nullable=False),
+        sa.Column("artefact_id", sa.Integer(), nullable=False),
+        sa.Column("environment_id", sa.Integer(), nullable=False),
+        sa.Column("status", postgresql.ENUM(name="testresultstatus", create_type=False), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["artefact_id"],
+            ["artefact.id"],
+            name=op.f("test_result_daily_summary_artefact_id_fkey"),
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["environment_id"],
+            ["environment.id"],
+            name=op.f("test_result_daily_summary_environment_id_fkey"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("test_result_daily_summary_pkey")),
+        sa.UniqueConstraint(
+            "day",
+            "artefact_id",
+            "environment_id",
+            "status",
+            name=op.f("test_result_daily_summary_day_artefact_id_environment_id_status_key"),
+        ),
+    )
+    op.create_index(
+        op.f("test_result_daily_summary_artefact_id_day_ix"),
+        "test_result_daily_summary",
+        ["artefact_id", "day"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("test_result_daily_summary_environment_id_day_ix"),
+        "test_result_daily_summary",
+        ["environment_id", "day"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("test_result_daily_summary_family_day_ix"), "test_result_daily_summary", ["family", "day"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("test_result_daily_summary")
+    op.drop_table("test_result_daily_rollup")
+    op.drop_table("rollup_watermark")
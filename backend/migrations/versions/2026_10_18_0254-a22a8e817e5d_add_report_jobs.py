@@ -0,0 +1,89 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+
+"""Add report jobs
+
+Revision ID: a22a8e817e5d
+Revises: 696184acaa5e
+Create Date: 2026-10-18 02:54:22.594919+00:00
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "a22a8e817e5d"
+down_revision = "696184acaa5e"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "report_job",
+        sa.Column("report", sa.Enum("TEST_RESULTS", "TEST_EXECUTIONS", name="reportname"), nullable=False),
+        sa.Column("start_date", sa.DateTime(), nullable=False),
+        sa.Column("end_date", sa.DateTime(), nullable=True),
+        sa.Column("filters_digest", sa.String(length=64), nullable=False),
+        sa.Column("status", postgresql.ENUM(name="jobstatus", create_type=False), nullable=False),
+        sa.Column("size", sa.BigInteger(), nullable=True),
+        sa.Column("error", sa.String(), nullable=True),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id", name=op.f("report_job_pkey")),
+    )
+    op.create_index(
+        "report_job_active_filters_digest_ix",
+        "report_job",
+        ["filters_digest"],
+        unique=True,
+        postgresql_where=sa.text("status IN ('PENDING', 'RUNNING')"),
+    )
+    op.create_table(
+        "report_job_chunk",
+        sa.Column("report_job_id", sa.Integer(), nullable=False),
+        sa.Column("byte_offset", sa.BigInteger(), nullable=False),
+        sa.Column("content", sa.LargeBinary(), nullable=False),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["report_job_id"],
+            ["report_job.id"],
+            name=op.f("report_job_chunk_report_job_id_fkey"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("report_job_chunk_pkey")),
+        sa.UniqueConstraint(
+            "report_job_id", "byte_offset", name=op.f("report_job_chunk_report_job_id_byte_offset_key")
+        ),
+    )
+    # Chunks are gzip compressed already, don't compress them again when stored out of line
+    op.execute("ALTER TABLE report_job_chunk ALTER COLUMN content SET STORAGE EXTERNAL")
+
+
+def downgrade() -> None:
+    op.drop_table("report_job_chunk")
+    op.drop_index(
+        "report_job_active_filters_digest_ix",
+        table_name="report_job",
+        postgresql_where=sa.text("status IN ('PENDING', 'RUNNING')"),
+    )
+    op.drop_table("report_job")
+    op.execute("DROP TYPE IF EXISTS reportname")
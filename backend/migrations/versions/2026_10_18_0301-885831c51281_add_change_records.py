@@ -0,0 +1,113 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+
+"""Add change records
+
+Revision ID: 885831c51281
+Revises: a22a8e817e5d
+Create Date: 2026-10-18 03:01:12.337019+00:00
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "885831c51281"
+down_revision = "a22a8e817e5d"
+branch_labels = None
+depends_on = None
+
+# Tables whose changes are recorded, with the entity of their rows and the column of their parent
+RECORDED_TABLES = {
+    "artefact": ("ARTEFACT", None),
+    "artefact_build": ("ARTEFACT_BUILD", "artefact_id"),
+    "test_execution": ("TEST_EXECUTION", "artefact_build_id"),
+    "test_result": ("TEST_RESULT", "test_execution_id"),
+    "artefact_build_environment_review": ("ENVIRONMENT_REVIEW", "artefact_build_id"),
+    "issue_test_result_attachment": ("ISSUE_ATTACHMENT", "test_result_id"),
+}
+
+# Transition tables can only be referenced by triggers on a single event
+TRIGGER_EVENTS = {"INSERT": "NEW", "UPDATE": "NEW", "DELETE": "OLD"}
+
+
+def upgrade() -> None:
+    op.create_table(
+        "change_record",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("transaction_id", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "entity",
+            sa.Enum(
+                "ARTEFACT",
+                "ARTEFACT_BUILD",
+                "TEST_EXECUTION",
+                "TEST_RESULT",
+                "ENVIRONMENT_REVIEW",
+                "ISSUE_ATTACHMENT",
+                name="changeentity",
+            ),
+            nullable=False,
+        ),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.Column("parent_id", sa.Integer(), nullable=True),
+        sa.Column("operation", sa.Enum("CREATED", "UPDATED", "DELETED", name="changeoperation"), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id", name=op.f("change_record_pkey")),
+    )
+    op.create_index(op.f("change_record_transaction_id_id_ix"), "change_record", ["transaction_id", "id"], unique=False)
+
+    # Records a change per row of the statement, taking the entity and the
+    # parent column as arguments
+    op.execute(
+        """
+        CREATE FUNCTION record_changes() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            EXECUTE format(
+                'INSERT INTO change_record '
+                '(transaction_id, entity, entity_id, parent_id, operation, created_at, updated_at) '
+                'SELECT pg_current_xact_id()::text::bigint, %L::changeentity, id, %s, %L::changeoperation, '
+                'now(), now() FROM changed_rows ORDER BY id',
+                TG_ARGV[0],
+                CASE WHEN TG_NARGS > 1 THEN quote_ident(TG_ARGV[1]) ELSE 'NULL' END,
+                CASE TG_OP WHEN 'INSERT' THEN 'CREATED' WHEN 'UPDATE' THEN 'UPDATED' ELSE 'DELETED' END
+            );
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    for table, (entity, parent_column) in RECORDED_TABLES.items():
+        arguments = ", ".join(f"'{argument}'" for argument in (entity, parent_column) if argument)
+        for event, transition in TRIGGER_EVENTS.items():
+            op.execute(
+                f"CREATE TRIGGER {table}_{event.lower()}_changes AFTER {event} ON {table} "
+                f"REFERENCING {transition} TABLE AS changed_rows "
+                f"FOR EACH STATEMENT EXECUTE FUNCTION record_changes({arguments})"
+            )
+
+
+def downgrade() -> None:
+    for table in RECORDED_TABLES:
+        for event in TRIGGER_EVENTS:
+            op.execute(f"DROP TRIGGER {table}_{event.lower()}_changes ON {table}")
+    op.execute("DROP FUNCTION record_changes")
+    op.drop_index(op.f("change_record_transaction_id_id_ix"), table_name="change_record")
+    op.drop_table("change_record")
+    op.execute("DROP TYPE IF EXISTS changeentity")
+    op.execute("DROP TYPE IF EXISTS changeoperation")
@@ -0,0 +1,45 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+
+"""Add test result ingest status
+
+Revision ID: 7fb87c0928a8
+Revises: 885831c51281
+Create Date: 2026-10-18 03:24:01.861036+00:00
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "7fb87c0928a8"
+down_revision = "885831c51281"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Ingests were never running, so every status has a counterpart
+    op.execute("CREATE TYPE testresultingeststatus AS ENUM('PENDING', 'COMPLETED', 'FAILED')")
+    op.execute(
+        "ALTER TABLE test_result_ingest ALTER COLUMN status TYPE testresultingeststatus "
+        "USING status::text::testresultingeststatus"
+    )
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE test_result_ingest ALTER COLUMN status TYPE jobstatus USING status::text::jobstatus")
+    op.execute("DROP TYPE IF EXISTS testresultingeststatus")
@@ -0,0 +1,43 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Drop io_log column of test results
+
+Revision ID: 9a21e5fea975
+Revises: 7fb87c0928a8
+Create Date: 2026-10-18 03:59:41.204519+00:00
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9a21e5fea975"
+down_revision = "7fb87c0928a8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Scans test_result without blocking its reads nor writes
+    op.execute("ALTER TABLE test_result VALIDATE CONSTRAINT test_result_io_log_id_fkey")
+    op.alter_column("test_result", "io_log_preview", server_default=None)  # type: ignore[arg-type]
+    op.drop_column("test_result", "io_log")
+
+
+def downgrade() -> None:
+    op.add_column("test_result", sa.Column("io_log", sa.VARCHAR(), nullable=False, server_default=""))
+    op.alter_column("test_result", "io_log_preview", server_default="")
@@ -0,0 +1,74 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+
+"""Add attachment rule version
+
+Revision ID: 47faf607c4a9
+Revises: 9a21e5fea975
+Create Date: 2026-10-18 04:18:16.174875+00:00
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "47faf607c4a9"
+down_revision = "9a21e5fea975"
+branch_labels = None
+depends_on = None
+
+# Tables whose changes change the version
+VERSIONED_TABLES = ["issue_test_result_attachment_rule", "issue_test_result_attachment_rule_execution_metadata"]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "attachment_rule_version",
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id", name=op.f("attachment_rule_version_pkey")),
+    )
+    op.execute("CREATE SEQUENCE attachment_rule_version_seq")
+    op.execute("INSERT INTO attachment_rule_version (version, created_at, updated_at) VALUES (0, now(), now())")
+
+    op.execute(
+        """
+        CREATE FUNCTION bump_attachment_rule_version() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            -- Unlike a counter a sequence doesn't hand out values again after a rollback,
+            -- so readers that saw the uncommitted version can't mistake it for a later one
+            UPDATE attachment_rule_version SET version = nextval('attachment_rule_version_seq'), updated_at = now();
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    for table in VERSIONED_TABLES:
+        op.execute(
+            f"CREATE TRIGGER {table}_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION bump_attachment_rule_version()"
+        )
+
+
+def downgrade() -> None:
+    for table in VERSIONED_TABLES:
+        op.execute(f"DROP TRIGGER {table}_version ON {table}")
+    op.execute("DROP FUNCTION bump_attachment_rule_version")
+    op.drop_table("attachment_rule_version")
+    op.execute("DROP SEQUENCE attachment_rule_version_seq")
@@ -0,0 +1,285 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""
+Benchmark matching test results against attachment rules
+
+Compares evaluating the rules in PostgreSQL with matching them through the
+in-memory attachment rule index, for a growing number of enabled rules. The
+benchmark writes to the database configured through DB_URL but runs in a
+single transaction that is rolled back at the end.
+
+The statement evaluating the rules in PostgreSQL is a frozen copy of the one
+used for submitted test results before the index replaced it.
+"""
+
+import argparse
+import logging
+import random
+import time
+from collections.abc import Callable
+
+from sqlalchemy import (
+    ColumnElement,
+    Integer,
+    Select,
+    SQLColumnExpression,
+    and_,
+    any_,
+    exists,
+    func,
+    literal,
+    or_,
+    select,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.orm.attributes import InstrumentedAttribute
+
+from test_observer.controllers.issues.attachment_rule_index import (
+    attachment_rule_index_cache,
+    load_attachment_rule_index,
+    load_matchable_test_results,
+)
+from test_observer.data_access.models import (
+    Artefact,
+    ArtefactBuild,
+    Environment,
+    Issue,
+    IssueTestResultAttachmentRule,
+    IssueTestResultAttachmentRuleExecutionMetadata,
+    TestCase,
+    TestExecution,
+    TestExecutionMetadata,
+    TestPlan,
+    TestResult,
+    test_execution_metadata_association_table,
+)
+from test_observer.data_access.models_enums import FamilyName, IssueSource, TestResultStatus
+from test_observer.data_access.setup import SessionLocal
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+)
+
+ISSUES = 100
+
+
+def _create_test_results(db: Session, results: int) -> list[int]:
+    statuses = list(TestResultStatus)
+    test_execution = TestExecution(
+        artefact_build=ArtefactBuild(
+            artefact=Artefact(
+                name="benchmark-0",
+                version="1",
+                stage="beta",
+                family=FamilyName.snap,
+                track="latest",
+                store="ubuntu",
+            ),
+            architecture="amd64",
+            revision=1,
+        ),
+        environment=Environment(name="benchmark-attachment-rules", architecture="amd64"),
+        test_plan=TestPlan(name="benchmark-attachment-rules"),
+        execution_metadata=[TestExecutionMetadata(category="benchmark", value="value-0")],
+    )
+    test_results = [
+        TestResult(
+            test_execution=test_execution,
+            test_case=TestCase(
+                name=f"benchmark/test-{i}",
+                category="benchmark",
+                template_id=f"benchmark/template-{i % 100}",
+            ),
+            status=statuses[i % len(statuses)],
+            comment="",
+        )
+        for i in range(results)
+    ]
+    db.add_all(test_results)
+    db.flush()
+    return [test_result.id for test_result in test_results]
+
+
+def _generate_rule(rng: random.Random, issue: Issue, results: int) -> IssueTestResultAttachmentRule:
+    # Most rules target specific test cases, some are broader. Names are drawn
+    # from twice the number of results so that about half of them match.
+    kind = rng.randrange(10)
+    if kind < 6:
+        return IssueTestResultAttachmentRule(
+            issue=issue,
+            test_case_names=[f"benchmark/test-{rng.randrange(2 * results)}"],
+        )
+    if kind < 8:
+        return IssueTestResultAttachmentRule(
+            issue=issue,
+            template_ids=[f"benchmark/template-{rng.randrange(200)}"],
+            test_result_statuses=[TestResultStatus.FAILED],
+        )
+    if kind < 9:
+        return IssueTestResultAttachmentRule(
+            issue=issue,
+            families=[FamilyName.snap],
+            execution_metadata=[
+                IssueTestResultAttachmentRuleExecutionMetadata(category="benchmark", value=f"value-{rng.randrange(5)}")
+            ],
+        )
+    return IssueTestResultAttachmentRule(
+        issue=issue,
+        artefacts=[f"benchmark-{rng.randrange(20)}"],
+        environment_names=["benchmark-attachment-rules"],
+    )
+
+
+def _array_empty_or_contains(array: InstrumentedAttribute, value: SQLColumnExpression) -> ColumnElement[bool]:
+    return or_(func.cardinality(array) == 0, array.any(value))
+
+
+def _execution_metadata_satisfied(test_execution_id: SQLColumnExpression[int]) -> ColumnElement[bool]:
+    required = aliased(IssueTestResultAttachmentRuleExecutionMetadata)
+    accepted = aliased(IssueTestResultAttachmentRuleExecutionMetadata)
+    category_satisfied = exists(
+        select(1)
+        .select_from(accepted)
+        .join(
+            TestExecutionMetadata,
+            and_(
+                TestExecutionMetadata.category == accepted.category,
+                TestExecutionMetadata.value == accepted.value,
+            ),
+        )
+        .join(
+            test_execution_metadata_association_table,
+            test_execution_metadata_association_table.c.test_execution_metadata_id == TestExecutionMetadata.id,
+        )
+        .where(
+            accepted.attachment_rule_id == required.attachment_rule_id,
+            accepted.category == required.category,
+            test_execution_metadata_association_table.c.test_execution_id == test_execution_id,
+        )
+        .correlate_except(accepted, TestExecutionMetadata, test_execution_metadata_association_table)
+    )
+    return ~exists(
+        select(1)
+        .select_from(required)
+        .where(required.attachment_rule_id == IssueTestResultAttachmentRule.id, ~category_satisfied)
+    )
+
+
+def _query_matching_attachment_rules(test_result_ids: list[int]) -> Select[tuple[int, int, int]]:
+    """Select (issue_id, attachment_rule_id, test_result_id) keeping the oldest rule of every issue"""
+    return (
+        select(IssueTestResultAttachmentRule.issue_id, IssueTestResultAttachmentRule.id, TestResult.id)
+        .select_from(IssueTestResultAttachmentRule)
+        .join(TestResult, TestResult.id == any_(literal(test_result_ids, ARRAY(Integer))))
+        .join(TestResult.test_case)
+        .join(TestResult.test_execution)
+        .join(TestExecution.artefact_build)
+        .join(ArtefactBuild.artefact)
+        .join(TestExecution.environment)
+        .where(IssueTestResultAttachmentRule.enabled)
+        .where(_array_empty_or_contains(IssueTestResultAttachmentRule.families, Artefact.family))
+        .where(_array_empty_or_contains(IssueTestResultAttachmentRule.artefacts, Artefact.name))
+        .where(_array_empty_or_contains(IssueTestResultAttachmentRule.artefact_versions, Artefact.version))
+        .where(_array_empty_or_contains(IssueTestResultAttachmentRule.artefact_stages, Artefact.stage))
+        .where(_array_empty_or_contains(IssueTestResultAttachmentRule.artefact_tracks, Artefact.track))
+        .where(_array_empty_or_contains(IssueTestResultAttachmentRule.environment_names, Environment.name))
+        .where(_array_empty_or_contains(IssueTestResultAttachmentRule.test_case_names, TestCase.name))
+        .where(_array_empty_or_contains(IssueTestResultAttachmentRule.template_ids, TestCase.template_id))
+        .where(_array_empty_or_contains(IssueTestResultAttachmentRule.test_result_statuses, TestResult.status))
+        .where(_execution_metadata_satisfied(TestResult.test_execution_id))
+        .distinct(TestResult.id, IssueTestResultAttachmentRule.issue_id)
+        .order_by(TestResult.id, IssueTestResultAttachmentRule.issue_id, IssueTestResultAttachmentRule.id)
+    )
+
+
+def _time(repeat: int, run: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        run()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def _benchmark_matching(db: Session, test_result_ids: list[int], rules: int, repeat: int) -> None:
+    def match_in_sql() -> int:
+        return len(db.execute(_query_matching_attachment_rules(test_result_ids)).all())
+
+    def match_in_memory() -> int:
+        index = attachment_rule_index_cache.get(db)
+        return sum(len(index.match(result)) for result in load_matchable_test_results(db, test_result_ids))
+
+    sql_matches = match_in_sql()
+    index_matches = match_in_memory()
+    assert sql_matches == index_matches, f"SQL found {sql_matches} matches, index {index_matches}"
+
+    build_ms = _time(1, lambda: load_attachment_rule_index(db))
+    sql_ms = _time(repeat, match_in_sql)
+    index_ms = _time(repeat, match_in_memory)
+
+    index = attachment_rule_index_cache.get(db)
+    matchable_test_results = load_matchable_test_results(db, test_result_ids)
+    match_ms = _time(repeat, lambda: [index.match(result) for result in matchable_test_results])
+
+    logging.info(
+        f"{rules} rules, {len(test_result_ids)} results, {sql_matches} matches: "
+        f"SQL {sql_ms:.1f} ms, index {index_ms:.1f} ms "
+        f"({match_ms / len(test_result_ids) * 1000:.1f} µs per result in memory), "
+        f"index build {build_ms:.1f} ms"
+    )
+
+
+def benchmark_attachment_rules(rule_counts: list[int], results: int, repeat: int) -> None:
+    rng = random.Random(0)
+
+    with SessionLocal() as db:
+        try:
+            test_result_ids = _create_test_results(db, results)
+            issues = [
+                Issue(source=IssueSource.GITHUB, project="canonical/benchmark", key=str(i)) for i in range(ISSUES)
+            ]
+            db.add_all(issues)
+
+            rules = 0
+            for rule_count in sorted(rule_counts):
+                db.add_all(_generate_rule(rng, issues[i % ISSUES], results) for i in range(rules, rule_count))
+                db.flush()
+                rules = rule_count
+
+                _benchmark_matching(db, test_result_ids, rules, repeat)
+        finally:
+            db.rollback()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmarks matching test results against attachment rules"
+        "\nUses the database at DB_URL, everything written to it is rolled back",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--rules",
+        help="Numbers of enabled rules to benchmark with",
+        default=[10, 100, 1000, 10000],
+        nargs="+",
+        type=int,
+    )
+    parser.add_argument("--results", help="Number of test results to match", default=1000, type=int)
+    parser.add_argument("--repeat", help="Number of times to repeat every measurement", default=5, type=int)
+
+    args = parser.parse_args()
+
+    benchmark_attachment_rules(args.rules, args.results, args.repeat)
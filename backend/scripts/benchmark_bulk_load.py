@@ -0,0 +1,192 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""
+Benchmark bulk loading of test results and test events
+
+Compares adding rows through the ORM, inserting them with a multi-row INSERT
+and staging them with COPY before merging them with INSERT ... SELECT. The
+benchmark writes to the database configured through DB_URL, so only run it
+against a disposable database. Everything it creates is deleted at the end.
+"""
+
+import argparse
+import logging
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import Any
+from uuid import uuid4
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from test_observer.data_access.bulk_load import staged_rows
+from test_observer.data_access.io_logs import store_io_logs
+from test_observer.data_access.models import (
+    Artefact,
+    ArtefactBuild,
+    DataModel,
+    Environment,
+    IoLog,
+    TestCase,
+    TestEvent,
+    TestExecution,
+    TestPlan,
+    TestResult,
+)
+from test_observer.data_access.models_enums import FamilyName, TestResultStatus
+from test_observer.data_access.repository import get_or_create
+from test_observer.data_access.setup import SessionLocal
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+)
+
+
+def _create_test_execution(db: Session, run: str) -> TestExecution:
+    artefact = Artefact(
+        name=f"benchmark-{run}",
+        version="1",
+        stage="beta",
+        family=FamilyName.snap,
+        track="latest",
+        store="ubuntu",
+    )
+    test_execution = TestExecution(
+        artefact_build=ArtefactBuild(artefact=artefact, architecture="amd64", revision=1),
+        environment=get_or_create(db, Environment, {"name": "benchmark", "architecture": "amd64"}),
+        test_plan=get_or_create(db, TestPlan, {"name": "benchmark"}),
+    )
+    db.add(test_execution)
+    db.commit()
+    return test_execution
+
+
+def _create_test_cases(db: Session, run: str, count: int) -> list[int]:
+    test_case_ids = db.scalars(
+        insert(TestCase).returning(TestCase.id, sort_by_parameter_order=True),
+        [{"name": f"benchmark/{run}/test-{i}", "category": "benchmark"} for i in range(count)],
+    ).all()
+    db.commit()
+    return list(test_case_ids)
+
+
+def _generate_test_results(test_execution_id: int, test_case_ids: list[int], io_log_id: int | None) -> list[dict]:
+    statuses = list(TestResultStatus)
+    return [
+        {
+            "test_execution_id": test_execution_id,
+            "test_case_id": test_case_id,
+            "status": statuses[i % len(statuses)],
+            "comment": "",
+            "io_log_id": io_log_id,
+            "io_log_preview": "",
+        }
+        for i, test_case_id in enumerate(test_case_ids)
+    ]
+
+
+def _generate_test_events(test_execution_id: int, count: int) -> list[dict]:
+    start = datetime.now()
+    return [
+        {
+            "test_execution_id": test_execution_id,
+            "event_name": f"event_{i}",
+            "timestamp": start + timedelta(seconds=i),
+            "detail": "",
+        }
+        for i in range(count)
+    ]
+
+
+def _load_with_orm(db: Session, model: type[DataModel], rows: list[dict]) -> None:
+    db.add_all(model(**row) for row in rows)
+    db.flush()
+
+
+def _load_with_insert(db: Session, model: type[DataModel], rows: list[dict]) -> None:
+    # RETURNING makes SQLAlchemy batch the rows into multi-row INSERTs
+    # rather than executing one INSERT per row
+    db.scalars(insert(model).returning(model.id), rows).all()
+
+
+def _load_with_copy(db: Session, model: type[DataModel], rows: list[dict]) -> None:
+    columns = list(rows[0])
+    with staged_rows(db, model, columns, rows) as staging:
+        db.execute(insert(model).from_select(columns, select(staging)))
+
+
+def _measure(
+    label: str,
+    repeat: int,
+    model: type[DataModel],
+    rows: list[dict],
+    load: Callable[[Session, Any, list[dict]], None],
+) -> None:
+    elapsed = 0.0
+    for _ in range(repeat):
+        with SessionLocal() as db:
+            start = time.perf_counter()
+            load(db, model, rows)
+            elapsed += time.perf_counter() - start
+            # Keep every repetition on an empty table
+            db.rollback()
+
+    logging.info(f"{label}: {repeat * len(rows) / elapsed:.0f} rows/s ({elapsed / repeat * 1000:.0f} ms per load)")
+
+
+def benchmark_bulk_load(rows: int, repeat: int, io_log_size: int) -> None:
+    run = uuid4().hex[:8]
+
+    io_log = f"{run} " + "x" * io_log_size
+    with SessionLocal() as db:
+        test_execution_id = _create_test_execution(db, run).id
+        test_case_ids = _create_test_cases(db, run, rows)
+        io_log_id = store_io_logs(db, [io_log]).get(io_log)
+        db.commit()
+
+    try:
+        test_results = _generate_test_results(test_execution_id, test_case_ids, io_log_id)
+        test_events = _generate_test_events(test_execution_id, rows)
+
+        for model, model_rows in ((TestResult, test_results), (TestEvent, test_events)):
+            name = model.__tablename__
+            _measure(f"{name} ORM", repeat, model, model_rows, _load_with_orm)
+            _measure(f"{name} multi-row INSERT", repeat, model, model_rows, _load_with_insert)
+            _measure(f"{name} COPY", repeat, model, model_rows, _load_with_copy)
+    finally:
+        with SessionLocal() as db:
+            db.execute(delete(Artefact).where(Artefact.name == f"benchmark-{run}"))
+            db.execute(delete(TestCase).where(TestCase.name.startswith(f"benchmark/{run}/")))
+            db.execute(delete(IoLog).where(IoLog.id == io_log_id))
+            db.commit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmarks bulk loading test results and test events"
+        "\nUses the database at DB_URL, which must be disposable as data is written to it",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--rows", help="Number of rows per load", default=50000, type=int)
+    parser.add_argument("--repeat", help="Number of loads to time", default=3, type=int)
+    parser.add_argument("--io_log_size", help="Size of the io_log of all results in bytes", default=200, type=int)
+
+    args = parser.parse_args()
+
+    benchmark_bulk_load(args.rows, args.repeat, args.io_log_size)
@@ -0,0 +1,270 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""
+Benchmark POST /v1/test-executions/{id}/test-results
+
+Compares the set-based ingest pipeline used by the endpoint against the
+previous implementation that handled results one at a time, which is kept
+here as a reference. The benchmark writes to the database configured through
+DB_URL, so only run it against a disposable database. Everything it creates
+is deleted at the end.
+"""
+
+import argparse
+import logging
+import time
+from collections.abc import Callable
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+from sqlalchemy import ColumnElement, SQLColumnExpression, and_, delete, exists, func, literal, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import InstrumentedAttribute
+
+from test_observer.common.enums import Permission
+from test_observer.controllers.applications.application_injection import (
+    get_current_application,
+)
+from test_observer.controllers.test_executions.models import TestResultRequest
+from test_observer.data_access.io_logs import io_log_preview, store_io_logs
+from test_observer.data_access.models import (
+    Application,
+    Artefact,
+    ArtefactBuild,
+    Environment,
+    Issue,
+    IssueTestResultAttachment,
+    IssueTestResultAttachmentRule,
+    IssueTestResultAttachmentRuleExecutionMetadata,
+    TestCase,
+    TestExecution,
+    TestExecutionMetadata,
+    TestExecutionRerunRequest,
+    TestPlan,
+    TestResult,
+    test_execution_metadata_association_table,
+)
+from test_observer.data_access.models_enums import FamilyName, TestResultStatus
+from test_observer.data_access.repository import get_or_create
+from test_observer.data_access.setup import SessionLocal
+from test_observer.main import app
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+)
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+def _array_empty_or_contains(array: InstrumentedAttribute, value: SQLColumnExpression) -> ColumnElement[bool]:
+    return or_(func.cardinality(array) == 0, array.any(value))
+
+
+def _apply_attachment_rules_row_by_row(db: Session, test_result: TestResult) -> None:
+    """Attaching issues as it was done for every result before the set-based pipeline"""
+    artefact = test_result.test_execution.artefact_build.artefact
+    rule = IssueTestResultAttachmentRule
+    metadata = IssueTestResultAttachmentRuleExecutionMetadata
+    unmatched_categories = (
+        select(metadata.attachment_rule_id)
+        .outerjoin(
+            TestExecutionMetadata,
+            and_(
+                TestExecutionMetadata.category == metadata.category,
+                TestExecutionMetadata.value == metadata.value,
+                TestExecutionMetadata.id.in_(
+                    select(test_execution_metadata_association_table.c.test_execution_metadata_id).where(
+                        test_execution_metadata_association_table.c.test_execution_id == test_result.test_execution_id
+                    )
+                ),
+            ),
+        )
+        .group_by(metadata.attachment_rule_id, metadata.category)
+        .having(func.count(TestExecutionMetadata.value) == 0)
+        .subquery()
+    )
+    matching_rules = (
+        select(rule.issue_id, rule.id, literal(test_result.id))
+        .where(rule.enabled)
+        .where(_array_empty_or_contains(rule.families, literal(artefact.family)))
+        .where(_array_empty_or_contains(rule.artefacts, literal(artefact.name)))
+        .where(_array_empty_or_contains(rule.artefact_versions, literal(artefact.version)))
+        .where(_array_empty_or_contains(rule.artefact_stages, literal(artefact.stage)))
+        .where(_array_empty_or_contains(rule.artefact_tracks, literal(artefact.track)))
+        .where(_array_empty_or_contains(rule.environment_names, literal(test_result.test_execution.environment.name)))
+        .where(_array_empty_or_contains(rule.test_case_names, literal(test_result.test_case.name)))
+        .where(_array_empty_or_contains(rule.template_ids, literal(test_result.test_case.template_id)))
+        .where(_array_empty_or_contains(rule.test_result_statuses, literal(test_result.status)))
+        .where(~exists(select(1).where(unmatched_categories.c.attachment_rule_id == rule.id)))
+        .order_by(rule.id)
+    )
+    db.execute(
+        insert(IssueTestResultAttachment)
+        .from_select(["issue_id", "attachment_rule_id", "test_result_id"], matching_rules)
+        .on_conflict_do_nothing()
+    )
+
+    db.execute(
+        insert(TestExecutionRerunRequest)
+        .from_select(
+            ["test_plan_id", "artefact_build_id", "environment_id"],
+            select(TestExecution.test_plan_id, TestExecution.artefact_build_id, TestExecution.environment_id)
+            .join(TestResult, TestResult.test_execution_id == TestExecution.id)
+            .join(IssueTestResultAttachment, IssueTestResultAttachment.test_result_id == TestResult.id)
+            .join(Issue, Issue.id == IssueTestResultAttachment.issue_id)
+            .where(Issue.auto_rerun_enabled, TestExecution.id == test_result.test_execution_id)
+            .distinct(),
+        )
+        .on_conflict_do_nothing()
+    )
+
+
+def _post_results_row_by_row(db: Session, test_execution_id: int, request: list[TestResultRequest]) -> None:
+    """The ingest loop as it was before the set-based pipeline"""
+    test_execution = db.get(TestExecution, test_execution_id, with_for_update=True)
+    assert test_execution is not None
+
+    for result in request:
+        test_case = get_or_create(
+            db,
+            TestCase,
+            filter_kwargs={"name": result.name},
+            creation_kwargs={"category": result.category, "template_id": result.template_id},
+        )
+        db.execute(
+            delete(TestResult).where(
+                TestResult.test_execution_id == test_execution.id,
+                TestResult.test_case_id == test_case.id,
+            )
+        )
+        test_result = TestResult(
+            test_execution=test_execution,
+            test_case=test_case,
+            status=result.status,
+            comment=result.comment,
+            io_log_id=store_io_logs(db, [result.io_log]).get(result.io_log),
+            io_log_preview=io_log_preview(result.io_log),
+        )
+        db.add(test_result)
+        db.flush()
+        _apply_attachment_rules_row_by_row(db, test_result)
+
+    db.commit()
+
+
+def _generate_request(run: str, results: int, io_log_size: int) -> list[dict]:
+    statuses = list(TestResultStatus)
+    return [
+        {
+            "name": f"benchmark/{run}/test-{i}",
+            "status": statuses[i % len(statuses)],
+            "category": "benchmark",
+            "template_id": f"benchmark/{run}/template-{i % 10}",
+            "comment": "",
+            "io_log": "x" * io_log_size,
+        }
+        for i in range(results)
+    ]
+
+
+def _create_test_execution(db: Session, run: str) -> TestExecution:
+    artefact = Artefact(
+        name=f"benchmark-{run}",
+        version="1",
+        stage="beta",
+        family=FamilyName.snap,
+        track="latest",
+        store="ubuntu",
+    )
+    test_execution = TestExecution(
+        artefact_build=ArtefactBuild(artefact=artefact, architecture="amd64", revision=1),
+        environment=get_or_create(db, Environment, {"name": "benchmark", "architecture": "amd64"}),
+        test_plan=get_or_create(db, TestPlan, {"name": "benchmark"}),
+    )
+    db.add(test_execution)
+    db.commit()
+    return test_execution
+
+
+def _measure(label: str, repeat: int, rows: int, send: Callable[[], None]) -> None:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        send()
+    elapsed = time.perf_counter() - start
+
+    logging.info(
+        f"{label}: {repeat / elapsed:.2f} requests/s, {repeat * rows / elapsed:.0f} rows/s "
+        f"({elapsed / repeat * 1000:.0f} ms per request)"
+    )
+
+
+def benchmark_post_results(results: int, repeat: int, io_log_size: int) -> None:
+    run = uuid4().hex[:8]
+    request = _generate_request(run, results, io_log_size)
+
+    app.dependency_overrides[get_current_application] = lambda: Application(
+        name="benchmark", permissions=[Permission.change_test]
+    )
+    client = TestClient(app)
+
+    with SessionLocal() as db:
+        test_execution_id = _create_test_execution(db, run).id
+
+    try:
+
+        def send_set_based() -> None:
+            response = client.post(f"/v1/test-executions/{test_execution_id}/test-results", json=request)
+            response.raise_for_status()
+
+        def send_row_by_row() -> None:
+            with SessionLocal() as db:
+                _post_results_row_by_row(
+                    db, test_execution_id, [TestResultRequest.model_validate(result) for result in request]
+                )
+
+        # The first request creates the test cases, later ones replace results
+        # so measure both situations separately
+        _measure("row by row (new test cases)", 1, results, send_row_by_row)
+        _measure("row by row (existing test cases)", repeat, results, send_row_by_row)
+
+        with SessionLocal() as db:
+            db.execute(delete(TestCase).where(TestCase.name.startswith(f"benchmark/{run}/")))
+            db.commit()
+
+        _measure("set based (new test cases)", 1, results, send_set_based)
+        _measure("set based (existing test cases)", repeat, results, send_set_based)
+    finally:
+        del app.dependency_overrides[get_current_application]
+        with SessionLocal() as db:
+            db.execute(delete(Artefact).where(Artefact.name == f"benchmark-{run}"))
+            db.execute(delete(TestCase).where(TestCase.name.startswith(f"benchmark/{run}/")))
+            db.commit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmarks submitting test results to a test execution"
+        "\nUses the database at DB_URL, which must be disposable as data is written to it",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--results", help="Number of results per request", default=5000, type=int)
+    parser.add_argument("--repeat", help="Number of requests to time", default=5, type=int)
+    parser.add_argument("--io_log_size", help="Size of every io_log in bytes", default=200, type=int)
+
+    args = parser.parse_args()
+
+    benchmark_post_results(args.results, args.repeat, args.io_log_size)
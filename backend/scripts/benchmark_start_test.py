@@ -0,0 +1,213 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""
+Benchmark PUT /v1/test-executions/start-test under concurrency
+
+Compares the single statement used by the endpoint to create the chain of
+artefact, build, environment, review, test plan and test execution against the
+previous implementation that resolved them one get_or_create at a time, which
+is kept here as a reference. Concurrent workers start test executions of a
+small pool of artefacts and environments, so most requests race for the same
+rows. Besides throughput and latency the benchmark reports the statements sent
+per request, as each is a round trip that costs more against a remote
+database than a local one. The benchmark writes to the database configured
+through DB_URL, so only run it against a disposable database. Everything it
+creates is deleted at the end.
+"""
+
+import argparse
+import logging
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
+
+from sqlalchemy import delete, event
+from sqlalchemy.orm import Session
+
+from test_observer.controllers.test_executions.models import StartSnapTestExecutionRequest
+from test_observer.controllers.test_executions.start_test import StartTestExecutionController
+from test_observer.data_access.models import (
+    Artefact,
+    ArtefactBuild,
+    ArtefactBuildEnvironmentReview,
+    Environment,
+    TestExecution,
+    TestPlan,
+)
+from test_observer.data_access.repository import create_test_execution_relevant_link, get_or_create
+from test_observer.data_access.setup import SessionLocal, engine
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+)
+
+
+def _start_test_one_by_one(db: Session, request: StartSnapTestExecutionRequest) -> int:
+    """The start-test flow as it was before the single statement chain"""
+    artefact = get_or_create(
+        db,
+        Artefact,
+        filter_kwargs={
+            "name": request.name,
+            "version": request.version,
+            "family": request.family,
+            "store": request.store,
+            "track": request.track,
+            "branch": request.branch,
+        },
+        creation_kwargs={"stage": request.execution_stage},
+    )
+    environment = get_or_create(db, Environment, {"name": request.environment, "architecture": request.arch})
+    artefact_build = get_or_create(
+        db,
+        ArtefactBuild,
+        {"architecture": request.arch, "revision": request.revision, "artefact_id": artefact.id},
+    )
+    get_or_create(
+        db,
+        ArtefactBuildEnvironmentReview,
+        {"environment_id": environment.id, "artefact_build_id": artefact_build.id},
+    )
+    test_plan = get_or_create(db, TestPlan, {"name": request.test_plan})
+    test_execution = get_or_create(
+        db,
+        TestExecution,
+        filter_kwargs={"ci_link": request.ci_link},
+        creation_kwargs={
+            "status": request.initial_status,
+            "environment_id": environment.id,
+            "artefact_build_id": artefact_build.id,
+            "test_plan_id": test_plan.id,
+        },
+    )
+    for link in request.relevant_links:
+        create_test_execution_relevant_link(db, test_execution.id, link.label, link.url)
+    if test_execution.rerun_request:
+        db.delete(test_execution.rerun_request)
+        db.commit()
+    db.commit()
+    return test_execution.id
+
+
+def _start_test_single_statement(db: Session, request: StartSnapTestExecutionRequest) -> int:
+    return StartTestExecutionController(request, db).execute()["id"]
+
+
+def _generate_requests(run: str, label: str, requests: int, artefacts: int) -> list[StartSnapTestExecutionRequest]:
+    return [
+        StartSnapTestExecutionRequest.model_validate(
+            {
+                "family": "snap",
+                "name": f"benchmark-{run}-{i % artefacts}",
+                "version": "1",
+                "revision": 1,
+                "track": "latest",
+                "store": "ubuntu",
+                "arch": "amd64",
+                "execution_stage": "beta",
+                "environment": f"benchmark-{run}-{i % 10}",
+                "test_plan": f"benchmark-{run}",
+                "ci_link": f"http://benchmark/{run}/{label}/{i}",
+                "relevant_links": [{"label": "Log", "url": f"http://benchmark/{run}/{label}/{i}/log"}],
+            }
+        )
+        for i in range(requests)
+    ]
+
+
+def _measure(
+    label: str,
+    workers: int,
+    requests: list[StartSnapTestExecutionRequest],
+    start_test: Callable[[Session, StartSnapTestExecutionRequest], int],
+) -> None:
+    def send(request: StartSnapTestExecutionRequest) -> float | None:
+        sent = time.perf_counter()
+        with SessionLocal() as db:
+            try:
+                start_test(db, request)
+            except Exception:
+                logging.debug("Request failed", exc_info=True)
+                return None
+        return time.perf_counter() - sent
+
+    statements = 0
+
+    def count_statement(*_: object) -> None:
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine, "before_cursor_execute", count_statement)
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            latencies = list(executor.map(send, requests))
+    finally:
+        elapsed = time.perf_counter() - start
+        event.remove(engine, "before_cursor_execute", count_statement)
+
+    succeeded = sorted(latency for latency in latencies if latency is not None)
+    failed = len(latencies) - len(succeeded)
+    p50 = succeeded[len(succeeded) // 2] * 1000 if succeeded else float("nan")
+    p99 = succeeded[int(len(succeeded) * 0.99)] * 1000 if succeeded else float("nan")
+    logging.info(
+        f"{label}: {len(requests) / elapsed:.1f} requests/s with {workers} workers, "
+        f"p50 {p50:.1f} ms, p99 {p99:.1f} ms, {statements / len(requests):.1f} statements per request, "
+        f"{failed} failed"
+    )
+
+
+def benchmark_start_test(requests: int, workers: int, artefacts: int) -> None:
+    run = uuid4().hex[:8]
+
+    try:
+        _measure(
+            "one by one",
+            workers,
+            _generate_requests(run, "one-by-one", requests, artefacts),
+            _start_test_one_by_one,
+        )
+        _measure(
+            "single statement",
+            workers,
+            _generate_requests(run, "single-statement", requests, artefacts),
+            _start_test_single_statement,
+        )
+    finally:
+        with SessionLocal() as db:
+            db.execute(delete(Artefact).where(Artefact.name.startswith(f"benchmark-{run}-")))
+            db.execute(delete(Environment).where(Environment.name.startswith(f"benchmark-{run}-")))
+            db.execute(delete(TestPlan).where(TestPlan.name == f"benchmark-{run}"))
+            db.commit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmarks starting test executions concurrently"
+        "\nUses the database at DB_URL, which must be disposable as data is written to it",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--requests", help="Number of start-test requests to send", default=2000, type=int)
+    parser.add_argument("--workers", help="Number of concurrent workers", default=16, type=int)
+    parser.add_argument(
+        "--artefacts", help="Number of distinct artefacts the requests are spread over", default=5, type=int
+    )
+
+    args = parser.parse_args()
+
+    benchmark_start_test(args.requests, args.workers, args.artefacts)
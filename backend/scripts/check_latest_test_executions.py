@@ -0,0 +1,69 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+
+"""
+Check that every group of test executions is recorded with its latest execution
+
+Reports the groups (test plan, artefact build and environment) whose recorded
+latest test execution isn't the one with the highest id, which can happen if
+executions are created or deleted outside of the API. With --fix, records the
+latest execution of every group.
+"""
+
+import logging
+from argparse import ArgumentParser
+
+from test_observer.data_access.latest_test_executions import (
+    backfill_latest_test_executions,
+    find_inconsistent_latest_test_executions,
+)
+from test_observer.data_access.setup import SessionLocal
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+)
+
+
+def check_latest_test_executions(fix: bool) -> int:
+    with SessionLocal() as db:
+        inconsistent = find_inconsistent_latest_test_executions(db)
+        for group in inconsistent:
+            logging.warning(
+                f"test_plan_id={group.test_plan_id} artefact_build_id={group.artefact_build_id} "
+                f"environment_id={group.environment_id}: latest is {group.latest_test_execution_id}, "
+                f"recorded {group.recorded_test_execution_id}"
+            )
+
+        if fix and inconsistent:
+            backfill_latest_test_executions(db)
+            db.commit()
+
+    return len(inconsistent)
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        prog="check_latest_test_executions",
+        description="Reports groups of test executions whose recorded latest test execution is wrong",
+    )
+    parser.add_argument("--fix", action="store_true", help="Record the latest test execution of every group")
+
+    args = parser.parse_args()
+
+    inconsistent = check_latest_test_executions(args.fix)
+    logging.info(f"{inconsistent} inconsistent group(s){' fixed' if args.fix and inconsistent else ''}")
+    raise SystemExit(1 if inconsistent and not args.fix else 0)
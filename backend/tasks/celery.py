@@ -17,16 +17,44 @@ from __future__ import annotations
 
 import logging
 from collections.abc import Sequence
-from datetime import UTC, datetime
+from datetime import UTC, date, datetime, timedelta
 from os import environ
 
 from celery import Celery, Task
+from sqlalchemy import ColumnElement
 from sqlalchemy.orm import Session
 
-from test_observer.data_access.models import Issue
+from test_observer.controllers.issues.attachment_rules_logic import (
+    fail_attachment_rule_job,
+    run_attachment_rule_job_chunk,
+    select_stale_attachment_rule_jobs,
+)
+from test_observer.controllers.reports.report_jobs_logic import (
+    claim_report_job,
+    delete_expired_report_jobs,
+    fail_report_job,
+    write_report,
+)
+from test_observer.controllers.test_executions.ingest_logic import (
+    delete_expired_test_result_ingests,
+    drain_test_result_ingests_batch,
+)
+from test_observer.data_access.changes import delete_expired_changes
+from test_observer.data_access.io_logs import delete_unreferenced_io_logs
+from test_observer.data_access.models import ArtefactBuild, Issue, TestResult
 from test_observer.data_access.models_enums import FamilyName
 from test_observer.data_access.repository import get_artefacts_by_family
 from test_observer.data_access.setup import SessionLocal
+from test_observer.data_access.test_result_rollups import (
+    ROLLUP_REBUILT_DAYS,
+    rebuild_test_result_rollups,
+    roll_up_test_results,
+)
+from test_observer.data_access.test_result_search import (
+    reindex_test_results_batch,
+    select_changes_to_repair,
+    set_repair_watermark,
+)
 from test_observer.external_apis.synchronizers.config import SyncConfig
 from test_observer.external_apis.synchronizers.factory import (
     create_synchronization_service,
@@ -60,6 +88,18 @@ def setup_periodic_tasks(sender, **kwargs):  # noqa
     sender.add_periodic_task(300, integrate_with_kernel_swm.s())
     sender.add_periodic_task(600, run_promote_artefacts.s())
     sender.add_periodic_task(600, clean_user_sessions.s())
+    # Ingests are drained as they're submitted, this picks up any missed enqueue
+    sender.add_periodic_task(60, drain_test_result_ingests.s())
+    sender.add_periodic_task(3600, clean_io_logs.s())
+    sender.add_periodic_task(600, update_test_result_rollups.s())
+    sender.add_periodic_task(86400, rebuild_recent_test_result_rollups.s())
+    sender.add_periodic_task(3600, clean_report_jobs.s())
+    sender.add_periodic_task(3600, clean_changes.s())
+    sender.add_periodic_task(3600, clean_test_result_ingests.s())
+    # Attachment rule jobs are run as they're created, this picks up any missed enqueue
+    sender.add_periodic_task(300, resume_stale_attachment_rule_jobs.s())
+    # Search entries are reindexed as test cases and artefacts change, this repairs any missed enqueue
+    sender.add_periodic_task(600, repair_test_result_search.s())
 
     # Staggered sync tasks
     if environ.get("ENABLE_ISSUE_SYNC", "false").lower() == "true":
@@ -92,8 +132,10 @@ def run_promote_artefacts():
         artefact_key = f"{artefact.family} - {artefact.name} - {artefact.version}"
         try:
             with SessionLocal() as db:
-                db.merge(artefact)
+                modified = db.is_modified(db.merge(artefact))
                 db.commit()
+            if modified:
+                _reindex_test_results(ArtefactBuild.artefact_id == artefact.id)
         except Exception as exc:
             processed_status[artefact_key] = False
             error_messages[artefact_key] = str(exc)
@@ -110,6 +152,157 @@ def clean_user_sessions():
         delete_expired_user_sessions(db)
 
 
+@app.task
+def apply_attachment_rule_retroactively(job_id: int):
+    """Apply an attachment rule to existing test results, one chunk per transaction"""
+    try:
+        while True:
+            with SessionLocal() as db:
+                if not run_attachment_rule_job_chunk(db, job_id):
+                    break
+    except Exception as exc:
+        logger.exception("Attachment rule job %s failed", job_id)
+        with SessionLocal() as db:
+            fail_attachment_rule_job(db, job_id, str(exc))
+        raise
+
+
+@app.task
+def resume_stale_attachment_rule_jobs():
+    """Run the attachment rule jobs that were never enqueued or lost by their worker"""
+    with SessionLocal() as db:
+        job_ids = select_stale_attachment_rule_jobs(db)
+
+    for job_id in job_ids:
+        logger.warning("Resuming stale attachment rule job %s", job_id)
+        try:
+            apply_attachment_rule_retroactively(job_id)
+        except Exception:
+            # Already logged and recorded on the job
+            continue
+
+
+@app.task
+def drain_test_result_ingests():
+    """Store asynchronously submitted test results, one batch per transaction"""
+    while True:
+        with SessionLocal() as db:
+            if not drain_test_result_ingests_batch(db):
+                break
+
+
+@app.task
+def clean_test_result_ingests():
+    """Delete finished test result ingests past their retention"""
+    with SessionLocal() as db:
+        delete_expired_test_result_ingests(db)
+        db.commit()
+
+
+def _reindex_test_results(where: ColumnElement[bool]) -> None:
+    last_id: int | None = 0
+    while last_id is not None:
+        with SessionLocal() as db:
+            last_id = reindex_test_results_batch(db, where, last_id)
+            db.commit()
+
+
+@app.task
+def reindex_test_case_test_results(test_case_ids: list[int]):
+    """Rewrite the search entries of the results of test cases, one batch per transaction"""
+    _reindex_test_results(TestResult.test_case_id.in_(test_case_ids))
+
+
+@app.task
+def reindex_artefact_test_results(artefact_id: int):
+    """Rewrite the search entries of the results of an artefact, one batch per transaction"""
+    _reindex_test_results(ArtefactBuild.artefact_id == artefact_id)
+
+
+@app.task
+def repair_test_result_search():
+    """Reindex the results of the test cases and artefacts changed since the last repair"""
+    with SessionLocal() as db:
+        test_case_ids, artefact_ids, up_to = select_changes_to_repair(db)
+        db.commit()
+
+    if test_case_ids:
+        _reindex_test_results(TestResult.test_case_id.in_(test_case_ids))
+    for artefact_id in artefact_ids:
+        _reindex_test_results(ArtefactBuild.artefact_id == artefact_id)
+
+    with SessionLocal() as db:
+        set_repair_watermark(db, up_to)
+        db.commit()
+
+
+@app.task
+def clean_io_logs():
+    """Delete io_logs no test result references anymore, one batch per transaction"""
+    while True:
+        with SessionLocal() as db:
+            deleted = delete_unreferenced_io_logs(db)
+            db.commit()
+        if not deleted:
+            break
+
+
+@app.task
+def clean_changes():
+    """Delete changes past their retention, one batch per transaction"""
+    while True:
+        with SessionLocal() as db:
+            deleted = delete_expired_changes(db)
+            db.commit()
+        if not deleted:
+            break
+
+
+@app.task
+def update_test_result_rollups():
+    """Count the test results created since the last run, a day of them per transaction"""
+    while True:
+        with SessionLocal() as db:
+            remaining = roll_up_test_results(db)
+            db.commit()
+        if not remaining:
+            break
+
+
+@app.task
+def rebuild_recent_test_result_rollups():
+    """Count the test results of the last days again, as some changed or were deleted since they were counted"""
+    with SessionLocal() as db:
+        rebuild_test_result_rollups(db, date.today() - timedelta(days=ROLLUP_REBUILT_DAYS))
+        db.commit()
+
+
+@app.task
+def generate_report(job_id: int):
+    """Generate and store the report of a report job"""
+    try:
+        with SessionLocal() as db:
+            job = claim_report_job(db, job_id)
+            db.commit()
+            if job is None:
+                return
+            write_report(db, job)
+            db.commit()
+    except Exception as exc:
+        logger.exception("Report job %s failed", job_id)
+        with SessionLocal() as db:
+            fail_report_job(db, job_id, str(exc))
+        raise
+
+
+@app.task
+def clean_report_jobs():
+    """Delete report jobs past their retention along with their report"""
+    with SessionLocal() as db:
+        delete_expired_report_jobs(db)
+        db.commit()
+
+
 @app.task
 def sync_high_priority_issues() -> dict:
     """Sync open and unknown issues (high priority)"""
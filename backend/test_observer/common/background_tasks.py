@@ -0,0 +1,99 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+
+"""
+Enqueueing of background tasks
+
+Controllers enqueue tasks through these functions rather than importing the
+Celery app, whose tasks themselves run the logic of controllers. Tasks are
+only imported when enqueued, once every module is loaded.
+
+Tasks are enqueued once the rows they work on are committed, so failing to
+reach the broker is logged rather than failing the request. Periodic tasks
+pick up the ingests, attachment rule jobs and reindexes that couldn't be
+enqueued, while report jobs time out.
+"""
+
+import logging
+from collections.abc import Iterable
+
+from celery import Task
+from sqlalchemy.event import listens_for
+from sqlalchemy.orm import Session, SessionTransaction
+
+logger = logging.getLogger(__name__)
+
+_PENDING_REINDEX_KEY = "pending_test_results_reindex"
+
+
+def _delay(task: Task, *args: object) -> None:
+    try:
+        task.delay(*args)
+    except Exception:
+        logger.exception("Failed to enqueue %s%r", task.name, args)
+
+
+def enqueue_attachment_rule_job(job_id: int) -> None:
+    from tasks.celery import apply_attachment_rule_retroactively
+
+    _delay(apply_attachment_rule_retroactively, job_id)
+
+
+def enqueue_test_result_ingests_drain() -> None:
+    from tasks.celery import drain_test_result_ingests
+
+    _delay(drain_test_result_ingests)
+
+
+def enqueue_report_job(job_id: int) -> None:
+    from tasks.celery import generate_report
+
+    _delay(generate_report, job_id)
+
+
+def enqueue_test_results_reindex(test_case_ids: list[int], artefact_ids: list[int]) -> None:
+    from tasks.celery import reindex_artefact_test_results, reindex_test_case_test_results
+
+    if test_case_ids:
+        _delay(reindex_test_case_test_results, test_case_ids)
+    for artefact_id in artefact_ids:
+        _delay(reindex_artefact_test_results, artefact_id)
+
+
+def reindex_test_results_on_commit(
+    db: Session,
+    test_case_ids: Iterable[int] = (),
+    artefact_ids: Iterable[int] = (),
+) -> None:
+    """
+    Rewrite the search entries of the results of test cases and artefacts once the transaction commits
+
+    The entries are rewritten by a background task, so that they only see the committed changes.
+    """
+    pending = db.info.setdefault(_PENDING_REINDEX_KEY, (set(), set()))
+    pending[0].update(test_case_ids)
+    pending[1].update(artefact_ids)
+
+
+@listens_for(Session, "after_commit")
+def _enqueue_pending_reindex(db: Session) -> None:
+    if pending := db.info.pop(_PENDING_REINDEX_KEY, None):
+        enqueue_test_results_reindex(sorted(pending[0]), sorted(pending[1]))
+
+
+@listens_for(Session, "after_soft_rollback")
+def _discard_pending_reindex(db: Session, _previous_transaction: SessionTransaction) -> None:
+    db.info.pop(_PENDING_REINDEX_KEY, None)
@@ -0,0 +1,134 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""
+Responses serving a single byte range of their content
+
+Clients fetch part of large texts, such as the end of a long log, with a
+standard Range header. Whole contents are compressed when clients accept it,
+while ranges are served as is so that their bounds apply to the text itself.
+
+Large stored contents, such as generated reports, are streamed a part at a
+time so that interrupted downloads resume with a range from where they stopped.
+"""
+
+import gzip
+import re
+from collections.abc import Callable, Iterator
+
+from fastapi import HTTPException, Response
+from fastapi.responses import StreamingResponse
+
+# Only single ranges are served, other Range headers are ignored as allowed by RFC 9110
+_BYTE_RANGE = re.compile(r"bytes=(\d*)-(\d*)")
+
+GZIP_COMPRESSION_LEVEL = 6
+
+
+def parse_byte_range(range_header: str, size: int) -> tuple[int, int] | None:
+    """
+    Parse a Range header into the inclusive bounds of a single byte range
+
+    :return: None when the header isn't a single byte range
+    :raises HTTPException: 416 when the range doesn't overlap the content
+    """
+    match = _BYTE_RANGE.fullmatch(range_header.replace(" ", ""))
+    if match is None or match.groups() == ("", ""):
+        return None
+
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+        if last and int(last) < start:
+            return None
+    else:
+        # A suffix range, the last bytes of the content
+        start = max(size - int(last), 0)
+        end = size - 1 if int(last) else -1
+
+    if start > end:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, end
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header accepts gzip, unless given a zero weight"""
+    for coding in accept_encoding.split(","):
+        name, _, params = coding.partition(";")
+        if name.strip().lower() == "gzip":
+            weight = params.replace(" ", "").removeprefix("q=")
+            try:
+                return not weight or float(weight) > 0
+            except ValueError:
+                return False
+    return False
+
+
+def byte_range_response(
+    content: bytes,
+    media_type: str,
+    range_header: str | None = None,
+    accept_encoding: str = "",
+) -> Response:
+    """Respond with the requested range of content, or the whole of it gzipped if accepted"""
+    headers = {"Accept-Ranges": "bytes", "Vary": "Accept-Encoding"}
+    byte_range = parse_byte_range(range_header, len(content)) if range_header else None
+
+    if byte_range is not None:
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{len(content)}"
+        return Response(content[start : end + 1], status_code=206, headers=headers, media_type=media_type)
+
+    if accepts_gzip(accept_encoding):
+        headers["Content-Encoding"] = "gzip"
+        content = gzip.compress(content, GZIP_COMPRESSION_LEVEL)
+    return Response(content, headers=headers, media_type=media_type)
+
+
+def streamed_range_response(
+    size: int,
+    read: Callable[[int, int], Iterator[bytes]],
+    media_type: str,
+    range_header: str | None = None,
+    headers: dict[str, str] | None = None,
+) -> StreamingResponse:
+    """
+    Respond with the requested range of a content, or the whole of it, streamed as it's read
+
+    :param size: size of the whole content in bytes
+    :param read: yields the bytes of the content from a start to an end offset, both inclusive
+    """
+    response_headers = {"Accept-Ranges": "bytes", **(headers or {})}
+    byte_range = parse_byte_range(range_header, size) if range_header else None
+
+    status_code = 200
+    start, end = 0, size - 1
+    if byte_range is not None:
+        status_code = 206
+        start, end = byte_range
+        response_headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    response_headers["Content-Length"] = str(end - start + 1)
+
+    return StreamingResponse(
+        read(start, end),
+        status_code=status_code,
+        headers=response_headers,
+        media_type=media_type,
+    )
@@ -14,6 +14,9 @@
 # SPDX-License-Identifier: AGPL-3.0-only
 
 from enum import StrEnum
+from typing import Annotated
+
+from fastapi import Query
 
 PREVIOUS_TEST_RESULT_COUNT = 10
 
@@ -23,3 +26,30 @@ VALID_ISSUE_HOSTS = {"github.com", "warthogs.atlassian.net", "bugs.launchpad.net
 class QueryValue(StrEnum):
     ANY = "any"
     NONE = "none"
+
+
+class CountMode(StrEnum):
+    """How searches count the items matching their filters"""
+
+    EXACT = "exact"
+    ESTIMATE = "estimate"
+    NONE = "none"
+
+
+# The count_mode query parameter of the search endpoints
+CountModeQuery = Annotated[
+    CountMode,
+    Query(
+        description=(
+            "How to count the matching items: exactly, from the query planner estimate "
+            "which is much cheaper for broad filters, or not at all"
+        )
+    ),
+]
+
+
+class ExportFormat(StrEnum):
+    """Columnar formats of exported reports"""
+
+    ARROW = "arrow"
+    PARQUET = "parquet"
@@ -0,0 +1,62 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""
+Opaque cursors for keyset pagination
+
+Searches ordered by (created_at DESC, id DESC) resume right after the last
+item of the previous page instead of skipping an offset of items, so that
+deep pages cost as much as the first one.
+"""
+
+import base64
+import json
+from collections.abc import Sequence
+from datetime import datetime
+
+from fastapi import HTTPException
+from sqlalchemy import ColumnElement, literal, tuple_
+from sqlalchemy.orm import QueryableAttribute
+
+from test_observer.data_access.models import Base
+
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps([created_at.isoformat(), id]).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        created_at, id = json.loads(base64.urlsafe_b64decode(cursor))
+        return datetime.fromisoformat(created_at), int(id)
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=422, detail=f"Invalid cursor: '{cursor}'.") from e
+
+
+def after_cursor(
+    created_at: QueryableAttribute[datetime],
+    id: QueryableAttribute[int],
+    cursor: str,
+) -> ColumnElement[bool]:
+    """Condition matching the items after a cursor in (created_at DESC, id DESC) order"""
+    cursor_created_at, cursor_id = decode_cursor(cursor)
+    return tuple_(created_at, id) < tuple_(literal(cursor_created_at), literal(cursor_id))
+
+
+def next_cursor(items: Sequence[Base], limit: int | None) -> str | None:
+    """Cursor of the page following the given items, None when it's the last page"""
+    if not items or limit is None or len(items) < limit:
+        return None
+    return encode_cursor(items[-1].created_at, items[-1].id)
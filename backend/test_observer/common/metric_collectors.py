@@ -13,6 +13,7 @@
 # SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
 # SPDX-License-Identifier: AGPL-3.0-only
 
+from collections import Counter
 from typing import TYPE_CHECKING
 
 from test_observer.common.metrics import (
@@ -22,14 +23,16 @@ from test_observer.common.metrics import (
 )
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
     from test_observer.controllers.execution_metadata.models import ExecutionMetadata
     from test_observer.controllers.test_executions.models import TestResultRequest
     from test_observer.data_access.models import (
         Issue,
-        TestCase,
         TestExecution,
         TestResult,
     )
+    from test_observer.data_access.models_enums import TestResultStatus
 
 from test_observer.data_access.models import TestExecution
 
@@ -55,19 +58,27 @@ def _get_base_metric_labels(test_execution: TestExecution) -> dict[str, str]:
     }
 
 
-def update_test_results_metric(
+def update_test_results_metrics(
+    test_execution: "TestExecution",
+    results: "Iterable[TestResultRequest]",
+) -> None:
+    """Update basic test results metric for many results of one test execution."""
+    update_test_results_count_metrics(test_execution, Counter((result.name, result.status) for result in results))
+
+
+def update_test_results_count_metrics(
     test_execution: "TestExecution",
-    test_case: "TestCase",
-    result: "TestResultRequest",
+    counts: "Mapping[tuple[str, TestResultStatus], int]",
 ) -> None:
-    """Update basic test results metric for ALL families."""
+    """Update basic test results metric from the number of results of every test name and status."""
     base_labels = _get_base_metric_labels(test_execution)
 
-    test_results.labels(
-        **base_labels,
-        test_name=test_case.name,
-        status=result.status.value,
-    ).inc()
+    for (test_name, status), count in counts.items():
+        test_results.labels(
+            **base_labels,
+            test_name=test_name,
+            status=status.value,
+        ).inc(count)
 
 
 def update_triaged_results_metric(
@@ -25,7 +25,7 @@ Example usage:
     test_executions_results.labels(**labels).inc()
 """
 
-from prometheus_client import Gauge
+from prometheus_client import Counter, Gauge
 from prometheus_fastapi_instrumentator import Instrumentator, metrics
 
 # Namespace for all metrics
@@ -112,3 +112,26 @@ test_results_metadata = Gauge(
         "metadata_value",
     ],
 )
+
+# Lookups of test cases by name in the process-local cache
+test_case_cache_lookups = Counter(
+    name=f"{NAMESPACE}_test_case_cache_lookups",
+    documentation="Test case names looked up in the test case cache, by whether they were cached",
+    labelnames=["result"],  # hit or miss
+)
+
+# Progress of the jobs applying attachment rules to existing test results,
+# counted by the worker processing them
+attachment_rule_job_chunks = Counter(
+    name=f"{NAMESPACE}_attachment_rule_job_chunks",
+    documentation="Chunks of test results processed by attachment rule jobs",
+)
+attachment_rule_job_attachments = Counter(
+    name=f"{NAMESPACE}_attachment_rule_job_attachments",
+    documentation="Attachments created by attachment rule jobs",
+)
+attachment_rule_jobs_finished = Counter(
+    name=f"{NAMESPACE}_attachment_rule_jobs_finished",
+    documentation="Attachment rule jobs finished, by their status",
+    labelnames=["status"],  # COMPLETED or FAILED
+)
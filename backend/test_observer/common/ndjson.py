@@ -0,0 +1,132 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""
+Incremental parsing of newline delimited JSON request bodies
+
+Large submissions are read from the request stream one line at a time and
+handed over in bounded chunks, so that memory use doesn't depend on the size
+of the body.
+"""
+
+from collections.abc import AsyncIterator
+from typing import Any
+
+from fastapi import HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# A chunk is handed over once it holds this many rows or this many bytes of
+# JSON, whichever comes first, as a few verbose io_logs can outweigh many rows
+NDJSON_CHUNK_ROWS = 1000
+NDJSON_CHUNK_BYTES = 16 * 1024 * 1024
+
+# Lines longer than this are rejected rather than buffered, a line being a single row
+NDJSON_MAX_LINE_BYTES = 64 * 1024 * 1024
+
+
+def ndjson_request_body(model: type[BaseModel]) -> dict[str, Any]:
+    """openapi_extra documenting an NDJSON body whose every line is a model"""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {NDJSON_MEDIA_TYPE: {"itemSchema": model.model_json_schema()}},
+        }
+    }
+
+
+def require_ndjson(request: Request) -> None:
+    """Dependency rejecting requests whose body isn't NDJSON"""
+    media_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if media_type != NDJSON_MEDIA_TYPE:
+        raise HTTPException(status_code=415, detail=f"Expected a {NDJSON_MEDIA_TYPE} body")
+
+
+class NDJSONReader:
+    """Reads the lines of an NDJSON request body, skipping blank ones"""
+
+    def __init__(self, request: Request, max_line_bytes: int = NDJSON_MAX_LINE_BYTES):
+        self._max_line_bytes = max_line_bytes
+        self._lines = self._read_lines(request)
+        self.line_number = 0
+
+    def _check_line_size(self, line: bytearray) -> None:
+        if len(line) > self._max_line_bytes:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Line {self.line_number + 1} is longer than {self._max_line_bytes} bytes",
+            )
+
+    async def _read_lines(self, request: Request) -> AsyncIterator[bytes]:
+        # Only the data just received is searched for newlines, so that long
+        # lines received in many parts are scanned once
+        buffer = bytearray()
+        async for data in request.stream():
+            start = 0
+            while (end := data.find(b"\n", start)) != -1:
+                buffer += data[start:end]
+                self._check_line_size(buffer)
+                yield bytes(buffer)
+                buffer.clear()
+                start = end + 1
+            buffer += data[start:]
+            self._check_line_size(buffer)
+        if buffer:
+            yield bytes(buffer)
+
+    async def _next_line(self) -> bytes | None:
+        async for line in self._lines:
+            self.line_number += 1
+            if line.strip():
+                return line
+        return None
+
+    def _parse[M: BaseModel](self, model: type[M], line: bytes) -> M:
+        try:
+            return model.model_validate_json(line)
+        except ValidationError as e:
+            raise RequestValidationError(
+                [{**error, "loc": ("body", self.line_number, *error["loc"])} for error in e.errors()]
+            ) from e
+
+    async def read_one[M: BaseModel](self, model: type[M]) -> M:
+        """Parse the next line, which must exist"""
+        line = await self._next_line()
+        if line is None:
+            raise RequestValidationError(
+                [{"type": "missing", "loc": ("body", self.line_number + 1), "msg": "Line required", "input": None}]
+            )
+        return self._parse(model, line)
+
+    async def read_chunks[M: BaseModel](
+        self,
+        model: type[M],
+        max_rows: int = NDJSON_CHUNK_ROWS,
+        max_bytes: int = NDJSON_CHUNK_BYTES,
+    ) -> AsyncIterator[list[M]]:
+        """Parse the remaining lines, yielding them in bounded chunks"""
+        chunk: list[M] = []
+        chunk_bytes = 0
+        while (line := await self._next_line()) is not None:
+            chunk.append(self._parse(model, line))
+            chunk_bytes += len(line)
+            if len(chunk) >= max_rows or chunk_bytes >= max_bytes:
+                yield chunk
+                chunk = []
+                chunk_bytes = 0
+        if chunk:
+            yield chunk
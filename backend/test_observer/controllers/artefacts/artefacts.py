@@ -16,9 +16,11 @@
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Security
-from sqlalchemy import distinct, func, select
+from sqlalchemy import select
 from sqlalchemy.orm import Session, selectinload
 
+from test_observer.common.background_tasks import reindex_test_results_on_commit
+from test_observer.common.constants import CountMode, CountModeQuery
 from test_observer.common.enums import Permission
 from test_observer.common.permissions import (
     check_artefact_permission,
@@ -34,6 +36,7 @@ from test_observer.controllers.applications.application_injection import (
     get_current_application,
 )
 from test_observer.controllers.artefacts.artefact_retriever import ArtefactRetriever
+from test_observer.data_access.counts import count_rows
 from test_observer.data_access.models import (
     Application,
     Artefact,
@@ -52,6 +55,7 @@ from test_observer.data_access.models_enums import (
 )
 from test_observer.data_access.repository import get_artefacts_by_family
 from test_observer.data_access.setup import get_db
+from test_observer.data_access.text_search import COMPLETION_LIMIT, complete, contains, relevance_order
 from test_observer.users.user_injection import get_current_user
 
 from . import builds, environment_reviews
@@ -128,26 +132,28 @@ def search_artefacts(
         int,
         Query(ge=0, description="Number of results to skip for pagination"),
     ] = 0,
+    count_mode: CountModeQuery = CountMode.EXACT,
     db: Session = Depends(get_db),
 ) -> ArtefactSearchResponse:
     """
     Search for artefacts by name with pagination support.
 
-    Returns a list of distinct artefact names that match the search query.
+    Returns a list of distinct artefact names that match the search query,
+    the most relevant first when searching.
     """
-    query = select(distinct(Artefact.name)).where(Artefact.archived.is_(False)).order_by(Artefact.name)
+    query = select(Artefact.name).where(Artefact.archived.is_(False)).group_by(Artefact.name)
 
     if families and len(families) > 0:
         query = query.where(Artefact.family.in_(families))
 
     # Apply search filter if provided
     if q and q.strip():
-        search_term = f"%{q.strip()}%"
-        query = query.where(Artefact.name.ilike(search_term))
+        query = query.where(contains(Artefact.name, q.strip()))
+        query = query.order_by(*relevance_order(db, [Artefact.name], q.strip()))
+    query = query.order_by(Artefact.name)
 
     # Count total before pagination
-    count_query = select(func.count()).select_from(query.subquery())
-    total_count = db.execute(count_query).scalar() or 0
+    total_count = count_rows(db, query, count_mode)
 
     # Apply pagination
     query = query.offset(offset).limit(limit)
@@ -161,6 +167,20 @@ def search_artefacts(
     )
 
 
+@router.get(
+    "/completions",
+    response_model=list[str],
+    dependencies=[Security(permission_checker, scopes=[Permission.view_artefact])],
+)
+def complete_artefact_names(
+    prefix: Annotated[str, Query(min_length=1, description="Beginning of the artefact names")],
+    limit: Annotated[int, Query(ge=1, le=100, description="Maximum number of names")] = COMPLETION_LIMIT,
+    db: Session = Depends(get_db),
+) -> list[str]:
+    """Names of unarchived artefacts starting with prefix, case insensitively, shortest first"""
+    return complete(db, Artefact.name, prefix, limit, Artefact.archived.is_(False))
+
+
 @router.get(
     "/history",
     response_model=ArtefactHistoryResponse,
@@ -260,6 +280,8 @@ def patch_artefact(
     if request.stage is not None:
         _validate_artefact_stage(artefact, request.stage)
         artefact.stage = request.stage
+    if request.archived is not None or request.stage is not None:
+        reindex_test_results_on_commit(db, artefact_ids=[artefact.id])
     if request.comment is not None:
         artefact.comment = request.comment
     if "jira_issue" in request.model_fields_set:
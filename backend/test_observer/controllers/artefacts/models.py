@@ -226,7 +226,7 @@ class ArtefactMinimalResponse(BaseModel):
 
 class ArtefactSearchResponse(BaseModel):
     artefacts: list[str]
-    count: int
+    count: int | None = Field(description="Number of matching items, as requested by count_mode")
     limit: int
     offset: int
 
@@ -0,0 +1,72 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+
+import base64
+import json
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Security
+from sqlalchemy.orm import Session
+
+from test_observer.common.enums import Permission
+from test_observer.common.permissions import permission_checker
+from test_observer.data_access.changes import get_changes
+from test_observer.data_access.setup import get_db
+
+from .models import ChangesResponse
+
+router = APIRouter(tags=["changes"])
+
+
+def _encode_position(position: tuple[int, int]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+def _decode_position(cursor: str) -> tuple[int, int]:
+    try:
+        transaction_id, id = json.loads(base64.urlsafe_b64decode(cursor))
+        return int(transaction_id), int(id)
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=422, detail=f"Invalid cursor: '{cursor}'.") from e
+
+
+@router.get(
+    "",
+    response_model=ChangesResponse,
+    dependencies=[Security(permission_checker, scopes=[Permission.view_artefact, Permission.view_test])],
+)
+def get_changes_since(
+    since: Annotated[
+        str | None,
+        Query(description="The next_cursor of the previous call, omit to get changes from the oldest one kept"),
+    ] = None,
+    limit: Annotated[int, Query(ge=1, le=10000, description="Maximum number of changes to return")] = 1000,
+    db: Session = Depends(get_db),
+):
+    """
+    Changes to artefacts, builds, test executions, test results, environment
+    reviews and issue attachments, in the order they were made
+
+    Poll with the returned next_cursor to get only what changed since. Fewer
+    changes than the limit means there are no more changes for now. Changes
+    are kept for 30 days, consumers further behind must fetch everything again.
+    """
+    position = _decode_position(since) if since is not None else (0, 0)
+    changes, next_position = get_changes(db, position, limit)
+    return ChangesResponse.model_validate(
+        {"changes": changes, "next_cursor": _encode_position(next_position)},
+        from_attributes=True,
+    )
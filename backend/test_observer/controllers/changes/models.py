@@ -0,0 +1,44 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from test_observer.data_access.models_enums import ChangeEntity, ChangeOperation
+
+
+class ChangeResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    entity: ChangeEntity
+    entity_id: int
+    parent_id: int | None = Field(
+        description=(
+            "ID of the artefact of a build, the build of a test execution or an environment review, "
+            "the test execution of a test result and the test result of an issue attachment"
+        )
+    )
+    operation: ChangeOperation
+    changed_at: datetime = Field(validation_alias="created_at")
+
+
+class ChangesResponse(BaseModel):
+    changes: list[ChangeResponse]
+    next_cursor: str = Field(
+        description="Cursor to pass as since to get the following changes, even when there are none yet"
+    )
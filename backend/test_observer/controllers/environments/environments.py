@@ -16,11 +16,13 @@
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, Query, Security
-from sqlalchemy import distinct, func, select
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from test_observer.common.constants import CountMode, CountModeQuery
 from test_observer.common.enums import Permission
 from test_observer.common.permissions import permission_checker
+from test_observer.data_access.counts import count_rows
 from test_observer.data_access.models import (
     Artefact,
     ArtefactBuild,
@@ -29,6 +31,7 @@ from test_observer.data_access.models import (
 )
 from test_observer.data_access.models_enums import FamilyName
 from test_observer.data_access.setup import get_db
+from test_observer.data_access.text_search import COMPLETION_LIMIT, complete, contains, relevance_order
 
 from . import reported_issues
 from .models import EnvironmentsResponse
@@ -63,14 +66,15 @@ def get_environments(
         int,
         Query(ge=0, description="Number of results to skip for pagination"),
     ] = 0,
+    count_mode: CountModeQuery = CountMode.EXACT,
     db: Session = Depends(get_db),
 ) -> EnvironmentsResponse:
     """
     Returns list of distinct environments that have been used in test executions.
 
-    Supports pagination and search filtering.
+    Supports pagination and search filtering, the most relevant first when searching.
     """
-    query = select(distinct(Environment.name)).order_by(Environment.name)
+    query = select(Environment.name).group_by(Environment.name)
 
     # Filter by families if provided
     if families and len(families) > 0:
@@ -83,12 +87,12 @@ def get_environments(
 
     # Apply search filter if provided
     if q and q.strip():
-        search_term = f"%{q.strip()}%"
-        query = query.where(Environment.name.ilike(search_term))
+        query = query.where(contains(Environment.name, q.strip()))
+        query = query.order_by(*relevance_order(db, [Environment.name], q.strip()))
+    query = query.order_by(Environment.name)
 
     # Count total before pagination
-    count_query = select(func.count()).select_from(query.subquery())
-    total_count = db.execute(count_query).scalar() or 0
+    total_count = count_rows(db, query, count_mode)
 
     # Apply pagination
     query = query.offset(offset).limit(limit)
@@ -100,3 +104,17 @@ def get_environments(
         limit=limit,
         offset=offset,
     )
+
+
+@router.get(
+    "/completions",
+    response_model=list[str],
+    dependencies=[Security(permission_checker, scopes=[Permission.view_test])],
+)
+def complete_environment_names(
+    prefix: Annotated[str, Query(min_length=1, description="Beginning of the environment names")],
+    limit: Annotated[int, Query(ge=1, le=100, description="Maximum number of names")] = COMPLETION_LIMIT,
+    db: Session = Depends(get_db),
+) -> list[str]:
+    """Environment names starting with prefix, case insensitively, shortest first"""
+    return complete(db, Environment.name, prefix, limit)
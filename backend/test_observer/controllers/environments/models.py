@@ -15,7 +15,7 @@
 
 from datetime import datetime
 
-from pydantic import BaseModel, HttpUrl, model_validator
+from pydantic import BaseModel, Field, HttpUrl, model_validator
 
 from test_observer.common.constants import VALID_ISSUE_HOSTS
 
@@ -51,6 +51,6 @@ class EnvironmentsResponse(BaseModel):
     """Response model for environments endpoint"""
 
     environments: list[str]
-    count: int
+    count: int | None = Field(description="Number of matching items, as requested by count_mode")
     limit: int
     offset: int
@@ -0,0 +1,300 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""
+Process-local index of the enabled attachment rules
+
+Every rule is a conjunction of "empty or contains" tests, so instead of asking
+PostgreSQL to evaluate all rules for every test result the rules are loaded
+once and bucketed by one of the values they require. Matching a test result
+then only checks the rules in the buckets of its own values, plus the few
+rules that don't constrain any indexed field.
+
+The index is rebuilt when the rules change. This is detected through a version
+row that triggers on the rule tables bump, which every replica reads in the
+transaction that uses the index. Any write to a rule, whether through the
+attachment rule endpoints or otherwise, is thus picked up everywhere without
+needing a message bus.
+"""
+
+from collections import defaultdict
+from collections.abc import Collection, Hashable, Iterable, Mapping
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any
+
+from sqlalchemy import Integer, Row, any_, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session
+
+from test_observer.data_access.models import (
+    Artefact,
+    ArtefactBuild,
+    AttachmentRuleVersion,
+    Environment,
+    IssueTestResultAttachmentRule,
+    IssueTestResultAttachmentRuleExecutionMetadata,
+    TestCase,
+    TestExecution,
+    TestExecutionMetadata,
+    TestResult,
+    test_execution_metadata_association_table,
+)
+from test_observer.data_access.models_enums import FamilyName, TestResultStatus
+
+
+@dataclass(frozen=True, slots=True)
+class MatchableTestResult:
+    """The fields of a test result that attachment rules can match on"""
+
+    test_result_id: int
+    family: FamilyName
+    artefact_name: str
+    artefact_version: str
+    artefact_stage: str
+    artefact_track: str
+    environment_name: str
+    test_case_name: str
+    template_id: str
+    status: TestResultStatus
+    execution_metadata: Mapping[str, frozenset[str]]
+
+
+# Pairs of rule field and the test result field it constrains, from the most
+# to the least selective. A rule is indexed under its first non-empty field.
+_MATCHED_FIELDS = (
+    ("test_case_names", "test_case_name"),
+    ("template_ids", "template_id"),
+    ("artefacts", "artefact_name"),
+    ("artefact_versions", "artefact_version"),
+    ("environment_names", "environment_name"),
+    ("artefact_tracks", "artefact_track"),
+    ("artefact_stages", "artefact_stage"),
+    ("families", "family"),
+    ("test_result_statuses", "status"),
+)
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledAttachmentRule:
+    id: int
+    issue_id: int
+    # Sets of accepted values keyed by test result field, empty sets are left out
+    constraints: tuple[tuple[str, frozenset[Hashable]], ...]
+    execution_metadata: Mapping[str, frozenset[str]]
+
+    @classmethod
+    def compile(
+        cls,
+        rule: Row | IssueTestResultAttachmentRule,
+        execution_metadata: Iterable[tuple[str, str]],
+    ) -> "CompiledAttachmentRule":
+        accepted_metadata: defaultdict[str, set[str]] = defaultdict(set)
+        for category, value in execution_metadata:
+            accepted_metadata[category].add(value)
+
+        return cls(
+            id=rule.id,
+            issue_id=rule.issue_id,
+            constraints=tuple(
+                (result_field, frozenset(getattr(rule, rule_field)))
+                for rule_field, result_field in _MATCHED_FIELDS
+                if getattr(rule, rule_field)
+            ),
+            execution_metadata={category: frozenset(values) for category, values in accepted_metadata.items()},
+        )
+
+    def matches(self, test_result: MatchableTestResult) -> bool:
+        for result_field, accepted in self.constraints:
+            if getattr(test_result, result_field) not in accepted:
+                return False
+
+        # Every category needs at least one of the accepted values
+        for category, accepted in self.execution_metadata.items():
+            if accepted.isdisjoint(test_result.execution_metadata.get(category, ())):
+                return False
+
+        return True
+
+
+class AttachmentRuleIndex:
+    def __init__(self, rules: Collection[CompiledAttachmentRule]):
+        self._buckets: dict[str, defaultdict[Any, list[CompiledAttachmentRule]]] = {
+            result_field: defaultdict(list) for _, result_field in _MATCHED_FIELDS
+        }
+        self._unindexed: list[CompiledAttachmentRule] = []
+
+        for rule in rules:
+            if rule.constraints:
+                result_field, accepted = rule.constraints[0]
+                for value in accepted:
+                    self._buckets[result_field][value].append(rule)
+            else:
+                self._unindexed.append(rule)
+
+        self._size = len(rules)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def match(self, test_result: MatchableTestResult) -> list[CompiledAttachmentRule]:
+        """
+        Find the rules attaching issues to a test result
+
+        When several rules attach the same issue only the oldest one is returned.
+        """
+        candidates = list(self._unindexed)
+        for result_field, buckets in self._buckets.items():
+            candidates.extend(buckets.get(getattr(test_result, result_field), ()))
+
+        matched: dict[int, CompiledAttachmentRule] = {}
+        for rule in sorted(candidates, key=lambda rule: rule.id):
+            if rule.issue_id not in matched and rule.matches(test_result):
+                matched[rule.issue_id] = rule
+        return list(matched.values())
+
+
+def _query_rules_version(db: Session) -> int | None:
+    return db.scalar(select(AttachmentRuleVersion.version))
+
+
+def load_attachment_rule_index(db: Session) -> AttachmentRuleIndex:
+    # Plain rows rather than ORM objects, as there may be thousands of rules
+    rules = db.execute(
+        select(
+            IssueTestResultAttachmentRule.id,
+            IssueTestResultAttachmentRule.issue_id,
+            *(getattr(IssueTestResultAttachmentRule, rule_field) for rule_field, _ in _MATCHED_FIELDS),
+        ).where(IssueTestResultAttachmentRule.enabled)
+    ).all()
+
+    execution_metadata: defaultdict[int, list[tuple[str, str]]] = defaultdict(list)
+    metadata_rows = db.execute(
+        select(
+            IssueTestResultAttachmentRuleExecutionMetadata.attachment_rule_id,
+            IssueTestResultAttachmentRuleExecutionMetadata.category,
+            IssueTestResultAttachmentRuleExecutionMetadata.value,
+        )
+        .join(IssueTestResultAttachmentRuleExecutionMetadata.attachment_rule)
+        .where(IssueTestResultAttachmentRule.enabled)
+    )
+    for attachment_rule_id, category, value in metadata_rows:
+        execution_metadata[attachment_rule_id].append((category, value))
+
+    return AttachmentRuleIndex(
+        [CompiledAttachmentRule.compile(rule, execution_metadata.get(rule.id, ())) for rule in rules]
+    )
+
+
+class AttachmentRuleIndexCache:
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._cached: tuple[int | None, AttachmentRuleIndex] | None = None
+
+    def get(self, db: Session) -> AttachmentRuleIndex:
+        """Get the index of enabled rules, reloading it if rules changed since it was built"""
+        version = _query_rules_version(db)
+
+        cached = self._cached
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        with self._lock:
+            # Another thread might have reloaded the index while we waited
+            cached = self._cached
+            if cached is not None and cached[0] == version:
+                return cached[1]
+
+            index = load_attachment_rule_index(db)
+            self._cached = (version, index)
+            return index
+
+
+attachment_rule_index_cache = AttachmentRuleIndexCache()
+
+
+def load_matchable_test_results(db: Session, test_result_ids: Collection[int]) -> list[MatchableTestResult]:
+    rows = db.execute(
+        select(
+            TestResult.id,
+            TestResult.test_execution_id,
+            TestResult.status,
+            TestCase.name,
+            TestCase.template_id,
+            Artefact.family,
+            Artefact.name,
+            Artefact.version,
+            Artefact.stage,
+            Artefact.track,
+            Environment.name,
+        )
+        .join(TestResult.test_case)
+        .join(TestResult.test_execution)
+        .join(TestExecution.artefact_build)
+        .join(ArtefactBuild.artefact)
+        .join(TestExecution.environment)
+        .where(TestResult.id == any_(literal(list(test_result_ids), ARRAY(Integer))))
+        .order_by(TestResult.id)
+    ).all()
+
+    execution_metadata: defaultdict[int, defaultdict[str, set[str]]] = defaultdict(lambda: defaultdict(set))
+    metadata_rows = db.execute(
+        select(
+            test_execution_metadata_association_table.c.test_execution_id,
+            TestExecutionMetadata.category,
+            TestExecutionMetadata.value,
+        )
+        .join(
+            TestExecutionMetadata,
+            TestExecutionMetadata.id == test_execution_metadata_association_table.c.test_execution_metadata_id,
+        )
+        .where(test_execution_metadata_association_table.c.test_execution_id.in_({row[1] for row in rows}))
+    )
+    for test_execution_id, category, value in metadata_rows:
+        execution_metadata[test_execution_id][category].add(value)
+
+    frozen_execution_metadata = {
+        test_execution_id: {category: frozenset(values) for category, values in metadata.items()}
+        for test_execution_id, metadata in execution_metadata.items()
+    }
+
+    return [
+        MatchableTestResult(
+            test_result_id=test_result_id,
+            family=family,
+            artefact_name=artefact_name,
+            artefact_version=artefact_version,
+            artefact_stage=artefact_stage,
+            artefact_track=artefact_track,
+            environment_name=environment_name,
+            test_case_name=test_case_name,
+            template_id=template_id,
+            status=status,
+            execution_metadata=frozen_execution_metadata.get(test_execution_id, {}),
+        )
+        for (
+            test_result_id,
+            test_execution_id,
+            status,
+            test_case_name,
+            template_id,
+            family,
+            artefact_name,
+            artefact_version,
+            artefact_stage,
+            artefact_track,
+            environment_name,
+        ) in rows
+    ]
@@ -16,18 +16,23 @@
 from fastapi import APIRouter, Depends, HTTPException, Security
 from sqlalchemy.orm import Session
 
+from test_observer.common.background_tasks import enqueue_attachment_rule_job
 from test_observer.common.enums import Permission
 from test_observer.common.permissions import permission_checker
 from test_observer.data_access.models import (
     Issue,
     IssueTestResultAttachmentRule,
     IssueTestResultAttachmentRuleExecutionMetadata,
+    IssueTestResultAttachmentRuleJob,
 )
 from test_observer.data_access.setup import get_db
 
+from .attachment_rules_logic import create_attachment_rule_job
 from .models import (
+    IssueTestResultAttachmentRuleJobResponse,
     IssueTestResultAttachmentRulePatchRequest,
     IssueTestResultAttachmentRulePostRequest,
+    IssueTestResultAttachmentRulePostResponse,
 )
 from .shared_models import MinimalIssueTestResultAttachmentRuleResponse
 
@@ -36,7 +41,7 @@ router = APIRouter()
 
 @router.post(
     "/{issue_id}/attachment-rules",
-    response_model=MinimalIssueTestResultAttachmentRuleResponse,
+    response_model=IssueTestResultAttachmentRulePostResponse,
     dependencies=[Security(permission_checker, scopes=[Permission.change_attachment_rule])],
 )
 def post_attachment_rule(
@@ -73,9 +78,24 @@ def post_attachment_rule(
 
     # Add the attachment rule
     db.add(attachment_rule)
+
+    # Existing test results are matched in the background
+    # as there can be millions of them
+    job = None
+    if request.apply_retroactively:
+        if not request.enabled:
+            raise HTTPException(status_code=422, detail="Disabled attachment rules can't be applied retroactively")
+        job = create_attachment_rule_job(db, attachment_rule)
+
     db.commit()
     db.refresh(attachment_rule)
-    return attachment_rule
+
+    if job is not None:
+        enqueue_attachment_rule_job(job.id)
+
+    response = IssueTestResultAttachmentRulePostResponse.model_validate(attachment_rule)
+    response.job = IssueTestResultAttachmentRuleJobResponse.model_validate(job) if job is not None else None
+    return response
 
 
 @router.patch(
@@ -126,3 +146,20 @@ def delete_attachment_rule(
     # Delete the attachment rule
     db.delete(attachment_rule)
     db.commit()
+
+
+@router.get(
+    "/{issue_id}/attachment-rules/{attachment_rule_id}/jobs/{job_id}",
+    response_model=IssueTestResultAttachmentRuleJobResponse,
+    dependencies=[Security(permission_checker, scopes=[Permission.view_issue])],
+)
+def get_attachment_rule_job(
+    issue_id: int,
+    attachment_rule_id: int,
+    job_id: int,
+    db: Session = Depends(get_db),
+):
+    job = db.get(IssueTestResultAttachmentRuleJob, job_id)
+    if job is None or job.attachment_rule_id != attachment_rule_id or job.attachment_rule.issue_id != issue_id:
+        raise HTTPException(status_code=404, detail="Attachment rule job not found")
+    return job
@@ -13,203 +13,178 @@
 # SPDX-FileCopyrightText: Copyright 2025 Canonical Ltd.
 # SPDX-License-Identifier: AGPL-3.0-only
 
+import logging
+from collections.abc import Collection
+from datetime import timedelta
+
 from sqlalchemy import (
     ColumnElement,
+    Integer,
     Select,
+    SQLColumnExpression,
     and_,
+    any_,
     exists,
     func,
     literal,
     or_,
     select,
 )
-from sqlalchemy.dialects.postgresql import insert
-from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.orm import Session, aliased
 from sqlalchemy.orm.attributes import InstrumentedAttribute
 
+from test_observer.common.metrics import (
+    attachment_rule_job_attachments,
+    attachment_rule_job_chunks,
+    attachment_rule_jobs_finished,
+)
+from test_observer.controllers.issues.attachment_rule_index import (
+    attachment_rule_index_cache,
+    load_matchable_test_results,
+)
 from test_observer.data_access.models import (
+    Artefact,
+    ArtefactBuild,
+    Environment,
     Issue,
     IssueTestResultAttachment,
     IssueTestResultAttachmentRule,
     IssueTestResultAttachmentRuleExecutionMetadata,
+    IssueTestResultAttachmentRuleJob,
+    TestCase,
     TestExecution,
     TestExecutionMetadata,
     TestExecutionRerunRequest,
     TestResult,
+    test_execution_metadata_association_table,
 )
+from test_observer.data_access.models_enums import JobStatus
 
+logger = logging.getLogger(__name__)
 
-def _array_empty_or_contains(array: InstrumentedAttribute, value: ColumnElement) -> ColumnElement[bool]:
+
+def _array_empty_or_contains(array: InstrumentedAttribute, value: SQLColumnExpression) -> ColumnElement[bool]:
     return or_(
         func.cardinality(array) == 0,
         array.any(value),
     )
 
 
-def _filter_by_execution_metadata(
-    stmt: Select[tuple[IssueTestResultAttachmentRule]],
-    test_result: TestResult,
-) -> Select[tuple[IssueTestResultAttachmentRule]]:
-    # Step 1: Build join condition for TestExecutionMetadata
-    # We want to match each attachment rule's metadata requirements to the actual
-    # metadata present in the test execution.
-    # This join condition ensures that only metadata for the current test execution,
-    # with matching category and value, is considered.
-    join_condition = and_(
-        TestExecutionMetadata.test_executions.any(TestExecution.id == test_result.test_execution_id),
-        TestExecutionMetadata.category == IssueTestResultAttachmentRuleExecutionMetadata.category,
-        TestExecutionMetadata.value == IssueTestResultAttachmentRuleExecutionMetadata.value,
-    )
+def _execution_metadata_satisfied(test_execution_id: SQLColumnExpression[int]) -> ColumnElement[bool]:
+    """
+    Whether the test execution has every execution metadata category the rule
+    requires, with one of the values the rule accepts for it
+    """
+    required = aliased(IssueTestResultAttachmentRuleExecutionMetadata)
+    accepted = aliased(IssueTestResultAttachmentRuleExecutionMetadata)
 
-    # Step 2: Build the unmatched_categories subquery
-    # For each attachment rule, we need to identify categories that are required by
-    # the rule but do not exist (or do not have a matching value) in the
-    # test execution's metadata.
-    # This subquery finds (rule_id, category) pairs for unfulfilled metadata.
-    unmatched_categories_query = select(
-        IssueTestResultAttachmentRuleExecutionMetadata.attachment_rule_id,
-        IssueTestResultAttachmentRuleExecutionMetadata.category,
-    )
-    unmatched_categories_query = unmatched_categories_query.outerjoin(
-        TestExecutionMetadata,
-        join_condition,
-    )
-    unmatched_categories_query = unmatched_categories_query.group_by(
-        IssueTestResultAttachmentRuleExecutionMetadata.attachment_rule_id,
-        IssueTestResultAttachmentRuleExecutionMetadata.category,
-    )
-    unmatched_categories_query = unmatched_categories_query.having(func.count(TestExecutionMetadata.value) == 0)
-    unmatched_categories = unmatched_categories_query.subquery()
-
-    # Step 3: Exclude rules with unmatched categories
-    # If any required category for a rule is not matched by the test execution's
-    # metadata, that rule should not apply.
-    # This exclusion ensures that only rules for which all required categories are
-    # satisfied are kept.
-    exclusion_condition = ~exists(
+    # A required category is satisfied when the test execution has
+    # at least one of the values the rule accepts for that category
+    category_satisfied = exists(
         select(1)
-        .select_from(unmatched_categories)
-        .where(unmatched_categories.c.attachment_rule_id == IssueTestResultAttachmentRule.id)
-    )
-    stmt = stmt.where(exclusion_condition)
-
-    # Step 4: Return the filtered statement
-    return stmt
-
-
-def query_matching_test_result_attachment_rules(
-    test_result: TestResult,
-) -> Select[tuple[IssueTestResultAttachmentRule]]:
-    stmt = select(IssueTestResultAttachmentRule)
-
-    # Only fetch enabled rules
-    stmt = stmt.where(IssueTestResultAttachmentRule.enabled)
-
-    # Filter families
-    stmt = stmt.where(
-        _array_empty_or_contains(
-            IssueTestResultAttachmentRule.families,
-            literal(test_result.test_execution.artefact_build.artefact.family),
-        )
-    )
-
-    # Filter artefacts
-    stmt = stmt.where(
-        _array_empty_or_contains(
-            IssueTestResultAttachmentRule.artefacts,
-            literal(test_result.test_execution.artefact_build.artefact.name),
-        )
-    )
-
-    # Filter artefact_versions
-    stmt = stmt.where(
-        _array_empty_or_contains(
-            IssueTestResultAttachmentRule.artefact_versions,
-            literal(test_result.test_execution.artefact_build.artefact.version),
+        .select_from(accepted)
+        .join(
+            TestExecutionMetadata,
+            and_(
+                TestExecutionMetadata.category == accepted.category,
+                TestExecutionMetadata.value == accepted.value,
+            ),
         )
-    )
-
-    # Filter artefact_stages
-    stmt = stmt.where(
-        _array_empty_or_contains(
-            IssueTestResultAttachmentRule.artefact_stages,
-            literal(test_result.test_execution.artefact_build.artefact.stage),
+        .join(
+            test_execution_metadata_association_table,
+            test_execution_metadata_association_table.c.test_execution_metadata_id == TestExecutionMetadata.id,
         )
-    )
-
-    # Filter artefact_tracks
-    stmt = stmt.where(
-        _array_empty_or_contains(
-            IssueTestResultAttachmentRule.artefact_tracks,
-            literal(test_result.test_execution.artefact_build.artefact.track),
+        .where(
+            accepted.attachment_rule_id == required.attachment_rule_id,
+            accepted.category == required.category,
+            test_execution_metadata_association_table.c.test_execution_id == test_execution_id,
         )
+        # Auto-correlation only looks at the immediately enclosing statement,
+        # whereas test_execution_id comes from the one above it
+        .correlate_except(accepted, TestExecutionMetadata, test_execution_metadata_association_table)
     )
 
-    # Filter environment_names
-    stmt = stmt.where(
-        _array_empty_or_contains(
-            IssueTestResultAttachmentRule.environment_names,
-            literal(test_result.test_execution.environment.name),
-        )
+    # The rule applies only if none of its required categories is unsatisfied
+    return ~exists(
+        select(1)
+        .select_from(required)
+        .where(required.attachment_rule_id == IssueTestResultAttachmentRule.id, ~category_satisfied)
     )
 
-    # Filter test_case_names
-    stmt = stmt.where(
-        _array_empty_or_contains(
-            IssueTestResultAttachmentRule.test_case_names,
-            literal(test_result.test_case.name),
-        )
-    )
 
-    # Filter template_ids
-    stmt = stmt.where(
-        _array_empty_or_contains(
-            IssueTestResultAttachmentRule.template_ids,
-            literal(test_result.test_case.template_id),
+def _select_matching_attachment_rules(*test_result_criteria: ColumnElement[bool]) -> Select[tuple[int, int, int]]:
+    """
+    Select (issue_id, attachment_rule_id, test_result_id) for every enabled rule
+    and test result satisfying the given criteria that the rule matches
+    """
+    return (
+        select(
+            IssueTestResultAttachmentRule.issue_id,
+            IssueTestResultAttachmentRule.id.label("attachment_rule_id"),
+            TestResult.id.label("test_result_id"),
         )
+        .select_from(IssueTestResultAttachmentRule)
+        .join(TestResult, and_(*test_result_criteria))
+        .join(TestResult.test_case)
+        .join(TestResult.test_execution)
+        .join(TestExecution.artefact_build)
+        .join(ArtefactBuild.artefact)
+        .join(TestExecution.environment)
+        .where(IssueTestResultAttachmentRule.enabled)
+        .where(_array_empty_or_contains(IssueTestResultAttachmentRule.families, Artefact.family))
+        .where(_array_empty_or_contains(IssueTestResultAttachmentRule.artefacts, Artefact.name))
+        .where(_array_empty_or_contains(IssueTestResultAttachmentRule.artefact_versions, Artefact.version))
+        .where(_array_empty_or_contains(IssueTestResultAttachmentRule.artefact_stages, Artefact.stage))
+        .where(_array_empty_or_contains(IssueTestResultAttachmentRule.artefact_tracks, Artefact.track))
+        .where(_array_empty_or_contains(IssueTestResultAttachmentRule.environment_names, Environment.name))
+        .where(_array_empty_or_contains(IssueTestResultAttachmentRule.test_case_names, TestCase.name))
+        .where(_array_empty_or_contains(IssueTestResultAttachmentRule.template_ids, TestCase.template_id))
+        .where(_array_empty_or_contains(IssueTestResultAttachmentRule.test_result_statuses, TestResult.status))
+        .where(_execution_metadata_satisfied(TestResult.test_execution_id))
     )
 
-    # Filter test result status
-    stmt = stmt.where(
-        _array_empty_or_contains(
-            IssueTestResultAttachmentRule.test_result_statuses,
-            literal(test_result.status),
-        )
-    )
 
-    # Filter execution metadata
-    stmt = _filter_by_execution_metadata(stmt, test_result)
+def query_test_results_matching_attachment_rule(
+    attachment_rule_id: int,
+    after_test_result_id: int,
+    up_to_test_result_id: int,
+) -> Select[tuple[int, int, int]]:
+    """
+    Match the test results in an id range against a single enabled attachment rule
 
-    return stmt
+    Returns (issue_id, attachment_rule_id, test_result_id) rows for the test
+    results with after_test_result_id < id <= up_to_test_result_id.
+    """
+    return _select_matching_attachment_rules(
+        TestResult.id > after_test_result_id,
+        TestResult.id <= up_to_test_result_id,
+    ).where(IssueTestResultAttachmentRule.id == attachment_rule_id)
 
 
-def apply_test_result_attachment_rules(db: Session, test_result: TestResult):
-    # Fetch matching attachment rule
-    attachment_rules_stmt = query_matching_test_result_attachment_rules(test_result)
+def apply_test_results_attachment_rules(db: Session, test_result_ids: Collection[int]):
+    """
+    Attach issues to newly created test results according to the enabled
+    attachment rules and request reruns for auto-rerun issues
 
-    # Apply attachment rules based on creation
-    attachment_rules_stmt = attachment_rules_stmt.order_by(IssueTestResultAttachmentRule.id)
+    Rules are matched in memory through the attachment rule index, so the
+    number of statements doesn't depend on the number of results or rules.
+    """
+    if not test_result_ids:
+        return
 
-    # Create a subquery
-    attachment_rules_subquery = attachment_rules_stmt.subquery()
-
-    # Create insertion statement using subquery
-    insert_stmt = (
-        insert(IssueTestResultAttachment)
-        .from_select(
-            ["issue_id", "attachment_rule_id", "test_result_id"],
-            select(
-                attachment_rules_subquery.c.issue_id,
-                attachment_rules_subquery.c.id,
-                literal(test_result.id),
-            ),
-        )
-        .on_conflict_do_nothing()
-    )
-
-    db.execute(insert_stmt)
+    index = attachment_rule_index_cache.get(db)
+    if len(index) > 0:
+        attachments = [
+            {"issue_id": rule.issue_id, "attachment_rule_id": rule.id, "test_result_id": test_result.test_result_id}
+            for test_result in load_matchable_test_results(db, test_result_ids)
+            for rule in index.match(test_result)
+        ]
+        if attachments:
+            db.execute(insert(IssueTestResultAttachment).on_conflict_do_nothing(), attachments)
 
     # Check if the issue has auto_rerun_enabled set and create rerun requests
+    new_test_result = aliased(TestResult)
     auto_rerun_rules_stmt = (
         insert(TestExecutionRerunRequest)
         .from_select(
@@ -230,10 +205,125 @@ def apply_test_result_attachment_rules(db: Session, test_result: TestResult):
             )
             .join(Issue, Issue.id == IssueTestResultAttachment.issue_id)
             .where(Issue.auto_rerun_enabled)
-            .where(TestExecution.id == test_result.test_execution_id)
+            .where(
+                TestExecution.id.in_(
+                    select(new_test_result.test_execution_id).where(
+                        new_test_result.id == any_(literal(list(test_result_ids), ARRAY(Integer)))
+                    )
+                )
+            )
             .distinct(),
         )
         .on_conflict_do_nothing()
     )
 
     db.execute(auto_rerun_rules_stmt)
+
+
+# Number of test result ids covered by every chunk of a retroactive job
+ATTACHMENT_RULE_JOB_CHUNK_SIZE = 10_000
+
+# Time without progress after which an unfinished job is considered lost,
+# e.g. to a failed enqueue or a worker restart, and resumed
+ATTACHMENT_RULE_JOB_STALE_AFTER = timedelta(minutes=10)
+
+_ACTIVE_STATUSES = [JobStatus.PENDING, JobStatus.RUNNING]
+
+
+def create_attachment_rule_job(
+    db: Session,
+    attachment_rule: IssueTestResultAttachmentRule,
+) -> IssueTestResultAttachmentRuleJob:
+    """
+    Create a job applying an attachment rule to the test results that already exist
+
+    Does NOT commit nor enqueue the job, the caller is responsible for both.
+    """
+    job = IssueTestResultAttachmentRuleJob(
+        attachment_rule=attachment_rule,
+        max_test_result_id=db.scalar(select(func.coalesce(func.max(TestResult.id), 0))),
+    )
+    db.add(job)
+    return job
+
+
+def run_attachment_rule_job_chunk(
+    db: Session,
+    job_id: int,
+    chunk_size: int = ATTACHMENT_RULE_JOB_CHUNK_SIZE,
+) -> bool:
+    """
+    Apply the job's attachment rule to the next chunk of test results and commit
+
+    The job row is locked while the chunk is processed, so a job that was
+    delivered twice is never processed concurrently.
+
+    :return: whether there are chunks left to process
+    """
+    job = db.get(IssueTestResultAttachmentRuleJob, job_id, with_for_update=True)
+    if job is None or job.status in (JobStatus.COMPLETED, JobStatus.FAILED):
+        db.rollback()
+        return False
+
+    up_to_test_result_id = min(job.last_test_result_id + chunk_size, job.max_test_result_id)
+    inserted = db.execute(
+        insert(IssueTestResultAttachment)
+        .from_select(
+            ["issue_id", "attachment_rule_id", "test_result_id"],
+            query_test_results_matching_attachment_rule(
+                job.attachment_rule_id,
+                job.last_test_result_id,
+                up_to_test_result_id,
+            ),
+        )
+        .on_conflict_do_nothing()
+    )
+
+    job.attachments_created += inserted.rowcount
+    job.last_test_result_id = up_to_test_result_id
+    job.status = JobStatus.COMPLETED if up_to_test_result_id >= job.max_test_result_id else JobStatus.RUNNING
+    db.commit()
+
+    attachment_rule_job_chunks.inc()
+    attachment_rule_job_attachments.inc(inserted.rowcount)
+    logger.info(
+        "Attachment rule job %s: %s of %s test result ids processed, %s attachments created",
+        job_id,
+        job.last_test_result_id,
+        job.max_test_result_id,
+        job.attachments_created,
+    )
+    if job.status == JobStatus.COMPLETED:
+        attachment_rule_jobs_finished.labels(status=JobStatus.COMPLETED).inc()
+
+    return job.status == JobStatus.RUNNING
+
+
+def fail_attachment_rule_job(db: Session, job_id: int, error: str) -> None:
+    job = db.get(IssueTestResultAttachmentRuleJob, job_id)
+    if job is not None:
+        job.status = JobStatus.FAILED
+        job.error = error
+        db.commit()
+        attachment_rule_jobs_finished.labels(status=JobStatus.FAILED).inc()
+
+
+def select_stale_attachment_rule_jobs(db: Session) -> list[int]:
+    """
+    Select the unfinished jobs that made no progress for a while
+
+    Such jobs were never enqueued, e.g. because the broker was unreachable,
+    or lost by their worker.
+
+    :return: ids of the jobs, oldest first
+    """
+    return list(
+        db.scalars(
+            select(IssueTestResultAttachmentRuleJob.id)
+            .where(
+                IssueTestResultAttachmentRuleJob.status.in_(_ACTIVE_STATUSES),
+                IssueTestResultAttachmentRuleJob.updated_at < func.localtimestamp() - ATTACHMENT_RULE_JOB_STALE_AFTER,
+            )
+            .order_by(IssueTestResultAttachmentRuleJob.id)
+        )
+    )
@@ -36,6 +36,7 @@ from test_observer.data_access.models import (
     IssueTestResultAttachmentRule,
     TestExecution,
     TestResult,
+    TestResultSearchEntry,
     User,
 )
 from test_observer.data_access.setup import get_db
@@ -124,7 +125,7 @@ def modify_issue_attachments(
                 status_code=422,
                 detail="At least one filter must be provided in test_results_filters",
             )
-        base_query = select(TestResult.id)
+        base_query = select(TestResultSearchEntry.id)
         filtered_ids_query = filter_test_results(base_query, filters).subquery()
 
         filtered_result_ids = [row[0] for row in db.execute(select(filtered_ids_query.c.id)).all()]
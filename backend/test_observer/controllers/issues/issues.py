@@ -20,11 +20,13 @@ from fastapi.security import SecurityScopes
 from sqlalchemy import String, func, select
 from sqlalchemy.orm import Session, selectinload
 
+from test_observer.common.constants import CountMode, CountModeQuery
 from test_observer.common.enums import Permission
 from test_observer.common.permissions import permission_checker
 from test_observer.controllers.applications.application_injection import (
     get_current_application,
 )
+from test_observer.data_access.counts import count_rows
 from test_observer.data_access.models import (
     Application,
     Artefact,
@@ -98,6 +100,7 @@ def get_issues(
         str | None,
         Query(description="Search term for issue source, project, keys, title, and status"),
     ] = None,
+    count_mode: CountModeQuery = CountMode.EXACT,
     db: Session = Depends(get_db),
 ):
     stmt = select(Issue)
@@ -141,8 +144,7 @@ def get_issues(
     stmt = stmt.order_by(Issue.source, Issue.project, Issue.key)
 
     # Count total before pagination
-    count_query = select(func.count()).select_from(stmt.subquery())
-    total_count = db.execute(count_query).scalar() or 0
+    total_count = count_rows(db, stmt, count_mode)
 
     # Apply limit and offset
     stmt = stmt.limit(limit).offset(offset)
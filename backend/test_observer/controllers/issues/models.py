@@ -13,7 +13,9 @@
 # SPDX-FileCopyrightText: Copyright 2025 Canonical Ltd.
 # SPDX-License-Identifier: AGPL-3.0-only
 
-from pydantic import AliasPath, BaseModel, ConfigDict, Field, HttpUrl
+from datetime import datetime
+
+from pydantic import AliasPath, BaseModel, ConfigDict, Field, HttpUrl, computed_field
 
 from test_observer.controllers.artefacts.models import (
     ArtefactBuildMinimalResponse,
@@ -29,6 +31,7 @@ from test_observer.data_access.models_enums import (
     FamilyName,
     IssueSource,
     IssueStatus,
+    JobStatus,
     TestResultStatus,
 )
 
@@ -67,6 +70,34 @@ class IssueTestResultAttachmentRulePostRequest(BaseModel):
     template_ids: list[str] = Field(default_factory=list)
     test_result_statuses: list[TestResultStatus] = Field(default_factory=list)
     execution_metadata: ExecutionMetadata = Field(default_factory=ExecutionMetadata)
+    apply_retroactively: bool = Field(
+        default=False,
+        description="Also apply the rule to existing test results in a background job",
+    )
+
+
+class IssueTestResultAttachmentRuleJobResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    attachment_rule_id: int
+    status: JobStatus
+    last_test_result_id: int
+    max_test_result_id: int
+    attachments_created: int
+    error: str | None
+    created_at: datetime
+    updated_at: datetime
+
+    @computed_field
+    def progress(self) -> float:
+        if self.max_test_result_id == 0:
+            return 1.0
+        return self.last_test_result_id / self.max_test_result_id
+
+
+class IssueTestResultAttachmentRulePostResponse(MinimalIssueTestResultAttachmentRuleResponse):
+    job: IssueTestResultAttachmentRuleJobResponse | None = None
 
 
 class IssueTestResultAttachmentRulePatchRequest(BaseModel):
@@ -93,7 +124,7 @@ class IssueResponse(BaseModel):
 
 class IssuesGetResponse(BaseModel):
     issues: list[MinimalIssueResponse]
-    count: int
+    count: int | None = Field(description="Number of matching items, as requested by count_mode")
     limit: int
     offset: int
 
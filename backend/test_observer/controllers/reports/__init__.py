@@ -15,8 +15,9 @@
 
 from fastapi import APIRouter
 
-from . import test_executions, test_results
+from . import report_jobs, test_executions, test_results
 
 router = APIRouter(tags=["reports"])
 router.include_router(test_results.router)
 router.include_router(test_executions.router)
+router.include_router(report_jobs.router)
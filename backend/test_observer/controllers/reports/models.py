@@ -0,0 +1,41 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from test_observer.data_access.models_enums import JobStatus, ReportName
+
+
+class ReportJobRequest(BaseModel):
+    report: ReportName
+    start_date: datetime = datetime.min
+    end_date: datetime | None = Field(default=None, description="Defaults to when the report is generated")
+
+
+class ReportJobResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    report: ReportName
+    start_date: datetime
+    end_date: datetime | None
+    status: JobStatus
+    size: int | None = Field(description="Size of the gzip compressed report, once completed")
+    error: str | None
+    created_at: datetime
+    updated_at: datetime
@@ -0,0 +1,107 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Security
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from test_observer.common.background_tasks import enqueue_report_job
+from test_observer.common.byte_ranges import streamed_range_response
+from test_observer.common.enums import Permission
+from test_observer.common.permissions import permission_checker
+from test_observer.data_access.models import ReportJob
+from test_observer.data_access.models_enums import JobStatus
+from test_observer.data_access.setup import get_db
+
+from .models import ReportJobRequest, ReportJobResponse
+from .report_jobs_logic import read_report, submit_report_job
+from .streaming import attachment_headers
+
+router = APIRouter()
+
+GZIP_MEDIA_TYPE = "application/gzip"
+
+
+@router.post(
+    "/jobs",
+    status_code=202,
+    response_model=ReportJobResponse,
+    dependencies=[Security(permission_checker, scopes=[Permission.view_report])],
+)
+def post_report_job(request: ReportJobRequest, db: Session = Depends(get_db)):
+    """
+    Generate a report in the background
+
+    Identical requests share the job of the first one while it's pending or
+    running. Poll the returned job, then download the report once completed.
+    """
+    job, created = submit_report_job(db, request.report, request.start_date, request.end_date)
+    db.commit()
+
+    if created:
+        enqueue_report_job(job.id)
+    return job
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=ReportJobResponse,
+    dependencies=[Security(permission_checker, scopes=[Permission.view_report])],
+)
+def get_report_job(job_id: int, db: Session = Depends(get_db)):
+    job = db.get(ReportJob, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Report job not found")
+    return job
+
+
+@router.get(
+    "/jobs/{job_id}/report",
+    response_class=StreamingResponse,
+    responses={
+        200: {"content": {GZIP_MEDIA_TYPE: {}}, "description": "The gzip compressed CSV report"},
+        206: {"content": {GZIP_MEDIA_TYPE: {}}, "description": "The requested range of the compressed report"},
+        409: {"description": "The report job isn't completed"},
+        416: {"description": "The requested range is outside the compressed report"},
+    },
+    dependencies=[Security(permission_checker, scopes=[Permission.view_report])],
+)
+def get_report_job_report(
+    job_id: int,
+    range_header: Annotated[
+        str | None,
+        Header(alias="Range", description="A single byte range of the compressed report, to resume a download"),
+    ] = None,
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    """
+    Download the report of a completed job, as gzip compressed CSV
+    """
+    job = db.get(ReportJob, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Report job not found")
+    if job.status != JobStatus.COMPLETED:
+        raise HTTPException(status_code=409, detail=f"Report job is {job.status.lower()}")
+
+    return streamed_range_response(
+        job.size or 0,
+        lambda start, end: read_report(db, job.id, start, end),
+        media_type=GZIP_MEDIA_TYPE,
+        range_header=range_header,
+        headers=attachment_headers(f"{job.report.lower()}_report_{job.id}.csv.gz"),
+    )
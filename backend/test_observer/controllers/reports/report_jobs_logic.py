@@ -0,0 +1,188 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+
+"""
+Report jobs, generating reports in the background
+
+Reports of long periods take minutes to generate. Rather than streaming them
+in a request, a worker stores them in the database and clients download them
+once done, from whichever unit of the API. Reports are gzip compressed CSV
+stored a chunk of rows at a time, every chunk being a gzip member of its own
+along with its offset in the compressed report, so that any byte range is read
+from the chunks it spans.
+"""
+
+import gzip
+import hashlib
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+
+from sqlalchemy import Select, delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from test_observer.data_access.models import ReportJob, ReportJobChunk
+from test_observer.data_access.models_enums import JobStatus, ReportName
+
+from .streaming import stream_csv
+from .test_executions import TEST_EXECUTIONS_REPORT_HEADERS, get_test_executions_reports_query
+from .test_results import TESTRESULTS_REPORT_COLUMNS, get_testresults_report_query
+
+REPORT_COMPRESSION_LEVEL = 6
+
+# Number of chunks of a report fetched at a time when downloading it
+REPORT_DOWNLOAD_CHUNKS = 16
+
+# Age of finished jobs from which they're deleted along with their report
+REPORT_JOB_RETENTION = timedelta(days=7)
+
+# Age of unfinished jobs from which they're considered lost, e.g. to a worker restart
+REPORT_JOB_TIMEOUT = timedelta(hours=6)
+
+_ACTIVE_STATUSES = [JobStatus.PENDING, JobStatus.RUNNING]
+
+
+def _filters_digest(report: ReportName, start_date: datetime, end_date: datetime | None) -> str:
+    filters = f"{report}|{start_date.isoformat()}|{end_date.isoformat() if end_date else ''}"
+    return hashlib.sha256(filters.encode()).hexdigest()
+
+
+def submit_report_job(
+    db: Session,
+    report: ReportName,
+    start_date: datetime,
+    end_date: datetime | None,
+) -> tuple[ReportJob, bool]:
+    """
+    Create a job generating a report, unless an identical one is pending or running
+
+    Does NOT commit nor enqueue the job, the caller is responsible for both.
+
+    :return: the job and whether it was created
+    """
+    digest = _filters_digest(report, start_date, end_date)
+    while True:
+        job_id = db.scalar(
+            insert(ReportJob)
+            .values(report=report, start_date=start_date, end_date=end_date, filters_digest=digest)
+            .on_conflict_do_nothing(
+                index_elements=[ReportJob.filters_digest],
+                index_where=ReportJob.status.in_(_ACTIVE_STATUSES),
+            )
+            .returning(ReportJob.id)
+        )
+        if job_id is not None:
+            return db.get_one(ReportJob, job_id), True
+
+        existing = db.scalar(
+            select(ReportJob).where(ReportJob.filters_digest == digest, ReportJob.status.in_(_ACTIVE_STATUSES))
+        )
+        # Otherwise the identical job finished in the meantime
+        if existing is not None:
+            return existing, False
+
+
+def claim_report_job(db: Session, job_id: int) -> ReportJob | None:
+    """
+    Mark a pending job as running, so that it's only generated once
+
+    This function does NOT commit the transaction.
+
+    :return: None when the job isn't pending anymore
+    """
+    return db.scalar(
+        update(ReportJob)
+        .where(ReportJob.id == job_id, ReportJob.status == JobStatus.PENDING)
+        .values(status=JobStatus.RUNNING, updated_at=func.now())
+        .returning(ReportJob)
+    )
+
+
+def _report_query(job: ReportJob) -> tuple[Select, list]:
+    end_date = job.end_date or datetime.now()
+    match job.report:
+        case ReportName.TEST_RESULTS:
+            return (
+                get_testresults_report_query(TESTRESULTS_REPORT_COLUMNS, job.start_date, end_date),
+                list(TESTRESULTS_REPORT_COLUMNS),
+            )
+        case ReportName.TEST_EXECUTIONS:
+            return get_test_executions_reports_query(job.start_date, end_date), TEST_EXECUTIONS_REPORT_HEADERS
+
+
+def write_report(db: Session, job: ReportJob) -> None:
+    """
+    Store the report of a running job and mark it completed
+
+    The report is read through a server-side cursor and stored a chunk of rows at a time.
+    This function does NOT commit the transaction, so the report is stored whole or not at all.
+    """
+    query, headers = _report_query(job)
+    size = 0
+    for chunk in stream_csv(db, query, headers):
+        content = gzip.compress(chunk.encode(), REPORT_COMPRESSION_LEVEL)
+        db.execute(insert(ReportJobChunk).values(report_job_id=job.id, byte_offset=size, content=content))
+        size += len(content)
+
+    job.size = size
+    job.status = JobStatus.COMPLETED
+
+
+def read_report(db: Session, job_id: int, start: int, end: int) -> Iterator[bytes]:
+    """Bytes of the compressed report of a job, from a start to an end offset both inclusive"""
+    result = db.execute(
+        select(ReportJobChunk.byte_offset, ReportJobChunk.content)
+        .where(
+            ReportJobChunk.report_job_id == job_id,
+            ReportJobChunk.byte_offset <= end,
+            ReportJobChunk.byte_offset + func.octet_length(ReportJobChunk.content) > start,
+        )
+        .order_by(ReportJobChunk.byte_offset),
+        execution_options={"yield_per": REPORT_DOWNLOAD_CHUNKS},
+    )
+    try:
+        for byte_offset, content in result.tuples():
+            yield content[max(start - byte_offset, 0) : end - byte_offset + 1]
+    finally:
+        result.close()
+
+
+def fail_report_job(db: Session, job_id: int, error: str) -> None:
+    """Mark a job as failed and commit"""
+    db.execute(update(ReportJob).where(ReportJob.id == job_id).values(status=JobStatus.FAILED, error=error))
+    db.commit()
+
+
+def delete_expired_report_jobs(db: Session) -> int:
+    """
+    Delete finished jobs past their retention along with their report, and fail lost jobs
+
+    This function does NOT commit the transaction.
+
+    :return: number of jobs deleted
+    """
+    now = db.execute(select(func.localtimestamp())).scalar_one()
+    db.execute(
+        update(ReportJob)
+        .where(ReportJob.status.in_(_ACTIVE_STATUSES), ReportJob.updated_at < now - REPORT_JOB_TIMEOUT)
+        .values(status=JobStatus.FAILED, error="Report job timed out", updated_at=func.now())
+    )
+    expired = db.execute(
+        delete(ReportJob).where(
+            ReportJob.status.not_in(_ACTIVE_STATUSES), ReportJob.updated_at < now - REPORT_JOB_RETENTION
+        )
+    )
+    return expired.rowcount
@@ -0,0 +1,128 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+
+"""
+Streaming of reports
+
+Reports are read through a server-side cursor, in chunks of a fixed number of
+rows, and every chunk is sent as soon as it's read. Memory use doesn't depend
+on the size of the report, and every download has its own cursor.
+
+Columnar reports are streamed as Arrow IPC or Parquet, with a record batch
+per chunk of rows.
+"""
+
+import csv
+import io
+from collections.abc import Buffer, Iterator, Sequence
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import Row, Select
+from sqlalchemy.orm import Session
+
+from test_observer.common.constants import ExportFormat
+
+CSV_MEDIA_TYPE = "text/csv"
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.ARROW: "application/vnd.apache.arrow.stream",
+    ExportFormat.PARQUET: "application/vnd.apache.parquet",
+}
+
+# Number of rows fetched from the cursor at a time
+REPORT_CHUNK_ROWS = 5000
+
+
+def stream_rows(db: Session, query: Select) -> Iterator[Sequence[Row]]:
+    """Rows of a query, in chunks of REPORT_CHUNK_ROWS read through a server-side cursor"""
+    result = db.execute(query, execution_options={"yield_per": REPORT_CHUNK_ROWS})
+    try:
+        yield from result.partitions()
+    finally:
+        result.close()
+
+
+def stream_csv(db: Session, query: Select, headers: Sequence[object]) -> Iterator[str]:
+    """CSV lines of the headers then of the rows of a query, a chunk of rows at a time"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush() -> str:
+        content = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return content
+
+    writer.writerow(headers)
+    yield flush()
+    for rows in stream_rows(db, query):
+        writer.writerows(rows)
+        yield flush()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Binary file that keeps what's written until it's taken, but tells the position in the whole file"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b: Buffer) -> int:
+        chunk = bytes(b)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def take(self) -> bytes:
+        content = b"".join(self._chunks)
+        self._chunks.clear()
+        return content
+
+
+def _record_batches(db: Session, query: Select, schema: pa.Schema) -> Iterator[pa.RecordBatch]:
+    for rows in stream_rows(db, query):
+        columns = zip(*rows, strict=True)
+        arrays = [pa.array(values, type=field.type) for values, field in zip(columns, schema, strict=True)]
+        yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def stream_export(db: Session, query: Select, schema: pa.Schema, export_format: ExportFormat) -> Iterator[bytes]:
+    """
+    Arrow IPC stream or Parquet file of the rows of a query, a chunk of rows at a time
+
+    The columns of the query are converted to the types of the fields of the schema, in order.
+    Every chunk of rows is sent as an Arrow record batch or a Parquet row group.
+    """
+    sink = _ChunkSink()
+    writer = pa.ipc.new_stream(sink, schema) if export_format == ExportFormat.ARROW else pq.ParquetWriter(sink, schema)
+
+    with writer:
+        for batch in _record_batches(db, query, schema):
+            writer.write_batch(batch)
+            yield sink.take()
+    yield sink.take()
+
+
+def attachment_headers(filename: str) -> dict[str, str]:
+    return {"Content-Disposition": f'attachment; filename="{filename}"'}
@@ -13,12 +13,10 @@
 # SPDX-FileCopyrightText: Copyright 2024 Canonical Ltd.
 # SPDX-License-Identifier: AGPL-3.0-only
 
-import csv
 from datetime import datetime
-from pathlib import Path
 
-from fastapi import APIRouter, BackgroundTasks, Depends, Security
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, Security
+from fastapi.responses import StreamingResponse
 from sqlalchemy import Select, func, select, text
 from sqlalchemy.orm import Session
 
@@ -35,6 +33,8 @@ from test_observer.data_access.models import (
 )
 from test_observer.data_access.setup import get_db
 
+from .streaming import CSV_MEDIA_TYPE, attachment_headers, stream_csv
+
 router = APIRouter()
 
 TEST_EXECUTIONS_REPORT_COLUMNS = [
@@ -88,7 +88,7 @@ TEST_EXECUTIONS_REPORT_HEADERS = [
 ]
 
 
-def _get_test_executions_reports_query(start_date: datetime, end_date: datetime) -> Select:
+def get_test_executions_reports_query(start_date: datetime, end_date: datetime) -> Select:
     """
     Builds the query that retrieves the test executions based on the parameters set
     """
@@ -136,35 +136,27 @@ def _get_test_executions_reports_query(start_date: datetime, end_date: datetime)
 
 @router.get(
     "/test-executions",
-    response_class=FileResponse,
+    response_class=StreamingResponse,
+    responses={200: {"content": {CSV_MEDIA_TYPE: {}}, "description": "The report in CSV"}},
     dependencies=[Security(permission_checker, scopes=[Permission.view_report])],
 )
 def get_test_execution_reports(
-    background_tasks: BackgroundTasks,
     start_date: datetime = datetime.min,
     end_date: datetime | None = None,
     db: Session = Depends(get_db),
-):
+) -> StreamingResponse:
     """
     Returns a csv report detailing all test executions within a given date range.
     Together with their artefact and environment details in csv format.
+
+    The report is streamed as it's read from the database.
     """
 
     if end_date is None:
         end_date = datetime.now()
 
-    cursor = db.execute(_get_test_executions_reports_query(start_date, end_date))
-
-    filename = "test_executions_report.csv"
-
-    try:
-        with open(filename, "w") as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow(TEST_EXECUTIONS_REPORT_HEADERS)
-            writer.writerows(cursor)
-    finally:
-        # Background tasks get called after the response was returned.
-        # So effectively, this will delete the file after it was returned to the user
-        background_tasks.add_task(lambda: Path(filename).unlink(missing_ok=True))
-
-    return filename
+    return StreamingResponse(
+        stream_csv(db, get_test_executions_reports_query(start_date, end_date), TEST_EXECUTIONS_REPORT_HEADERS),
+        media_type=CSV_MEDIA_TYPE,
+        headers=attachment_headers("test_executions_report.csv"),
+    )
@@ -13,16 +13,17 @@
 # SPDX-FileCopyrightText: Copyright 2024 Canonical Ltd.
 # SPDX-License-Identifier: AGPL-3.0-only
 
-import csv
+from collections.abc import Sequence
 from datetime import datetime
-from pathlib import Path
 
-from fastapi import APIRouter, BackgroundTasks, Depends, Security
-from fastapi.responses import FileResponse
-from sqlalchemy import select
+import pyarrow as pa
+from fastapi import APIRouter, Depends, Security
+from fastapi.responses import StreamingResponse
+from sqlalchemy import ColumnElement, Select, Text, cast, select
 from sqlalchemy.orm import Session
 from sqlalchemy.orm.attributes import InstrumentedAttribute
 
+from test_observer.common.constants import ExportFormat
 from test_observer.common.enums import Permission
 from test_observer.common.permissions import permission_checker
 from test_observer.data_access.models import (
@@ -36,6 +37,8 @@ from test_observer.data_access.models import (
 )
 from test_observer.data_access.setup import get_db
 
+from .streaming import CSV_MEDIA_TYPE, EXPORT_MEDIA_TYPES, attachment_headers, stream_csv, stream_export
+
 router = APIRouter()
 
 TESTRESULTS_REPORT_COLUMNS: list[InstrumentedAttribute] = [
@@ -65,46 +68,115 @@ TESTRESULTS_REPORT_COLUMNS: list[InstrumentedAttribute] = [
     TestResult.created_at,
 ]
 
+# Strings repeated across rows are sent once per record batch
+DICTIONARY_STRING = pa.dictionary(pa.int32(), pa.string())
+
+TESTRESULTS_EXPORT_COLUMNS: list[tuple[str, ColumnElement | InstrumentedAttribute, pa.DataType]] = [
+    ("artefact_family", cast(Artefact.family, Text), DICTIONARY_STRING),
+    ("artefact_id", Artefact.id, pa.int64()),
+    ("artefact_name", Artefact.name, DICTIONARY_STRING),
+    ("artefact_version", Artefact.version, DICTIONARY_STRING),
+    ("artefact_status", cast(Artefact.status, Text), DICTIONARY_STRING),
+    ("artefact_track", Artefact.track, DICTIONARY_STRING),
+    ("artefact_stage", Artefact.stage, DICTIONARY_STRING),
+    ("artefact_series", Artefact.series, DICTIONARY_STRING),
+    ("artefact_repo", Artefact.repo, DICTIONARY_STRING),
+    ("artefact_os", Artefact.os, DICTIONARY_STRING),
+    ("artefact_created_at", Artefact.created_at, pa.timestamp("us")),
+    ("test_execution_id", TestExecution.id, pa.int64()),
+    ("test_execution_status", cast(TestExecution.status, Text), DICTIONARY_STRING),
+    ("test_execution_c3_link", TestExecution.c3_link, pa.string()),
+    ("test_execution_checkbox_version", TestExecution.checkbox_version, DICTIONARY_STRING),
+    ("test_plan", TestPlan.name, DICTIONARY_STRING),
+    ("environment_name", Environment.name, DICTIONARY_STRING),
+    ("environment_architecture", Environment.architecture, DICTIONARY_STRING),
+    ("test_case_template_id", TestCase.template_id, DICTIONARY_STRING),
+    ("test_case_name", TestCase.name, DICTIONARY_STRING),
+    ("test_case_category", TestCase.category, DICTIONARY_STRING),
+    ("test_result_id", TestResult.id, pa.int64()),
+    ("test_result_status", cast(TestResult.status, Text), DICTIONARY_STRING),
+    ("test_result_created_at", TestResult.created_at, pa.timestamp("us")),
+]
+
+TESTRESULTS_EXPORT_SCHEMA = pa.schema([(name, data_type) for name, _, data_type in TESTRESULTS_EXPORT_COLUMNS])
+
+
+def get_testresults_report_query(
+    columns: Sequence[ColumnElement | InstrumentedAttribute],
+    start_date: datetime,
+    end_date: datetime | None,
+) -> Select:
+    if end_date is None:
+        end_date = datetime.now()
+
+    return (
+        select(*columns)
+        .join_from(Artefact, ArtefactBuild)
+        .join_from(ArtefactBuild, TestExecution)
+        .join_from(TestExecution, Environment)
+        .join_from(TestExecution, TestPlan)
+        .join_from(TestExecution, TestResult)
+        .join_from(TestResult, TestCase)
+        .where(Artefact.created_at >= start_date, Artefact.created_at <= end_date)
+    )
+
 
 @router.get(
     "/test-results",
-    response_class=FileResponse,
+    response_class=StreamingResponse,
+    responses={200: {"content": {CSV_MEDIA_TYPE: {}}, "description": "The report in CSV"}},
     dependencies=[Security(permission_checker, scopes=[Permission.view_report])],
 )
 def get_testresults_report(
-    background_tasks: BackgroundTasks,
     start_date: datetime = datetime.min,
     end_date: datetime | None = None,
     db: Session = Depends(get_db),
-):
+) -> StreamingResponse:
     """
     Returns a csv report detailing all artefacts within a given date range. Together
     with their test executions and test results in csv format.
+
+    The report is streamed as it's read from the database.
     """
-    if end_date is None:
-        end_date = datetime.now()
+    query = get_testresults_report_query(TESTRESULTS_REPORT_COLUMNS, start_date, end_date)
 
-    cursor = db.execute(
-        select(*TESTRESULTS_REPORT_COLUMNS)
-        .join_from(Artefact, ArtefactBuild)
-        .join_from(ArtefactBuild, TestExecution)
-        .join_from(TestExecution, Environment)
-        .join_from(TestExecution, TestPlan)
-        .join_from(TestExecution, TestResult)
-        .join_from(TestResult, TestCase)
-        .where(Artefact.created_at >= start_date, Artefact.created_at <= end_date)
+    return StreamingResponse(
+        stream_csv(db, query, TESTRESULTS_REPORT_COLUMNS),
+        media_type=CSV_MEDIA_TYPE,
+        headers=attachment_headers("testresults_report.csv"),
     )
 
-    filename = "testresults_report.csv"
 
-    try:
-        with open(filename, "w") as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow(TESTRESULTS_REPORT_COLUMNS)
-            writer.writerows(cursor)
-    finally:
-        # Background tasks get called after the response was returned.
-        # So effectively, this will delete the file after it was returned to the user
-        background_tasks.add_task(lambda: Path(filename).unlink(missing_ok=True))
+@router.get(
+    "/test-results/export",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "content": {media_type: {} for media_type in EXPORT_MEDIA_TYPES.values()},
+            "description": "The report as an Arrow IPC stream or a Parquet file",
+        }
+    },
+    dependencies=[Security(permission_checker, scopes=[Permission.view_report])],
+)
+def export_testresults_report(
+    format: ExportFormat = ExportFormat.PARQUET,
+    start_date: datetime = datetime.min,
+    end_date: datetime | None = None,
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    """
+    Returns the test results report in a columnar format, for analytics
 
-    return filename
+    Strings repeated across rows, like the family, environment, test case and
+    status, are dictionary encoded. Every record batch of the Arrow stream,
+    or row group of the Parquet file, is streamed as it's read from the database.
+    """
+    query = get_testresults_report_query(
+        [column.label(name) for name, column, _ in TESTRESULTS_EXPORT_COLUMNS], start_date, end_date
+    )
+
+    return StreamingResponse(
+        stream_export(db, query, TESTRESULTS_EXPORT_SCHEMA, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers=attachment_headers(f"testresults_report.{format}"),
+    )
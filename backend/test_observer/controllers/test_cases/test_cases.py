@@ -30,6 +30,7 @@ from test_observer.data_access.models import (
 )
 from test_observer.data_access.models_enums import FamilyName
 from test_observer.data_access.setup import get_db
+from test_observer.data_access.text_search import COMPLETION_LIMIT, complete, contains, relevance_order
 
 from . import reported_issues
 from .models import TestCasesResponse
@@ -72,15 +73,12 @@ def get_test_cases(
     Template ID represents the generic test (e.g., "disk/stats_name")
     Test case name is the specific instance (e.g., "disk/stats_nvme0n1")
     Multiple test cases can share the same template ID but have different names.
+    When searching, the most relevant test cases come first.
     """
-    query = (
-        select(
-            TestCase.name.label("test_case"),
-            TestCase.template_id,
-        )
-        .distinct()
-        .order_by(TestCase.name, TestCase.template_id)
-    )
+    query = select(
+        TestCase.name.label("test_case"),
+        TestCase.template_id,
+    ).group_by(TestCase.name, TestCase.template_id)
 
     # Filter by families if provided
     if families and len(families) > 0:
@@ -94,11 +92,26 @@ def get_test_cases(
 
     # Apply search filter if provided
     if q and q.strip():
-        search_term = f"%{q.strip()}%"
-        query = query.where(TestCase.name.ilike(search_term))
+        query = query.where(contains(TestCase.name, q.strip()))
+        query = query.order_by(*relevance_order(db, [TestCase.name], q.strip()))
+    query = query.order_by(TestCase.name, TestCase.template_id)
 
     # Apply pagination
     query = query.offset(offset).limit(limit)
 
     rows = db.execute(query).mappings().all()
     return TestCasesResponse.from_rows(rows)
+
+
+@router.get(
+    "/completions",
+    response_model=list[str],
+    dependencies=[Security(permission_checker, scopes=[Permission.view_test])],
+)
+def complete_test_case_names(
+    prefix: Annotated[str, Query(min_length=1, description="Beginning of the test case names")],
+    limit: Annotated[int, Query(ge=1, le=100, description="Maximum number of names")] = COMPLETION_LIMIT,
+    db: Session = Depends(get_db),
+) -> list[str]:
+    """Test case names starting with prefix, case insensitively, shortest first"""
+    return complete(db, TestCase.name, prefix, limit)
@@ -16,11 +16,13 @@
 from . import (  # noqa: F401
     end_test,
     get_test_results,
+    ingest,
     post_results,
     relevant_links,
     reruns,
     search,
     start_test,
+    start_test_batch,
     status_update,
     test_execution,
 )
@@ -13,15 +13,15 @@
 # SPDX-FileCopyrightText: Copyright 2024 Canonical Ltd.
 # SPDX-License-Identifier: AGPL-3.0-only
 
-from fastapi import Depends, HTTPException, Security
-from sqlalchemy import select
+from fastapi import Depends, HTTPException, Request, Security
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import Integer, String, column, exists, select, update, values
 from sqlalchemy.orm import Session, joinedload
 
+from test_observer.common.background_tasks import reindex_test_results_on_commit
 from test_observer.common.enums import Permission
+from test_observer.common.ndjson import NDJSONReader, ndjson_request_body, require_ndjson
 from test_observer.common.permissions import permission_checker
-from test_observer.controllers.issues.attachment_rules_logic import (
-    apply_test_result_attachment_rules,
-)
 from test_observer.data_access.models import (
     ArtefactBuild,
     TestCase,
@@ -32,11 +32,13 @@ from test_observer.data_access.models_enums import (
     TestExecutionStatus,
     TestResultStatus,
 )
-from test_observer.data_access.repository import get_or_create
+from test_observer.data_access.repository import resolve_test_cases
 from test_observer.data_access.setup import get_db
+from test_observer.data_access.test_case_cache import cache_test_cases_on_commit
+from test_observer.data_access.test_result_search import index_test_results
 
-from .logic import delete_previous_results
-from .models import C3TestResult, C3TestResultStatus, EndTestExecutionRequest
+from .logic import delete_test_results_except, upsert_test_results
+from .models import C3TestResult, C3TestResultStatus, EndTestExecutionHeader, EndTestExecutionRequest
 from .router import router
 
 
@@ -45,72 +47,166 @@ from .router import router
     dependencies=[Security(permission_checker, scopes=[Permission.change_test])],
 )
 def end_test_execution(request: EndTestExecutionRequest, db: Session = Depends(get_db)):
-    test_execution = _find_related_test_execution(request, db)
+    store_end_test(db, request)
+    db.commit()
 
-    if test_execution is None:
-        raise HTTPException(status_code=404, detail="Related TestExecution not found")
 
-    delete_previous_results(db, test_execution)
-    _store_c3_test_results(db, request.test_results, test_execution)
+@router.put(
+    "/end-test/stream",
+    dependencies=[
+        Security(permission_checker, scopes=[Permission.change_test]),
+        Depends(require_ndjson),
+    ],
+    openapi_extra=ndjson_request_body(C3TestResult),
+)
+async def end_test_execution_stream(request: Request, db: Session = Depends(get_db)):
+    """
+    Like ending a test execution but with an NDJSON body
 
-    has_failures = test_execution.has_failures
+    The first line holds the ci_link, c3_link and checkbox_version fields of
+    the end-test request and every following line one of its test_results.
+    Results are validated and written in bounded chunks as the body is
+    received, and everything is committed together at the end.
 
-    test_execution.status = TestExecutionStatus.FAILED if has_failures else TestExecutionStatus.PASSED
+    The test execution stays locked, and the transaction open, for as long as
+    the body takes to upload. Other submissions to the same execution wait
+    meanwhile, and a long transaction holds back vacuuming. That is the price
+    of not holding the whole submission anywhere. Slow clients should rather
+    use /end-test/async, which stages the request and stores it in a worker.
+    """
+    reader = NDJSONReader(request)
+    header = await reader.read_one(EndTestExecutionHeader)
 
-    if request.c3_link is not None:
-        test_execution.c3_link = request.c3_link
+    test_execution = await run_in_threadpool(_find_related_test_execution, header, db)
 
-    test_execution.checkbox_version = request.checkbox_version
+    test_case_ids: set[int] = set()
+    async for chunk in reader.read_chunks(C3TestResult):
+        test_case_ids |= await run_in_threadpool(_store_c3_test_results, db, chunk, test_execution)
 
-    db.commit()
+    await run_in_threadpool(_finish_ending, db, header, test_execution, test_case_ids)
+    await run_in_threadpool(db.commit)
 
 
-def _find_related_test_execution(request: EndTestExecutionRequest, db: Session) -> TestExecution | None:
-    # Serialise concurrent requests for the same execution. Without this lock,
-    # a retry can race through when there are no pre-existing rows to lock on,
-    # and both requests insert a full duplicate set.
+def store_end_test(db: Session, request: EndTestExecutionRequest) -> None:
+    """
+    Replace the results of the test execution and mark it as ended
+
+    This function does NOT commit the transaction.
+    """
+    test_execution = _find_related_test_execution(request, db)
+    test_case_ids = _store_c3_test_results(db, request.test_results, test_execution)
+    _finish_ending(db, request, test_execution, test_case_ids)
+
+
+def _finish_ending(
+    db: Session,
+    header: EndTestExecutionHeader,
+    test_execution: TestExecution,
+    test_case_ids: set[int],
+) -> None:
+    # Results of previous submissions are updated in place, drop the ones
+    # for test cases that weren't submitted this time
+    delete_test_results_except(db, test_execution, test_case_ids)
+
+    has_failures = db.scalar(
+        select(
+            exists().where(
+                TestResult.test_execution_id == test_execution.id,
+                TestResult.status == TestResultStatus.FAILED,
+            )
+        )
+    )
+    test_execution.status = TestExecutionStatus.FAILED if has_failures else TestExecutionStatus.PASSED
+    index_test_results(db, TestResult.test_execution_id == test_execution.id)
+
+    if header.c3_link is not None:
+        test_execution.c3_link = header.c3_link
+
+    test_execution.checkbox_version = header.checkbox_version
+
+
+def _find_related_test_execution(header: EndTestExecutionHeader, db: Session) -> TestExecution:
+    # Serialise concurrent requests for the same execution. Ending replaces all
+    # the results, so two different submissions interleaving could each delete
+    # the results the other one stored.
     # with_for_update(of=TestExecution) locks only the test_execution row,
     # not the joined rows.
     stmt = (
         select(TestExecution)
-        .where(TestExecution.ci_link == request.ci_link)
-        .options(
-            joinedload(TestExecution.artefact_build).joinedload(ArtefactBuild.artefact),
-            joinedload(TestExecution.test_results).joinedload(TestResult.test_case),
-        )
+        .where(TestExecution.ci_link == header.ci_link)
+        .options(joinedload(TestExecution.artefact_build).joinedload(ArtefactBuild.artefact))
         .with_for_update(of=TestExecution)
     )
 
-    return db.execute(stmt).unique().scalar_one_or_none()
+    test_execution = db.execute(stmt).unique().scalar_one_or_none()
+
+    if test_execution is None:
+        raise HTTPException(status_code=404, detail="Related TestExecution not found")
+
+    return test_execution
 
 
 def _store_c3_test_results(
     db: Session,
     c3_test_results: list[C3TestResult],
     test_execution: TestExecution,
-) -> None:
-    for r in c3_test_results:
-        test_case = get_or_create(
-            db,
-            TestCase,
-            filter_kwargs={"name": r.name},
-            creation_kwargs={"category": r.category},
+) -> set[int]:
+    """
+    Store a chunk of the results of a test execution
+
+    :return: ids of the test cases of the stored results
+    """
+    if not c3_test_results:
+        return set()
+
+    test_cases = resolve_test_cases(
+        db,
+        ({"name": r.name, "category": r.category, "template_id": r.template_id or ""} for r in c3_test_results),
+    )
+    test_case_ids = {name: test_case.id for name, test_case in test_cases.items()}
+
+    # Unlike the category, a given template_id also overwrites the one of an
+    # existing test case, with the last result for a test case winning
+    template_ids = {r.name: r.template_id for r in c3_test_results if r.template_id}
+    if template_ids:
+        # Compared with the stored rows as the cached template_id may be stale
+        new_template_ids = values(column("id", Integer), column("template_id", String), name="new_template_ids").data(
+            [(test_case_ids[name], template_id) for name, template_id in template_ids.items()]
         )
-
-        if r.template_id:
-            test_case.template_id = r.template_id
-
-        test_result = TestResult(
-            test_case=test_case,
-            test_execution=test_execution,
-            status=_parse_c3_test_result_status(r.status),
-            comment=r.comment,
-            io_log=r.io_log,
+        updated_ids = db.scalars(
+            update(TestCase)
+            .where(
+                TestCase.id == new_template_ids.c.id,
+                TestCase.template_id.is_distinct_from(new_template_ids.c.template_id),
+            )
+            .values(template_id=new_template_ids.c.template_id)
+            .returning(TestCase.id)
+        ).all()
+        cache_test_cases_on_commit(
+            db,
+            {name: test_cases[name]._replace(template_id=template_id) for name, template_id in template_ids.items()},
         )
+        if updated_ids:
+            # Results of other executions of these test cases are searched by the new template_id
+            reindex_test_results_on_commit(db, test_case_ids=updated_ids)
+
+    # Later results for the same test case overwrite earlier ones
+    results_by_test_case_id = {test_case_ids[r.name]: r for r in c3_test_results}
+    upsert_test_results(
+        db,
+        test_execution,
+        [
+            {
+                "test_case_id": test_case_id,
+                "status": _parse_c3_test_result_status(r.status),
+                "comment": r.comment,
+                "io_log": r.io_log,
+            }
+            for test_case_id, r in results_by_test_case_id.items()
+        ],
+    )
 
-        db.add(test_result)
-        db.flush()
-        apply_test_result_attachment_rules(db, test_result)
+    return set(results_by_test_case_id)
 
 
 def _parse_c3_test_result_status(status: C3TestResultStatus) -> TestResultStatus:
@@ -22,7 +22,6 @@ triggering route registration side-effects from search.py.
 from typing import Literal
 
 from sqlalchemy import Select, and_, exists, select, true
-from sqlalchemy.orm import aliased
 
 from test_observer.common.constants import QueryValue
 from test_observer.controllers.execution_metadata.models import ExecutionMetadata
@@ -32,6 +31,7 @@ from test_observer.data_access.models import (
     ArtefactBuild,
     ColumnElement,
     Environment,
+    LatestTestExecution,
     TestEvent,
     TestExecution,
     TestExecutionMetadata,
@@ -126,18 +126,10 @@ def build_execution_filters(
         query_filters.append(rerun_exists if filters.rerun_is_requested else ~rerun_exists)
 
     if filters.execution_is_latest is not None:
-        newer_execution = aliased(TestExecution)
-        newer_execution_exists = exists(
-            select(1)
-            .select_from(newer_execution)
-            .where(
-                TestExecution.test_plan_id == newer_execution.test_plan_id,
-                TestExecution.artefact_build_id == newer_execution.artefact_build_id,
-                TestExecution.environment_id == newer_execution.environment_id,
-                TestExecution.id < newer_execution.id,
-            )
+        is_latest = exists(
+            select(1).select_from(LatestTestExecution).where(LatestTestExecution.test_execution_id == TestExecution.id)
         )
-        query_filters.append(~newer_execution_exists if filters.execution_is_latest else newer_execution_exists)
+        query_filters.append(is_latest if filters.execution_is_latest else ~is_latest)
 
     event_names = getattr(filters, "event_names", [])
     if event_names != []:
@@ -13,13 +13,16 @@
 # SPDX-FileCopyrightText: Copyright 2024 Canonical Ltd.
 # SPDX-License-Identifier: AGPL-3.0-only
 
-from fastapi import Depends, HTTPException, Security
+from typing import Annotated
+
+from fastapi import Depends, HTTPException, Query, Security
 from sqlalchemy import select
 from sqlalchemy.orm import Session, selectinload
 
 from test_observer.common.enums import Permission
 from test_observer.common.permissions import permission_checker
 from test_observer.data_access.models import (
+    IoLog,
     IssueTestResultAttachment,
     TestExecution,
     TestResult,
@@ -36,12 +39,23 @@ from .shared_models import TestResultResponse
     response_model=list[TestResultResponse],
     dependencies=[Security(permission_checker, scopes=[Permission.view_test])],
 )
-def get_test_results(id: int, db: Session = Depends(get_db)):
+def get_test_results(
+    id: int,
+    include_io_log: Annotated[
+        bool,
+        Query(description="Include the whole io_log of every result, rather than only its preview"),
+    ] = False,
+    db: Session = Depends(get_db),
+):
     test_execution = db.get(TestExecution, id)
 
     if test_execution is None:
         raise HTTPException(status_code=404, detail="TestExecution not found")
 
+    io_log_loader = selectinload(TestResult.stored_io_log)
+    if include_io_log:
+        io_log_loader = io_log_loader.undefer(IoLog.content)
+
     test_results_from_db = (
         db.execute(
             select(TestResult)
@@ -49,6 +63,7 @@ def get_test_results(id: int, db: Session = Depends(get_db)):
             .order_by(TestResult.id)
             .options(
                 selectinload(TestResult.test_case),
+                io_log_loader,
                 selectinload(TestResult.issue_attachments).selectinload(IssueTestResultAttachment.issue),
             )
         )
@@ -62,6 +77,8 @@ def get_test_results(id: int, db: Session = Depends(get_db)):
     for test_result in test_results_from_db:
         parsed_test_result = TestResultResponse.model_validate(test_result)
         parsed_test_result.previous_results = previous_test_results.get(test_result.test_case_id, [])
+        if include_io_log:
+            parsed_test_result.io_log = test_result.io_log
         test_results.append(parsed_test_result)
 
     return test_results
@@ -0,0 +1,108 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+from fastapi import Depends, HTTPException, Security
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
+
+from test_observer.common.background_tasks import enqueue_test_result_ingests_drain
+from test_observer.common.enums import Permission
+from test_observer.common.metric_collectors import update_test_results_metrics
+from test_observer.common.permissions import permission_checker
+from test_observer.data_access.models import ArtefactBuild, TestExecution, TestResultIngest
+from test_observer.data_access.setup import get_db
+
+from .ingest_logic import create_end_test_ingest, create_test_results_ingest
+from .models import EndTestExecutionRequest, TestResultIngestResponse, TestResultRequest
+from .router import router
+
+
+@router.post(
+    "/{id}/test-results/async",
+    status_code=202,
+    response_model=TestResultIngestResponse,
+    dependencies=[Security(permission_checker, scopes=[Permission.change_test])],
+)
+def post_results_async(
+    id: int,
+    request: list[TestResultRequest],
+    db: Session = Depends(get_db),
+):
+    """
+    Like posting test results but only stages them, leaving the storing to a worker
+
+    Poll the returned ingest for completion.
+    """
+    test_execution = db.get(
+        TestExecution,
+        id,
+        options=[
+            selectinload(TestExecution.artefact_build).selectinload(ArtefactBuild.artefact),
+            selectinload(TestExecution.environment),
+            selectinload(TestExecution.test_plan),
+        ],
+    )
+
+    if test_execution is None:
+        raise HTTPException(status_code=404, detail="TestExecution not found")
+
+    ingest = create_test_results_ingest(db, test_execution, request)
+    db.commit()
+
+    enqueue_test_result_ingests_drain()
+
+    # Metrics live in the API process rather than the worker
+    update_test_results_metrics(test_execution, request)
+
+    return ingest
+
+
+@router.put(
+    "/end-test/async",
+    status_code=202,
+    response_model=TestResultIngestResponse,
+    dependencies=[Security(permission_checker, scopes=[Permission.change_test])],
+)
+def end_test_execution_async(request: EndTestExecutionRequest, db: Session = Depends(get_db)):
+    """
+    Like ending a test execution but only stages the request, leaving the storing to a worker
+
+    Poll the returned ingest for completion.
+    """
+    test_execution = db.scalar(select(TestExecution).where(TestExecution.ci_link == request.ci_link))
+
+    if test_execution is None:
+        raise HTTPException(status_code=404, detail="Related TestExecution not found")
+
+    ingest = create_end_test_ingest(db, test_execution, request)
+    db.commit()
+
+    enqueue_test_result_ingests_drain()
+
+    return ingest
+
+
+@router.get(
+    "/ingests/{ingest_id}",
+    response_model=TestResultIngestResponse,
+    dependencies=[Security(permission_checker, scopes=[Permission.view_test])],
+)
+def get_test_result_ingest(ingest_id: int, db: Session = Depends(get_db)):
+    ingest = db.get(TestResultIngest, ingest_id)
+
+    if ingest is None:
+        raise HTTPException(status_code=404, detail="Test result ingest not found")
+
+    return ingest
@@ -0,0 +1,154 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+import gzip
+import logging
+from datetime import timedelta
+
+from pydantic import TypeAdapter
+from sqlalchemy import delete, exists, func, select
+from sqlalchemy.orm import Session, aliased, undefer
+
+from test_observer.data_access.models import TestExecution, TestResultIngest
+from test_observer.data_access.models_enums import TestResultIngestKind, TestResultIngestStatus
+
+from .end_test import store_end_test
+from .models import EndTestExecutionRequest, TestResultRequest
+from .post_results import store_test_results
+
+logger = logging.getLogger(__name__)
+
+# Number of ingests stored by every transaction of the drain
+TEST_RESULT_INGEST_BATCH_SIZE = 50
+
+# Age of finished ingests from which they're deleted
+TEST_RESULT_INGEST_RETENTION = timedelta(days=7)
+
+_test_results_adapter = TypeAdapter(list[TestResultRequest])
+
+
+def create_test_results_ingest(
+    db: Session,
+    test_execution: TestExecution,
+    test_results: list[TestResultRequest],
+) -> TestResultIngest:
+    """
+    Stage test results posted to a test execution
+
+    Does NOT commit nor enqueue the drain, the caller is responsible for both.
+    """
+    ingest = TestResultIngest(
+        test_execution_id=test_execution.id,
+        kind=TestResultIngestKind.TEST_RESULTS,
+        payload=gzip.compress(_test_results_adapter.dump_json(test_results)),
+        test_results_count=len(test_results),
+    )
+    db.add(ingest)
+    return ingest
+
+
+def create_end_test_ingest(
+    db: Session,
+    test_execution: TestExecution,
+    request: EndTestExecutionRequest,
+) -> TestResultIngest:
+    """
+    Stage the end of a test execution along with its test results
+
+    Does NOT commit nor enqueue the drain, the caller is responsible for both.
+    """
+    ingest = TestResultIngest(
+        test_execution_id=test_execution.id,
+        kind=TestResultIngestKind.END_TEST,
+        # The links are validated as URLs but kept as strings, which pydantic warns about
+        payload=gzip.compress(request.model_dump_json(warnings=False).encode()),
+        test_results_count=len(request.test_results),
+    )
+    db.add(ingest)
+    return ingest
+
+
+def _store_ingest(db: Session, ingest: TestResultIngest) -> None:
+    payload = gzip.decompress(ingest.payload)
+    match ingest.kind:
+        case TestResultIngestKind.TEST_RESULTS:
+            test_execution = db.get_one(TestExecution, ingest.test_execution_id)
+            store_test_results(db, test_execution, _test_results_adapter.validate_json(payload))
+        case TestResultIngestKind.END_TEST:
+            store_end_test(db, EndTestExecutionRequest.model_validate_json(payload))
+
+
+def drain_test_result_ingests_batch(db: Session, batch_size: int = TEST_RESULT_INGEST_BATCH_SIZE) -> int:
+    """
+    Store the next batch of pending ingests and commit
+
+    Ingests are claimed with SKIP LOCKED so that concurrent workers drain
+    different ingests. An ingest waits for the earlier pending ingests of its
+    test execution, so that results are stored in submission order. Every
+    ingest is stored in a savepoint, so a failing one doesn't hold back the
+    rest of the batch.
+
+    :return: number of ingests processed
+    """
+    earlier = aliased(TestResultIngest)
+    ingests = db.scalars(
+        select(TestResultIngest)
+        .where(
+            TestResultIngest.status == TestResultIngestStatus.PENDING,
+            ~exists().where(
+                earlier.test_execution_id == TestResultIngest.test_execution_id,
+                earlier.status == TestResultIngestStatus.PENDING,
+                earlier.id < TestResultIngest.id,
+            ),
+        )
+        .order_by(TestResultIngest.id)
+        .limit(batch_size)
+        .options(undefer(TestResultIngest.payload))
+        .with_for_update(of=TestResultIngest, skip_locked=True)
+    ).all()
+
+    for ingest in ingests:
+        try:
+            with db.begin_nested():
+                _store_ingest(db, ingest)
+        except Exception as exc:
+            logger.exception("Test result ingest %s failed", ingest.id)
+            ingest.status = TestResultIngestStatus.FAILED
+            ingest.error = str(exc)
+        else:
+            ingest.status = TestResultIngestStatus.COMPLETED
+            # Keep the row to report the status until its retention but drop the staged results
+            ingest.payload = b""
+
+    db.commit()
+
+    return len(ingests)
+
+
+def delete_expired_test_result_ingests(db: Session) -> int:
+    """
+    Delete finished ingests past their retention
+
+    This function does NOT commit the transaction.
+
+    :return: number of ingests deleted
+    """
+    expired = db.execute(
+        delete(TestResultIngest).where(
+            TestResultIngest.status != TestResultIngestStatus.PENDING,
+            TestResultIngest.updated_at < func.localtimestamp() - TEST_RESULT_INGEST_RETENTION,
+        )
+    )
+    return expired.rowcount
@@ -14,34 +14,172 @@
 # SPDX-License-Identifier: AGPL-3.0-only
 
 from collections import defaultdict
+from collections.abc import Collection
 
-from sqlalchemy import delete, desc, func, or_, over, select
+from sqlalchemy import Integer, all_, any_, delete, desc, func, literal, or_, over, select
+from sqlalchemy.dialects.postgresql import ARRAY, Insert, insert
 from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import ReturningInsert
 
 from test_observer.common.constants import PREVIOUS_TEST_RESULT_COUNT
+from test_observer.controllers.issues.attachment_rules_logic import apply_test_results_attachment_rules
 from test_observer.controllers.test_executions.shared_models import PreviousTestResult
+from test_observer.data_access.bulk_load import staged_rows
+from test_observer.data_access.conflicts import rows_in_lock_order
+from test_observer.data_access.io_logs import io_log_preview, store_io_logs
 from test_observer.data_access.models import (
     Artefact,
     ArtefactBuild,
+    IssueTestResultAttachment,
     TestEvent,
     TestExecution,
     TestResult,
 )
+from test_observer.data_access.test_result_search import index_test_results
 
+# Columns of the results stored by upsert_test_results
+TEST_RESULT_COLUMNS = ["test_execution_id", "test_case_id", "status", "comment", "io_log_id", "io_log_preview"]
 
-def delete_previous_results(
+# Number of results from which they are staged with COPY before being stored,
+# below which the overhead of the staging table outweighs its speed
+TEST_RESULTS_BULK_LOAD_THRESHOLD = 1000
+
+
+def _upsert_test_results_statement(stmt: Insert) -> ReturningInsert[tuple[int]]:
+    return stmt.on_conflict_do_update(
+        index_elements=[TestResult.test_execution_id, TestResult.test_case_id],
+        set_={
+            "status": stmt.excluded.status,
+            "comment": stmt.excluded.comment,
+            "io_log_id": stmt.excluded.io_log_id,
+            "io_log_preview": stmt.excluded.io_log_preview,
+            "updated_at": func.now(),
+        },
+        where=or_(
+            TestResult.status != stmt.excluded.status,
+            TestResult.comment != stmt.excluded.comment,
+            TestResult.io_log_id.is_distinct_from(stmt.excluded.io_log_id),
+        ),
+    ).returning(TestResult.id)
+
+
+def upsert_test_results(
+    db: Session,
+    test_execution: TestExecution,
+    test_results: list[dict],
+) -> None:
+    """
+    Store results of a test execution, updating those already stored for their test case
+
+    Results whose status, comment and io_log didn't change are left untouched
+    along with their attachments. Changed results keep their id but lose the
+    attachments made by attachment rules, which are then applied again to all
+    new and changed results. Concurrent calls for the same test execution are
+    safe without locking it. Large numbers of results are streamed to the
+    database with COPY.
+    This function does NOT commit the transaction.
+
+    :test_results: dicts with test_case_id, status, comment and io_log, at
+        most one per test case
+    """
+    if not test_results:
+        return
+
+    io_log_ids = store_io_logs(db, (test_result["io_log"] for test_result in test_results))
+    rows = [
+        {
+            "test_execution_id": test_execution.id,
+            "test_case_id": test_result["test_case_id"],
+            "status": test_result["status"],
+            "comment": test_result["comment"],
+            "io_log_id": io_log_ids.get(test_result["io_log"]),
+            "io_log_preview": io_log_preview(test_result["io_log"]),
+        }
+        for test_result in test_results
+    ]
+    if len(rows) < TEST_RESULTS_BULK_LOAD_THRESHOLD:
+        written_ids = db.scalars(
+            _upsert_test_results_statement(insert(TestResult)),
+            rows_in_lock_order({row["test_case_id"]: row for row in rows}),
+        ).all()
+    else:
+        with staged_rows(db, TestResult, TEST_RESULT_COLUMNS, rows) as staging:
+            # Selected in the lock order of the rows inserted directly
+            written_ids = db.scalars(
+                _upsert_test_results_statement(
+                    insert(TestResult).from_select(
+                        TEST_RESULT_COLUMNS,
+                        select(staging).order_by(staging.c.test_case_id),
+                    )
+                )
+            ).all()
+    db.expire(test_execution, ["test_results"])
+
+    if written_ids:
+        db.execute(
+            delete(IssueTestResultAttachment).where(
+                IssueTestResultAttachment.test_result_id == any_(literal(written_ids, ARRAY(Integer))),
+                IssueTestResultAttachment.attachment_rule_id.is_not(None),
+            )
+        )
+        apply_test_results_attachment_rules(db, written_ids)
+        index_test_results(db, TestResult.id == any_(literal(written_ids, ARRAY(Integer))))
+
+
+def delete_test_results_except(
     db: Session,
     test_execution: TestExecution,
-):
-    db.execute(delete(TestResult).where(TestResult.test_execution_id == test_execution.id))
+    test_case_ids: Collection[int],
+) -> None:
+    """Delete the results of a test execution for any test case but the given ones"""
+    db.execute(
+        delete(TestResult).where(
+            TestResult.test_execution_id == test_execution.id,
+            TestResult.test_case_id != all_(literal(list(test_case_ids), ARRAY(Integer))),
+        )
+    )
     db.expire(test_execution, ["test_results"])
 
 
-def delete_previous_test_events(
+def upsert_test_events(
+    db: Session,
+    test_execution: TestExecution,
+    test_events: list[dict],
+) -> None:
+    """
+    Store events of a test execution, updating the detail of those already stored
+
+    Events are identified by their timestamp and event_name, with the last of
+    repeated events winning. Events whose detail didn't change aren't written.
+    This function does NOT commit the transaction.
+
+    :test_events: dicts with event_name, timestamp and detail
+    """
+    rows_by_key = {
+        (test_event["timestamp"], test_event["event_name"]): {"test_execution_id": test_execution.id, **test_event}
+        for test_event in test_events
+    }
+    if not rows_by_key:
+        return
+
+    stmt = insert(TestEvent)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[TestEvent.test_execution_id, TestEvent.timestamp, TestEvent.event_name],
+            set_={"detail": stmt.excluded.detail, "updated_at": func.now()},
+            where=TestEvent.detail != stmt.excluded.detail,
+        ),
+        rows_in_lock_order(rows_by_key),
+    )
+    db.expire(test_execution, ["test_events"])
+
+
+def delete_test_events(
     db: Session,
     test_execution: TestExecution,
-):
-    db.execute(delete(TestEvent).where(TestEvent.test_execution_id == test_execution.id))
+    test_event_ids: Collection[int],
+) -> None:
+    db.execute(delete(TestEvent).where(TestEvent.id == any_(literal(list(test_event_ids), ARRAY(Integer)))))
     db.expire(test_execution, ["test_events"])
 
 
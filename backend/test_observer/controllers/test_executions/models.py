@@ -47,11 +47,13 @@ from test_observer.data_access.models_enums import (
     SnapStage,
     SolutionStage,
     TestExecutionStatus,
+    TestResultIngestKind,
+    TestResultIngestStatus,
     TestResultStatus,
 )
 
 
-class _StartTestExecutionRequest(BaseModel):
+class _ArtefactToTest(BaseModel):
     name: str = Field(
         description="User-defined name identifying the artefact under test. "
         "Not unique - multiple versions/stages of the same artefact share this name. "
@@ -66,6 +68,25 @@ class _StartTestExecutionRequest(BaseModel):
         description="CPU architecture where tests will execute. "
         "Common values: 'amd64', 'arm64', 'armhf', 's390x', 'ppc64el'"
     )
+    needs_assignment: bool = Field(
+        default=False,
+        description="Whether the artefact created from this test "
+        "execution requires assignment of a reviewer. Set to true if "
+        "test results need human review before the artefact can be "
+        "promoted. Default false means no review assignment needed.",
+    )
+
+    @field_validator("version")
+    @classmethod
+    def validate_version(cls: type["_ArtefactToTest"], version: str) -> str:
+        if version in ("", "null"):
+            raise ValueError(f"Invalid version value '{version}'")
+        return version
+
+
+class TestExecutionToStart(BaseModel):
+    __test__ = False
+
     environment: str = Field(
         description="Name of the test execution environment. "
         "This can identify the specific physical device, VM, or "
@@ -99,23 +120,9 @@ class _StartTestExecutionRequest(BaseModel):
         "execution (e.g., bug reports, documentation, related PRs). Can "
         "be omitted or left empty.",
     )
-    needs_assignment: bool = Field(
-        default=False,
-        description="Whether the artefact created from this test "
-        "execution requires assignment of a reviewer. Set to true if "
-        "test results need human review before the artefact can be "
-        "promoted. Default false means no review assignment needed.",
-    )
-
-    @field_validator("version")
-    @classmethod
-    def validate_version(cls: type["_StartTestExecutionRequest"], version: str) -> str:
-        if version in ("", "null"):
-            raise ValueError(f"Invalid version value '{version}'")
-        return version
 
 
-class StartSnapTestExecutionRequest(_StartTestExecutionRequest):
+class SnapArtefactToTest(_ArtefactToTest):
     family: Literal[FamilyName.snap]
     revision: int = Field(
         description="Snap package revision number from the store. "
@@ -151,7 +158,7 @@ class StartSnapTestExecutionRequest(_StartTestExecutionRequest):
     )
 
 
-class StartDebTestExecutionRequest(_StartTestExecutionRequest):
+class DebArtefactToTest(_ArtefactToTest):
     family: Literal[FamilyName.deb]
     series: str = Field(
         description="Ubuntu release series being tested. Examples: "
@@ -190,7 +197,7 @@ class StartDebTestExecutionRequest(_StartTestExecutionRequest):
         return self
 
 
-class StartCharmTestExecutionRequest(_StartTestExecutionRequest):
+class CharmArtefactToTest(_ArtefactToTest):
     family: Literal[FamilyName.charm]
     revision: int = Field(
         description="Charm revision number from Charmhub. "
@@ -217,7 +224,7 @@ class StartCharmTestExecutionRequest(_StartTestExecutionRequest):
     )
 
 
-class StartImageTestExecutionRequest(_StartTestExecutionRequest):
+class ImageArtefactToTest(_ArtefactToTest):
     family: Literal[FamilyName.image] = FamilyName.image
 
     # Fields that must be present to register a brand new image. An existing image is
@@ -283,7 +290,7 @@ class StartImageTestExecutionRequest(_StartTestExecutionRequest):
     )
 
 
-class StartSolutionTestExecutionRequest(_StartTestExecutionRequest):
+class SolutionArtefactToTest(_ArtefactToTest):
     family: Literal[FamilyName.solution]
     track: str = Field(
         description="Solution release track being tested. "
@@ -305,6 +312,52 @@ class StartSolutionTestExecutionRequest(_StartTestExecutionRequest):
     )
 
 
+class StartSnapTestExecutionRequest(TestExecutionToStart, SnapArtefactToTest):
+    pass
+
+
+class StartDebTestExecutionRequest(TestExecutionToStart, DebArtefactToTest):
+    pass
+
+
+class StartCharmTestExecutionRequest(TestExecutionToStart, CharmArtefactToTest):
+    pass
+
+
+class StartImageTestExecutionRequest(TestExecutionToStart, ImageArtefactToTest):
+    pass
+
+
+class StartSolutionTestExecutionRequest(TestExecutionToStart, SolutionArtefactToTest):
+    pass
+
+
+ArtefactToTest = Annotated[
+    SnapArtefactToTest | DebArtefactToTest | CharmArtefactToTest | ImageArtefactToTest | SolutionArtefactToTest,
+    Field(discriminator="family"),
+]
+
+
+class StartTestExecutionsBatchRequest(BaseModel):
+    artefact: ArtefactToTest = Field(
+        description="The artefact under test, described as in a single start-test request. "
+        "It is shared by every test execution of the batch."
+    )
+    executions: list[TestExecutionToStart] = Field(
+        min_length=1,
+        max_length=1000,
+        description="The test executions to start on the artefact, one per environment and test plan. "
+        "The ids of the test executions are returned in the same order.",
+    )
+
+    @model_validator(mode="after")
+    def unique_ci_links(self) -> Self:
+        ci_links = [execution.ci_link for execution in self.executions if execution.ci_link is not None]
+        if len(ci_links) != len(set(ci_links)):
+            raise ValueError("Received several executions with the same ci_link")
+        return self
+
+
 class C3TestResultStatus(StrEnum):
     PASS = "pass"
     FAIL = "fail"
@@ -329,13 +382,31 @@ class TestResultRequest(BaseModel):
     io_log: str = ""
 
 
-class EndTestExecutionRequest(BaseModel):
+class EndTestExecutionHeader(BaseModel):
     ci_link: Annotated[str, HttpUrl]
     c3_link: Annotated[str, HttpUrl] | None = None
     checkbox_version: str | None = None
+
+
+class EndTestExecutionRequest(EndTestExecutionHeader):
     test_results: list[C3TestResult]
 
 
+class TestResultIngestResponse(BaseModel):
+    __test__ = False
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    test_execution_id: int
+    kind: TestResultIngestKind
+    status: TestResultIngestStatus
+    test_results_count: int
+    error: str | None
+    created_at: datetime
+    updated_at: datetime
+
+
 class TestExecutionsPatchRequest(BaseModel):
     __test__ = False
 
@@ -394,7 +465,11 @@ class TestExecutionResponseWithContext(TestExecutionResponse):
 
 
 class TestExecutionSearchResponse(BaseModel):
-    count: int
+    count: int | None = Field(description="Number of matching items, as requested by count_mode")
     limit: int
     offset: int
+    next_cursor: str | None = Field(
+        default=None,
+        description="Cursor to pass to get the next page, null on the last page",
+    )
     test_executions: list[TestExecutionResponseWithContext]
@@ -13,87 +13,125 @@
 # SPDX-FileCopyrightText: Copyright 2024 Canonical Ltd.
 # SPDX-License-Identifier: AGPL-3.0-only
 
-from fastapi import Depends, HTTPException, Security
-from sqlalchemy import delete
+from collections import Counter
+
+from fastapi import Depends, HTTPException, Request, Security
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session, selectinload
 
 from test_observer.common.enums import Permission
 from test_observer.common.metric_collectors import (
-    update_test_results_metric,
+    update_test_results_count_metrics,
+    update_test_results_metrics,
 )
+from test_observer.common.ndjson import NDJSONReader, ndjson_request_body, require_ndjson
 from test_observer.common.permissions import permission_checker
-from test_observer.controllers.issues.attachment_rules_logic import (
-    apply_test_result_attachment_rules,
-)
 from test_observer.controllers.test_executions.models import TestResultRequest
 from test_observer.data_access.models import (
     ArtefactBuild,
-    TestCase,
     TestExecution,
-    TestResult,
 )
-from test_observer.data_access.repository import get_or_create
+from test_observer.data_access.models_enums import TestResultStatus
+from test_observer.data_access.repository import get_or_create_test_cases
 from test_observer.data_access.setup import get_db
 
+from .logic import upsert_test_results
 from .router import router
 
 
-@router.post(
-    "/{id}/test-results",
-    dependencies=[Security(permission_checker, scopes=[Permission.change_test])],
-)
-def post_results(
-    id: int,
-    request: list[TestResultRequest],
-    db: Session = Depends(get_db),
-):
-    # Serialise concurrent requests for the same execution. Without this lock,
-    # a retry can miss uncommitted inserts from the first request (READ COMMITTED)
-    # and produce duplicate rows.
+def _lock_test_execution(db: Session, id: int) -> TestExecution:
+    # Ending a test execution replaces all its results under a FOR UPDATE lock.
+    # FOR SHARE waits for it, so that results posted meanwhile aren't deleted,
+    # while concurrent posts, which upsert per test case, don't wait for each other.
     test_execution = db.get(
         TestExecution,
         id,
         options=[
             selectinload(TestExecution.artefact_build).selectinload(ArtefactBuild.artefact),
             selectinload(TestExecution.environment),
+            selectinload(TestExecution.test_plan),
             selectinload(TestExecution.execution_metadata),
         ],
-        with_for_update=True,
+        with_for_update={"read": True},
     )
 
     if test_execution is None:
         raise HTTPException(status_code=404, detail="TestExecution not found")
 
+    return test_execution
+
+
+def store_test_results(db: Session, test_execution: TestExecution, request: list[TestResultRequest]) -> None:
+    """
+    Store the results of the given test cases in a test execution
+
+    This function does NOT commit the transaction nor update the metrics, so
+    it can be called for consecutive chunks of a submission that is committed
+    as a whole.
+    """
+    # Later results for the same test case overwrite earlier ones
+    results_by_name: dict[str, TestResultRequest] = {}
     for result in request:
-        test_case = get_or_create(
-            db,
-            TestCase,
-            filter_kwargs={"name": result.name},
-            creation_kwargs={
-                "category": result.category,
-                "template_id": result.template_id,
-            },
-        )
-
-        db.execute(
-            delete(TestResult).where(
-                TestResult.test_execution_id == test_execution.id,
-                TestResult.test_case_id == test_case.id,
-            )
-        )
-
-        test_result = TestResult(
-            test_execution=test_execution,
-            test_case=test_case,
-            status=result.status,
-            comment=result.comment,
-            io_log=result.io_log,
-        )
-
-        db.add(test_result)
-        db.flush()
-        apply_test_result_attachment_rules(db, test_result)
-
-        update_test_results_metric(test_execution, test_case, result)
+        results_by_name.pop(result.name, None)
+        results_by_name[result.name] = result
+    results = list(results_by_name.values())
+
+    test_case_ids = get_or_create_test_cases(db, (result.model_dump() for result in results))
+
+    upsert_test_results(
+        db,
+        test_execution,
+        [
+            {
+                "test_case_id": test_case_ids[result.name],
+                "status": result.status,
+                "comment": result.comment,
+                "io_log": result.io_log,
+            }
+            for result in results
+        ],
+    )
 
+
+@router.post(
+    "/{id}/test-results",
+    dependencies=[Security(permission_checker, scopes=[Permission.change_test])],
+)
+def post_results(
+    id: int,
+    request: list[TestResultRequest],
+    db: Session = Depends(get_db),
+):
+    test_execution = _lock_test_execution(db, id)
+    store_test_results(db, test_execution, request)
     db.commit()
+    update_test_results_metrics(test_execution, request)
+
+
+@router.post(
+    "/{id}/test-results/stream",
+    dependencies=[
+        Security(permission_checker, scopes=[Permission.change_test]),
+        Depends(require_ndjson),
+    ],
+    openapi_extra=ndjson_request_body(TestResultRequest),
+)
+async def post_results_stream(id: int, request: Request, db: Session = Depends(get_db)):
+    """
+    Like posting test results but with an NDJSON body holding one result per line
+
+    Results are validated and written in bounded chunks as the body is
+    received, so that arbitrarily large submissions don't have to be held in
+    memory. They are committed together once the whole body has been stored,
+    so an end-test of the same execution waits for the upload to finish.
+    """
+    test_execution = await run_in_threadpool(_lock_test_execution, db, id)
+
+    # Counted rather than kept, so that memory stays bounded by the chunk size
+    submitted: Counter[tuple[str, TestResultStatus]] = Counter()
+    async for chunk in NDJSONReader(request).read_chunks(TestResultRequest):
+        await run_in_threadpool(store_test_results, db, test_execution, chunk)
+        submitted.update((result.name, result.status) for result in chunk)
+
+    await run_in_threadpool(db.commit)
+    await run_in_threadpool(update_test_results_count_metrics, test_execution, submitted)
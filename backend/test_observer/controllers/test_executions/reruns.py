@@ -47,7 +47,7 @@ from test_observer.data_access.models import (
     FamilyName,
     TestExecution,
     TestExecutionRerunRequest,
-    TestResult,
+    TestResultSearchEntry,
     User,
 )
 from test_observer.data_access.repository import get_or_create
@@ -84,7 +84,7 @@ def _build_rerun_conditions(request: RerunRequest | DeleteReruns) -> list:
                 status_code=422,
                 detail="At least one filter must be provided in test_results_filters",
             )
-        filtered_ids_query = filter_test_results(select(TestResult.test_execution_id).distinct(), filters)
+        filtered_ids_query = filter_test_results(select(TestResultSearchEntry.test_execution_id).distinct(), filters)
         conditions.append(TestExecution.id.in_(filtered_ids_query))
 
     if request.test_executions_filters is not None:
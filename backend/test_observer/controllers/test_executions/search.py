@@ -19,10 +19,11 @@ from datetime import datetime
 from typing import Annotated, Literal, TypeVar
 
 from fastapi import Depends, HTTPException, Query, Security
-from sqlalchemy import and_, desc, exists, func, select
+from sqlalchemy import and_, desc, exists, select
 from sqlalchemy.orm import Session, selectinload
 
-from test_observer.common.constants import QueryValue
+from test_observer.common.constants import CountMode, CountModeQuery, QueryValue
+from test_observer.common.cursors import after_cursor, next_cursor
 from test_observer.common.enums import Permission
 from test_observer.common.permissions import permission_checker
 from test_observer.controllers.execution_metadata.models import ExecutionMetadata
@@ -34,6 +35,7 @@ from test_observer.controllers.test_executions.shared_models import (
     TestExecutionSearchFilters,
     TestResultResponse,
 )
+from test_observer.data_access.counts import count_rows
 from test_observer.data_access.models import (
     ArtefactBuild,
     TestExecution,
@@ -52,6 +54,7 @@ T = TypeVar("T")
 # selectinload options used when querying from TestResult root (test_result=any/{ids})
 _TEST_RESULT_QUERY_OPTIONS = [
     selectinload(TestResult.test_case),
+    selectinload(TestResult.stored_io_log),
     selectinload(TestResult.test_execution).selectinload(TestExecution.environment),
     selectinload(TestResult.test_execution)
     .selectinload(TestExecution.artefact_build)
@@ -143,7 +146,8 @@ def _search_executions(
     filters: TestExecutionSearchFilters,
     parsed_test_result: list[int] | QueryValue,
     db: Session,
-) -> tuple[list[TestExecution], dict[int, list[TestResult]], int]:
+    count_mode: CountMode = CountMode.EXACT,
+) -> tuple[list[TestExecution], dict[int, list[TestResult]], int | None]:
     """Query test executions with a single path for any/none/specific result modes."""
     query_filters, joins_needed = build_execution_filters(filters)
 
@@ -176,20 +180,19 @@ def _search_executions(
     if query_filters:
         ids_query = ids_query.where(and_(*query_filters))
 
+    count_query = apply_te_joins(select(TestExecution.id), joins_needed).where(and_(*query_filters))
+
+    if filters.cursor is not None:
+        ids_query = ids_query.where(after_cursor(TestExecution.created_at, TestExecution.id, filters.cursor))
     ids_query = ids_query.order_by(desc(TestExecution.created_at), desc(TestExecution.id))
     if filters.offset is not None:
         ids_query = ids_query.offset(filters.offset)
     if filters.limit is not None:
         ids_query = ids_query.limit(filters.limit)
 
-    count_query = select(func.count()).select_from(
-        apply_te_joins(select(TestExecution.id), joins_needed).where(and_(*query_filters)).subquery()
-    )
-
     execution_ids = [row[0] for row in db.execute(ids_query).all()]
     if not execution_ids:
-        total = db.execute(count_query).scalar() or 0
-        return [], {}, total
+        return [], {}, count_rows(db, count_query, count_mode)
 
     data_query = select(TestExecution).options(*TEST_EXECUTION_OPTIONS)
     data_query = data_query.where(TestExecution.id.in_(execution_ids))
@@ -208,8 +211,7 @@ def _search_executions(
     execution_by_id = {execution.id: execution for execution in rows}
     ordered_rows = [execution_by_id[execution_id] for execution_id in execution_ids if execution_id in execution_by_id]
 
-    total = db.execute(count_query).scalar() or 0
-    return ordered_rows, grouped_results, total
+    return ordered_rows, grouped_results, count_rows(db, count_query, count_mode)
 
 
 @router.get(
@@ -299,6 +301,16 @@ def search_test_executions(
     ] = None,
     limit: Annotated[int, Query(ge=0, le=1000, description="Maximum number of results to return")] = 50,
     offset: Annotated[int, Query(ge=0, description="Number of results to skip for pagination")] = 0,
+    cursor: Annotated[
+        str | None,
+        Query(
+            description=(
+                "The next_cursor of the previous page, to continue right after its last item. "
+                "Unlike offset, it keeps deep pages as fast as the first one"
+            )
+        ),
+    ] = None,
+    count_mode: CountModeQuery = CountMode.EXACT,
     db: Session = Depends(get_db),
 ) -> TestExecutionSearchResponse:
     """Search test executions with optional test result context.
@@ -331,9 +343,10 @@ def search_test_executions(
         until_date=until_date,
         limit=limit,
         offset=offset,
+        cursor=cursor,
     )
 
-    test_executions, grouped_results, total = _search_executions(filters, parsed_test_result, db)
+    test_executions, grouped_results, total = _search_executions(filters, parsed_test_result, db, count_mode)
     items = []
     for test_execution in test_executions:
         filtered_results = grouped_results.get(test_execution.id, [])
@@ -346,5 +359,6 @@ def search_test_executions(
         count=total,
         limit=limit,
         offset=offset,
+        next_cursor=next_cursor(test_executions, limit),
         test_executions=items,
     )
@@ -46,7 +46,17 @@ class TestResultResponse(BaseModel):
     template_id: str = Field(validation_alias=AliasPath("test_case", "template_id"))
     status: TestResultStatus
     comment: str
-    io_log: str
+    io_log_preview: str
+    io_log_size: int = Field(description="Size of the whole io_log in bytes")
+    # Not read from the test result, as loading every io_log is expensive
+    io_log: str | None = Field(
+        default=None,
+        validation_alias="included_io_log",
+        description=(
+            "The whole io_log, only included when requested. "
+            "Otherwise get it from /v1/test-results/{id}/io-log, where it can be fetched in ranges."
+        ),
+    )
     previous_results: list[PreviousTestResult] = Field(
         default=[],
         description=(
@@ -102,6 +112,7 @@ class TestExecutionSearchFilters(TestExecutionFilterBase):
     event_names: list[str] | Literal[QueryValue.ANY, QueryValue.NONE] = Field(default_factory=list)
     limit: int = 50
     offset: int = 0
+    cursor: str | None = None
 
 
 class TestExecutionRerunFilters(TestExecutionFilterBase):
@@ -16,9 +16,11 @@
 import logging
 import random
 from datetime import date, timedelta
+from typing import Any
 
 from fastapi import Body, Depends, HTTPException, Security
-from sqlalchemy import select
+from sqlalchemy import CTE, Column, ColumnElement, Row, Select, delete, func, insert, literal, select, true
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from test_observer.common.enums import Permission
@@ -28,29 +30,34 @@ from test_observer.common.review_notification import (
     batch_create_jira_reviewer_cards,
     batch_create_review_notifications,
 )
+from test_observer.data_access.latest_test_executions import record_latest_test_executions
 from test_observer.data_access.models import (
     Artefact,
     ArtefactBuild,
     ArtefactBuildEnvironmentReview,
     ArtefactMatchingRule,
+    Base,
     Environment,
     Team,
     TestExecution,
+    TestExecutionRelevantLink,
+    TestExecutionRerunRequest,
     TestPlan,
     User,
     calculate_bundled_builds_hash,
 )
 from test_observer.data_access.models_enums import NotificationType
 from test_observer.data_access.queries import match_artefact_considering_specificity
-from test_observer.data_access.repository import (
-    create_test_execution_relevant_link,
-    get_or_create,
-)
 from test_observer.data_access.setup import get_db
 from test_observer.external_apis.jira import get_jira_client
 from test_observer.external_apis.jira.jira_client import JiraClient
 
 from .models import (
+    CharmArtefactToTest,
+    DebArtefactToTest,
+    ImageArtefactToTest,
+    SnapArtefactToTest,
+    SolutionArtefactToTest,
     StartCharmTestExecutionRequest,
     StartDebTestExecutionRequest,
     StartImageTestExecutionRequest,
@@ -80,34 +87,100 @@ def _ceil_division(numerator: int, denominator: int) -> int:
     return (numerator + denominator - 1) // denominator
 
 
-class StartTestExecutionController:
+# A request loses a race when a concurrent one inserts the same row first, in
+# which case the next attempt finds that row. Failing every attempt means the
+# request conflicts with existing data in some other way.
+_CHAIN_ATTEMPTS = 3
+
+
+def _select_from_ctes(stmt: Select, ctes: list[CTE]) -> Select:
+    # The CTEs of the chain have a single row, so cross joining them is intended
+    if len(ctes) < 2:
+        return stmt
+    joined = ctes[0].join(ctes[1], true())
+    for cte in ctes[2:]:
+        joined = joined.join(cte, true())
+    return stmt.select_from(joined)
+
+
+def _select_row_to_insert(model: type[Base], fields: dict[str, Any]) -> tuple[list[str], Select]:
+    """
+    Select a single row to insert from fields holding either plain values or
+    columns of previous CTEs
+
+    Columns left out are set to their Python-side defaults, as the ORM would,
+    since INSERT ... SELECT only gets the server-side ones.
+    """
+    values = dict(fields)
+    for column in model.__table__.c:
+        default = column.default
+        if column.name not in values and default is not None and (default.is_scalar or default.is_clause_element):
+            values[column.name] = default.arg  # type: ignore[attr-defined]
+
+    ctes = [value.table for value in values.values() if isinstance(value, Column) and isinstance(value.table, CTE)]
+    row = select(
+        *(
+            (value if isinstance(value, ColumnElement) else literal(value, model.__table__.c[name].type)).label(name)
+            for name, value in values.items()
+        )
+    )
+    return list(values), _select_from_ctes(row, list(dict.fromkeys(ctes)))
+
+
+def _get_or_insert_cte(
+    name: str,
+    model: type[Base],
+    filter_kwargs: dict[str, Any],
+    creation_kwargs: dict[str, Any] | None = None,
+    returning: list[str] | None = None,
+) -> CTE:
+    """
+    CTE equivalent of get_or_create, producing the id of the row matching filter_kwargs
+
+    Values can be columns of previous CTEs. Like get_or_create, inserting a row
+    a concurrent transaction has just inserted too raises an IntegrityError.
+    """
+    table = model.__table__
+    columns = [table.c["id"], *(table.c[column] for column in returning or [])]
+
+    existing = select(*columns).where(
+        *(
+            table.c[column].is_(None) if value is None else table.c[column] == value
+            for column, value in filter_kwargs.items()
+        )
+    )
+    names, row = _select_row_to_insert(model, {**filter_kwargs, **(creation_kwargs or {})})
+    inserted = (
+        insert(model).from_select(names, row.where(~existing.exists())).returning(*columns).cte(f"{name}_inserted")
+    )
+    return select(*inserted.c).union_all(existing).cte(name)
+
+
+class TestExecutionsStarter:
+    """Starts test executions of the artefact described by a request"""
+
+    __test__ = False
+
+    artefact_id: int
+    artefact: Artefact
+
     def __init__(
         self,
         request: (
-            StartSnapTestExecutionRequest
-            | StartDebTestExecutionRequest
-            | StartCharmTestExecutionRequest
-            | StartImageTestExecutionRequest
-            | StartSolutionTestExecutionRequest
-        ) = Body(discriminator="family"),
-        db: Session = Depends(get_db),
+            SnapArtefactToTest | DebArtefactToTest | CharmArtefactToTest | ImageArtefactToTest | SolutionArtefactToTest
+        ),
+        db: Session,
     ):
         self.request = request
         self.db = db
 
-    def execute(self):
-        self.create_artefact()
-        # arch must be resolved after the artefact exists: for an existing image the
+    def resolve_artefact(self) -> None:
+        self.load_existing_image()
+        # arch must be resolved after looking up the image: for an existing image the
         # request may omit arch, in which case it is derived from the image's build.
         self.resolved_arch = self._resolve_arch()
-        self.create_environment()
-        self.create_artefact_build()
-        self.create_artefact_build_environment()
-        self.create_test_plan()
-        self.create_test_execution()
-        self.create_relevant_links()
-        self.delete_rerun_request()
 
+    def commit(self) -> None:
         new_reviewers = self.assign_reviewer()
 
         self.db.commit()
@@ -116,8 +189,6 @@ class StartTestExecutionController:
         if new_reviewers is not None:
             batch_create_jira_reviewer_cards(new_reviewers)
 
-        return {"id": self.test_execution.id}
-
     def _assign_reviewers_to_environments(self) -> list[User]:
         """Assigns reviewers to environment reviews
 
@@ -166,6 +237,10 @@ class StartTestExecutionController:
         if self.request.needs_assignment is False:
             return None
 
+        # Rows were written through Core, so relationships loaded before are stale
+        self.db.expire_all()
+        self.artefact = self.db.get_one(Artefact, self.artefact_id)
+
         newly_assigned_reviewers: list[User] = []
         rule_ids = self.db.execute(match_artefact_considering_specificity(self.artefact)).scalars().all()
         if len(rule_ids) > 0:
@@ -214,131 +289,62 @@ class StartTestExecutionController:
 
         return None
 
-    def create_test_plan(self):
-        self.test_plan = get_or_create(
-            self.db,
-            TestPlan,
-            filter_kwargs={
-                "name": self.request.test_plan,
-            },
+    def load_existing_image(self) -> None:
+        # An image is identified by its sha256 alone, so an existing image can be
+        # tested by submitting only its sha256; the rest is needed only to create it.
+        self.existing_image: Artefact | None = None
+        if not isinstance(self.request, ImageArtefactToTest):
+            return
+
+        existing_image = (
+            self.db.query(Artefact).filter_by(family=self.request.family, sha256=self.request.sha256).one_or_none()
         )
 
-    def create_test_execution(self):
-        # If ci_link is None, we cannot uniquely identify the test execution,
-        # so always create a new one instead of using get_or_create
-        if self.request.ci_link is None:
-            self.test_execution = TestExecution(
-                status=self.request.initial_status,
-                environment_id=self.environment.id,
-                artefact_build_id=self.artefact_build.id,
-                test_plan_id=self.test_plan.id,
-                ci_link=None,
+        if existing_image is None and any(
+            getattr(self.request, field) is None for field in self.request.REQUIRED_CREATION_FIELDS
+        ):
+            raise HTTPException(
+                status_code=422,
+                detail="No image with this sha256 exists yet; provide the full image details to create it.",
             )
-            self.db.add(self.test_execution)
-            self.db.flush()
-        else:
-            self.test_execution = get_or_create(
-                self.db,
-                TestExecution,
-                filter_kwargs={
-                    "ci_link": self.request.ci_link,
-                },
-                creation_kwargs={
-                    "status": self.request.initial_status,
-                    "environment_id": self.environment.id,
-                    "artefact_build_id": self.artefact_build.id,
-                    "test_plan_id": self.test_plan.id,
-                },
+        # An image is single-architecture: a provided arch must match the existing build.
+        if (
+            existing_image is not None
+            and self.request.arch is not None
+            and self.request.arch not in existing_image.architectures
+        ):
+            raise HTTPException(
+                status_code=422,
+                detail="'arch' must match the existing image build architecture.",
             )
+        self.existing_image = existing_image
 
-    def create_relevant_links(self):
-        if self.request.relevant_links:
-            for link in self.request.relevant_links:
-                create_test_execution_relevant_link(
-                    self.db,
-                    self.test_execution.id,
-                    link.label,
-                    link.url,
-                )
-
-    def create_artefact_build_environment(self):
-        get_or_create(
-            self.db,
-            ArtefactBuildEnvironmentReview,
-            filter_kwargs={
-                "environment_id": self.environment.id,
-                "artefact_build_id": self.artefact_build.id,
-            },
-        )
-
-    def create_artefact_build(self):
-        self.artefact_build = get_or_create(
-            self.db,
-            ArtefactBuild,
-            filter_kwargs={
-                "architecture": self.resolved_arch,
-                "revision": getattr(self.request, "revision", None),
-                "artefact_id": self.artefact.id,
-            },
-        )
-
-    def create_environment(self):
-        self.environment = get_or_create(
-            self.db,
-            Environment,
-            filter_kwargs={
-                "name": self.request.environment,
-                "architecture": self.resolved_arch,
-            },
-        )
-
-    def create_artefact(self) -> None:
+    def _artefact_fields(self) -> tuple[dict[str, Any], dict[str, Any]]:
+        """Returns the fields identifying the artefact and the extra fields needed to create it"""
         # The lookup filter must hold exactly the artefact's family-specific unique key;
-        # any other fields go in creation_kwargs so a differing value can't miss the
+        # any other fields are only used on creation so a differing value can't miss the
         # existing row and then trip the unique constraint on insert.
-        filter_kwargs = {
+        filter_kwargs: dict[str, Any] = {
             "name": self.request.name,
             "version": self.request.version,
             "family": self.request.family,
         }
-        creation_kwargs: dict = {"stage": self.request.execution_stage}
+        creation_kwargs: dict[str, Any] = {"stage": self.request.execution_stage}
 
         match self.request:
-            case StartSnapTestExecutionRequest():
+            case SnapArtefactToTest():
                 filter_kwargs["store"] = self.request.store
                 filter_kwargs["track"] = self.request.track
                 filter_kwargs["branch"] = self.request.branch
-            case StartCharmTestExecutionRequest():
+            case CharmArtefactToTest():
                 filter_kwargs["track"] = self.request.track
                 filter_kwargs["branch"] = self.request.branch
-            case StartDebTestExecutionRequest():
+            case DebArtefactToTest():
                 filter_kwargs["series"] = self.request.series
                 filter_kwargs["repo"] = self.request.repo
                 filter_kwargs["source"] = self.request.source
-
-            # An image is identified by its sha256 alone, so an existing image can be
-            # tested by submitting only its sha256; the rest is needed only to create it.
-            case StartImageTestExecutionRequest():
+            case ImageArtefactToTest():
                 filter_kwargs = {"family": self.request.family, "sha256": self.request.sha256}
-                existing_image = self.db.query(Artefact).filter_by(**filter_kwargs).one_or_none()
-
-                if existing_image is None and any(
-                    getattr(self.request, field) is None for field in self.request.REQUIRED_CREATION_FIELDS
-                ):
-                    raise HTTPException(
-                        status_code=422,
-                        detail="No image with this sha256 exists yet; provide the full image details to create it.",
-                    )
-                # An image is single-architecture: a provided arch must match the existing build.
-                if (
-                    existing_image is not None
-                    and self.request.arch is not None
-                    and self.request.arch not in existing_image.architectures
-                ):
-                    raise HTTPException(
-                        status_code=422,
-                        detail="'arch' must match the existing image build architecture.",
-                    )
                 creation_kwargs |= {
                     "name": self.request.name,
                     "version": self.request.version,
@@ -351,21 +357,64 @@ class StartTestExecutionController:
             # In other families, a single artefact will progress through stages,
             # i.e. move from edge to stable. Solutions are different. Different stages are treated
             # as different artefacts for solutions.
-            case StartSolutionTestExecutionRequest():
+            case SolutionArtefactToTest():
                 filter_kwargs["track"] = self.request.track
                 filter_kwargs["source"] = self.request.source
                 filter_kwargs["stage"] = self.request.execution_stage
                 filter_kwargs["bundled_builds_hash"] = calculate_bundled_builds_hash([])
                 creation_kwargs = {}
 
-        self.artefact = get_or_create(self.db, Artefact, filter_kwargs=filter_kwargs, creation_kwargs=creation_kwargs)
+        return filter_kwargs, creation_kwargs
+
+    def artefact_build_ctes(self) -> tuple[CTE, CTE]:
+        """CTEs resolving or creating the artefact and the artefact build of the request"""
+        if self.existing_image is not None:
+            artefact = select(literal(self.existing_image.id).label("id")).cte("artefact")
+        else:
+            filter_kwargs, creation_kwargs = self._artefact_fields()
+            artefact = _get_or_insert_cte("artefact", Artefact, filter_kwargs, creation_kwargs)
+
+        artefact_build = _get_or_insert_cte(
+            "artefact_build",
+            ArtefactBuild,
+            {
+                "architecture": self.resolved_arch,
+                "revision": getattr(self.request, "revision", None),
+                "artefact_id": artefact.c.id,
+            },
+        )
+        return artefact, artefact_build
+
+    def create_artefact_build(self) -> int:
+        artefact, artefact_build = self.artefact_build_ctes()
+        row = self.execute_chain(
+            _select_from_ctes(
+                select(artefact.c.id.label("artefact_id"), artefact_build.c.id.label("artefact_build_id")),
+                [artefact, artefact_build],
+            )
+        )
+        self.artefact_id = row.artefact_id
+        return row.artefact_build_id
+
+    def execute_chain(self, stmt: Select) -> Row:
+        for _ in range(_CHAIN_ATTEMPTS):
+            try:
+                with self.db.begin_nested():
+                    return self.db.execute(stmt).one()
+            except IntegrityError:
+                continue
+
+        raise HTTPException(
+            status_code=409,
+            detail="The test execution conflicts with existing data, e.g. an artefact with the same unique fields",
+        )
 
     def _resolve_arch(self) -> str:
         if self.request.arch is not None:
             return self.request.arch
 
         # arch was omitted: only valid for an existing image, derive it from its build.
-        architectures = self.artefact.architectures
+        architectures = self.existing_image.architectures if self.existing_image is not None else set()
         if len(architectures) == 1:
             return next(iter(architectures))
 
@@ -374,11 +423,6 @@ class StartTestExecutionController:
             detail="'arch' is required and could not be derived from the image's builds.",
         )
 
-    def delete_rerun_request(self):
-        if self.test_execution.rerun_request:
-            self.db.delete(self.test_execution.rerun_request)
-            self.db.commit()
-
     def determine_due_date(self):
         name = self.artefact.name
         is_kernel = name.startswith("linux-") or name.endswith("-kernel")
@@ -388,6 +432,123 @@ class StartTestExecutionController:
         return None
 
 
+class StartTestExecutionController(TestExecutionsStarter):
+    def __init__(
+        self,
+        request: (
+            StartSnapTestExecutionRequest
+            | StartDebTestExecutionRequest
+            | StartCharmTestExecutionRequest
+            | StartImageTestExecutionRequest
+            | StartSolutionTestExecutionRequest
+        ) = Body(discriminator="family"),
+        db: Session = Depends(get_db),
+    ):
+        super().__init__(request, db)
+        self.execution = request
+
+    def execute(self):
+        self.resolve_artefact()
+        self.create_test_execution_chain()
+        self.create_relevant_links()
+        self.commit()
+
+        return {"id": self.test_execution_id}
+
+    def _build_test_execution_chain(self) -> Select:
+        """
+        Build a single statement resolving or creating the artefact, artefact build,
+        environment, environment review, test plan and test execution of the request
+        and deleting the rerun request the new test execution fulfils
+
+        Every link of the chain is a data-modifying CTE inserting the row unless it
+        exists, followed by a CTE selecting the existing row otherwise.
+        """
+        artefact, artefact_build = self.artefact_build_ctes()
+        environment = _get_or_insert_cte(
+            "environment",
+            Environment,
+            {"name": self.execution.environment, "architecture": self.resolved_arch},
+        )
+        test_plan = _get_or_insert_cte("test_plan", TestPlan, {"name": self.execution.test_plan})
+
+        environment_review = _get_or_insert_cte(
+            "environment_review",
+            ArtefactBuildEnvironmentReview,
+            {"environment_id": environment.c.id, "artefact_build_id": artefact_build.c.id},
+        )
+
+        test_execution_fields = {
+            "status": self.execution.initial_status,
+            "environment_id": environment.c.id,
+            "artefact_build_id": artefact_build.c.id,
+            "test_plan_id": test_plan.c.id,
+        }
+        # If ci_link is None, we cannot uniquely identify the test execution,
+        # so always create a new one instead of looking for an existing one
+        if self.execution.ci_link is None:
+            names, row = _select_row_to_insert(TestExecution, test_execution_fields)
+            test_execution = (
+                insert(TestExecution)
+                .from_select(names, row)
+                .returning(
+                    TestExecution.id,
+                    TestExecution.test_plan_id,
+                    TestExecution.artefact_build_id,
+                    TestExecution.environment_id,
+                )
+                .cte("test_execution")
+            )
+        else:
+            test_execution = _get_or_insert_cte(
+                "test_execution",
+                TestExecution,
+                {"ci_link": self.execution.ci_link},
+                test_execution_fields,
+                returning=["test_plan_id", "artefact_build_id", "environment_id"],
+            )
+
+        deleted_rerun_request = (
+            delete(TestExecutionRerunRequest)
+            .where(
+                TestExecutionRerunRequest.test_plan_id == test_execution.c.test_plan_id,
+                TestExecutionRerunRequest.artefact_build_id == test_execution.c.artefact_build_id,
+                TestExecutionRerunRequest.environment_id == test_execution.c.environment_id,
+            )
+            .returning(TestExecutionRerunRequest.id)
+            .cte("deleted_rerun_request")
+        )
+
+        return _select_from_ctes(
+            select(
+                artefact.c.id.label("artefact_id"),
+                test_execution.c.id.label("test_execution_id"),
+                environment_review.c.id.label("environment_review_id"),
+                select(func.count())
+                .select_from(deleted_rerun_request)
+                .scalar_subquery()
+                .label("deleted_rerun_requests"),
+            ),
+            [artefact, test_execution, environment_review],
+        )
+
+    def create_test_execution_chain(self) -> None:
+        row = self.execute_chain(self._build_test_execution_chain())
+        self.artefact_id = row.artefact_id
+        self.test_execution_id = row.test_execution_id
+        record_latest_test_executions(self.db, [self.test_execution_id])
+
+    def create_relevant_links(self):
+        if self.execution.relevant_links:
+            self.db.execute(
+                insert(TestExecutionRelevantLink),
+                [
+                    {"test_execution_id": self.test_execution_id, "label": link.label, "url": str(link.url)}
+                    for link in self.execution.relevant_links
+                ],
+            )
+
+
 @router.put(
     "/start-test",
     dependencies=[Security(permission_checker, scopes=[Permission.change_test])],
@@ -0,0 +1,218 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+from collections.abc import Iterable
+from typing import Any
+
+from fastapi import Depends, Security
+from sqlalchemy import Integer, String, any_, delete, insert, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from test_observer.common.enums import Permission
+from test_observer.common.permissions import permission_checker
+from test_observer.data_access.conflicts import insert_or_select, rows_in_lock_order
+from test_observer.data_access.latest_test_executions import record_latest_test_executions
+from test_observer.data_access.models import (
+    ArtefactBuildEnvironmentReview,
+    Environment,
+    TestExecution,
+    TestExecutionRelevantLink,
+    TestExecutionRerunRequest,
+    TestPlan,
+)
+from test_observer.data_access.setup import get_db
+
+from .models import StartTestExecutionsBatchRequest
+from .router import router
+from .start_test import TestExecutionsStarter
+
+
+def _get_or_create_by_name(
+    db: Session,
+    model: type[Environment] | type[TestPlan],
+    names: Iterable[str],
+    **shared_fields: str,
+) -> dict[str, int]:
+    """
+    Bulk get_or_create of environments or test plans, which are unique by name
+    and the shared fields
+
+    :return: mapping of name to id
+    """
+    names = list(dict.fromkeys(names))
+
+    def select_ids(names: list[str]) -> dict[str, int]:
+        stmt = select(model.name, model.id).where(
+            model.name == any_(literal(names, ARRAY(String))),
+            *(getattr(model, field) == value for field, value in shared_fields.items()),
+        )
+        return dict(db.execute(stmt).tuples().all())
+
+    ids = select_ids(names)
+
+    if missing := {name: {"name": name, **shared_fields} for name in names if name not in ids}:
+        inserted, inserted_concurrently = insert_or_select(
+            db,
+            pg_insert(model)
+            .on_conflict_do_nothing(index_elements=["name", *shared_fields])
+            .returning(model.name, model.id),
+            missing,
+            lambda row: row.id,
+            select_ids,
+        )
+        ids.update(inserted)
+        ids.update(inserted_concurrently)
+
+    return ids
+
+
+class StartTestExecutionsBatchController(TestExecutionsStarter):
+    """
+    Starts many test executions of one artefact build at once
+
+    The artefact and build are resolved once and every other row is looked up
+    or created in bulk, so the number of statements doesn't depend on the
+    size of the batch. Reviewers are assigned once for the whole batch.
+    """
+
+    def __init__(self, request: StartTestExecutionsBatchRequest, db: Session = Depends(get_db)):
+        super().__init__(request.artefact, db)
+        self.executions = request.executions
+
+    def execute(self) -> list[int]:
+        self.resolve_artefact()
+
+        artefact_build_id = self.create_artefact_build()
+
+        environment_ids = _get_or_create_by_name(
+            self.db,
+            Environment,
+            (execution.environment for execution in self.executions),
+            architecture=self.resolved_arch,
+        )
+        test_plan_ids = _get_or_create_by_name(
+            self.db, TestPlan, (execution.test_plan for execution in self.executions)
+        )
+
+        self.db.execute(
+            pg_insert(ArtefactBuildEnvironmentReview).on_conflict_do_nothing(
+                index_elements=["artefact_build_id", "environment_id"]
+            ),
+            rows_in_lock_order(
+                {
+                    environment_id: {"artefact_build_id": artefact_build_id, "environment_id": environment_id}
+                    for environment_id in environment_ids.values()
+                }
+            ),
+        )
+
+        test_execution_ids = self._create_test_executions(artefact_build_id, environment_ids, test_plan_ids)
+        record_latest_test_executions(self.db, test_execution_ids)
+        self._delete_rerun_requests(test_execution_ids)
+        self._create_relevant_links(test_execution_ids)
+
+        self.commit()
+
+        return test_execution_ids
+
+    def _create_test_executions(
+        self,
+        artefact_build_id: int,
+        environment_ids: dict[str, int],
+        test_plan_ids: dict[str, int],
+    ) -> list[int]:
+        rows: list[dict[str, Any]] = [
+            {
+                "ci_link": execution.ci_link,
+                "status": execution.initial_status,
+                "environment_id": environment_ids[execution.environment],
+                "artefact_build_id": artefact_build_id,
+                "test_plan_id": test_plan_ids[execution.test_plan],
+            }
+            for execution in self.executions
+        ]
+
+        # Like start-test, executions are reused by ci_link and always created without one
+        ci_links: list[str] = [row["ci_link"] for row in rows if row["ci_link"] is not None]
+
+        def select_ids(ci_links: list[str]) -> dict[str, int]:
+            stmt = select(TestExecution.ci_link, TestExecution.id).where(
+                TestExecution.ci_link == any_(literal(ci_links, ARRAY(String)))
+            )
+            return {row.ci_link: row.id for row in self.db.execute(stmt)}
+
+        ids_by_ci_link: dict[str, int] = select_ids(ci_links) if ci_links else {}
+
+        # ci_links are unique within a batch
+        if missing := {
+            row["ci_link"]: row for row in rows if row["ci_link"] is not None and row["ci_link"] not in ids_by_ci_link
+        }:
+            inserted, inserted_concurrently = insert_or_select(
+                self.db,
+                pg_insert(TestExecution)
+                .on_conflict_do_nothing(index_elements=["ci_link"])
+                .returning(TestExecution.ci_link, TestExecution.id),
+                missing,
+                lambda row: row.id,
+                select_ids,
+            )
+            ids_by_ci_link.update(inserted)
+            ids_by_ci_link.update(inserted_concurrently)
+
+        without_ci_link = [row for row in rows if row["ci_link"] is None]
+        new_ids = iter(
+            self.db.execute(
+                insert(TestExecution).returning(TestExecution.id, sort_by_parameter_order=True),
+                without_ci_link,
+            ).scalars()
+            if without_ci_link
+            else []
+        )
+
+        return [ids_by_ci_link[row["ci_link"]] if row["ci_link"] is not None else next(new_ids) for row in rows]
+
+    def _delete_rerun_requests(self, test_execution_ids: list[int]) -> None:
+        # An execution reused through its ci_link fulfils the rerun request of its
+        # own plan, build and environment, which may differ from the request's
+        self.db.execute(
+            delete(TestExecutionRerunRequest).where(
+                TestExecutionRerunRequest.test_plan_id == TestExecution.test_plan_id,
+                TestExecutionRerunRequest.artefact_build_id == TestExecution.artefact_build_id,
+                TestExecutionRerunRequest.environment_id == TestExecution.environment_id,
+                TestExecution.id == any_(literal(test_execution_ids, ARRAY(Integer))),
+            )
+        )
+
+    def _create_relevant_links(self, test_execution_ids: list[int]) -> None:
+        links = [
+            {"test_execution_id": test_execution_id, "label": link.label, "url": str(link.url)}
+            for test_execution_id, execution in zip(test_execution_ids, self.executions, strict=True)
+            for link in execution.relevant_links
+        ]
+        if links:
+            self.db.execute(insert(TestExecutionRelevantLink), links)
+
+
+@router.put(
+    "/start-test/batch",
+    dependencies=[Security(permission_checker, scopes=[Permission.change_test])],
+)
+def start_test_executions_batch(
+    test_starter: StartTestExecutionsBatchController = Depends(StartTestExecutionsBatchController),
+) -> list[int]:
+    """Start a test execution per environment and test plan of one artefact build"""
+    return test_starter.execute()
@@ -13,7 +13,10 @@
 # SPDX-FileCopyrightText: Copyright 2024 Canonical Ltd.
 # SPDX-License-Identifier: AGPL-3.0-only
 
+from datetime import UTC, datetime
+
 from fastapi import Depends, HTTPException, Security
+from sqlalchemy import select
 from sqlalchemy.orm import Session, joinedload
 
 from test_observer.common.enums import Permission
@@ -21,41 +24,77 @@ from test_observer.common.permissions import permission_checker
 from test_observer.data_access.models import (
     TestEvent,
     TestExecution,
+    TestResult,
 )
 from test_observer.data_access.models_enums import TestExecutionStatus
 from test_observer.data_access.setup import get_db
+from test_observer.data_access.test_result_search import index_test_results
 
-from .logic import delete_previous_test_events
+from .logic import delete_test_events, upsert_test_events
 from .models import StatusUpdateRequest, TestEventResponse
 from .router import router
 from .testflinger_event_parser import TestflingerEventParser
 
 
+def _stored_timestamp(timestamp: datetime) -> datetime:
+    """Timestamps are stored in UTC without a time zone"""
+    if timestamp.tzinfo is None:
+        return timestamp
+    return timestamp.astimezone(UTC).replace(tzinfo=None)
+
+
+def _normalize_events(events: list[TestEventResponse]) -> dict[tuple[datetime, str], TestEventResponse]:
+    """Key events by timestamp and name, the last of repeated events winning"""
+    normalized = (event.model_copy(update={"timestamp": _stored_timestamp(event.timestamp)}) for event in events)
+    return {(event.timestamp, event.event_name): event for event in normalized}
+
+
 @router.put(
     "/{id}/status_update",
     dependencies=[Security(permission_checker, scopes=[Permission.change_test])],
 )
 def put_status_update(id: int, request: StatusUpdateRequest, db: Session = Depends(get_db)):
-    test_execution = db.get(
-        TestExecution,
-        id,
-        options=[joinedload(TestExecution.test_events)],
-    )
+    """
+    Replace the events of a test execution
+
+    Agents send all the events of a job every time, so only the events that
+    weren't stored yet are written and processed. Events are processed in the
+    order of the request rather than that of their timestamps.
+    """
+    test_execution = db.get(TestExecution, id)
     if test_execution is None:
         raise HTTPException(status_code=404, detail="TestExecution not found")
 
-    delete_previous_test_events(db, test_execution)
-
-    for event in request.events:
-        test_event = TestEvent(
-            event_name=event.event_name,
-            timestamp=event.timestamp,
-            detail=event.detail,
-        )
-        db.add(test_event)
-        test_execution.test_events.append(test_event)
-    event_parser = TestflingerEventParser()
-    event_parser.process_events(test_execution.test_events)
+    events = _normalize_events(request.events)
+    stored_events = {
+        (timestamp, event_name): (event_id, detail)
+        for event_id, timestamp, event_name, detail in db.execute(
+            select(TestEvent.id, TestEvent.timestamp, TestEvent.event_name, TestEvent.detail).where(
+                TestEvent.test_execution_id == test_execution.id
+            )
+        ).tuples()
+    }
+
+    removed_event_ids = [event_id for key, (event_id, _) in stored_events.items() if key not in events]
+    new_events = [event for key, event in events.items() if key not in stored_events]
+    changed_events = [
+        event for key, event in events.items() if key in stored_events and stored_events[key][1] != event.detail
+    ]
+
+    if removed_event_ids:
+        delete_test_events(db, test_execution, removed_event_ids)
+    upsert_test_events(db, test_execution, [event.model_dump() for event in new_events + changed_events])
+
+    # Events usually only get appended, in which case only the new ones need
+    # processing. Otherwise process all of them again.
+    appended = set(list(events)[: len(stored_events)]) == stored_events.keys()
+    if removed_event_ids or changed_events or not appended:
+        event_parser = TestflingerEventParser()
+        event_parser.process_events(list(events.values()))
+    else:
+        event_parser = TestflingerEventParser(has_previous_events=bool(stored_events))
+        event_parser.process_events(new_events)
+
     if event_parser.resource_url is not None:
         test_execution.resource_url = event_parser.resource_url
     if (
@@ -64,6 +103,7 @@ def put_status_update(id: int, request: StatusUpdateRequest, db: Session = Depen
         and test_execution.status is not TestExecutionStatus.PASSED
     ):
         test_execution.status = TestExecutionStatus.ENDED_PREMATURELY
+        index_test_results(db, TestResult.test_execution_id == test_execution.id)
     db.commit()
 
 
@@ -90,21 +130,10 @@ def get_status_update(id: int, db: Session = Depends(get_db)):
     dependencies=[Security(permission_checker, scopes=[Permission.change_test])],
 )
 def post_status_update(id: int, request: StatusUpdateRequest, db: Session = Depends(get_db)):
-    test_execution = db.get(
-        TestExecution,
-        id,
-        options=[joinedload(TestExecution.test_events)],
-    )
+    test_execution = db.get(TestExecution, id)
     if test_execution is None:
         raise HTTPException(status_code=404, detail="TestExecution not found")
 
-    for event in request.events:
-        test_event = TestEvent(
-            event_name=event.event_name,
-            timestamp=event.timestamp,
-            detail=event.detail,
-        )
-        db.add(test_event)
-        test_execution.test_events.append(test_event)
+    upsert_test_events(db, test_execution, [event.model_dump() for event in _normalize_events(request.events).values()])
 
     db.commit()
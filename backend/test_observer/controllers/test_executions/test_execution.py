@@ -26,10 +26,12 @@ from test_observer.controllers.execution_metadata.models import ExecutionMetadat
 from test_observer.data_access.models import (
     TestExecution,
     TestExecutionMetadata,
+    TestResult,
     test_execution_metadata_association_table,
 )
 from test_observer.data_access.models_enums import TestExecutionStatus, TestResultStatus
 from test_observer.data_access.setup import get_db
+from test_observer.data_access.test_result_search import index_test_results
 
 from .models import TestExecutionsPatchRequest
 from .router import router
@@ -98,6 +100,8 @@ def patch_test_execution(
         update_execution_metadata_metric(test_execution, request.execution_metadata)
 
     _set_test_execution_status(request, test_execution)
+    if request.status is not None:
+        index_test_results(db, TestResult.test_execution_id == test_execution.id)
 
     db.commit()
 
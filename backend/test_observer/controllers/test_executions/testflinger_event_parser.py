@@ -13,21 +13,34 @@
 # SPDX-FileCopyrightText: Copyright 2024 Canonical Ltd.
 # SPDX-License-Identifier: AGPL-3.0-only
 
-from test_observer.data_access.models import TestEvent
+from collections.abc import Sequence
+
+from .models import TestEventResponse
 
 
 class TestflingerEventParser:
-    def __init__(self):
+    """
+    Derives the state of a Testflinger job from its events, in the order they were sent
+
+    Events can be processed incrementally, each call getting the events that
+    follow those of the previous calls. When earlier events were processed by
+    another parser, say so with has_previous_events.
+    """
+
+    def __init__(self, has_previous_events: bool = False):
         self.is_done = False
         self.has_issues = False
-        self.resource_url = None
+        self.resource_url: str | None = None
+        self._has_previous_events = has_previous_events
+
+    def process_events(self, events: Sequence[TestEventResponse]):
+        if not events:
+            return
 
-    def process_events(self, events: list[TestEvent]):
         final_event = events[-1]
-        if final_event.event_name == "job_end":
-            self.is_done = True
-            if final_event.detail != "normal_exit":
-                self.has_issues = True
+        self.is_done = final_event.event_name == "job_end"
+        self.has_issues = self.is_done and final_event.detail != "normal_exit"
 
-        if events[0].event_name == "job_start":
+        if not self._has_previous_events and events[0].event_name == "job_start":
             self.resource_url = events[0].detail
+        self._has_previous_events = True
@@ -14,23 +14,21 @@
 # SPDX-License-Identifier: AGPL-3.0-only
 
 from sqlalchemy import Select, and_, exists, select, true
-from sqlalchemy.orm import aliased
 
 from test_observer.common.constants import QueryValue
+from test_observer.common.cursors import after_cursor
 from test_observer.controllers.execution_metadata.models import ExecutionMetadata
 from test_observer.controllers.test_results.shared_models import TestResultSearchFilters
+from test_observer.data_access.log_search import matching_test_results
 from test_observer.data_access.models import (
-    Artefact,
-    ArtefactBuild,
     ColumnElement,
-    Environment,
     IssueTestResultAttachment,
-    TestCase,
+    LatestTestExecution,
     TestExecution,
     TestExecutionMetadata,
     TestExecutionRerunRequest,
-    TestResult,
-    User,
+    TestResultSearchEntry,
+    artefact_reviewers_association,
     test_execution_metadata_association_table,
 )
 
@@ -47,7 +45,7 @@ def filter_execution_metadata(
             test_execution_metadata_association_table.c.test_execution_metadata_id == TestExecutionMetadata.id,
         )
         subq = subq.where(
-            test_execution_metadata_association_table.c.test_execution_id == TestExecution.id,
+            test_execution_metadata_association_table.c.test_execution_id == TestResultSearchEntry.test_execution_id,
             TestExecutionMetadata.category == category,
             TestExecutionMetadata.value.in_(values),
         )
@@ -58,58 +56,45 @@ def filter_execution_metadata(
     return and_(*conditions)
 
 
-def build_query_filters_and_joins(
-    filters: TestResultSearchFilters,
-) -> tuple[list[ColumnElement[bool]], set[str]]:
+def build_query_filters(filters: TestResultSearchFilters) -> list[ColumnElement[bool]]:
     query_filters: list[ColumnElement[bool]] = []
-    joins_needed = set()
 
     if len(filters.families) > 0:
-        query_filters.append(Artefact.family.in_(filters.families))
-        joins_needed.update(["test_execution", "artefact_build", "artefact"])
+        query_filters.append(TestResultSearchEntry.family.in_(filters.families))
 
     if len(filters.artefacts) > 0:
-        query_filters.append(Artefact.name.in_(filters.artefacts))
-        joins_needed.update(["test_execution", "artefact_build", "artefact"])
+        query_filters.append(TestResultSearchEntry.artefact_name.in_(filters.artefacts))
 
     if len(filters.artefact_versions) > 0:
-        query_filters.append(Artefact.version.in_(filters.artefact_versions))
-        joins_needed.update(["test_execution", "artefact_build", "artefact"])
+        query_filters.append(TestResultSearchEntry.artefact_version.in_(filters.artefact_versions))
 
     if len(filters.artefact_stages) > 0:
-        query_filters.append(Artefact.stage.in_(filters.artefact_stages))
-        joins_needed.update(["test_execution", "artefact_build", "artefact"])
+        query_filters.append(TestResultSearchEntry.artefact_stage.in_(filters.artefact_stages))
 
     if len(filters.artefact_tracks) > 0:
-        query_filters.append(Artefact.track.in_(filters.artefact_tracks))
-        joins_needed.update(["test_execution", "artefact_build", "artefact"])
+        query_filters.append(TestResultSearchEntry.artefact_track.in_(filters.artefact_tracks))
 
     if filters.artefact_is_archived is not None:
-        query_filters.append(Artefact.archived == filters.artefact_is_archived)
-        joins_needed.update(["test_execution", "artefact_build", "artefact"])
+        query_filters.append(TestResultSearchEntry.artefact_archived == filters.artefact_is_archived)
 
     if len(filters.environments) > 0:
-        query_filters.append(Environment.name.in_(filters.environments))
-        joins_needed.update(["test_execution", "environment"])
+        query_filters.append(TestResultSearchEntry.environment_name.in_(filters.environments))
 
     if len(filters.test_cases) > 0:
-        query_filters.append(TestCase.name.in_(filters.test_cases))
-        joins_needed.add("test_case")
+        query_filters.append(TestResultSearchEntry.test_case_name.in_(filters.test_cases))
 
     if len(filters.template_ids) > 0:
-        query_filters.append(TestCase.template_id.in_(filters.template_ids))
-        joins_needed.add("test_case")
+        query_filters.append(TestResultSearchEntry.template_id.in_(filters.template_ids))
 
     if len(filters.execution_metadata) > 0:
         query_filters.append(filter_execution_metadata(filters.execution_metadata))
-        joins_needed.add("test_execution")
 
     if filters.issues == QueryValue.ANY:
         query_filters.append(
             exists(
                 select(1)
                 .select_from(IssueTestResultAttachment)
-                .where(IssueTestResultAttachment.test_result_id == TestResult.id)
+                .where(IssueTestResultAttachment.test_result_id == TestResultSearchEntry.id)
             )
         )
     elif filters.issues == QueryValue.NONE:
@@ -117,7 +102,7 @@ def build_query_filters_and_joins(
             ~exists(
                 select(1)
                 .select_from(IssueTestResultAttachment)
-                .where(IssueTestResultAttachment.test_result_id == TestResult.id)
+                .where(IssueTestResultAttachment.test_result_id == TestResultSearchEntry.id)
             )
         )
     elif len(filters.issues) > 0:
@@ -126,91 +111,74 @@ def build_query_filters_and_joins(
                 select(1)
                 .select_from(IssueTestResultAttachment)
                 .where(
-                    IssueTestResultAttachment.test_result_id == TestResult.id,
+                    IssueTestResultAttachment.test_result_id == TestResultSearchEntry.id,
                     IssueTestResultAttachment.issue_id.in_(filters.issues),
                 )
             )
         )
 
     if len(filters.test_result_statuses) > 0:
-        query_filters.append(TestResult.status.in_(filters.test_result_statuses))
+        query_filters.append(TestResultSearchEntry.status.in_(filters.test_result_statuses))
 
     if len(filters.test_execution_statuses) > 0:
-        query_filters.append(TestExecution.status.in_(filters.test_execution_statuses))
-        joins_needed.add("test_execution")
+        query_filters.append(TestResultSearchEntry.execution_status.in_(filters.test_execution_statuses))
 
     if filters.reviewer_ids != []:
+        reviewers = select(1).where(artefact_reviewers_association.c.artefact_id == TestResultSearchEntry.artefact_id)
         if filters.reviewer_ids == QueryValue.ANY:
-            query_filters.append(Artefact.reviewers.any())
+            query_filters.append(exists(reviewers))
         elif filters.reviewer_ids == QueryValue.NONE:
-            query_filters.append(~Artefact.reviewers.any())
+            query_filters.append(~exists(reviewers))
         elif len(filters.reviewer_ids) > 0:
-            query_filters.append(Artefact.reviewers.any(User.id.in_(filters.reviewer_ids)))
-        joins_needed.update(["test_execution", "artefact_build", "artefact"])
+            query_filters.append(
+                exists(reviewers.where(artefact_reviewers_association.c.user_id.in_(filters.reviewer_ids)))
+            )
 
     if filters.rerun_is_requested is not None:
-        joins_needed.add("test_execution")
         rerun_exists = exists(
             select(1)
             .select_from(TestExecutionRerunRequest)
-            .where(
-                TestExecutionRerunRequest.test_plan_id == TestExecution.test_plan_id,
-                TestExecutionRerunRequest.artefact_build_id == TestExecution.artefact_build_id,
-                TestExecutionRerunRequest.environment_id == TestExecution.environment_id,
+            .join(
+                TestExecution,
+                and_(
+                    TestExecutionRerunRequest.test_plan_id == TestExecution.test_plan_id,
+                    TestExecutionRerunRequest.artefact_build_id == TestExecution.artefact_build_id,
+                    TestExecutionRerunRequest.environment_id == TestExecution.environment_id,
+                ),
             )
+            .where(TestExecution.id == TestResultSearchEntry.test_execution_id)
         )
         query_filters.append(rerun_exists if filters.rerun_is_requested else ~rerun_exists)
 
     if filters.execution_is_latest is not None:
-        joins_needed.add("test_execution")
-        newer_execution = aliased(TestExecution)
-        newer_execution_exists = exists(
+        is_latest = exists(
             select(1)
-            .select_from(newer_execution)
-            .where(
-                TestExecution.test_plan_id == newer_execution.test_plan_id,
-                TestExecution.artefact_build_id == newer_execution.artefact_build_id,
-                TestExecution.environment_id == newer_execution.environment_id,
-                TestExecution.id < newer_execution.id,
-            )
+            .select_from(LatestTestExecution)
+            .where(LatestTestExecution.test_execution_id == TestResultSearchEntry.test_execution_id)
         )
-        query_filters.append(~newer_execution_exists if filters.execution_is_latest else newer_execution_exists)
+        query_filters.append(is_latest if filters.execution_is_latest else ~is_latest)
 
     if filters.from_date is not None:
-        query_filters.append(TestResult.created_at >= filters.from_date)
+        query_filters.append(TestResultSearchEntry.created_at >= filters.from_date)
 
     if filters.until_date is not None:
-        query_filters.append(TestResult.created_at <= filters.until_date)
-
-    return query_filters, joins_needed
-
-
-def apply_joins(query: Select, joins_needed: set[str]) -> Select:
-    if "test_execution" in joins_needed:
-        query = query.join(TestResult.test_execution)
+        query_filters.append(TestResultSearchEntry.created_at <= filters.until_date)
 
-    if "environment" in joins_needed:
-        query = query.join(TestExecution.environment)
+    if filters.log_query is not None:
+        query_filters.append(TestResultSearchEntry.id.in_(matching_test_results(filters.log_query)))
 
-    if "artefact_build" in joins_needed:
-        query = query.join(TestExecution.artefact_build)
+    if filters.cursor is not None:
+        query_filters.append(after_cursor(TestResultSearchEntry.created_at, TestResultSearchEntry.id, filters.cursor))
 
-    if "artefact" in joins_needed:
-        query = query.join(ArtefactBuild.artefact)
-
-    if "test_case" in joins_needed:
-        query = query.join(TestResult.test_case)
-
-    return query
+    return query_filters
 
 
 def filter_test_results(query: Select, filters: TestResultSearchFilters) -> Select:
-    # Build filters and track which joins are needed
-    query_filters, joins_needed = build_query_filters_and_joins(filters)
-
-    # Build the main query with only necessary joins
-    query = apply_joins(query, joins_needed)
+    """
+    Filter a query selecting from the search entries of test results
 
+    The id of an entry is the id of its test result.
+    """
     # Apply pagination
     if filters.offset is not None:
         query = query.offset(filters.offset)
@@ -218,7 +186,7 @@ def filter_test_results(query: Select, filters: TestResultSearchFilters) -> Sele
         query = query.limit(filters.limit)
 
     # Apply all filters
-    if query_filters:
+    if query_filters := build_query_filters(filters):
         query = query.where(and_(*query_filters))
 
     return query
@@ -13,7 +13,10 @@
 # SPDX-FileCopyrightText: Copyright 2025 Canonical Ltd.
 # SPDX-License-Identifier: AGPL-3.0-only
 
-from pydantic import BaseModel, ConfigDict
+from datetime import date, datetime
+from enum import StrEnum
+
+from pydantic import BaseModel, ConfigDict, Field
 
 from test_observer.controllers.artefacts.models import (
     ArtefactBuildMinimalResponse,
@@ -23,6 +26,7 @@ from test_observer.controllers.artefacts.models import (
 from test_observer.controllers.test_executions.shared_models import (
     TestResultResponse,
 )
+from test_observer.data_access.models_enums import FamilyName
 
 
 class TestResultSearchResponse(BaseModel):
@@ -41,12 +45,55 @@ class TestResultResponseWithContext(BaseModel):
     test_execution: TestExecutionResponse
     artefact: ArtefactResponse
     artefact_build: ArtefactBuildMinimalResponse
+    log_highlights: list[str] | None = Field(
+        default=None,
+        description=(
+            "Fragments of the comment and io_log around the matches of log_query, "
+            "with the matches between <b> and </b>. Only set when searching by log_query"
+        ),
+    )
 
 
 class TestResultSearchResponseWithContext(BaseModel):
     """Response model for test results search endpoint with full context"""
 
-    count: int
+    count: int | None = Field(description="Number of matching items, as requested by count_mode")
     limit: int
     offset: int
+    next_cursor: str | None = Field(
+        default=None,
+        description="Cursor to pass to get the next page, null on the last page",
+    )
     test_results: list[TestResultResponseWithContext]
+
+
+class TestResultSummaryGroup(StrEnum):
+    """Fields test results can be counted by"""
+
+    DAY = "day"
+    FAMILY = "family"
+    ARTEFACT = "artefact"
+    ENVIRONMENT = "environment"
+    TEST_CASE = "test_case"
+
+
+class TestResultSummaryCounts(BaseModel):
+    """Number of test results of every status in a group, only the fields grouped by are set"""
+
+    day: date | None = None
+    family: FamilyName | None = None
+    artefact_id: int | None = None
+    environment_id: int | None = None
+    test_case_id: int | None = None
+    passed: int
+    failed: int
+    skipped: int
+
+
+class TestResultSummaryResponse(BaseModel):
+    """Response model for test results summary endpoint"""
+
+    counted_until: datetime | None = Field(
+        description="Creation time up to which results are counted, null until results are first counted"
+    )
+    groups: list[TestResultSummaryCounts]
@@ -50,8 +50,10 @@ class TestResultSearchFilters(BaseModel):
     execution_is_latest: bool | None = None
     from_date: datetime | None = None
     until_date: datetime | None = None
+    log_query: str | None = None
     offset: int | None = None
     limit: int | None = None
+    cursor: str | None = None
 
     @model_validator(mode="before")
     @classmethod
@@ -78,5 +80,5 @@ class TestResultSearchFilters(BaseModel):
                 or value is None
             )
             for key, value in self.model_dump().items()
-            if key not in ("from_date", "until_date", "offset", "limit", "assignee_ids")
+            if key not in ("from_date", "until_date", "offset", "limit", "cursor", "assignee_ids")
         )
@@ -14,29 +14,42 @@
 # SPDX-License-Identifier: AGPL-3.0-only
 
 import base64
-from datetime import datetime
+from datetime import date, datetime
 from typing import Annotated, Literal, TypeVar
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Security
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, Security
 from sqlalchemy import (
+    Integer,
+    Select,
+    any_,
     desc,
     func,
+    literal,
     select,
 )
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Session, selectinload
 
-from test_observer.common.constants import QueryValue
+from test_observer.common.byte_ranges import byte_range_response
+from test_observer.common.constants import CountMode, CountModeQuery, QueryValue
+from test_observer.common.cursors import next_cursor
 from test_observer.common.enums import Permission
 from test_observer.common.permissions import permission_checker
 from test_observer.controllers.execution_metadata.models import ExecutionMetadata
+from test_observer.data_access.counts import count_rows
+from test_observer.data_access.log_search import LOG_QUERY_MAX_MATCHES, highlight_test_results
 from test_observer.data_access.models import (
     Artefact,
     ArtefactBuild,
+    IoLog,
     IssueTestResultAttachment,
     IssueTestResultAttachmentRule,
     TestExecution,
     TestExecutionMetadata,
     TestResult,
+    TestResultDailyRollup,
+    TestResultDailySummary,
+    TestResultSearchEntry,
 )
 from test_observer.data_access.models_enums import (
     FamilyName,
@@ -44,11 +57,15 @@ from test_observer.data_access.models_enums import (
     TestResultStatus,
 )
 from test_observer.data_access.setup import get_db
+from test_observer.data_access.test_result_rollups import get_test_result_rollups_watermark
 
 from .filter_test_results import filter_test_results
 from .models import (
     TestResultResponseWithContext,
     TestResultSearchResponseWithContext,
+    TestResultSummaryCounts,
+    TestResultSummaryGroup,
+    TestResultSummaryResponse,
 )
 from .shared_models import TestResultSearchFilters
 
@@ -121,43 +138,60 @@ def parse_list_or_query_value(
 def _search_with_result_details(
     filters: TestResultSearchFilters,
     db: Session,
-) -> tuple[list[TestResult], int]:
-    """Query test results with full details using shared filter machinery."""
+    include_io_log: bool = False,
+    count_mode: CountMode = CountMode.EXACT,
+) -> tuple[list[TestResult], int | None]:
+    """
+    Query test results with full details using shared filter machinery
+
+    The page of results is found in their search entries alone, after which
+    only the results of the page are loaded with their details.
+    """
+    page_query = filter_test_results(select(TestResultSearchEntry.id), filters).order_by(
+        desc(TestResultSearchEntry.created_at), desc(TestResultSearchEntry.id)
+    )
+    page_ids = list(db.scalars(page_query))
+
+    count_filters = filters.model_copy(update={"limit": None, "offset": None, "cursor": None})
+    count_query = filter_test_results(select(TestResultSearchEntry.id), count_filters)
+    total = count_rows(db, count_query, count_mode)
+
+    if not page_ids:
+        return [], total
+
+    io_log_loader = selectinload(TestResult.stored_io_log)
+    if include_io_log:
+        io_log_loader = io_log_loader.undefer(IoLog.content)
     _artefact = (
         selectinload(TestResult.test_execution)
         .selectinload(TestExecution.artefact_build)
         .selectinload(ArtefactBuild.artefact)
     )
-    query = select(TestResult).options(
-        selectinload(TestResult.test_case),
-        selectinload(TestResult.test_execution).selectinload(TestExecution.environment),
-        _artefact.selectinload(Artefact.reviewers),
-        selectinload(TestResult.test_execution).selectinload(TestExecution.execution_metadata),
-        selectinload(TestResult.test_execution).selectinload(TestExecution.test_plan),
-        selectinload(TestResult.test_execution).selectinload(TestExecution.relevant_links),
-        selectinload(TestResult.test_execution).selectinload(TestExecution.rerun_request),
-        selectinload(TestResult.issue_attachments).selectinload(IssueTestResultAttachment.issue),
-        selectinload(TestResult.issue_attachments)
-        .selectinload(IssueTestResultAttachment.attachment_rule)
-        .selectinload(IssueTestResultAttachmentRule.execution_metadata),
-        # Pre-load all builds + environment reviews for each artefact
-        # so that Artefact.all_environment_reviews_count and completed_environment_reviews_count
-        # can evaluate without additional queries
-        _artefact.selectinload(Artefact.builds).selectinload(ArtefactBuild.environment_reviews),
+    query = (
+        select(TestResult)
+        .options(
+            selectinload(TestResult.test_case),
+            io_log_loader,
+            selectinload(TestResult.test_execution).selectinload(TestExecution.environment),
+            _artefact.selectinload(Artefact.reviewers),
+            selectinload(TestResult.test_execution).selectinload(TestExecution.execution_metadata),
+            selectinload(TestResult.test_execution).selectinload(TestExecution.test_plan),
+            selectinload(TestResult.test_execution).selectinload(TestExecution.relevant_links),
+            selectinload(TestResult.test_execution).selectinload(TestExecution.rerun_request),
+            selectinload(TestResult.issue_attachments).selectinload(IssueTestResultAttachment.issue),
+            selectinload(TestResult.issue_attachments)
+            .selectinload(IssueTestResultAttachment.attachment_rule)
+            .selectinload(IssueTestResultAttachmentRule.execution_metadata),
+            # Pre-load all builds + environment reviews for each artefact
+            # so that Artefact.all_environment_reviews_count and completed_environment_reviews_count
+            # can evaluate without additional queries
+            _artefact.selectinload(Artefact.builds).selectinload(ArtefactBuild.environment_reviews),
+        )
+        .where(TestResult.id == any_(literal(page_ids, ARRAY(Integer))))
+        .order_by(desc(TestResult.created_at), desc(TestResult.id))
     )
-    query = filter_test_results(query, filters)
-    query = query.order_by(desc(TestResult.created_at), desc(TestResult.id))
-    if filters.offset is not None:
-        query = query.offset(filters.offset)
-    if filters.limit is not None:
-        query = query.limit(filters.limit)
-
-    count_filters = filters.model_copy(update={"limit": None, "offset": None})
-    count_query = select(func.count()).select_from(TestResult)
-    count_query = filter_test_results(count_query, count_filters)
 
     rows = db.execute(query).scalars().all()
-    total = db.execute(count_query).scalar() or 0
     return list(rows), total
 
 
@@ -235,8 +269,32 @@ def search_test_results(
     ] = None,
     from_date: Annotated[datetime | None, Query(description="Filter results from this timestamp")] = None,
     until_date: Annotated[datetime | None, Query(description="Filter results until this timestamp")] = None,
+    log_query: Annotated[
+        str | None,
+        Query(
+            description=(
+                "Filter by words appearing in sequence in the comment or io_log, case insensitively. "
+                "Only the start and end of long io_logs are searched, and only the "
+                f"{LOG_QUERY_MAX_MATCHES} most recent matching results are considered"
+            )
+        ),
+    ] = None,
     limit: Annotated[int, Query(ge=0, le=1000, description="Maximum number of results to return")] = 50,
     offset: Annotated[int, Query(ge=0, description="Number of results to skip for pagination")] = 0,
+    cursor: Annotated[
+        str | None,
+        Query(
+            description=(
+                "The next_cursor of the previous page, to continue right after its last item. "
+                "Unlike offset, it keeps deep pages as fast as the first one"
+            )
+        ),
+    ] = None,
+    include_io_log: Annotated[
+        bool,
+        Query(description="Include the whole io_log of every result, rather than only its preview"),
+    ] = False,
+    count_mode: CountModeQuery = CountMode.EXACT,
     db: Session = Depends(get_db),
 ) -> TestResultSearchResponseWithContext:
     """
@@ -264,25 +322,164 @@ def search_test_results(
         execution_is_latest=execution_is_latest,
         from_date=from_date,
         until_date=until_date,
+        log_query=log_query.strip() if log_query and log_query.strip() else None,
         limit=limit,
         offset=offset,
+        cursor=cursor,
+    )
+
+    test_results, total = _search_with_result_details(
+        filters, db, include_io_log or filters.log_query is not None, count_mode
     )
 
-    test_results, total = _search_with_result_details(filters, db)
+    highlights = {}
+    if filters.log_query is not None:
+        highlights = highlight_test_results(db, filters.log_query, test_results)
+
+    items = []
+    for tr in test_results:
+        item = TestResultResponseWithContext.model_validate(
+            {
+                "test_result": tr,
+                "test_execution": tr.test_execution,
+                "artefact": tr.test_execution.artefact_build.artefact,
+                "artefact_build": tr.test_execution.artefact_build,
+            }
+        )
+        if include_io_log:
+            item.test_result.io_log = tr.io_log
+        if filters.log_query is not None:
+            item.log_highlights = highlights[tr.id]
+        items.append(item)
 
     return TestResultSearchResponseWithContext(
         count=total,
         limit=limit,
         offset=offset,
-        test_results=[
-            TestResultResponseWithContext.model_validate(
-                {
-                    "test_result": tr,
-                    "test_execution": tr.test_execution,
-                    "artefact": tr.test_execution.artefact_build.artefact,
-                    "artefact_build": tr.test_execution.artefact_build,
-                }
-            )
-            for tr in test_results
-        ],
+        next_cursor=next_cursor(test_results, limit),
+        test_results=items,
+    )
+
+
+def _summary_query(
+    start_date: date,
+    end_date: date,
+    families: list[FamilyName],
+    artefact_ids: list[int],
+    environment_ids: list[int],
+    test_case_ids: list[int],
+    group_by: list[TestResultSummaryGroup],
+) -> Select:
+    # Counts across test cases are read from the rollup without them, which is much smaller
+    by_test_case = bool(test_case_ids) or TestResultSummaryGroup.TEST_CASE in group_by
+    rollup: type[TestResultDailyRollup] | type[TestResultDailySummary] = (
+        TestResultDailyRollup if by_test_case else TestResultDailySummary
+    )
+
+    group_columns = {
+        TestResultSummaryGroup.DAY: rollup.day,
+        TestResultSummaryGroup.FAMILY: rollup.family,
+        TestResultSummaryGroup.ARTEFACT: rollup.artefact_id,
+        TestResultSummaryGroup.ENVIRONMENT: rollup.environment_id,
+        TestResultSummaryGroup.TEST_CASE: TestResultDailyRollup.test_case_id,
+    }
+    grouped = [group_columns[group] for group in dict.fromkeys(group_by)]
+
+    query = (
+        select(
+            *grouped,
+            *(
+                func.coalesce(func.sum(rollup.count).filter(rollup.status == status), 0).label(status.lower())
+                for status in TestResultStatus
+            ),
+        )
+        .where(rollup.day.between(start_date, end_date))
+        .group_by(*grouped)
+        .order_by(*grouped)
+    )
+    if families:
+        query = query.where(rollup.family.in_(families))
+    if artefact_ids:
+        query = query.where(rollup.artefact_id.in_(artefact_ids))
+    if environment_ids:
+        query = query.where(rollup.environment_id.in_(environment_ids))
+    if test_case_ids:
+        query = query.where(TestResultDailyRollup.test_case_id.in_(test_case_ids))
+    return query
+
+
+@router.get(
+    "/summary",
+    response_model=TestResultSummaryResponse,
+    dependencies=[Security(permission_checker, scopes=[Permission.view_test])],
+)
+def get_test_results_summary(
+    start_date: Annotated[date, Query(description="First day of the results counted")],
+    end_date: Annotated[date | None, Query(description="Last day of the results counted, today by default")] = None,
+    families: Annotated[list[FamilyName] | None, Query(description="Filter by artefact families")] = None,
+    artefact_ids: Annotated[list[int] | None, Query(description="Filter by artefact ids")] = None,
+    environment_ids: Annotated[list[int] | None, Query(description="Filter by environment ids")] = None,
+    test_case_ids: Annotated[list[int] | None, Query(description="Filter by test case ids")] = None,
+    group_by: Annotated[
+        list[TestResultSummaryGroup] | None,
+        Query(description="Fields to count results by, all matching results are counted together by default"),
+    ] = None,
+    db: Session = Depends(get_db),
+) -> TestResultSummaryResponse:
+    """
+    Count test results by status over a range of days.
+
+    Results are counted from daily rollups, by the day they were created, and
+    are counted a few minutes after their creation.
+    """
+    query = _summary_query(
+        start_date,
+        end_date or date.today(),
+        families or [],
+        artefact_ids or [],
+        environment_ids or [],
+        test_case_ids or [],
+        group_by or [],
+    )
+    groups = [TestResultSummaryCounts.model_validate(row) for row in db.execute(query).mappings()]
+
+    return TestResultSummaryResponse(counted_until=get_test_result_rollups_watermark(db), groups=groups)
+
+
+@router.get(
+    "/{id}/io-log",
+    response_class=Response,
+    responses={
+        200: {"content": {"text/plain": {}}, "description": "The whole io_log"},
+        206: {"content": {"text/plain": {}}, "description": "The requested range of the io_log"},
+        416: {"description": "The requested range is outside the io_log"},
+    },
+    dependencies=[Security(permission_checker, scopes=[Permission.view_test])],
+)
+def get_test_result_io_log(
+    id: int,
+    range_header: Annotated[
+        str | None,
+        Header(
+            alias="Range",
+            description="A single byte range of the UTF-8 encoded io_log, e.g. bytes=-65536 for its end",
+        ),
+    ] = None,
+    accept_encoding: Annotated[str, Header()] = "",
+    db: Session = Depends(get_db),
+) -> Response:
+    """
+    Get the io_log of a test result as plain text.
+
+    The whole io_log is gzip compressed when accepted, ranges are served as is.
+    """
+    test_result = db.get(TestResult, id, options=[selectinload(TestResult.stored_io_log).undefer(IoLog.content)])
+    if test_result is None:
+        raise HTTPException(status_code=404, detail="TestResult not found")
+
+    return byte_range_response(
+        test_result.io_log.encode(),
+        media_type="text/plain; charset=utf-8",
+        range_header=range_header,
+        accept_encoding=accept_encoding,
     )
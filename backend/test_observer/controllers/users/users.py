@@ -28,6 +28,7 @@ from test_observer.controllers.users.models import (
 )
 from test_observer.data_access.models import User
 from test_observer.data_access.setup import get_db
+from test_observer.data_access.text_search import contains, relevance_order
 from test_observer.users.user_injection import get_current_user
 
 router = APIRouter(tags=["users"])
@@ -71,7 +72,7 @@ def get_users(
     db: Session = Depends(get_db),
 ):
     # Build base query with search filter
-    query = select(User).order_by(User.name)
+    query = select(User)
 
     # Build search filters if provided
     search_filters = []
@@ -79,11 +80,10 @@ def get_users(
         # Split search terms on whitespace and filter each one
         search_terms = q.split()
         for term in search_terms:
-            search_pattern = f"%{term}%"
             term_filters: list[ColumnElement[bool]] = [
-                User.email.ilike(search_pattern),
-                User.name.ilike(search_pattern),
-                User.launchpad_handle.ilike(search_pattern),
+                contains(User.email, term),
+                contains(User.name, term),
+                contains(User.launchpad_handle, term),
             ]
 
             # If term is numeric, also search by ID
@@ -92,9 +92,11 @@ def get_users(
 
             search_filters.append(or_(*term_filters))
 
-    # Apply search filters to query
-    if search_filters:
+    # Apply search filters to query, the most relevant users first
+    if q and search_filters:
         query = query.where(and_(*search_filters))
+        query = query.order_by(*relevance_order(db, [User.name, User.email, User.launchpad_handle], q.strip()))
+    query = query.order_by(User.name)
 
     # Get total count with same filters
     count_query = select(func.count()).select_from(User)
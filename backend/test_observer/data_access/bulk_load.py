@@ -0,0 +1,144 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""
+Bulk loading of rows with COPY
+
+Rows are streamed with COPY ... FROM STDIN into a temporary staging table
+shaped after a model, from which they can be merged into the model's table
+with a single INSERT ... SELECT. This is much faster than inserting them
+through the ORM or even multi-row INSERTs, at the cost of a fixed overhead
+that only pays off for large numbers of rows.
+"""
+
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Any
+
+from sqlalchemy import Column, MetaData, Table, text
+from sqlalchemy.orm import Session
+
+from .models import DataModel
+
+# Rows are sent to the database in messages of about this many bytes
+COPY_CHUNK_BYTES = 1024 * 1024
+
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\n": "\\n", "\r": "\\r", "\t": "\\t"})
+
+
+def _format_copy_value(value: object) -> str:
+    """Format a value for the text format of COPY"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, datetime | date):
+        return value.isoformat()
+    return str(value).translate(_COPY_ESCAPES)
+
+
+def _copy_data(db: Session, columns: Sequence[Column], rows: Iterable[Mapping[str, Any]]) -> Iterator[bytes]:
+    dialect = db.get_bind().dialect
+    processors = [column.type.bind_processor(dialect) for column in columns]
+
+    chunk: list[str] = []
+    chunk_size = 0
+    for row in rows:
+        values = []
+        for column, processor in zip(columns, processors, strict=True):
+            value = row[column.name]
+            values.append(_format_copy_value(processor(value) if processor and value is not None else value))
+        line = "\t".join(values) + "\n"
+        chunk.append(line)
+        chunk_size += len(line)
+        if chunk_size >= COPY_CHUNK_BYTES:
+            yield "".join(chunk).encode()
+            chunk = []
+            chunk_size = 0
+    if chunk:
+        yield "".join(chunk).encode()
+
+
+def copy_rows(db: Session, table: Table, rows: Iterable[Mapping[str, Any]]) -> int:
+    """
+    Stream rows into a table with COPY ... FROM STDIN
+
+    Rows are consumed lazily so they can be generated on the fly.
+    This function does NOT commit the transaction.
+
+    :rows: mappings holding a value for every column of the table
+    :return: number of rows copied
+    """
+    columns = list(table.columns)
+    preparer = db.get_bind().dialect.identifier_preparer
+    statement = (
+        f"COPY {preparer.format_table(table)} "
+        f"({', '.join(preparer.format_column(column) for column in columns)}) FROM STDIN"
+    )
+
+    # COPY isn't exposed by SQLAlchemy so use the pg8000 cursor, which runs on
+    # the connection of the session and so in its transaction
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.execute(statement, stream=_copy_data(db, columns, rows))  # type: ignore[call-arg]
+        return cursor.rowcount
+    finally:
+        cursor.close()
+
+
+@contextmanager
+def staged_rows(
+    db: Session,
+    model: type[DataModel],
+    column_names: Sequence[str],
+    rows: Iterable[Mapping[str, Any]],
+) -> Iterator[Table]:
+    """
+    Copy rows into a temporary table with the given columns of a model
+
+    The staging table takes its column types from the model but has no
+    constraints nor defaults, so rows are only checked once merged into the
+    model's table, typically with insert(model).from_select(...). It is
+    dropped on exit, or along with the transaction if that ends first. The
+    block runs in a savepoint, so that an error within it drops the table
+    by rolling back the savepoint, along with what the block wrote.
+    This function does NOT commit the transaction.
+
+    :rows: mappings holding a value for every one of the columns
+    :return: the staging table
+    """
+    model_table = model.__table__
+    staging = Table(
+        f"{model.__tablename__}_staging",
+        MetaData(),
+        *(Column(name, model_table.c[name].type) for name in column_names),
+    )
+    preparer = db.get_bind().dialect.identifier_preparer
+    staging_name = preparer.format_table(staging)
+
+    with db.begin_nested():
+        # Create the table from the model's one rather than from the Table above,
+        # which would also try to create the enum types of its columns
+        db.execute(
+            text(
+                f"CREATE TEMPORARY TABLE {staging_name} ON COMMIT DROP AS "
+                f"SELECT {', '.join(preparer.format_column(column) for column in staging.columns)} "
+                f"FROM {preparer.quote(model.__tablename__)} WITH NO DATA"
+            )
+        )
+        copy_rows(db, staging, rows)
+        yield staging
+        db.execute(text(f"DROP TABLE {staging_name}"))
@@ -0,0 +1,101 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+
+"""
+Records of changes, for consumers polling for what changed
+
+Changes are recorded by statement-level triggers, a record per row changed,
+so that bulk statements are recorded along with ORM changes and in the same
+transaction. Records are ordered by the ID of their transaction, and only
+those of transactions older than any running transaction are read, so that
+records committed late aren't skipped by consumers that already read past them.
+"""
+
+from datetime import timedelta
+
+from sqlalchemy import BigInteger, ColumnElement, Text, delete, func, literal, or_, select, tuple_
+from sqlalchemy.orm import Session
+
+from .models import ChangeRecord
+
+# Age from which changes are deleted, consumers further behind must fetch everything again
+CHANGE_RETENTION = timedelta(days=30)
+
+# Number of expired changes deleted by every transaction of the cleanup
+CHANGE_CLEANUP_BATCH_SIZE = 10000
+
+
+def _transaction_id(xid8: ColumnElement) -> ColumnElement[int]:
+    # PostgreSQL has no cast from xid8 to bigint, though every xid8 fits one
+    return xid8.cast(Text).cast(BigInteger)
+
+
+def _visibility_horizon() -> ColumnElement[int]:
+    # Every transaction older than the snapshot xmin is committed or rolled back
+    return _transaction_id(func.pg_snapshot_xmin(func.pg_current_snapshot()))
+
+
+def get_changes(db: Session, after: tuple[int, int], limit: int) -> tuple[list[ChangeRecord], tuple[int, int]]:
+    """
+    Changes after a position, in the order they were made
+
+    A position is a transaction ID and a change ID. The returned position is
+    that of the next changes, which skips ahead to the visibility horizon when
+    there are no more changes, so that the changes of long finished transactions
+    aren't scanned again.
+
+    :return: the changes and the position of the next changes
+    """
+    horizon = db.execute(select(_visibility_horizon())).scalar_one()
+    changes = list(
+        db.scalars(
+            select(ChangeRecord)
+            .where(
+                or_(
+                    ChangeRecord.transaction_id < horizon,
+                    # A transaction sees its own changes
+                    ChangeRecord.transaction_id == _transaction_id(func.pg_current_xact_id_if_assigned()),
+                ),
+                tuple_(ChangeRecord.transaction_id, ChangeRecord.id) > tuple_(literal(after[0]), literal(after[1])),
+            )
+            .order_by(ChangeRecord.transaction_id, ChangeRecord.id)
+            .limit(limit)
+        )
+    )
+
+    positions = [after]
+    if changes:
+        positions.append((changes[-1].transaction_id, changes[-1].id))
+    if len(changes) < limit:
+        positions.append((horizon, 0))
+    return changes, max(positions)
+
+
+def delete_expired_changes(db: Session, batch_size: int = CHANGE_CLEANUP_BATCH_SIZE) -> int:
+    """
+    Delete a batch of changes past their retention
+
+    This function does NOT commit the transaction.
+
+    :return: number of changes deleted
+    """
+    expired = (
+        select(ChangeRecord.id)
+        .where(ChangeRecord.created_at < func.now() - CHANGE_RETENTION)
+        .order_by(ChangeRecord.transaction_id, ChangeRecord.id)
+        .limit(batch_size)
+    )
+    return len(db.execute(delete(ChangeRecord).where(ChangeRecord.id.in_(expired)).returning(ChangeRecord.id)).all())
@@ -0,0 +1,73 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+
+"""
+Writing rows that concurrent transactions may also write
+
+A transaction inserting or updating a row of a unique key locks it, and a
+concurrent transaction writing the same key waits for it to end. Two
+transactions writing several such rows in different orders can each wait
+for a row the other holds, so rows that may conflict are always written in
+the order of their keys.
+"""
+
+from collections.abc import Callable, Mapping
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import Row
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import ReturningInsert
+
+if TYPE_CHECKING:
+    from _typeshed import SupportsRichComparison
+
+
+def rows_in_lock_order[K: SupportsRichComparison](rows: Mapping[K, dict]) -> list[dict]:
+    """Rows to write, by their key, in the order concurrent writes lock them"""
+    return [rows[key] for key in sorted(rows)]
+
+
+def insert_or_select[K: SupportsRichComparison, V](
+    db: Session,
+    stmt: ReturningInsert[Any],
+    rows: Mapping[K, dict],
+    read_row: Callable[[Row[Any]], V],
+    select_stored: Callable[[list[K]], Mapping[K, V]],
+    in_lock_order: bool = True,
+) -> tuple[dict[K, V], dict[K, V]]:
+    """
+    Insert rows unique by a key, or select them if a concurrent transaction inserted them first
+
+    The statement must be an INSERT ... ON CONFLICT DO NOTHING returning the
+    key of the inserted rows first. Skipping conflicts rather than raising
+    lets concurrent requests inserting the same rows neither fail nor fill
+    the PostgreSQL logs with errors. The rows skipped were committed by
+    another transaction since the caller looked for them, so they're selected
+    instead.
+    This function does NOT commit the transaction.
+
+    :rows: rows to insert, by their key
+    :read_row: reads the value of a row returned by the statement
+    :select_stored: selects the value of the stored rows of some keys
+    :in_lock_order: False to insert rows in the order of the mapping, when
+        the order of their ids matters more than avoiding deadlocks
+    :return: values of the inserted rows, and of the rows inserted by another transaction
+    """
+    values = rows_in_lock_order(rows) if in_lock_order else list(rows.values())
+    inserted = {row[0]: read_row(row) for row in db.execute(stmt, values)}
+    if conflicting := [key for key in rows if key not in inserted]:
+        return inserted, dict(select_stored(conflicting))
+    return inserted, {}
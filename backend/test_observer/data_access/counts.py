@@ -0,0 +1,118 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""
+Counting the rows matched by search queries
+
+Exact counts scan every matching row, which for broad filters costs more
+than fetching a page. They are cached for a short while, as paging through a
+search repeats the same count. Estimates come from the query planner instead
+and cost about as much as planning the query.
+"""
+
+import time
+from collections import OrderedDict
+from threading import Lock
+
+from sqlalchemy import ClauseElement, Executable, Select, func, select
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.compiler import SQLCompiler
+
+from test_observer.common.constants import CountMode
+
+# Seconds an exact count is reused for the same query
+COUNT_CACHE_TTL = 30
+COUNT_CACHE_SIZE = 1000
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN of a statement, returning its plan as JSON"""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler: SQLCompiler, **kw: object) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+class CountCache:
+    """Thread safe mapping of queries to their count, expiring after a time to live"""
+
+    def __init__(self, ttl: float, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._counts: OrderedDict[tuple[str, str], tuple[float, int]] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: tuple[str, str]) -> int | None:
+        with self._lock:
+            entry = self._counts.get(key)
+            if entry is None:
+                return None
+            expiry, count = entry
+            if expiry <= time.monotonic():
+                del self._counts[key]
+                return None
+            return count
+
+    def put(self, key: tuple[str, str], count: int) -> None:
+        with self._lock:
+            self._counts[key] = (time.monotonic() + self.ttl, count)
+            self._counts.move_to_end(key)
+            while len(self._counts) > self.max_size:
+                self._counts.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+
+count_cache = CountCache(COUNT_CACHE_TTL, COUNT_CACHE_SIZE)
+
+
+def _cache_key(db: Session, query: Select) -> tuple[str, str]:
+    # The same filters build the same statement with the same parameters
+    compiled = query.compile(db.get_bind())
+    return str(compiled), repr(sorted(compiled.params.items()))
+
+
+def estimate_count(db: Session, query: Select) -> int:
+    """Number of rows the planner expects the query to return"""
+    plan = db.execute(Explain(query)).scalar_one()
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_rows(db: Session, query: Select, count_mode: CountMode = CountMode.EXACT) -> int | None:
+    """
+    Count the rows of a query, before pagination, as requested by count_mode
+
+    :return: the count, None when count_mode is none
+    """
+    if count_mode == CountMode.NONE:
+        return None
+    if count_mode == CountMode.ESTIMATE:
+        return estimate_count(db, query)
+
+    key = _cache_key(db, query)
+    count = count_cache.get(key)
+    if count is None:
+        count = db.execute(select(func.count()).select_from(query.subquery())).scalar_one()
+        count_cache.put(key, count)
+    return count
@@ -0,0 +1,113 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""
+Storage of test result io_logs
+
+io_logs are kept out of the test_result table, compressed and stored once
+per distinct content along with their search chunks. Results reference them
+along with a short preview.
+"""
+
+import hashlib
+import zlib
+from collections.abc import Iterable
+
+from sqlalchemy import LargeBinary, any_, delete, exists, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.orm import Session
+
+from .conflicts import insert_or_select
+from .log_search import index_io_logs
+from .models import IoLog, TestResult
+
+# Number of characters of an io_log kept in the row of its results
+IO_LOG_PREVIEW_LENGTH = 200
+
+IO_LOG_COMPRESSION_LEVEL = 6
+
+# Number of unreferenced io_logs deleted by every transaction of the cleanup
+IO_LOG_CLEANUP_BATCH_SIZE = 1000
+
+
+def io_log_preview(io_log: str) -> str:
+    return io_log[:IO_LOG_PREVIEW_LENGTH]
+
+
+def store_io_logs(db: Session, io_logs: Iterable[str]) -> dict[str, int]:
+    """
+    Store io_logs that aren't stored yet, in a fixed number of statements
+
+    The returned io_logs are locked until the end of the transaction, so
+    that they can't be deleted as unreferenced before results reference them.
+    Empty io_logs aren't stored.
+    This function does NOT commit the transaction.
+
+    :return: mapping of every non-empty io_log to the id of its row
+    """
+    digests = {hashlib.sha256(io_log.encode()).digest(): io_log for io_log in io_logs if io_log}
+    if not digests:
+        return {}
+
+    def select_ids(selected: Iterable[bytes]) -> dict[bytes, int]:
+        stmt = (
+            select(IoLog.digest, IoLog.id)
+            .where(IoLog.digest == any_(literal(list(selected), ARRAY(LargeBinary))))
+            .with_for_update(key_share=True)
+        )
+        return dict(db.execute(stmt).tuples().all())
+
+    ids = select_ids(digests)
+
+    missing = {
+        digest: {
+            "digest": digest,
+            "content": zlib.compress(digests[digest].encode(), IO_LOG_COMPRESSION_LEVEL),
+            "size": len(digests[digest].encode()),
+        }
+        for digest in digests.keys() - ids.keys()
+    }
+    if missing:
+        inserted, inserted_concurrently = insert_or_select(
+            db,
+            insert(IoLog).on_conflict_do_nothing(index_elements=["digest"]).returning(IoLog.digest, IoLog.id),
+            missing,
+            lambda row: row.id,
+            select_ids,
+        )
+        index_io_logs(db, ((io_log_id, digests[digest]) for digest, io_log_id in inserted.items()))
+        ids.update(inserted)
+        ids.update(inserted_concurrently)
+
+    return {io_log: ids[digest] for digest, io_log in digests.items()}
+
+
+def delete_unreferenced_io_logs(db: Session, batch_size: int = IO_LOG_CLEANUP_BATCH_SIZE) -> int:
+    """
+    Delete a batch of io_logs that no test result references anymore
+
+    Results stop referencing their io_log when they're updated or deleted.
+    io_logs about to be referenced by an ongoing transaction are skipped.
+    This function does NOT commit the transaction.
+
+    :return: number of io_logs deleted
+    """
+    unreferenced = (
+        select(IoLog.id)
+        .where(~exists().where(TestResult.io_log_id == IoLog.id))
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    return len(db.execute(delete(IoLog).where(IoLog.id.in_(unreferenced)).returning(IoLog.id)).all())
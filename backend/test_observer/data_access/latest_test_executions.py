@@ -0,0 +1,122 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+
+"""
+Tracking of the latest test execution of every group
+
+A group is the test executions of a test plan on an artefact build and an
+environment, the latest of which is the one with the highest id. The
+latest_test_execution table maps every group to its latest execution and is
+updated in the same transaction that starts executions.
+"""
+
+from collections.abc import Sequence
+from typing import NamedTuple
+
+from sqlalchemy import ColumnElement, Integer, Select, any_, func, literal, select, true
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.orm import Session
+
+from .models import LatestTestExecution, TestExecution
+
+_GROUP_COLUMNS = ["test_plan_id", "artefact_build_id", "environment_id"]
+
+
+class InconsistentGroup(NamedTuple):
+    test_plan_id: int
+    artefact_build_id: int
+    environment_id: int
+    latest_test_execution_id: int | None
+    recorded_test_execution_id: int | None
+
+
+def _latest_per_group(where: ColumnElement[bool]) -> Select:
+    # Ordered so that concurrent transactions lock groups in the same order
+    return (
+        select(
+            TestExecution.test_plan_id,
+            TestExecution.artefact_build_id,
+            TestExecution.environment_id,
+            func.max(TestExecution.id).label("test_execution_id"),
+        )
+        .where(where)
+        .group_by(TestExecution.test_plan_id, TestExecution.artefact_build_id, TestExecution.environment_id)
+        .order_by(TestExecution.test_plan_id, TestExecution.artefact_build_id, TestExecution.environment_id)
+    )
+
+
+def _upsert_latest(db: Session, latest: Select, only_newer: bool) -> None:
+    stmt = insert(LatestTestExecution).from_select([*_GROUP_COLUMNS, "test_execution_id"], latest)
+    recorded, excluded = LatestTestExecution.test_execution_id, stmt.excluded.test_execution_id
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=_GROUP_COLUMNS,
+            set_={"test_execution_id": excluded, "updated_at": func.now()},
+            where=recorded < excluded if only_newer else recorded != excluded,
+        )
+    )
+
+
+def record_latest_test_executions(db: Session, test_execution_ids: Sequence[int]) -> None:
+    """
+    Record the given test executions as the latest of their groups
+
+    Executions older than the one recorded for their group are ignored, so
+    passing executions reused through their ci_link is harmless.
+    This function does NOT commit the transaction.
+    """
+    if not test_execution_ids:
+        return
+
+    _upsert_latest(
+        db,
+        _latest_per_group(TestExecution.id == any_(literal(list(test_execution_ids), ARRAY(Integer)))),
+        only_newer=True,
+    )
+
+
+def find_inconsistent_latest_test_executions(db: Session) -> list[InconsistentGroup]:
+    """Find the groups whose recorded latest test execution isn't their latest one"""
+    latest = _latest_per_group(true()).subquery()
+    stmt = (
+        select(
+            func.coalesce(latest.c.test_plan_id, LatestTestExecution.test_plan_id),
+            func.coalesce(latest.c.artefact_build_id, LatestTestExecution.artefact_build_id),
+            func.coalesce(latest.c.environment_id, LatestTestExecution.environment_id),
+            latest.c.test_execution_id,
+            LatestTestExecution.test_execution_id,
+        )
+        .select_from(latest)
+        .outerjoin(
+            LatestTestExecution,
+            (LatestTestExecution.test_plan_id == latest.c.test_plan_id)
+            & (LatestTestExecution.artefact_build_id == latest.c.artefact_build_id)
+            & (LatestTestExecution.environment_id == latest.c.environment_id),
+            full=True,
+        )
+        .where(latest.c.test_execution_id.is_distinct_from(LatestTestExecution.test_execution_id))
+    )
+    return [InconsistentGroup(*row) for row in db.execute(stmt)]
+
+
+def backfill_latest_test_executions(db: Session) -> None:
+    """
+    Record the latest test execution of every group, correcting any group
+    recorded with another execution
+
+    This function does NOT commit the transaction.
+    """
+    _upsert_latest(db, _latest_per_group(true()), only_newer=False)
@@ -0,0 +1,191 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+
+"""
+Full-text search of test result comments and io_logs
+
+Comments are searched through an expression index on test_result. io_logs
+are compressed, so their search vectors are computed when they're stored.
+tsvectors don't keep word positions past 16383, which phrase searches need,
+so io_logs are split into overlapping chunks with a search vector each. Only
+the start and the end of very long io_logs are searched.
+
+Queries match the words of the searched string in sequence, with the simple
+text search configuration, so error strings match as written rather than
+stemmed.
+"""
+
+from collections.abc import Iterable
+
+from sqlalchemy import (
+    ColumnElement,
+    Integer,
+    Select,
+    SQLColumnExpression,
+    Text,
+    any_,
+    bindparam,
+    func,
+    insert,
+    literal,
+    literal_column,
+    select,
+    union,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session
+
+from .models import IoLogSearchChunk, TestResult
+
+LOG_SEARCH_CONFIG: ColumnElement[str] = literal_column("'simple'::regconfig")
+
+# Number of characters searched at each end of very long io_logs
+IO_LOG_SEARCHED_LENGTH = 500_000
+
+# Chunks have at most about half as many words as characters, which keeps
+# their positions in range. They overlap to match phrases across them.
+IO_LOG_SEARCH_CHUNK_LENGTH = 30_000
+IO_LOG_SEARCH_CHUNK_OVERLAP = 1_000
+
+# Number of most recent matching results a search considers, whatever its other filters
+LOG_QUERY_MAX_MATCHES = 10_000
+
+# Delimits the matches in highlights
+HIGHLIGHT_START = "<b>"
+HIGHLIGHT_STOP = "</b>"
+_HIGHLIGHT_FRAGMENT_DELIMITER = "\x1e"
+_HIGHLIGHT_OPTIONS = (
+    f"MaxFragments=3, MaxWords=20, MinWords=5, StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, "
+    f'FragmentDelimiter="{_HIGHLIGHT_FRAGMENT_DELIMITER}"'
+)
+
+
+def io_log_search_chunks(io_log: str) -> list[str]:
+    """Parts of an io_log that searches match, in order"""
+    # PostgreSQL text can't hold NUL characters
+    io_log = io_log.replace("\x00", "")
+    parts = [io_log]
+    if len(io_log) > 2 * IO_LOG_SEARCHED_LENGTH:
+        parts = [io_log[:IO_LOG_SEARCHED_LENGTH], io_log[-IO_LOG_SEARCHED_LENGTH:]]
+    return [
+        part[start : start + IO_LOG_SEARCH_CHUNK_LENGTH + IO_LOG_SEARCH_CHUNK_OVERLAP]
+        for part in parts
+        for start in range(0, len(part), IO_LOG_SEARCH_CHUNK_LENGTH)
+    ]
+
+
+def _search_vector(searched_text: SQLColumnExpression[str]) -> ColumnElement[str]:
+    return func.to_tsvector(LOG_SEARCH_CONFIG, searched_text)
+
+
+def _search_query(log_query: str) -> ColumnElement:
+    return func.phraseto_tsquery(LOG_SEARCH_CONFIG, log_query)
+
+
+def index_io_logs(db: Session, io_logs: Iterable[tuple[int, str]]) -> None:
+    """
+    Store the search chunks of io_logs given with their id
+
+    This function does NOT commit the transaction.
+    """
+    chunks = [
+        {"io_log_id": io_log_id, "position": position, "searched_text": chunk}
+        for io_log_id, io_log in io_logs
+        for position, chunk in enumerate(io_log_search_chunks(io_log))
+    ]
+    if chunks:
+        db.execute(
+            insert(IoLogSearchChunk).values(search_vector=_search_vector(bindparam("searched_text"))),
+            chunks,
+        )
+
+
+def matching_test_results(log_query: str) -> Select:
+    """Ids of the most recent test results whose comment or io_log match log_query"""
+    tsquery = _search_query(log_query)
+    # Each source of matches is searched apart, so that each can use its index
+    comment_matches = select(TestResult.id).where(_search_vector(TestResult.comment).bool_op("@@")(tsquery))
+    io_log_matches = select(TestResult.id).where(
+        TestResult.io_log_id.in_(
+            select(IoLogSearchChunk.io_log_id).where(IoLogSearchChunk.search_vector.bool_op("@@")(tsquery))
+        )
+    )
+    matches = union(
+        *(
+            select(most_recent.c.id)
+            for most_recent in (
+                comment_matches.order_by(TestResult.id.desc()).limit(LOG_QUERY_MAX_MATCHES).subquery(),
+                io_log_matches.order_by(TestResult.id.desc()).limit(LOG_QUERY_MAX_MATCHES).subquery(),
+            )
+        )
+    ).subquery()
+    return select(matches.c.id).order_by(matches.c.id.desc()).limit(LOG_QUERY_MAX_MATCHES)
+
+
+def highlight_matches(db: Session, log_query: str, texts: list[str]) -> list[list[str]]:
+    """
+    Fragments of every text around the matches of log_query
+
+    Matches are delimited by HIGHLIGHT_START and HIGHLIGHT_STOP, texts
+    without matches have no fragments.
+    """
+    if not texts:
+        return []
+
+    searched = (
+        func.unnest(literal(texts, ARRAY(Text))).table_valued("text", with_ordinality="position").render_derived()
+    )
+    headlines = db.scalars(
+        select(func.ts_headline(LOG_SEARCH_CONFIG, searched.c.text, _search_query(log_query), _HIGHLIGHT_OPTIONS))
+        .select_from(searched)
+        .order_by(searched.c.position)
+    ).all()
+    return [
+        headline.split(_HIGHLIGHT_FRAGMENT_DELIMITER) if HIGHLIGHT_START in headline else [] for headline in headlines
+    ]
+
+
+def highlight_test_results(db: Session, log_query: str, test_results: list[TestResult]) -> dict[int, list[str]]:
+    """
+    Fragments of the comment and io_log of test results around the matches of log_query
+
+    Only the first chunk of every io_log that matches is highlighted. The
+    io_logs of the test results must be loaded.
+
+    :return: mapping of the id of every test result to its fragments
+    """
+    io_log_ids = [test_result.io_log_id for test_result in test_results if test_result.io_log_id is not None]
+    first_matching_chunks = dict(
+        db.execute(
+            select(IoLogSearchChunk.io_log_id, func.min(IoLogSearchChunk.position))
+            .where(
+                IoLogSearchChunk.io_log_id == any_(literal(io_log_ids, ARRAY(Integer))),
+                IoLogSearchChunk.search_vector.bool_op("@@")(_search_query(log_query)),
+            )
+            .group_by(IoLogSearchChunk.io_log_id)
+        )
+        .tuples()
+        .all()
+    )
+
+    texts = []
+    for test_result in test_results:
+        texts.append(test_result.comment)
+        position = first_matching_chunks.get(test_result.io_log_id) if test_result.io_log_id is not None else None
+        texts.append("" if position is None else io_log_search_chunks(test_result.io_log)[position])
+
+    fragments = highlight_matches(db, log_query, texts)
+    return {test_result.id: fragments[2 * i] + fragments[2 * i + 1] for i, test_result in enumerate(test_results)}
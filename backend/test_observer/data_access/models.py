@@ -15,17 +15,20 @@
 
 import hashlib
 import secrets
+import zlib
 from collections import defaultdict
 from datetime import date, datetime, timedelta
 from typing import TYPE_CHECKING, Any, TypeVar
 
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     Column,
     DateTime,
     Enum,
     ForeignKey,
     Index,
+    LargeBinary,
     MetaData,
     String,
     Table,
@@ -36,9 +39,11 @@ from sqlalchemy import (
     desc,
     event,
     exists,
+    literal_column,
     select,
+    text,
 )
-from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import (
     DeclarativeBase,
@@ -55,11 +60,17 @@ from test_observer.common.enums import Permission
 from test_observer.data_access.models_enums import (
     ArtefactBuildEnvironmentReviewDecision,
     ArtefactStatus,
+    ChangeEntity,
+    ChangeOperation,
     FamilyName,
     IssueSource,
     IssueStatus,
+    JobStatus,
     NotificationType,
+    ReportName,
     TestExecutionStatus,
+    TestResultIngestKind,
+    TestResultIngestStatus,
     TestResultStatus,
 )
 
@@ -609,6 +620,30 @@ class TestExecutionRerunRequest(Base):
     )
 
 
+class LatestTestExecution(Base):
+    """
+    Stores the latest test execution of every group
+    (test_plan + artefact_build + environment).
+
+    Kept up to date as test executions start, so that filtering on whether
+    an execution is the latest of its group is a lookup in this table rather
+    than a search for a newer execution of the same group.
+    """
+
+    __test__ = False
+    __tablename__ = "latest_test_execution"
+    __table_args__ = (UniqueConstraint("test_plan_id", "artefact_build_id", "environment_id"),)
+
+    test_plan_id: Mapped[int] = mapped_column(ForeignKey("test_plan.id", ondelete="CASCADE"))
+    artefact_build_id: Mapped[int] = mapped_column(ForeignKey("artefact_build.id", ondelete="CASCADE"), index=True)
+    environment_id: Mapped[int] = mapped_column(ForeignKey("environment.id", ondelete="CASCADE"), index=True)
+
+    test_execution_id: Mapped[int] = mapped_column(ForeignKey("test_execution.id", ondelete="CASCADE"), unique=True)
+
+    def __repr__(self) -> str:
+        return data_model_repr(self, "test_plan_id", "artefact_build_id", "environment_id", "test_execution_id")
+
+
 test_execution_metadata_association_table = Table(
     "test_execution_metadata_association_table",
     Base.metadata,
@@ -648,7 +683,8 @@ class TestExecution(Base):
 
     __test__ = False
     __tablename__ = "test_execution"
-    __table_args__ = (Index(None, "updated_at"),)
+    # created_at and id order the paginated test execution search
+    __table_args__ = (Index(None, "updated_at"), Index(None, "created_at", "id"))
 
     ci_link: Mapped[str | None] = mapped_column(String(200), nullable=True, unique=True)
     c3_link: Mapped[str | None] = mapped_column(String(200), nullable=True)
@@ -731,6 +767,51 @@ class TestCase(Base):
         return data_model_repr(self, "name", "category")
 
 
+class IoLog(Base):
+    """
+    A table to store the io_log of test results out of their rows
+
+    Every distinct io_log is stored once, compressed, and shared by all the
+    results that have it.
+    """
+
+    __tablename__ = "io_log"
+
+    # sha256 of the UTF-8 encoded io_log
+    digest: Mapped[bytes] = mapped_column(LargeBinary, unique=True)
+    # zlib compressed UTF-8 encoded io_log, only loaded when read
+    content: Mapped[bytes] = mapped_column(LargeBinary, deferred=True)
+    size: Mapped[int]
+
+    @property
+    def text(self) -> str:
+        return zlib.decompress(self.content).decode()
+
+    def __repr__(self) -> str:
+        return data_model_repr(self, "size")
+
+
+class IoLogSearchChunk(Base):
+    """
+    A table to search io_logs, which are stored compressed, by their words
+
+    Every io_log is split into chunks with a full-text search vector each,
+    see log_search.py.
+    """
+
+    __tablename__ = "io_log_search_chunk"
+
+    io_log_id: Mapped[int] = mapped_column(ForeignKey("io_log.id", ondelete="CASCADE"), index=True)
+    # Order of the chunk in the io_log
+    position: Mapped[int]
+    search_vector: Mapped[str] = mapped_column(TSVECTOR)
+
+    __table_args__ = (Index(None, "search_vector", postgresql_using="gin"),)
+
+    def __repr__(self) -> str:
+        return data_model_repr(self, "io_log_id", "position")
+
+
 class TestResult(Base):
     """
     A table to represent individual test results/runs
@@ -741,11 +822,27 @@ class TestResult(Base):
 
     status: Mapped[TestResultStatus]
     comment: Mapped[str]
-    io_log: Mapped[str]
 
-    __table_args__ = (Index(None, "created_at"),)
+    # The io_log is stored in its own table, null when empty
+    io_log_id: Mapped[int | None] = mapped_column(ForeignKey("io_log.id"), index=True)
+    stored_io_log: Mapped[IoLog | None] = relationship()
+    # Start of the io_log, to show without loading the whole of it
+    io_log_preview: Mapped[str] = mapped_column(default="")
 
-    test_execution_id: Mapped[int] = mapped_column(ForeignKey("test_execution.id", ondelete="CASCADE"), index=True)
+    # One result per test case of an execution, which also indexes test_execution_id
+    # created_at and id order the paginated test result search
+    # The full-text index serves searches of comments, see log_search.py
+    __table_args__ = (
+        Index(None, "created_at", "id"),
+        UniqueConstraint("test_execution_id", "test_case_id"),
+        Index(
+            "test_result_comment_search_ix",
+            func.to_tsvector(literal_column("'simple'::regconfig"), column("comment")),
+            postgresql_using="gin",
+        ),
+    )
+
+    test_execution_id: Mapped[int] = mapped_column(ForeignKey("test_execution.id", ondelete="CASCADE"))
     test_execution: Mapped["TestExecution"] = relationship(back_populates="test_results")
 
     test_case_id: Mapped[int] = mapped_column(ForeignKey("test_case.id", ondelete="CASCADE"), index=True)
@@ -753,17 +850,259 @@ class TestResult(Base):
 
     issue_attachments: Mapped[list["IssueTestResultAttachment"]] = relationship(back_populates="test_result")
 
+    @property
+    def io_log(self) -> str:
+        return self.stored_io_log.text if self.stored_io_log else ""
+
+    @property
+    def io_log_size(self) -> int:
+        return self.stored_io_log.size if self.stored_io_log else 0
+
     def __repr__(self) -> str:
         return data_model_repr(
             self,
             "status",
             "comment",
-            "io_log",
+            "io_log_preview",
             "test_execution_id",
             "test_case_id",
         )
 
 
+class TestResultSearchEntry(Base):
+    """
+    A denormalized copy of the searchable fields of a test result
+
+    Written along with the results and whenever a copied field changes, so
+    that searching test results filters this single narrow table and only
+    then loads the page of results found. The id and created_at are those
+    of the test result.
+    """
+
+    __test__ = False
+    __tablename__ = "test_result_search"
+    # Every index ends with the order of the paginated search
+    __table_args__ = (
+        Index(None, "created_at", "id"),
+        Index(None, "test_case_name", "created_at", "id"),
+        Index(None, "artefact_name", "created_at", "id"),
+        Index(None, "environment_name", "created_at", "id"),
+        Index(None, "template_id", "created_at", "id", postgresql_where=text("template_id <> ''")),
+        Index(
+            "test_result_search_failed_created_at_id_ix",
+            "created_at",
+            "id",
+            postgresql_where=text("status = 'FAILED'"),
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(ForeignKey("test_result.id", ondelete="CASCADE"), primary_key=True)
+
+    test_execution_id: Mapped[int]
+    test_case_id: Mapped[int]
+    artefact_id: Mapped[int]
+
+    family: Mapped[FamilyName]
+    artefact_name: Mapped[str] = mapped_column(String(200))
+    artefact_version: Mapped[str]
+    artefact_stage: Mapped[str] = mapped_column(String(100))
+    artefact_track: Mapped[str]
+    artefact_archived: Mapped[bool]
+    environment_name: Mapped[str]
+    test_case_name: Mapped[str]
+    template_id: Mapped[str]
+    status: Mapped[TestResultStatus]
+    execution_status: Mapped[TestExecutionStatus]
+
+    def __repr__(self) -> str:
+        return data_model_repr(self, "artefact_name", "environment_name", "test_case_name", "status")
+
+
+class TestResultIngest(Base):
+    """
+    A staging table for test results submitted asynchronously
+
+    The validated request is stored compressed and drained into the test
+    results of the execution by a background worker, in submission order for
+    every test execution.
+    """
+
+    __test__ = False
+    __tablename__ = "test_result_ingest"
+
+    __table_args__ = (Index(None, "status", "id"),)
+
+    test_execution_id: Mapped[int] = mapped_column(ForeignKey("test_execution.id", ondelete="CASCADE"), index=True)
+    test_execution: Mapped["TestExecution"] = relationship()
+
+    kind: Mapped[TestResultIngestKind]
+    # gzip compressed JSON of the request body
+    payload: Mapped[bytes] = mapped_column(LargeBinary)
+    test_results_count: Mapped[int]
+    status: Mapped[TestResultIngestStatus] = mapped_column(default=TestResultIngestStatus.PENDING)
+    error: Mapped[str | None] = mapped_column(default=None)
+
+    def __repr__(self) -> str:
+        return data_model_repr(self, "test_execution_id", "kind", "status", "test_results_count")
+
+
+class TestResultDailyRollup(Base):
+    """
+    Number of test results per day, artefact, environment, test case and status
+
+    The day is that of the creation of the results. Kept up to date by a
+    periodic job, see test_result_rollups.py, so that statistics over long
+    periods don't count the results themselves.
+    """
+
+    __test__ = False
+    __tablename__ = "test_result_daily_rollup"
+    __table_args__ = (
+        UniqueConstraint("day", "artefact_id", "environment_id", "test_case_id", "status"),
+        Index(None, "family", "day"),
+        Index(None, "artefact_id", "day"),
+        Index(None, "environment_id", "day"),
+        Index(None, "test_case_id", "day"),
+    )
+
+    day: Mapped[date]
+    family: Mapped[FamilyName]
+    artefact_id: Mapped[int] = mapped_column(ForeignKey("artefact.id", ondelete="CASCADE"))
+    environment_id: Mapped[int] = mapped_column(ForeignKey("environment.id", ondelete="CASCADE"))
+    test_case_id: Mapped[int] = mapped_column(ForeignKey("test_case.id", ondelete="CASCADE"))
+    status: Mapped[TestResultStatus]
+    count: Mapped[int]
+
+    def __repr__(self) -> str:
+        return data_model_repr(self, "day", "artefact_id", "environment_id", "test_case_id", "status", "count")
+
+
+class TestResultDailySummary(Base):
+    """
+    Number of test results per day, artefact, environment and status
+
+    The rollup of test_result_daily_rollup across test cases, which statistics
+    that don't break results down by test case read instead.
+    """
+
+    __test__ = False
+    __tablename__ = "test_result_daily_summary"
+    __table_args__ = (
+        UniqueConstraint("day", "artefact_id", "environment_id", "status"),
+        Index(None, "family", "day"),
+        Index(None, "artefact_id", "day"),
+        Index(None, "environment_id", "day"),
+    )
+
+    day: Mapped[date]
+    family: Mapped[FamilyName]
+    artefact_id: Mapped[int] = mapped_column(ForeignKey("artefact.id", ondelete="CASCADE"))
+    environment_id: Mapped[int] = mapped_column(ForeignKey("environment.id", ondelete="CASCADE"))
+    status: Mapped[TestResultStatus]
+    count: Mapped[int]
+
+    def __repr__(self) -> str:
+        return data_model_repr(self, "day", "artefact_id", "environment_id", "status", "count")
+
+
+class RollupWatermark(Base):
+    """
+    Time up to which rows were processed by a periodic job
+
+    E.g. the creation time up to which test results are counted by the rollups.
+    """
+
+    __tablename__ = "rollup_watermark"
+
+    name: Mapped[str] = mapped_column(String(100), unique=True)
+    watermark: Mapped[datetime]
+
+    def __repr__(self) -> str:
+        return data_model_repr(self, "name", "watermark")
+
+
+class ReportJob(Base):
+    """
+    A table to track background jobs generating reports
+
+    The report is stored compressed in chunks, see report_jobs_logic.py, and
+    downloaded once the job is completed. Pending and running jobs are unique
+    per report and filters so that identical requests share a job.
+    """
+
+    __tablename__ = "report_job"
+    __table_args__ = (
+        Index(
+            "report_job_active_filters_digest_ix",
+            "filters_digest",
+            unique=True,
+            postgresql_where=text("status IN ('PENDING', 'RUNNING')"),
+        ),
+    )
+
+    report: Mapped[ReportName]
+    start_date: Mapped[datetime]
+    # Null for reports up to the time they're generated
+    end_date: Mapped[datetime | None] = mapped_column(default=None)
+    # SHA-256 of the report and filters, in hex
+    filters_digest: Mapped[str] = mapped_column(String(64))
+
+    status: Mapped[JobStatus] = mapped_column(default=JobStatus.PENDING)
+    # Size of the compressed report, once completed
+    size: Mapped[int | None] = mapped_column(BigInteger, default=None)
+    error: Mapped[str | None] = mapped_column(default=None)
+
+    def __repr__(self) -> str:
+        return data_model_repr(self, "report", "start_date", "end_date", "status", "size")
+
+
+class ReportJobChunk(Base):
+    """
+    A table to store the compressed report of a job, a chunk of rows at a time
+
+    Every chunk is a gzip member of its own, so that the report is their
+    concatenation in order of byte offset.
+    """
+
+    __tablename__ = "report_job_chunk"
+    __table_args__ = (UniqueConstraint("report_job_id", "byte_offset"),)
+
+    report_job_id: Mapped[int] = mapped_column(ForeignKey("report_job.id", ondelete="CASCADE"))
+    # Position of the first byte of the chunk in the compressed report
+    byte_offset: Mapped[int] = mapped_column(BigInteger)
+    content: Mapped[bytes] = mapped_column(LargeBinary)
+
+    def __repr__(self) -> str:
+        return data_model_repr(self, "report_job_id", "byte_offset")
+
+
+class ChangeRecord(Base):
+    """
+    A table to record what changed, for consumers polling for changes
+
+    Triggers on the tables of artefacts, builds, test executions, test results,
+    environment reviews and issue attachments write a record per row changed,
+    in the same transaction as the change. Records are read in order of
+    transaction then id, see controllers/changes.
+    """
+
+    __tablename__ = "change_record"
+    __table_args__ = (Index(None, "transaction_id", "id"),)
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    # ID of the transaction that made the change, as given by pg_current_xact_id()
+    transaction_id: Mapped[int] = mapped_column(BigInteger)
+    entity: Mapped[ChangeEntity]
+    entity_id: Mapped[int]
+    # ID of the artefact of a build, the build of a test execution or a review,
+    # the test execution of a result and the test result of an issue attachment
+    parent_id: Mapped[int | None]
+    operation: Mapped[ChangeOperation]
+
+    def __repr__(self) -> str:
+        return data_model_repr(self, "transaction_id", "entity", "entity_id", "parent_id", "operation")
+
+
 class TestEvent(Base):
     """
     A table to represent test events that have ocurred during a job
@@ -775,7 +1114,11 @@ class TestEvent(Base):
     event_name: Mapped[str]
     timestamp: Mapped[datetime]
     detail: Mapped[str]
-    test_execution_id: Mapped[int] = mapped_column(ForeignKey("test_execution.id", ondelete="CASCADE"), index=True)
+
+    # An event is identified by its time and name, which also indexes test_execution_id
+    __table_args__ = (UniqueConstraint("test_execution_id", "timestamp", "event_name"),)
+
+    test_execution_id: Mapped[int] = mapped_column(ForeignKey("test_execution.id", ondelete="CASCADE"))
     test_execution: Mapped["TestExecution"] = relationship(back_populates="test_events")
 
     def __repr__(self) -> str:
@@ -968,6 +1311,51 @@ class IssueTestResultAttachmentRule(Base):
     test_result_statuses: Mapped[list[TestResultStatus]] = mapped_column(
         ARRAY(Enum(TestResultStatus)), nullable=False, default=list
     )
+    jobs: Mapped[list["IssueTestResultAttachmentRuleJob"]] = relationship(
+        back_populates="attachment_rule", cascade="all, delete"
+    )
+
+
+class AttachmentRuleVersion(Base):
+    """
+    Single row holding a new version every time attachment rules change
+
+    Triggers on the rule tables set it within the changing transaction, so
+    readers see a new version exactly when they can see the changed rules.
+    """
+
+    __tablename__ = "attachment_rule_version"
+
+    version: Mapped[int] = mapped_column(BigInteger)
+
+    def __repr__(self) -> str:
+        return data_model_repr(self, "version")
+
+
+class IssueTestResultAttachmentRuleJob(Base):
+    """
+    A table to track background jobs applying an attachment rule to existing test results
+
+    Test results are processed in chunks of ids up to max_test_result_id, which
+    is the newest test result when the job is created. Later results are
+    matched when they are submitted.
+    """
+
+    __tablename__ = "issue_test_result_attachment_rule_job"
+
+    attachment_rule_id: Mapped[int] = mapped_column(
+        ForeignKey("issue_test_result_attachment_rule.id", ondelete="CASCADE"), index=True
+    )
+    attachment_rule: Mapped["IssueTestResultAttachmentRule"] = relationship(back_populates="jobs")
+
+    status: Mapped[JobStatus] = mapped_column(default=JobStatus.PENDING)
+    max_test_result_id: Mapped[int]
+    last_test_result_id: Mapped[int] = mapped_column(default=0)
+    attachments_created: Mapped[int] = mapped_column(default=0)
+    error: Mapped[str | None] = mapped_column(default=None)
+
+    def __repr__(self) -> str:
+        return data_model_repr(self, "attachment_rule_id", "status", "last_test_result_id", "max_test_result_id")
 
 
 class IssueTestResultAttachmentRuleExecutionMetadata(Base):
@@ -131,3 +131,47 @@ class IssueStatus(StrEnum):
 class NotificationType(StrEnum):
     USER_ASSIGNED_ARTEFACT_REVIEW = "USER_ASSIGNED_ARTEFACT_REVIEW"
     USER_ASSIGNED_ENVIRONMENT_REVIEW = "USER_ASSIGNED_ENVIRONMENT_REVIEW"
+
+
+class JobStatus(StrEnum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+
+
+class ReportName(StrEnum):
+    TEST_RESULTS = "TEST_RESULTS"
+    TEST_EXECUTIONS = "TEST_EXECUTIONS"
+
+
+class ChangeEntity(StrEnum):
+    ARTEFACT = "ARTEFACT"
+    ARTEFACT_BUILD = "ARTEFACT_BUILD"
+    TEST_EXECUTION = "TEST_EXECUTION"
+    TEST_RESULT = "TEST_RESULT"
+    ENVIRONMENT_REVIEW = "ENVIRONMENT_REVIEW"
+    ISSUE_ATTACHMENT = "ISSUE_ATTACHMENT"
+
+
+class ChangeOperation(StrEnum):
+    CREATED = "CREATED"
+    UPDATED = "UPDATED"
+    DELETED = "DELETED"
+
+
+class TestResultIngestKind(StrEnum):
+    __test__ = False
+
+    TEST_RESULTS = "TEST_RESULTS"
+    END_TEST = "END_TEST"
+
+
+# Unlike JobStatus there's no running status, as ingests are claimed with a
+# row lock and stored in the same transaction that finishes them
+class TestResultIngestStatus(StrEnum):
+    __test__ = False
+
+    PENDING = "PENDING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
@@ -19,12 +19,15 @@ from collections.abc import Iterable
 from typing import Any
 
 from pydantic import HttpUrl
-from sqlalchemy import and_, func
+from sqlalchemy import Row, String, and_, any_, func, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, joinedload
 
-from .models import Artefact, ArtefactBuild, DataModel, TestExecutionRelevantLink
+from .conflicts import insert_or_select
+from .models import Artefact, ArtefactBuild, DataModel, TestCase, TestExecutionRelevantLink
 from .models_enums import FamilyName
+from .test_case_cache import CachedTestCase, cache_test_cases_on_commit, test_case_cache
 
 
 def get_artefacts_by_family(
@@ -206,6 +209,80 @@ def get_or_create(
     return instance
 
 
+def resolve_test_cases(db: Session, test_cases: Iterable[dict]) -> dict[str, CachedTestCase]:
+    """
+    Bulk version of get_or_create for TestCase, resolving every name in a fixed
+    number of statements regardless of how many test cases are given.
+
+    Test cases are first looked up in the process-local test case cache, and
+    only those missing from it are read from or created in the database.
+    Like get_or_create, existing test cases are returned untouched and the extra
+    fields (category, template_id) are only used when creating a new one, from
+    the last occurrence of its name.
+    This function does NOT commit the transaction.
+
+    :db: DB session
+    :test_cases: dicts with a "name" key and optionally "category" and "template_id"
+    :return: mapping of test case name to test case
+    """
+    # Keep the last occurrence of every name, like the results stored for them
+    rows_by_name = {test_case["name"]: test_case for test_case in test_cases}
+
+    if not rows_by_name:
+        return {}
+
+    resolved = test_case_cache.get_many(rows_by_name)
+    if len(resolved) == len(rows_by_name):
+        return resolved
+
+    columns = (TestCase.name, TestCase.id, TestCase.category, TestCase.template_id)
+
+    def read_test_case(row: Row[Any]) -> CachedTestCase:
+        return CachedTestCase(row.id, row.category, row.template_id)
+
+    def select_test_cases(names: Iterable[str]) -> dict[str, CachedTestCase]:
+        stmt = select(*columns).where(TestCase.name == any_(literal(list(names), ARRAY(String))))
+        return {row.name: read_test_case(row) for row in db.execute(stmt)}
+
+    # Most test cases already exist so look them up first to avoid needless writes
+    found = select_test_cases(name for name in rows_by_name if name not in resolved)
+
+    # In the order given, which orders the ids of new test cases and thus of their results
+    missing = {
+        name: {
+            "name": name,
+            "category": row.get("category", ""),
+            "template_id": row.get("template_id", ""),
+        }
+        for name, row in rows_by_name.items()
+        if name not in resolved and name not in found
+    }
+    if missing:
+        inserted, inserted_concurrently = insert_or_select(
+            db,
+            insert(TestCase).on_conflict_do_nothing(index_elements=["name"]).returning(*columns),
+            missing,
+            read_test_case,
+            select_test_cases,
+            in_lock_order=False,
+        )
+        found.update(inserted)
+        found.update(inserted_concurrently)
+
+    cache_test_cases_on_commit(db, found)
+    resolved.update(found)
+    return resolved
+
+
+def get_or_create_test_cases(db: Session, test_cases: Iterable[dict]) -> dict[str, int]:
+    """
+    Like resolve_test_cases, but only returns the ids of the test cases
+
+    :return: mapping of test case name to test case id
+    """
+    return {name: test_case.id for name, test_case in resolve_test_cases(db, test_cases).items()}
+
+
 def create_test_execution_relevant_link(
     session: Session, test_execution_id: int, label: str, url: HttpUrl
 ) -> TestExecutionRelevantLink:
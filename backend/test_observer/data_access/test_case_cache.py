@@ -0,0 +1,111 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""
+Process-local cache of test cases by name
+
+There are comparatively few test cases, shared by a great many results, and
+they are never deleted by the application. So ingesting results can mostly
+skip looking them up in the database. Test cases only enter the cache once
+the transaction that resolved them commits, so it never holds the id of a
+test case that was rolled back.
+
+The template_id of a cached test case can lag behind an update made by
+another process, until this process updates or evicts it.
+"""
+
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
+from threading import Lock
+from typing import NamedTuple
+
+from sqlalchemy.event import listens_for
+from sqlalchemy.orm import Session, SessionTransaction
+
+from test_observer.common.metrics import test_case_cache_lookups
+
+# Number of test cases kept in the cache, the least recently used ones being evicted
+TEST_CASE_CACHE_SIZE = 100_000
+
+_PENDING_KEY = "pending_test_cases"
+
+
+class CachedTestCase(NamedTuple):
+    id: int
+    category: str
+    template_id: str
+
+
+class TestCaseCache:
+    """Thread safe LRU mapping of test case names to test cases"""
+
+    __test__ = False
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._test_cases: OrderedDict[str, CachedTestCase] = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._test_cases)
+
+    def get_many(self, names: Iterable[str]) -> dict[str, CachedTestCase]:
+        """Get the cached test cases among the given names, counting hits and misses"""
+        found: dict[str, CachedTestCase] = {}
+        misses = 0
+        with self._lock:
+            for name in names:
+                test_case = self._test_cases.get(name)
+                if test_case is None:
+                    misses += 1
+                else:
+                    self._test_cases.move_to_end(name)
+                    found[name] = test_case
+
+        test_case_cache_lookups.labels(result="hit").inc(len(found))
+        test_case_cache_lookups.labels(result="miss").inc(misses)
+        return found
+
+    def put_many(self, test_cases: Mapping[str, CachedTestCase]) -> None:
+        with self._lock:
+            self._test_cases.update(test_cases)
+            for name in test_cases:
+                self._test_cases.move_to_end(name)
+            while len(self._test_cases) > self.max_size:
+                self._test_cases.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._test_cases.clear()
+
+
+test_case_cache = TestCaseCache(TEST_CASE_CACHE_SIZE)
+
+
+def cache_test_cases_on_commit(db: Session, test_cases: Mapping[str, CachedTestCase]) -> None:
+    """Add test cases to the cache once the transaction of the session commits"""
+    db.info.setdefault(_PENDING_KEY, {}).update(test_cases)
+
+
+@listens_for(Session, "after_commit")
+def _cache_pending_test_cases(db: Session) -> None:
+    if pending := db.info.pop(_PENDING_KEY, None):
+        test_case_cache.put_many(pending)
+
+
+@listens_for(Session, "after_soft_rollback")
+def _discard_pending_test_cases(db: Session, _previous_transaction: SessionTransaction) -> None:
+    # Even rolling back a savepoint may undo the creation of some of them
+    db.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,164 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+
+"""
+Maintenance of the daily rollups of test results
+
+test_result_daily_rollup and test_result_daily_summary count the results
+created every day. A periodic job adds the results created since the
+watermark, the creation time up to which results are counted, a day of
+results per transaction. Results are only counted a while after their
+creation so that transactions still storing results when the job runs are
+counted on a later run.
+
+Results can still change status or be deleted once counted, and long
+transactions can store results older than the watermark. Rebuilding the
+rollups of recent days counts them again from scratch to account for these.
+"""
+
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy import ColumnElement, Date, cast, delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from .models import (
+    Artefact,
+    ArtefactBuild,
+    RollupWatermark,
+    TestExecution,
+    TestResult,
+    TestResultDailyRollup,
+    TestResultDailySummary,
+)
+
+TEST_RESULT_ROLLUP = "test_result"
+
+# Age of results from which they are counted
+ROLLUP_SETTLE_DELAY = timedelta(minutes=10)
+
+# Duration of the results counted by every transaction of the job
+ROLLUP_WINDOW = timedelta(days=1)
+
+# Number of days whose rollups are rebuilt, before today
+ROLLUP_REBUILT_DAYS = 7
+
+
+def _lock_watermark(db: Session) -> datetime:
+    """The watermark of the test result rollups, locked until the end of the transaction"""
+    db.execute(
+        insert(RollupWatermark)
+        .values(name=TEST_RESULT_ROLLUP, watermark=datetime.min)
+        .on_conflict_do_nothing(index_elements=[RollupWatermark.name])
+    )
+    return db.execute(
+        select(RollupWatermark.watermark).where(RollupWatermark.name == TEST_RESULT_ROLLUP).with_for_update()
+    ).scalar_one()
+
+
+def _set_watermark(db: Session, watermark: datetime) -> None:
+    db.execute(
+        update(RollupWatermark)
+        .where(RollupWatermark.name == TEST_RESULT_ROLLUP)
+        .values(watermark=watermark, updated_at=func.now())
+    )
+
+
+def _add_counts(db: Session, where: ColumnElement[bool]) -> None:
+    """Add the counts of the results matching a condition to both rollups"""
+    day = cast(TestResult.created_at, Date)
+    results = (
+        select(
+            day.label("day"),
+            Artefact.family,
+            ArtefactBuild.artefact_id,
+            TestExecution.environment_id,
+            TestResult.test_case_id,
+            TestResult.status,
+            func.count().label("count"),
+        )
+        .join(TestResult.test_execution)
+        .join(TestExecution.artefact_build)
+        .join(ArtefactBuild.artefact)
+        .where(where)
+        .group_by(day, Artefact.family, ArtefactBuild.artefact_id, TestExecution.environment_id)
+        .group_by(TestResult.test_case_id, TestResult.status)
+    )
+
+    rollup_columns = ["day", "family", "artefact_id", "environment_id", "test_case_id", "status", "count"]
+    stmt = insert(TestResultDailyRollup).from_select(rollup_columns, results)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["day", "artefact_id", "environment_id", "test_case_id", "status"],
+            set_={"count": TestResultDailyRollup.count + stmt.excluded.count, "updated_at": func.now()},
+        )
+    )
+
+    # The summary aggregates the same results again rather than the rollup, which
+    # already held counts of other results
+    counts = results.subquery()
+    summary_columns = ["day", "family", "artefact_id", "environment_id", "status"]
+    summary = select(*(counts.c[name] for name in summary_columns), func.sum(counts.c.count)).group_by(
+        *(counts.c[name] for name in summary_columns)
+    )
+    stmt = insert(TestResultDailySummary).from_select([*summary_columns, "count"], summary)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["day", "artefact_id", "environment_id", "status"],
+            set_={"count": TestResultDailySummary.count + stmt.excluded.count, "updated_at": func.now()},
+        )
+    )
+
+
+def roll_up_test_results(db: Session) -> bool:
+    """
+    Count the results created after the watermark, up to a day of them
+
+    Concurrent calls wait for each other.
+    This function does NOT commit the transaction.
+
+    :return: whether results created after the new watermark are old enough to be counted
+    """
+    watermark = _lock_watermark(db)
+    horizon = db.execute(select(func.localtimestamp() - ROLLUP_SETTLE_DELAY)).scalar_one()
+
+    # Skip periods without results, starting with those before the first one
+    first_created_at = db.scalar(select(func.min(TestResult.created_at)).where(TestResult.created_at > watermark))
+    if first_created_at is None or first_created_at > horizon:
+        _set_watermark(db, max(watermark, horizon))
+        return False
+
+    end = min(first_created_at + ROLLUP_WINDOW, horizon)
+    _add_counts(db, TestResult.created_at.between(first_created_at, end))
+    _set_watermark(db, end)
+    return end < horizon
+
+
+def rebuild_test_result_rollups(db: Session, since: date) -> None:
+    """
+    Count again the results created from a day up to the watermark
+
+    This function does NOT commit the transaction.
+    """
+    watermark = _lock_watermark(db)
+    db.execute(delete(TestResultDailyRollup).where(TestResultDailyRollup.day >= since))
+    db.execute(delete(TestResultDailySummary).where(TestResultDailySummary.day >= since))
+    _add_counts(db, TestResult.created_at.between(datetime.combine(since, time.min), watermark))
+
+
+def get_test_result_rollups_watermark(db: Session) -> datetime | None:
+    """Creation time up to which results are counted, None before the rollups are first updated"""
+    return db.scalar(select(RollupWatermark.watermark).where(RollupWatermark.name == TEST_RESULT_ROLLUP))
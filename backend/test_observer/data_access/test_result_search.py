@@ -0,0 +1,201 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+
+"""
+Maintenance of the denormalized test result search table
+
+Every test result has a row in test_result_search copying the fields it is
+searched by from its execution, artefact, environment and test case. Rows
+are written when results are stored and rewritten when a copied field of
+the rows they come from changes. They are deleted along with their result.
+
+Changes to test cases and artefacts, which can have any number of results,
+are copied in batches by a background task rather than within the request.
+A periodic repair copies them again in case that task was lost.
+"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import ColumnElement, Integer, Select, any_, func, literal, select, tuple_, update
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.orm import Session
+
+from .models import (
+    Artefact,
+    ArtefactBuild,
+    Environment,
+    RollupWatermark,
+    TestCase,
+    TestExecution,
+    TestResult,
+    TestResultSearchEntry,
+)
+
+# Columns of test_result_search copied from other tables, in the order of _select_entries
+_COPIED_COLUMNS = [
+    "id",
+    "created_at",
+    "test_execution_id",
+    "test_case_id",
+    "artefact_id",
+    "family",
+    "artefact_name",
+    "artefact_version",
+    "artefact_stage",
+    "artefact_track",
+    "artefact_archived",
+    "environment_name",
+    "test_case_name",
+    "template_id",
+    "status",
+    "execution_status",
+]
+
+# Number of test results whose entries are rewritten by every transaction of a reindex
+REINDEX_BATCH_SIZE = 5000
+
+# Name of the watermark up to which changes of test cases and artefacts were repaired
+REPAIR_WATERMARK = "test_result_search_repair"
+
+# Age of the changes from which they're repaired, so that their transaction is committed
+REPAIR_SETTLE_DELAY = timedelta(minutes=10)
+
+
+def _join_related(stmt: Select) -> Select:
+    return (
+        stmt.join(TestResult.test_execution)
+        .join(TestExecution.artefact_build)
+        .join(ArtefactBuild.artefact)
+        .join(TestExecution.environment)
+        .join(TestResult.test_case)
+    )
+
+
+def _select_entries(where: ColumnElement[bool]) -> Select:
+    stmt = _join_related(
+        select(
+            TestResult.id,
+            TestResult.created_at,
+            TestResult.test_execution_id,
+            TestResult.test_case_id,
+            ArtefactBuild.artefact_id,
+            Artefact.family,
+            Artefact.name,
+            Artefact.version,
+            Artefact.stage,
+            Artefact.track,
+            Artefact.archived,
+            Environment.name,
+            TestCase.name,
+            TestCase.template_id,
+            TestResult.status,
+            TestExecution.status,
+            func.now(),
+        )
+    ).where(where)
+    # Ordered so that concurrent reindexes lock entries in the same order
+    return stmt.order_by(TestResult.id)
+
+
+def index_test_results(db: Session, where: ColumnElement[bool]) -> None:
+    """
+    Write the search entries of the test results matching a condition
+
+    The condition may refer to the test result, its test execution, artefact
+    build, artefact, environment and test case. Entries whose fields didn't
+    change are left untouched. Pending changes of the session are flushed
+    first so that they are copied.
+    This function does NOT commit the transaction.
+    """
+    db.flush()
+
+    stmt = insert(TestResultSearchEntry).from_select([*_COPIED_COLUMNS, "updated_at"], _select_entries(where))
+    # The id and created_at of a result never change
+    updated = _COPIED_COLUMNS[2:]
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[TestResultSearchEntry.id],
+            set_={**{name: stmt.excluded[name] for name in updated}, "updated_at": func.now()},
+            where=tuple_(*(TestResultSearchEntry.__table__.c[name] for name in updated)).is_distinct_from(
+                tuple_(*(stmt.excluded[name] for name in updated))
+            ),
+        )
+    )
+
+
+def reindex_test_results_batch(
+    db: Session,
+    where: ColumnElement[bool],
+    after_id: int = 0,
+    batch_size: int = REINDEX_BATCH_SIZE,
+) -> int | None:
+    """
+    Write the search entries of a batch of the test results matching a condition
+
+    Results are taken in order of id from after_id, so that every statement is
+    bounded however many results match.
+    This function does NOT commit the transaction.
+
+    :return: id of the last result of the batch, None when there were none left
+    """
+    ids = db.scalars(
+        _join_related(select(TestResult.id))
+        .where(where, TestResult.id > after_id)
+        .order_by(TestResult.id)
+        .limit(batch_size)
+    ).all()
+    if not ids:
+        return None
+
+    index_test_results(db, TestResult.id == any_(literal(list(ids), ARRAY(Integer))))
+    return ids[-1]
+
+
+def select_changes_to_repair(db: Session) -> tuple[list[int], list[int], datetime]:
+    """
+    Select the test cases and artefacts changed since the last repair of the search entries
+
+    The first repair starts from the time it runs rather than repairing every
+    entry. Entries of the results of the changes that are already up to date
+    are left untouched when reindexed.
+
+    :return: ids of the changed test cases and artefacts, and the time up to
+        which they were changed, to set as watermark once they're reindexed
+    """
+    up_to = db.execute(select(func.localtimestamp() - REPAIR_SETTLE_DELAY)).scalar_one()
+    db.execute(
+        insert(RollupWatermark)
+        .values(name=REPAIR_WATERMARK, watermark=up_to)
+        .on_conflict_do_nothing(index_elements=[RollupWatermark.name])
+    )
+    since = db.execute(select(RollupWatermark.watermark).where(RollupWatermark.name == REPAIR_WATERMARK)).scalar_one()
+
+    test_case_ids = db.scalars(
+        select(TestCase.id).where(TestCase.updated_at > since, TestCase.updated_at <= up_to).order_by(TestCase.id)
+    ).all()
+    artefact_ids = db.scalars(
+        select(Artefact.id).where(Artefact.updated_at > since, Artefact.updated_at <= up_to).order_by(Artefact.id)
+    ).all()
+    return list(test_case_ids), list(artefact_ids), up_to
+
+
+def set_repair_watermark(db: Session, watermark: datetime) -> None:
+    """This function does NOT commit the transaction."""
+    db.execute(
+        update(RollupWatermark)
+        .where(RollupWatermark.name == REPAIR_WATERMARK)
+        .values(watermark=watermark, updated_at=func.now())
+    )
@@ -0,0 +1,85 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""
+Substring search over names
+
+Searched names have GIN trigram indexes where the pg_trgm extension is
+available. These serve ILIKE patterns with wildcards on both sides, so
+substring and prefix matches don't scan the whole table. Matches are ranked
+with prefix matches first, then by trigram similarity to the search term, or
+by length when pg_trgm isn't installed.
+"""
+
+from sqlalchemy import ColumnElement, SQLColumnExpression, func, or_, select, text
+from sqlalchemy.orm import Session
+
+# Number of completions returned when not specified
+COMPLETION_LIMIT = 10
+
+_trigram_support: dict[str, bool] = {}
+
+
+def has_trigram_support(db: Session) -> bool:
+    """Whether the pg_trgm extension is installed, checked once per database"""
+    url = db.get_bind().engine.url.render_as_string()
+    if url not in _trigram_support:
+        _trigram_support[url] = bool(
+            db.scalar(text("SELECT EXISTS (SELECT FROM pg_extension WHERE extname = 'pg_trgm')"))
+        )
+    return _trigram_support[url]
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def contains(column: SQLColumnExpression[str | None], term: str) -> ColumnElement[bool]:
+    """Case insensitive substring match, served by the trigram index of the column"""
+    return column.ilike(f"%{_escape_like(term)}%", escape="\\")
+
+
+def starts_with(column: SQLColumnExpression[str | None], term: str) -> ColumnElement[bool]:
+    """Case insensitive prefix match, served by the trigram index of the column"""
+    return column.ilike(f"{_escape_like(term)}%", escape="\\")
+
+
+def relevance_order(db: Session, columns: list[SQLColumnExpression[str | None]], term: str) -> list[ColumnElement]:
+    """
+    ORDER BY clauses ranking the rows matching term in any of columns, best first
+
+    Callers append their own tie-breakers.
+    """
+    is_prefix = or_(*(starts_with(column, term) for column in columns))
+    if has_trigram_support(db):
+        closeness = func.greatest(*(func.similarity(column, term) for column in columns)).desc()
+    else:
+        # Shorter names containing the term are more similar to it
+        closeness = func.least(*(func.length(column) for column in columns)).asc()
+    return [is_prefix.desc().nulls_last(), closeness.nulls_last()]
+
+
+def complete(
+    db: Session, column: SQLColumnExpression[str | None], prefix: str, limit: int, *where: ColumnElement[bool]
+) -> list[str]:
+    """Distinct values of column starting with prefix, shortest first"""
+    query = (
+        select(column)
+        .where(starts_with(column, prefix), *where)
+        .group_by(column)
+        .order_by(func.length(column), column)
+        .limit(limit)
+    )
+    return list(db.scalars(query))
@@ -0,0 +1,41 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+
+from unittest.mock import patch
+
+from test_observer.common import background_tasks
+from test_observer.common.background_tasks import enqueue_attachment_rule_job, enqueue_test_results_reindex
+
+
+def test_enqueue_failure_is_logged():
+    with (
+        patch("tasks.celery.apply_attachment_rule_retroactively.delay", side_effect=ConnectionError),
+        patch.object(background_tasks.logger, "exception") as log_exception,
+    ):
+        enqueue_attachment_rule_job(1)
+
+    log_exception.assert_called_once()
+
+
+def test_reindex_enqueue_failure_is_logged():
+    with (
+        patch("tasks.celery.reindex_test_case_test_results.delay", side_effect=ConnectionError),
+        patch("tasks.celery.reindex_artefact_test_results.delay", side_effect=ConnectionError),
+        patch.object(background_tasks.logger, "exception") as log_exception,
+    ):
+        enqueue_test_results_reindex([1], [2])
+
+    assert log_exception.call_count == 2
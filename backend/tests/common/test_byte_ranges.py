@@ -0,0 +1,81 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+from collections.abc import Iterator
+
+import pytest
+from fastapi import HTTPException
+
+from test_observer.common.byte_ranges import accepts_gzip, parse_byte_range, streamed_range_response
+
+
+@pytest.mark.parametrize(
+    ("range_header", "expected"),
+    [
+        ("bytes=0-99", (0, 99)),
+        ("bytes=10-", (10, 999)),
+        ("bytes=-100", (900, 999)),
+        ("bytes=-5000", (0, 999)),
+        ("bytes=990-5000", (990, 999)),
+        ("bytes=5-4", None),
+        ("bytes=-", None),
+        ("bytes=0-1,5-6", None),
+        ("lines=0-10", None),
+    ],
+)
+def test_parses_single_byte_range(range_header: str, expected: tuple[int, int] | None):
+    assert parse_byte_range(range_header, 1000) == expected
+
+
+@pytest.mark.parametrize("range_header", ["bytes=1000-", "bytes=-0"])
+def test_rejects_unsatisfiable_range(range_header: str):
+    with pytest.raises(HTTPException) as exc_info:
+        parse_byte_range(range_header, 1000)
+
+    assert exc_info.value.status_code == 416
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "expected"),
+    [("gzip", True), ("deflate, gzip;q=0.5", True), ("gzip;q=0", False), ("br", False), ("", False)],
+)
+def test_accepts_gzip(accept_encoding: str, expected: bool):
+    assert accepts_gzip(accept_encoding) is expected
+
+
+@pytest.mark.parametrize(
+    ("range_header", "status_code", "content_range", "content_length"),
+    [(None, 200, None, "1000"), ("bytes=-100", 206, "bytes 900-999/1000", "100")],
+)
+def test_streams_range_of_content(
+    range_header: str | None,
+    status_code: int,
+    content_range: str | None,
+    content_length: str,
+):
+    reads: list[tuple[int, int]] = []
+
+    def read(start: int, end: int) -> Iterator[bytes]:
+        reads.append((start, end))
+        return iter([bytes(end - start + 1)])
+
+    response = streamed_range_response(1000, read, "application/octet-stream", range_header, {"X-Header": "value"})
+
+    assert response.status_code == status_code
+    assert response.headers.get("content-range") == content_range
+    assert response.headers["content-length"] == content_length
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["x-header"] == "value"
+    assert reads == [(0, 999)] if range_header is None else [(900, 999)]
@@ -0,0 +1,90 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel
+
+from test_observer.common.ndjson import NDJSONReader
+
+
+class Line(BaseModel):
+    value: int
+
+
+def _request(*body_parts: bytes) -> Request:
+    messages = [{"type": "http.request", "body": part, "more_body": True} for part in body_parts]
+    messages.append({"type": "http.request", "body": b"", "more_body": False})
+
+    async def receive() -> dict:
+        return messages.pop(0)
+
+    return Request({"type": "http", "method": "POST", "headers": []}, receive)
+
+
+def _read_chunks(request: Request, max_line_bytes: int = 1024, **kwargs: int) -> list[list[int]]:
+    async def read() -> list[list[int]]:
+        reader = NDJSONReader(request, max_line_bytes=max_line_bytes)
+        return [[line.value for line in chunk] async for chunk in reader.read_chunks(Line, **kwargs)]
+
+    return asyncio.run(read())
+
+
+def test_reassembles_lines_split_across_body_parts():
+    request = _request(b'{"value": 1}\n{"val', b'ue": 2}\n\n{"value"', b": 3}")
+
+    assert _read_chunks(request) == [[1, 2, 3]]
+
+
+def test_bounds_chunks_by_rows():
+    request = _request(b"".join(b'{"value": %d}\n' % i for i in range(5)))
+
+    assert _read_chunks(request, max_rows=2) == [[0, 1], [2, 3], [4]]
+
+
+def test_bounds_chunks_by_bytes():
+    request = _request(b'{"value": 1}\n{"value": 2}\n{"value": 3}\n')
+
+    assert _read_chunks(request, max_bytes=20) == [[1, 2], [3]]
+
+
+def test_reports_line_number_of_invalid_line():
+    request = _request(b'{"value": 1}\n\n{"value": "x"}\n')
+
+    with pytest.raises(RequestValidationError) as e:
+        _read_chunks(request)
+
+    assert e.value.errors()[0]["loc"] == ("body", 3, "value")
+
+
+@pytest.mark.parametrize(
+    "body_parts",
+    [
+        [b'{"value": 1}\n{"value": 1' + b" " * 20 + b"}\n"],
+        # Rejected before the end of the line is received
+        [b'{"value": 1}\n{"value": 1', b" " * 10, b" " * 10],
+    ],
+)
+def test_rejects_lines_longer_than_maximum(body_parts: list[bytes]):
+    request = _request(*body_parts)
+
+    with pytest.raises(HTTPException) as e:
+        _read_chunks(request, max_line_bytes=20)
+
+    assert e.value.status_code == 413
+    assert e.value.detail == "Line 2 is longer than 20 bytes"
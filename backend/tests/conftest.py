@@ -17,9 +17,10 @@
 
 import json
 from base64 import b64encode
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
 from contextlib import contextmanager
 from os import environ
+from unittest.mock import MagicMock, patch
 
 import itsdangerous
 import pytest
@@ -39,9 +40,11 @@ from test_observer.common.enums import Permission
 from test_observer.controllers.applications.application_injection import (
     get_current_application,
 )
+from test_observer.data_access.counts import count_cache
 from test_observer.data_access.models import Application, TestExecution, User
 from test_observer.data_access.models_enums import StageName
 from test_observer.data_access.setup import get_db
+from test_observer.data_access.test_case_cache import test_case_cache
 from test_observer.main import app
 from tests.data_generator import DataGenerator
 
@@ -142,6 +145,25 @@ def db_session(db_engine: Engine):
     connection.close()
 
 
+@pytest.fixture(autouse=True)
+def clear_test_case_cache():
+    """Forget test cases cached by a previous test, whose transaction was rolled back"""
+    test_case_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_count_cache():
+    """Forget counts cached by a previous test, whose transaction was rolled back"""
+    count_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def enqueue_test_results_reindex() -> Iterator[MagicMock]:
+    """Record the reindexes enqueued on commit rather than sending them to a broker"""
+    with patch("test_observer.common.background_tasks.enqueue_test_results_reindex") as mock:
+        yield mock
+
+
 @pytest.fixture(scope="function")
 def test_client(db_session: Session) -> TestClient:
     """Create a test http client"""
@@ -17,6 +17,7 @@ from collections.abc import Callable
 from datetime import date, timedelta
 from operator import itemgetter
 from typing import Any
+from unittest.mock import MagicMock
 
 import pytest
 from fastapi.testclient import TestClient
@@ -24,7 +25,13 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from test_observer.common.enums import Permission
-from test_observer.data_access.models import Artefact, Notification, TestExecution
+from test_observer.data_access.models import (
+    Artefact,
+    ArtefactBuild,
+    Notification,
+    TestExecution,
+    TestResultSearchEntry,
+)
 from test_observer.data_access.models_enums import (
     ArtefactBuildEnvironmentReviewDecision,
     ArtefactStatus,
@@ -32,6 +39,7 @@ from test_observer.data_access.models_enums import (
     NotificationType,
     StageName,
 )
+from test_observer.data_access.test_result_search import reindex_test_results_batch
 from test_observer.main import app
 from test_observer.users.user_injection import get_current_user
 from tests.conftest import authenticate_user, make_authenticated_request
@@ -446,6 +454,29 @@ def test_artefact_unarchive(test_client: TestClient, generator: DataGenerator):
     assert not artefact.archived
 
 
+def test_artefact_archive_updates_search_entries(
+    test_client: TestClient,
+    generator: DataGenerator,
+    test_execution: TestExecution,
+    db_session: Session,
+    enqueue_test_results_reindex: MagicMock,
+):
+    test_result = generator.gen_test_result(generator.gen_test_case(), test_execution)
+    artefact_id = test_execution.artefact_build.artefact_id
+
+    make_authenticated_request(
+        lambda: test_client.patch(f"/v1/artefacts/{artefact_id}", json={"archived": True}),
+        Permission.change_artefact,
+    )
+
+    enqueue_test_results_reindex.assert_called_once_with([], [artefact_id])
+    reindex_test_results_batch(db_session, ArtefactBuild.artefact_id == artefact_id)
+    entry = db_session.get(TestResultSearchEntry, test_result.id)
+    assert entry
+    db_session.refresh(entry)
+    assert entry.artefact_archived
+
+
 def test_artefact_promote(test_client: TestClient, generator: DataGenerator):
     artefact = generator.gen_artefact(StageName.candidate)
 
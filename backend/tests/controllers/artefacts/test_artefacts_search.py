@@ -254,3 +254,44 @@ def test_search_artefacts_pagination_metadata(test_client: TestClient, generator
     assert data["limit"] == 2
     assert data["offset"] == 1
     assert len(data["artefacts"]) == 2
+
+
+def test_search_artefacts_ranks_closest_matches_first(test_client: TestClient, generator: DataGenerator):
+    unique_marker = uuid.uuid4().hex[:8]
+    names = [f"core-{unique_marker}-desktop", f"{unique_marker}-core", f"{unique_marker}"]
+    for name in names:
+        generator.gen_artefact(name=name)
+
+    response = make_authenticated_request(
+        lambda: test_client.get(f"/v1/artefacts/search?q={unique_marker}"),
+        Permission.view_artefact,
+    )
+
+    assert response.status_code == 200
+    assert response.json()["artefacts"] == [unique_marker, f"{unique_marker}-core", f"core-{unique_marker}-desktop"]
+
+
+def test_complete_artefact_names(test_client: TestClient, generator: DataGenerator):
+    unique_marker = uuid.uuid4().hex[:8]
+    generator.gen_artefact(name=f"{unique_marker}-core22")
+    generator.gen_artefact(name=f"{unique_marker}-core22", version="2")
+    generator.gen_artefact(name=f"{unique_marker}-core")
+    generator.gen_artefact(name=f"{unique_marker}-archived", archived=True)
+    generator.gen_artefact(name=f"other-{unique_marker}")
+
+    response = make_authenticated_request(
+        lambda: test_client.get(f"/v1/artefacts/completions?prefix={unique_marker.upper()}"),
+        Permission.view_artefact,
+    )
+
+    assert response.status_code == 200
+    assert response.json() == [f"{unique_marker}-core", f"{unique_marker}-core22"]
+
+
+def test_complete_artefact_names_requires_prefix(test_client: TestClient):
+    response = make_authenticated_request(
+        lambda: test_client.get("/v1/artefacts/completions?prefix="),
+        Permission.view_artefact,
+    )
+
+    assert response.status_code == 422
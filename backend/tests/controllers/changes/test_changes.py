@@ -0,0 +1,67 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+
+from fastapi.testclient import TestClient
+from httpx import Response
+
+from test_observer.common.enums import Permission
+from test_observer.data_access.models_enums import ChangeEntity, ChangeOperation
+from tests.conftest import make_authenticated_request
+from tests.data_generator import DataGenerator
+
+
+def _get_changes(test_client: TestClient, params: dict) -> Response:
+    return make_authenticated_request(
+        lambda: test_client.get("/v1/changes", params=params),
+        Permission.view_artefact,
+        Permission.view_test,
+    )
+
+
+def test_gets_changes_since_cursor(test_client: TestClient, generator: DataGenerator):
+    artefact = generator.gen_artefact()
+
+    response = _get_changes(test_client, {})
+    assert response.status_code == 200
+    [change] = response.json()["changes"]
+    assert change["entity"] == ChangeEntity.ARTEFACT
+    assert change["entity_id"] == artefact.id
+    assert change["parent_id"] is None
+    assert change["operation"] == ChangeOperation.CREATED
+    assert "changed_at" in change
+
+    build = generator.gen_artefact_build(artefact)
+    response = _get_changes(test_client, {"since": response.json()["next_cursor"]})
+    assert [(c["entity"], c["entity_id"]) for c in response.json()["changes"]] == [
+        (ChangeEntity.ARTEFACT_BUILD, build.id)
+    ]
+
+    response = _get_changes(test_client, {"since": response.json()["next_cursor"]})
+    assert response.json()["changes"] == []
+
+
+def test_limits_changes(test_client: TestClient, generator: DataGenerator):
+    for name in ["a", "b", "c"]:
+        generator.gen_artefact(name=name)
+
+    first_page = _get_changes(test_client, {"limit": 2}).json()
+    second_page = _get_changes(test_client, {"limit": 2, "since": first_page["next_cursor"]}).json()
+
+    assert (len(first_page["changes"]), len(second_page["changes"])) == (2, 1)
+
+
+def test_rejects_invalid_cursor(test_client: TestClient):
+    assert _get_changes(test_client, {"since": "invalid"}).status_code == 422
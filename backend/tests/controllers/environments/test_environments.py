@@ -332,3 +332,18 @@ def test_get_environments_pagination_metadata(test_client: TestClient, generator
     assert data["limit"] == 2
     assert data["offset"] == 1
     assert len(data["environments"]) == 2
+
+
+def test_complete_environment_names(test_client: TestClient, generator: DataGenerator):
+    unique_marker = uuid.uuid4().hex[:8]
+    generator.gen_environment(name=f"{unique_marker}-laptop", architecture="amd64")
+    generator.gen_environment(name=f"{unique_marker}-laptop", architecture="arm64")
+    generator.gen_environment(name=f"{unique_marker}-rpi4")
+
+    response = make_authenticated_request(
+        lambda: test_client.get(f"/v1/environments/completions?prefix={unique_marker}"),
+        Permission.view_test,
+    )
+
+    assert response.status_code == 200
+    assert response.json() == [f"{unique_marker}-rpi4", f"{unique_marker}-laptop"]
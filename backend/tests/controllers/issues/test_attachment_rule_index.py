@@ -0,0 +1,159 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from test_observer.common.enums import Permission
+from test_observer.controllers.issues.attachment_rule_index import (
+    AttachmentRuleIndex,
+    CompiledAttachmentRule,
+    MatchableTestResult,
+    attachment_rule_index_cache,
+)
+from test_observer.controllers.issues.attachment_rules_logic import (
+    apply_test_results_attachment_rules,
+)
+from test_observer.data_access.models import IssueTestResultAttachmentRule, TestExecution
+from test_observer.data_access.models_enums import FamilyName, TestResultStatus
+from tests.conftest import make_authenticated_request
+from tests.data_generator import DataGenerator
+
+test_result = MatchableTestResult(
+    test_result_id=1,
+    family=FamilyName.snap,
+    artefact_name="core",
+    artefact_version="1.1.1",
+    artefact_stage="beta",
+    artefact_track="latest",
+    environment_name="laptop",
+    test_case_name="camera/detect",
+    template_id="camera/detect_name",
+    status=TestResultStatus.FAILED,
+    execution_metadata={"category1": frozenset({"value1", "value2"})},
+)
+
+
+def _rule(
+    rule_id: int,
+    issue_id: int,
+    constraints: dict | None = None,
+    execution_metadata: dict | None = None,
+) -> CompiledAttachmentRule:
+    return CompiledAttachmentRule(
+        id=rule_id,
+        issue_id=issue_id,
+        constraints=tuple((field, frozenset(values)) for field, values in (constraints or {}).items()),
+        execution_metadata={category: frozenset(values) for category, values in (execution_metadata or {}).items()},
+    )
+
+
+def test_index_matches_rules_of_every_bucket():
+    rules = [
+        _rule(1, 1, {"test_case_name": ["camera/detect"]}),
+        _rule(2, 2, {"family": [FamilyName.snap], "environment_name": ["laptop", "desktop"]}),
+        _rule(3, 3),
+        _rule(4, 4, {"status": [TestResultStatus.FAILED]}, {"category1": ["value2", "value3"]}),
+        _rule(5, 5, {"test_case_name": ["camera/poweroff"]}),
+        _rule(6, 6, {"family": [FamilyName.snap], "environment_name": ["desktop"]}),
+        _rule(7, 7, execution_metadata={"category2": ["value1"]}),
+    ]
+
+    matched = AttachmentRuleIndex(rules).match(test_result)
+
+    assert [rule.id for rule in matched] == [1, 2, 3, 4]
+
+
+def test_index_keeps_oldest_rule_of_every_issue():
+    rules = [
+        _rule(3, 1, {"artefact_name": ["core"]}),
+        _rule(2, 1),
+        _rule(1, 2, {"template_id": ["camera/detect_name"]}),
+        _rule(4, 2, {"artefact_track": ["latest"]}),
+    ]
+
+    matched = AttachmentRuleIndex(rules).match(test_result)
+
+    assert {(rule.issue_id, rule.id) for rule in matched} == {(1, 2), (2, 1)}
+
+
+def test_cache_picks_up_rule_changes(
+    test_client: TestClient,
+    generator: DataGenerator,
+    db_session: Session,
+    test_execution: TestExecution,
+):
+    test_case = generator.gen_test_case()
+    issue = generator.gen_issue()
+
+    response = make_authenticated_request(
+        lambda: test_client.post(f"/v1/issues/{issue.id}/attachment-rules", json={"test_case_names": [test_case.name]}),
+        Permission.change_attachment_rule,
+    )
+    rule_id = response.json()["id"]
+
+    index = attachment_rule_index_cache.get(db_session)
+    assert attachment_rule_index_cache.get(db_session) is index
+
+    first_result = generator.gen_test_result(test_case, test_execution)
+    apply_test_results_attachment_rules(db_session, [first_result.id])
+    db_session.expire_all()
+    assert [attachment.attachment_rule_id for attachment in first_result.issue_attachments] == [rule_id]
+
+    make_authenticated_request(
+        lambda: test_client.patch(f"/v1/issues/{issue.id}/attachment-rules/{rule_id}", json={"enabled": False}),
+        Permission.change_attachment_rule,
+    )
+    db_session.expire_all()
+    assert attachment_rule_index_cache.get(db_session) is not index
+
+    second_result = generator.gen_test_result(
+        test_case,
+        generator.gen_test_execution(test_execution.artefact_build, generator.gen_environment(name="other")),
+    )
+    apply_test_results_attachment_rules(db_session, [second_result.id])
+    db_session.expire_all()
+    assert second_result.issue_attachments == []
+
+
+def test_cache_picks_up_deleted_rules(test_client: TestClient, generator: DataGenerator, db_session: Session):
+    test_case = generator.gen_test_case()
+    issue = generator.gen_issue()
+    rule = IssueTestResultAttachmentRule(issue=issue, test_case_names=[test_case.name])
+    db_session.add(rule)
+    db_session.commit()
+
+    assert len(attachment_rule_index_cache.get(db_session)) == 1
+
+    make_authenticated_request(
+        lambda: test_client.delete(f"/v1/issues/{issue.id}/attachment-rules/{rule.id}"),
+        Permission.change_attachment_rule,
+    )
+    db_session.expire_all()
+
+    assert len(attachment_rule_index_cache.get(db_session)) == 0
+
+
+def test_cache_picks_up_bulk_updates(generator: DataGenerator, db_session: Session):
+    issue = generator.gen_issue()
+    db_session.add(IssueTestResultAttachmentRule(issue=issue, test_case_names=["test"]))
+    db_session.commit()
+
+    assert len(attachment_rule_index_cache.get(db_session)) == 1
+
+    db_session.execute(update(IssueTestResultAttachmentRule).values(enabled=False))
+
+    assert len(attachment_rule_index_cache.get(db_session)) == 0
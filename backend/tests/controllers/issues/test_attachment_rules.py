@@ -13,20 +13,23 @@
 # SPDX-FileCopyrightText: Copyright 2025 Canonical Ltd.
 # SPDX-License-Identifier: AGPL-3.0-only
 
+from unittest.mock import patch
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 
 from test_observer.common.enums import Permission
 from test_observer.controllers.issues.attachment_rules_logic import (
-    apply_test_result_attachment_rules,
+    apply_test_results_attachment_rules,
 )
 from test_observer.data_access.models import (
     IssueTestResultAttachmentRule,
     IssueTestResultAttachmentRuleExecutionMetadata,
+    IssueTestResultAttachmentRuleJob,
     TestExecution,
 )
-from test_observer.data_access.models_enums import TestResultStatus
+from test_observer.data_access.models_enums import JobStatus, TestResultStatus
 from tests.conftest import make_authenticated_request
 from tests.data_generator import DataGenerator
 
@@ -34,6 +37,7 @@ issue_endpoint = "/v1/issues/{issue_id}"
 post_endpoint = issue_endpoint + "/attachment-rules"
 patch_endpoint = post_endpoint + "/{attachment_rule_id}"
 delete_endpoint = patch_endpoint
+job_endpoint = patch_endpoint + "/jobs/{job_id}"
 
 
 def auth_request(method: str, test_client: TestClient, endpoint: str, **kwargs):
@@ -119,7 +123,9 @@ def test_post_attachment_rule(
 
     assert response.status_code == 200
     attachment_rule = db_session.get(IssueTestResultAttachmentRule, response.json()["id"])
-    _assert_attachment_rule_response(response.json(), attachment_rule)
+    rule_json = response.json()
+    assert rule_json.pop("job") is None
+    _assert_attachment_rule_response(rule_json, attachment_rule)
 
     issue_response = make_authenticated_request(
         lambda: test_client.get(issue_endpoint.format(issue_id=issue.id)),
@@ -159,6 +165,110 @@ def test_post_attachment_rule_twice(test_client: TestClient, generator: DataGene
     }
 
 
+def test_post_attachment_rule_apply_retroactively(
+    test_client: TestClient,
+    generator: DataGenerator,
+    post_attachment_rule: dict,
+    test_execution: TestExecution,
+):
+    issue = generator.gen_issue()
+    test_result = generator.gen_test_result(generator.gen_test_case(), test_execution)
+
+    with patch(
+        "test_observer.controllers.issues.attachment_rules.enqueue_attachment_rule_job"
+    ) as mock_apply_retroactively:
+        response = auth_request(
+            "post",
+            test_client,
+            post_endpoint.format(issue_id=issue.id),
+            json={**post_attachment_rule, "apply_retroactively": True},
+        )
+
+    assert response.status_code == 200
+    job = response.json()["job"]
+    assert job["attachment_rule_id"] == response.json()["id"]
+    assert job["status"] == JobStatus.PENDING
+    assert job["last_test_result_id"] == 0
+    assert job["max_test_result_id"] == test_result.id
+    assert job["progress"] == 0
+    mock_apply_retroactively.assert_called_once_with(job["id"])
+
+
+def test_post_disabled_attachment_rule_apply_retroactively(
+    test_client: TestClient,
+    generator: DataGenerator,
+    post_attachment_rule: dict,
+):
+    issue = generator.gen_issue()
+
+    with patch(
+        "test_observer.controllers.issues.attachment_rules.enqueue_attachment_rule_job"
+    ) as mock_apply_retroactively:
+        response = auth_request(
+            "post",
+            test_client,
+            post_endpoint.format(issue_id=issue.id),
+            json={**post_attachment_rule, "enabled": False, "apply_retroactively": True},
+        )
+
+    assert response.status_code == 422
+    mock_apply_retroactively.assert_not_called()
+
+
+def test_get_attachment_rule_job(
+    test_client: TestClient,
+    generator: DataGenerator,
+    db_session: Session,
+):
+    issue = generator.gen_issue()
+    attachment_rule = IssueTestResultAttachmentRule(issue=issue)
+    job = IssueTestResultAttachmentRuleJob(
+        attachment_rule=attachment_rule,
+        status=JobStatus.RUNNING,
+        last_test_result_id=25,
+        max_test_result_id=100,
+        attachments_created=3,
+    )
+    db_session.add(job)
+    db_session.commit()
+
+    response = make_authenticated_request(
+        lambda: test_client.get(
+            job_endpoint.format(issue_id=issue.id, attachment_rule_id=attachment_rule.id, job_id=job.id)
+        ),
+        Permission.view_issue,
+    )
+
+    assert response.status_code == 200
+    assert response.json()["id"] == job.id
+    assert response.json()["status"] == JobStatus.RUNNING
+    assert response.json()["attachments_created"] == 3
+    assert response.json()["progress"] == 0.25
+    assert response.json()["error"] is None
+
+
+def test_get_attachment_rule_job_wrong_issue(
+    test_client: TestClient,
+    generator: DataGenerator,
+    db_session: Session,
+):
+    issue = generator.gen_issue()
+    other_issue = generator.gen_issue(key="other")
+    attachment_rule = IssueTestResultAttachmentRule(issue=issue)
+    job = IssueTestResultAttachmentRuleJob(attachment_rule=attachment_rule, max_test_result_id=0)
+    db_session.add(job)
+    db_session.commit()
+
+    response = make_authenticated_request(
+        lambda: test_client.get(
+            job_endpoint.format(issue_id=other_issue.id, attachment_rule_id=attachment_rule.id, job_id=job.id)
+        ),
+        Permission.view_issue,
+    )
+
+    assert response.status_code == 404
+
+
 def test_patch_attachment_rule_no_change(test_client: TestClient, generator: DataGenerator, post_attachment_rule: dict):
     issue = generator.gen_issue()
 
@@ -337,7 +447,11 @@ def test_attachment_rule_matches_only_selected_statuses(
 ):
     """Test that attachment rules filter test results by test_result_statuses."""
     issue = generator.gen_issue()
-    test_case = generator.gen_test_case(template_id="template")
+    # A test execution has one result per test case
+    test_cases = {
+        status: generator.gen_test_case(name=f"camera/detect-{status.lower()}", template_id="template")
+        for status in TestResultStatus
+    }
 
     # Create attachment rule that only matches FAILED test results
     rule_response = auth_request(
@@ -348,7 +462,7 @@ def test_attachment_rule_matches_only_selected_statuses(
             "enabled": True,
             "families": [test_execution.artefact_build.artefact.family],
             "environment_names": [test_execution.environment.name],
-            "test_case_names": [test_case.name],
+            "test_case_names": [test_case.name for test_case in test_cases.values()],
             "template_ids": ["template"],
             "test_result_statuses": ["FAILED"],
             "execution_metadata": {},
@@ -357,12 +471,18 @@ def test_attachment_rule_matches_only_selected_statuses(
     assert rule_response.status_code == 200
 
     # Create test results with different statuses using the data generator
-    tr_failed = generator.gen_test_result(test_case, test_execution, status=TestResultStatus.FAILED)
-    apply_test_result_attachment_rules(db_session, tr_failed)
-    tr_skipped = generator.gen_test_result(test_case, test_execution, status=TestResultStatus.SKIPPED)
-    apply_test_result_attachment_rules(db_session, tr_skipped)
-    tr_passed = generator.gen_test_result(test_case, test_execution, status=TestResultStatus.PASSED)
-    apply_test_result_attachment_rules(db_session, tr_passed)
+    tr_failed = generator.gen_test_result(
+        test_cases[TestResultStatus.FAILED], test_execution, status=TestResultStatus.FAILED
+    )
+    apply_test_results_attachment_rules(db_session, [tr_failed.id])
+    tr_skipped = generator.gen_test_result(
+        test_cases[TestResultStatus.SKIPPED], test_execution, status=TestResultStatus.SKIPPED
+    )
+    apply_test_results_attachment_rules(db_session, [tr_skipped.id])
+    tr_passed = generator.gen_test_result(
+        test_cases[TestResultStatus.PASSED], test_execution, status=TestResultStatus.PASSED
+    )
+    apply_test_results_attachment_rules(db_session, [tr_passed.id])
     db_session.commit()
 
     # Fetch test results
@@ -400,7 +520,11 @@ def test_attachment_rule_with_empty_statuses_matches_all(
 ):
     """Test that attachment rules with empty test_result_statuses match all statuses."""
     issue = generator.gen_issue()
-    test_case = generator.gen_test_case(template_id="template")
+    # A test execution has one result per test case
+    test_cases = {
+        status: generator.gen_test_case(name=f"camera/detect-{status.lower()}", template_id="template")
+        for status in TestResultStatus
+    }
 
     # Create attachment rule with no status filter (empty array)
     rule_response = auth_request(
@@ -411,7 +535,7 @@ def test_attachment_rule_with_empty_statuses_matches_all(
             "enabled": True,
             "families": [test_execution.artefact_build.artefact.family],
             "environment_names": [test_execution.environment.name],
-            "test_case_names": [test_case.name],
+            "test_case_names": [test_case.name for test_case in test_cases.values()],
             "template_ids": ["template"],
             "test_result_statuses": [],
             "execution_metadata": {},
@@ -420,12 +544,18 @@ def test_attachment_rule_with_empty_statuses_matches_all(
     assert rule_response.status_code == 200
 
     # Create test results with different statuses using the data generator
-    tr_failed = generator.gen_test_result(test_case, test_execution, status=TestResultStatus.FAILED)
-    apply_test_result_attachment_rules(db_session, tr_failed)
-    tr_passed = generator.gen_test_result(test_case, test_execution, status=TestResultStatus.PASSED)
-    apply_test_result_attachment_rules(db_session, tr_passed)
-    tr_skipped = generator.gen_test_result(test_case, test_execution, status=TestResultStatus.SKIPPED)
-    apply_test_result_attachment_rules(db_session, tr_skipped)
+    tr_failed = generator.gen_test_result(
+        test_cases[TestResultStatus.FAILED], test_execution, status=TestResultStatus.FAILED
+    )
+    apply_test_results_attachment_rules(db_session, [tr_failed.id])
+    tr_passed = generator.gen_test_result(
+        test_cases[TestResultStatus.PASSED], test_execution, status=TestResultStatus.PASSED
+    )
+    apply_test_results_attachment_rules(db_session, [tr_passed.id])
+    tr_skipped = generator.gen_test_result(
+        test_cases[TestResultStatus.SKIPPED], test_execution, status=TestResultStatus.SKIPPED
+    )
+    apply_test_results_attachment_rules(db_session, [tr_skipped.id])
     db_session.commit()
 
     # Fetch test results
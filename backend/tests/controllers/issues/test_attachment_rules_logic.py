@@ -13,21 +13,33 @@
 # SPDX-FileCopyrightText: Copyright 2025 Canonical Ltd.
 # SPDX-License-Identifier: AGPL-3.0-only
 
+from datetime import datetime, timedelta
+
 import pytest
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 
+from test_observer.controllers.issues import attachment_rules_logic
+from test_observer.controllers.issues.attachment_rule_index import (
+    attachment_rule_index_cache,
+    load_matchable_test_results,
+)
 from test_observer.controllers.issues.attachment_rules_logic import (
-    apply_test_result_attachment_rules,
-    query_matching_test_result_attachment_rules,
+    apply_test_results_attachment_rules,
+    create_attachment_rule_job,
+    query_test_results_matching_attachment_rule,
+    run_attachment_rule_job_chunk,
+    select_stale_attachment_rule_jobs,
 )
 from test_observer.data_access.models import (
     IssueTestResultAttachmentRule,
     IssueTestResultAttachmentRuleExecutionMetadata,
+    IssueTestResultAttachmentRuleJob,
 )
-from test_observer.data_access.models_enums import FamilyName
+from test_observer.data_access.models_enums import FamilyName, JobStatus
 from tests.data_generator import DataGenerator
 
-params_query_matching_test_result_attachment_rules: list[dict] = [
+params_matching_attachment_rules: list[dict] = [
     {
         "label": "no_rules",
         "attachment_rules": [],
@@ -181,10 +193,10 @@ params_query_matching_test_result_attachment_rules: list[dict] = [
 
 @pytest.mark.parametrize(
     "params",
-    params_query_matching_test_result_attachment_rules,
-    ids=[params["label"] for params in params_query_matching_test_result_attachment_rules],
+    params_matching_attachment_rules,
+    ids=[params["label"] for params in params_matching_attachment_rules],
 )
-def test_query_matching_test_result_attachment_rules(
+def test_matching_attachment_rules(
     params: dict,
     generator: DataGenerator,
     db_session: Session,
@@ -234,10 +246,28 @@ def test_query_matching_test_result_attachment_rules(
         if match_expected:
             expected_matched_rules.add(attachment_rule.id)
 
-    attachment_rules_stmt = query_matching_test_result_attachment_rules(test_result)
-    attachment_rules = db_session.scalars(attachment_rules_stmt).all()
+    # The statement retroactive jobs match every rule with
+    matched_rules = {
+        attachment_rule_id
+        for attachment_rule in db_session.scalars(select(IssueTestResultAttachmentRule))
+        for _, attachment_rule_id, _ in db_session.execute(
+            query_test_results_matching_attachment_rule(attachment_rule.id, test_result.id - 1, test_result.id)
+        )
+    }
+    assert matched_rules == expected_matched_rules
 
-    assert {rule.id for rule in attachment_rules} == expected_matched_rules
+    # The in-memory index must agree with it
+    [matchable_test_result] = load_matchable_test_results(db_session, [test_result.id])
+    index_rows = [
+        (rule.issue_id, rule.id, test_result.id)
+        for rule in attachment_rule_index_cache.get(db_session).match(matchable_test_result)
+    ]
+
+    # All rules belong to the same issue, so only the oldest matching one is attached
+    if expected_matched_rules:
+        assert index_rows == [(issue.id, min(expected_matched_rules), test_result.id)]
+    else:
+        assert index_rows == []
 
 
 def test_apply_test_result_attachment_rules(
@@ -264,9 +294,123 @@ def test_apply_test_result_attachment_rules(
         db_session.add(attachment_rule)
     db_session.commit()
 
-    apply_test_result_attachment_rules(db_session, test_result)
+    apply_test_results_attachment_rules(db_session, [test_result.id])
 
     assert {(attachment.issue_id, attachment.attachment_rule_id) for attachment in test_result.issue_attachments} == {
         (issue_1.id, attachment_rules[0].id),
         (issue_3.id, attachment_rules[2].id),
     }
+
+
+def test_apply_test_results_attachment_rules_across_executions(
+    generator: DataGenerator,
+    db_session: Session,
+):
+    environment = generator.gen_environment()
+    snap_execution = generator.gen_test_execution(
+        artefact_build=generator.gen_artefact_build(artefact=generator.gen_artefact(family=FamilyName.snap)),
+        environment=environment,
+        execution_metadata={"category1": ["value1"]},
+    )
+    charm_execution = generator.gen_test_execution(
+        artefact_build=generator.gen_artefact_build(artefact=generator.gen_artefact(family=FamilyName.charm)),
+        environment=environment,
+        execution_metadata={"category1": ["value2"]},
+    )
+    test_case = generator.gen_test_case()
+    snap_result = generator.gen_test_result(test_case=test_case, test_execution=snap_execution)
+    charm_result = generator.gen_test_result(test_case=test_case, test_execution=charm_execution)
+    issue_1 = generator.gen_issue(key="1")
+    issue_2 = generator.gen_issue(key="2")
+
+    attachment_rules = [
+        IssueTestResultAttachmentRule(issue=issue_1, families=[FamilyName.snap]),
+        IssueTestResultAttachmentRule(
+            issue=issue_2,
+            execution_metadata=[
+                IssueTestResultAttachmentRuleExecutionMetadata(category="category1", value="value2"),
+            ],
+        ),
+        IssueTestResultAttachmentRule(issue=issue_1),
+    ]
+    db_session.add_all(attachment_rules)
+    db_session.commit()
+
+    apply_test_results_attachment_rules(db_session, [snap_result.id, charm_result.id])
+    db_session.expire_all()
+
+    assert {(attachment.issue_id, attachment.attachment_rule_id) for attachment in snap_result.issue_attachments} == {
+        (issue_1.id, attachment_rules[0].id),
+    }
+    assert {(attachment.issue_id, attachment.attachment_rule_id) for attachment in charm_result.issue_attachments} == {
+        (issue_1.id, attachment_rules[2].id),
+        (issue_2.id, attachment_rules[1].id),
+    }
+
+
+def test_run_attachment_rule_job_chunk(
+    generator: DataGenerator,
+    db_session: Session,
+):
+    environment = generator.gen_environment()
+    snap_execution = generator.gen_test_execution(
+        artefact_build=generator.gen_artefact_build(artefact=generator.gen_artefact(family=FamilyName.snap)),
+        environment=environment,
+    )
+    charm_execution = generator.gen_test_execution(
+        artefact_build=generator.gen_artefact_build(artefact=generator.gen_artefact(family=FamilyName.charm)),
+        environment=environment,
+    )
+    test_cases = [generator.gen_test_case(name=f"test-{i}") for i in range(3)]
+    snap_results = [generator.gen_test_result(test_case, snap_execution) for test_case in test_cases]
+    charm_results = [generator.gen_test_result(test_case, charm_execution) for test_case in test_cases]
+    issue = generator.gen_issue()
+
+    attachment_rule = IssueTestResultAttachmentRule(issue=issue, families=[FamilyName.snap])
+    db_session.add(attachment_rule)
+    job = create_attachment_rule_job(db_session, attachment_rule)
+    db_session.commit()
+
+    # Results submitted after the job was created are not its concern
+    later_result = generator.gen_test_result(generator.gen_test_case(name="later"), snap_execution)
+
+    chunks = 1
+    while run_attachment_rule_job_chunk(db_session, job.id, chunk_size=2):
+        chunks += 1
+        assert job.status == JobStatus.RUNNING
+
+    db_session.expire_all()
+    assert job.status == JobStatus.COMPLETED
+    assert job.last_test_result_id == job.max_test_result_id == charm_results[-1].id
+    assert job.attachments_created == len(snap_results)
+    assert chunks >= 3
+    for test_result in snap_results:
+        assert [attachment.attachment_rule_id for attachment in test_result.issue_attachments] == [attachment_rule.id]
+    for test_result in [*charm_results, later_result]:
+        assert test_result.issue_attachments == []
+
+    # Finished jobs are left alone
+    assert not run_attachment_rule_job_chunk(db_session, job.id)
+
+
+def test_selects_stale_attachment_rule_jobs(generator: DataGenerator, db_session: Session):
+    attachment_rule = IssueTestResultAttachmentRule(issue=generator.gen_issue())
+    db_session.add(attachment_rule)
+    jobs = {
+        status: create_attachment_rule_job(db_session, attachment_rule)
+        for status in [JobStatus.PENDING, JobStatus.RUNNING, JobStatus.COMPLETED, JobStatus.FAILED]
+    }
+    for status, job in jobs.items():
+        job.status = status
+    recent = create_attachment_rule_job(db_session, attachment_rule)
+    db_session.flush()
+    db_session.execute(
+        update(IssueTestResultAttachmentRuleJob)
+        .where(IssueTestResultAttachmentRuleJob.id.in_([job.id for job in jobs.values()]))
+        .values(
+            updated_at=datetime.now() - attachment_rules_logic.ATTACHMENT_RULE_JOB_STALE_AFTER - timedelta(minutes=1)
+        )
+    )
+
+    assert select_stale_attachment_rule_jobs(db_session) == [jobs[JobStatus.PENDING].id, jobs[JobStatus.RUNNING].id]
+    assert recent.status == JobStatus.PENDING
@@ -19,7 +19,7 @@ from sqlalchemy.orm import Session
 
 from test_observer.common.enums import Permission
 from test_observer.controllers.issues.attachment_rules_logic import (
-    apply_test_result_attachment_rules,
+    apply_test_results_attachment_rules,
 )
 from test_observer.data_access.models import (
     IssueTestResultAttachmentRule,
@@ -143,7 +143,7 @@ def test_auto_rerun_creates_rerun_request_when_enabled(
     assert rerun_requests_before == 0
 
     # Apply attachment rules
-    apply_test_result_attachment_rules(db_session, test_result)
+    apply_test_results_attachment_rules(db_session, [test_result.id])
 
     # Verify rerun request was created
     rerun_requests = db_session.query(TestExecutionRerunRequest).all()
@@ -179,7 +179,7 @@ def test_auto_rerun_does_not_create_rerun_request_when_disabled(
     db_session.commit()
 
     # Apply attachment rules
-    apply_test_result_attachment_rules(db_session, test_result)
+    apply_test_results_attachment_rules(db_session, [test_result.id])
 
     # Verify NO rerun request was created
     rerun_requests = db_session.query(TestExecutionRerunRequest).all()
@@ -222,7 +222,7 @@ def test_auto_rerun_multiple_issues_with_different_settings(
     db_session.commit()
 
     # Apply attachment rules
-    apply_test_result_attachment_rules(db_session, test_result)
+    apply_test_results_attachment_rules(db_session, [test_result.id])
 
     # Verify both issues are attached
     assert len(test_result.issue_attachments) == 2
@@ -261,14 +261,14 @@ def test_auto_rerun_no_duplicate_rerun_requests(
     db_session.commit()
 
     # Apply attachment rules to first test result
-    apply_test_result_attachment_rules(db_session, test_result1)
+    apply_test_results_attachment_rules(db_session, [test_result1.id])
 
     # Verify rerun request was created
     rerun_requests = db_session.query(TestExecutionRerunRequest).all()
     assert len(rerun_requests) == 1
 
     # Apply attachment rules to second test result from same execution
-    apply_test_result_attachment_rules(db_session, test_result2)
+    apply_test_results_attachment_rules(db_session, [test_result2.id])
 
     # Verify NO duplicate rerun request was created
     rerun_requests = db_session.query(TestExecutionRerunRequest).all()
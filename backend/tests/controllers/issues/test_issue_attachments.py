@@ -42,12 +42,13 @@ def auth_post_bulk(test_client: TestClient, endpoint: str, json: dict):
 
 def gen_test_results(generator: DataGenerator):
     environment = generator.gen_environment()
-    test_case = generator.gen_test_case()
+    test_case_1 = generator.gen_test_case()
+    test_case_2 = generator.gen_test_case(name="camera/detect-2")
     artefact = generator.gen_artefact()
     artefact_build = generator.gen_artefact_build(artefact)
     test_execution = generator.gen_test_execution(artefact_build, environment)
-    test_result_1 = generator.gen_test_result(test_case, test_execution)
-    test_result_2 = generator.gen_test_result(test_case, test_execution)
+    test_result_1 = generator.gen_test_result(test_case_1, test_execution)
+    test_result_2 = generator.gen_test_result(test_case_2, test_execution)
     return test_result_1, test_result_2
 
 
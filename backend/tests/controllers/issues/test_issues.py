@@ -57,6 +57,18 @@ def test_get_all(test_client: TestClient, generator: DataGenerator):
     assert data["offset"] == 0
 
 
+def test_get_all_without_count(test_client: TestClient, generator: DataGenerator):
+    generator.gen_issue()
+    response = make_authenticated_request(
+        lambda: test_client.get(endpoint, params={"count_mode": "none"}),
+        Permission.view_issue,
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["issues"]) == 1
+    assert data["count"] is None
+
+
 def test_get_issue(test_client: TestClient, generator: DataGenerator):
     issue = generator.gen_issue()
 
@@ -0,0 +1,237 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+
+import gzip
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+from httpx import Response
+from pytest import MonkeyPatch
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from test_observer.common.enums import Permission
+from test_observer.controllers.reports import report_jobs_logic, streaming
+from test_observer.controllers.reports.report_jobs_logic import (
+    claim_report_job,
+    delete_expired_report_jobs,
+    fail_report_job,
+    read_report,
+    submit_report_job,
+    write_report,
+)
+from test_observer.data_access.models import ReportJob, ReportJobChunk, TestExecution
+from test_observer.data_access.models_enums import JobStatus, ReportName
+from tests.conftest import make_authenticated_request
+from tests.data_generator import DataGenerator
+
+REPORT_REQUEST = {"report": ReportName.TEST_RESULTS, "start_date": "2026-01-01T00:00:00"}
+
+
+@pytest.fixture
+def mock_generate_report() -> Iterator[MagicMock]:
+    with patch("test_observer.controllers.reports.report_jobs.enqueue_report_job") as mock:
+        yield mock
+
+
+def _post_report_job(test_client: TestClient, request: dict) -> dict:
+    response = make_authenticated_request(
+        lambda: test_client.post("/v1/reports/jobs", json=request),
+        Permission.view_report,
+    )
+    assert response.status_code == 202
+    return response.json()
+
+
+def _completed_job(db_session: Session, report: ReportName = ReportName.TEST_RESULTS) -> ReportJob:
+    job, _ = submit_report_job(db_session, report, datetime(2026, 1, 1), None)
+    claimed = claim_report_job(db_session, job.id)
+    assert claimed is not None
+    write_report(db_session, claimed)
+    db_session.commit()
+    return claimed
+
+
+def _report_content(db_session: Session, job: ReportJob) -> bytes:
+    assert job.size is not None
+    return b"".join(read_report(db_session, job.id, 0, job.size - 1))
+
+
+def test_submits_report_job(test_client: TestClient, mock_generate_report: MagicMock):
+    job = _post_report_job(test_client, REPORT_REQUEST)
+
+    assert (job["report"], job["status"], job["end_date"], job["size"]) == (
+        ReportName.TEST_RESULTS,
+        JobStatus.PENDING,
+        None,
+        None,
+    )
+    mock_generate_report.assert_called_once_with(job["id"])
+
+
+def test_deduplicates_identical_active_jobs(
+    test_client: TestClient, db_session: Session, mock_generate_report: MagicMock
+):
+    job = _post_report_job(test_client, REPORT_REQUEST)
+    other_report = _post_report_job(test_client, {**REPORT_REQUEST, "report": ReportName.TEST_EXECUTIONS})
+    other_dates = _post_report_job(test_client, {**REPORT_REQUEST, "end_date": "2026-02-01T00:00:00"})
+
+    assert _post_report_job(test_client, REPORT_REQUEST)["id"] == job["id"]
+    assert len({job["id"], other_report["id"], other_dates["id"]}) == 3
+    assert mock_generate_report.call_count == 3
+
+    db_session.execute(update(ReportJob).where(ReportJob.id == job["id"]).values(status=JobStatus.COMPLETED))
+    assert _post_report_job(test_client, REPORT_REQUEST)["id"] != job["id"]
+
+
+@pytest.mark.usefixtures("mock_generate_report")
+def test_gets_report_job(test_client: TestClient):
+    job = _post_report_job(test_client, REPORT_REQUEST)
+
+    response = make_authenticated_request(
+        lambda: test_client.get(f"/v1/reports/jobs/{job['id']}"),
+        Permission.view_report,
+    )
+
+    assert response.status_code == 200
+    assert response.json() == job
+
+
+def test_claims_pending_job_once(db_session: Session):
+    job, _ = submit_report_job(db_session, ReportName.TEST_RESULTS, datetime(2026, 1, 1), None)
+
+    claimed = claim_report_job(db_session, job.id)
+    assert claimed is not None
+    assert claimed.status == JobStatus.RUNNING
+    assert claim_report_job(db_session, job.id) is None
+
+
+def test_writes_report_in_compressed_chunks(
+    db_session: Session,
+    generator: DataGenerator,
+    test_execution: TestExecution,
+    monkeypatch: MonkeyPatch,
+):
+    monkeypatch.setattr(streaming, "REPORT_CHUNK_ROWS", 1)
+    for name in ["a", "b"]:
+        generator.gen_test_result(generator.gen_test_case(name=name), test_execution)
+
+    job = _completed_job(db_session)
+
+    content = _report_content(db_session, job)
+    assert (job.status, job.size) == (JobStatus.COMPLETED, len(content))
+    # One gzip member for the headers, then one per row
+    chunks = db_session.scalars(
+        select(ReportJobChunk).where(ReportJobChunk.report_job_id == job.id).order_by(ReportJobChunk.byte_offset)
+    ).all()
+    assert len(chunks) == 3
+    assert b"".join(chunk.content for chunk in chunks) == content
+    lines = gzip.decompress(content).decode().splitlines()
+    assert lines[0].startswith("Artefact.family,Artefact.id")
+    assert len(lines) == 3
+
+
+def test_reads_ranges_spanning_chunks(
+    db_session: Session,
+    generator: DataGenerator,
+    test_execution: TestExecution,
+    monkeypatch: MonkeyPatch,
+):
+    monkeypatch.setattr(streaming, "REPORT_CHUNK_ROWS", 1)
+    for name in ["a", "b", "c"]:
+        generator.gen_test_result(generator.gen_test_case(name=name), test_execution)
+    job = _completed_job(db_session)
+    content = _report_content(db_session, job)
+
+    for start, end in [(0, 0), (5, len(content) - 5), (len(content) // 2, len(content) - 1)]:
+        assert b"".join(read_report(db_session, job.id, start, end)) == content[start : end + 1]
+
+
+def test_downloads_report_with_ranges(test_client: TestClient, db_session: Session, test_execution: TestExecution):
+    job = _completed_job(db_session, ReportName.TEST_EXECUTIONS)
+    content = _report_content(db_session, job)
+
+    def download(headers: dict[str, str]) -> Response:
+        return make_authenticated_request(
+            lambda: test_client.get(f"/v1/reports/jobs/{job.id}/report", headers=headers),
+            Permission.view_report,
+        )
+
+    response = download({})
+    assert response.status_code == 200
+    assert response.content == content
+    assert response.headers["content-type"] == "application/gzip"
+    assert response.headers["content-disposition"] == (f'attachment; filename="test_executions_report_{job.id}.csv.gz"')
+    assert str(test_execution.id) in gzip.decompress(response.content).decode()
+
+    # Resuming an interrupted download
+    response = download({"Range": "bytes=10-"})
+    assert response.status_code == 206
+    assert response.headers["content-range"] == f"bytes 10-{len(content) - 1}/{len(content)}"
+    assert content[:10] + response.content == content
+
+    assert download({"Range": f"bytes={len(content)}-"}).status_code == 416
+
+
+@pytest.mark.usefixtures("mock_generate_report")
+def test_rejects_download_of_unfinished_job(test_client: TestClient):
+    job = _post_report_job(test_client, REPORT_REQUEST)
+
+    def download(job_id: int) -> Response:
+        return make_authenticated_request(
+            lambda: test_client.get(f"/v1/reports/jobs/{job_id}/report"),
+            Permission.view_report,
+        )
+
+    assert download(job["id"]).status_code == 409
+    assert download(job["id"] + 1).status_code == 404
+
+
+def test_fails_report_job(db_session: Session):
+    job, _ = submit_report_job(db_session, ReportName.TEST_RESULTS, datetime(2026, 1, 1), None)
+
+    fail_report_job(db_session, job.id, "error")
+
+    db_session.refresh(job)
+    assert (job.status, job.error) == (JobStatus.FAILED, "error")
+
+
+def test_deletes_expired_report_jobs(db_session: Session):
+    expired_id = _completed_job(db_session).id
+    kept_id = _completed_job(db_session).id
+    lost, _ = submit_report_job(db_session, ReportName.TEST_EXECUTIONS, datetime(2026, 1, 1), None)
+    db_session.execute(
+        update(ReportJob)
+        .where(ReportJob.id.in_([expired_id, lost.id]))
+        .values(updated_at=datetime.now() - report_jobs_logic.REPORT_JOB_RETENTION - timedelta(days=1))
+    )
+
+    assert delete_expired_report_jobs(db_session) == 1
+
+    db_session.expire_all()
+    assert db_session.get(ReportJob, expired_id) is None
+    chunk_counts = dict(
+        db_session.execute(select(ReportJobChunk.report_job_id, func.count()).group_by(ReportJobChunk.report_job_id))
+        .tuples()
+        .all()
+    )
+    assert expired_id not in chunk_counts
+    assert chunk_counts[kept_id] > 0
+    db_session.refresh(lost)
+    assert lost.status == JobStatus.FAILED
@@ -15,13 +15,16 @@
 
 import csv
 from datetime import datetime, timedelta
-from io import StringIO
+from io import BytesIO, StringIO
 
+import pyarrow as pa
+import pyarrow.parquet as pq
 from fastapi.testclient import TestClient
 from httpx import Response
 
 from test_observer.common.enums import Permission
 from test_observer.controllers.reports.test_results import (
+    TESTRESULTS_EXPORT_SCHEMA,
     TESTRESULTS_REPORT_COLUMNS,
 )
 from test_observer.data_access.models import TestResult
@@ -81,6 +84,51 @@ def test_get_testresults_report_out_range(test_client: TestClient, generator: Da
     assert table[0] == [str(c) for c in TESTRESULTS_REPORT_COLUMNS]
 
 
+def test_get_testresults_report_streams_attachment(test_client: TestClient):
+    response = make_authenticated_request(
+        lambda: test_client.get("/v1/reports/test-results"),
+        Permission.view_report,
+    )
+
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"] == 'attachment; filename="testresults_report.csv"'
+
+
+def test_exports_testresults_report_as_parquet(test_client: TestClient, generator: DataGenerator):
+    artefact = generator.gen_artefact(StageName.beta)
+    test_execution = generator.gen_test_execution(generator.gen_artefact_build(artefact), generator.gen_environment())
+    test_result = generator.gen_test_result(generator.gen_test_case(), test_execution)
+
+    response = make_authenticated_request(
+        lambda: test_client.get("/v1/reports/test-results/export"),
+        Permission.view_report,
+    )
+
+    assert response.headers["content-type"] == "application/vnd.apache.parquet"
+    assert response.headers["content-disposition"] == 'attachment; filename="testresults_report.parquet"'
+    table = pq.read_table(BytesIO(response.content))
+    assert table.schema == TESTRESULTS_EXPORT_SCHEMA
+    assert table.to_pylist() == [_expected_export_row(test_result)]
+
+
+def test_exports_testresults_report_as_arrow(test_client: TestClient, generator: DataGenerator):
+    artefact = generator.gen_artefact(StageName.beta, created_at=datetime.now() - timedelta(days=2))
+    test_execution = generator.gen_test_execution(generator.gen_artefact_build(artefact), generator.gen_environment())
+    generator.gen_test_result(generator.gen_test_case(), test_execution)
+
+    response = make_authenticated_request(
+        lambda: test_client.get(
+            "/v1/reports/test-results/export",
+            params={"format": "arrow", "start_date": (datetime.now() - timedelta(days=1)).isoformat()},
+        ),
+        Permission.view_report,
+    )
+
+    assert response.headers["content-type"] == "application/vnd.apache.arrow.stream"
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert (table.schema, table.num_rows) == (TESTRESULTS_EXPORT_SCHEMA, 0)
+
+
 def _read_csv_response(response: Response) -> list:
     content = response.content.decode()
     csv_reader = csv.reader(StringIO(content))
@@ -118,3 +166,36 @@ def _expected_report_row(test_result: TestResult) -> list:
         test_result.status.name,
         str(test_result.created_at),
     ]
+
+
+def _expected_export_row(test_result: TestResult) -> dict:
+    test_case = test_result.test_case
+    test_execution = test_result.test_execution
+    environment = test_execution.environment
+    artefact = test_execution.artefact_build.artefact
+    return {
+        "artefact_family": artefact.family,
+        "artefact_id": artefact.id,
+        "artefact_name": artefact.name,
+        "artefact_version": artefact.version,
+        "artefact_status": artefact.status.name,
+        "artefact_track": artefact.track,
+        "artefact_stage": artefact.stage,
+        "artefact_series": artefact.series,
+        "artefact_repo": artefact.repo,
+        "artefact_os": artefact.os,
+        "artefact_created_at": artefact.created_at,
+        "test_execution_id": test_execution.id,
+        "test_execution_status": test_execution.status.name,
+        "test_execution_c3_link": test_execution.c3_link,
+        "test_execution_checkbox_version": test_execution.checkbox_version,
+        "test_plan": test_execution.test_plan.name,
+        "environment_name": environment.name,
+        "environment_architecture": environment.architecture,
+        "test_case_template_id": test_case.template_id,
+        "test_case_name": test_case.name,
+        "test_case_category": test_case.category,
+        "test_result_id": test_result.id,
+        "test_result_status": test_result.status.name,
+        "test_result_created_at": test_result.created_at,
+    }
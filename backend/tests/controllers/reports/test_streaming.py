@@ -0,0 +1,104 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+
+import io
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pytest import MonkeyPatch
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from test_observer.common.constants import ExportFormat
+from test_observer.controllers.reports import streaming
+from test_observer.controllers.reports.streaming import stream_csv, stream_export
+from test_observer.data_access.models import TestCase
+from tests.data_generator import DataGenerator
+
+
+def test_streams_csv_in_chunks(db_session: Session, generator: DataGenerator, monkeypatch: MonkeyPatch):
+    monkeypatch.setattr(streaming, "REPORT_CHUNK_ROWS", 2)
+    for name in ["a", "b,c", "d"]:
+        generator.gen_test_case(name=name)
+
+    chunks = list(stream_csv(db_session, select(TestCase.name).order_by(TestCase.name), ["TestCase.name"]))
+
+    assert chunks == ["TestCase.name\r\n", 'a\r\n"b,c"\r\n', "d\r\n"]
+
+
+def test_reads_through_server_side_cursor(db_session: Session):
+    server_side: list[bool] = []
+    event.listen(
+        db_session.connection(),
+        "before_cursor_execute",
+        lambda _conn, cursor, *_args: server_side.append(getattr(cursor, "server_side", False)),
+    )
+
+    list(stream_csv(db_session, select(TestCase.name), ["TestCase.name"]))
+
+    assert server_side == [True]
+
+
+TEST_CASE_SCHEMA = pa.schema([("id", pa.int64()), ("category", pa.dictionary(pa.int32(), pa.string()))])
+
+
+def _stream_test_cases(db_session: Session, export_format: ExportFormat) -> list[bytes]:
+    query = select(TestCase.id, TestCase.category).order_by(TestCase.id)
+    return list(stream_export(db_session, query, TEST_CASE_SCHEMA, export_format))
+
+
+def test_streams_arrow_record_batch_per_chunk(db_session: Session, generator: DataGenerator, monkeypatch: MonkeyPatch):
+    monkeypatch.setattr(streaming, "REPORT_CHUNK_ROWS", 2)
+    test_cases = [generator.gen_test_case(name=name, category="category") for name in ["a", "b", "c"]]
+
+    chunks = _stream_test_cases(db_session, ExportFormat.ARROW)
+
+    reader = pa.ipc.open_stream(b"".join(chunks))
+    batches = list(reader)
+    assert reader.schema == TEST_CASE_SCHEMA
+    assert [batch.num_rows for batch in batches] == [2, 1]
+    assert pa.Table.from_batches(batches).to_pydict() == {
+        "id": [test_case.id for test_case in test_cases],
+        "category": ["category"] * 3,
+    }
+    assert batches[0].column("category").dictionary.to_pylist() == ["category"]
+    # Every batch is sent as soon as it's written
+    assert len(chunks) == 3
+
+
+def test_streams_parquet_row_group_per_chunk(db_session: Session, generator: DataGenerator, monkeypatch: MonkeyPatch):
+    monkeypatch.setattr(streaming, "REPORT_CHUNK_ROWS", 2)
+    test_cases = [generator.gen_test_case(name=name, category="category") for name in ["a", "b", "c"]]
+
+    chunks = _stream_test_cases(db_session, ExportFormat.PARQUET)
+
+    parquet_file = pq.ParquetFile(io.BytesIO(b"".join(chunks)))
+    assert parquet_file.metadata.num_row_groups == 2
+    table = parquet_file.read()
+    assert table.schema == TEST_CASE_SCHEMA
+    assert table.to_pydict() == {"id": [test_case.id for test_case in test_cases], "category": ["category"] * 3}
+    assert all(chunks[:2])
+
+
+def test_exports_empty_query(db_session: Session):
+    for export_format in ExportFormat:
+        content = b"".join(_stream_test_cases(db_session, export_format))
+
+        if export_format == ExportFormat.ARROW:
+            table = pa.ipc.open_stream(content).read_all()
+        else:
+            table = pq.read_table(io.BytesIO(content))
+        assert (table.schema, table.num_rows) == (TEST_CASE_SCHEMA, 0)
@@ -252,3 +252,17 @@ def test_ordering_by_name(test_client: TestClient, generator: DataGenerator):
 
     tpl_map = dict(names_tpls)
     assert all(tpl_map[i["test_case"]] == i["template_id"] for i in ours)
+
+
+def test_complete_test_case_names(test_client: TestClient, generator: DataGenerator):
+    unique_marker = uuid.uuid4().hex[:8]
+    for suffix in ["/capture/jpeg", "/capture", "/detect"]:
+        generator.gen_test_case(name=f"{unique_marker}{suffix}")
+
+    response = make_authenticated_request(
+        lambda: test_client.get(f"/v1/test-cases/completions?prefix={unique_marker}/ca&limit=1"),
+        Permission.view_test,
+    )
+
+    assert response.status_code == 200
+    assert response.json() == [f"{unique_marker}/capture"]
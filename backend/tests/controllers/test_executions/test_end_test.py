@@ -13,15 +13,25 @@
 # SPDX-FileCopyrightText: Copyright 2024 Canonical Ltd.
 # SPDX-License-Identifier: AGPL-3.0-only
 
+import json
+from unittest.mock import MagicMock
+
+import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from test_observer.common.enums import Permission
+from test_observer.controllers.test_executions import logic
+from test_observer.controllers.test_executions.logic import TEST_RESULTS_BULK_LOAD_THRESHOLD
+from test_observer.data_access.models import TestResult, TestResultSearchEntry
 from test_observer.data_access.models_enums import (
     StageName,
     TestExecutionStatus,
     TestResultStatus,
 )
+from test_observer.data_access.test_case_cache import CachedTestCase, test_case_cache
+from test_observer.data_access.test_result_search import reindex_test_results_batch
 from tests.conftest import make_authenticated_request
 from tests.data_generator import DataGenerator
 
@@ -175,6 +185,124 @@ def test_end_test_updates_template_id(test_client: TestClient, generator: DataGe
     assert test_execution.relevant_links[0].url == "http://report.example.com"
 
 
+def test_end_test_keeps_last_result_of_duplicate_names(test_client: TestClient, generator: DataGenerator):
+    artefact = generator.gen_artefact(StageName.beta)
+    artefact_build = generator.gen_artefact_build(artefact)
+    test_execution = generator.gen_test_execution(
+        artefact_build, generator.gen_environment(), ci_link="http://localhost"
+    )
+    result = {"name": "duplicated", "comment": "", "io_log": ""}
+
+    response = make_authenticated_request(
+        lambda: test_client.put(
+            "/v1/test-executions/end-test",
+            json={
+                "ci_link": test_execution.ci_link,
+                "c3_link": "",
+                "test_results": [
+                    {**result, "status": "fail", "category": "first", "template_id": "first"},
+                    {**result, "status": "pass", "category": "last", "template_id": "last"},
+                ],
+            },
+        ),
+        Permission.change_test,
+    )
+
+    assert response.status_code == 200
+    [test_result] = test_execution.test_results
+    assert test_result.status == TestResultStatus.PASSED
+    assert (test_result.test_case.category, test_result.test_case.template_id) == ("last", "last")
+
+
+def test_end_test_updates_template_id_of_stale_cached_test_case(
+    test_client: TestClient,
+    generator: DataGenerator,
+    db_session: Session,
+    enqueue_test_results_reindex: MagicMock,
+):
+    artefact_build = generator.gen_artefact_build(generator.gen_artefact(StageName.beta))
+    test_execution = generator.gen_test_execution(
+        artefact_build, generator.gen_environment(), ci_link="http://localhost"
+    )
+    test_case = generator.gen_test_case(template_id="updated by another process")
+    test_case_cache.put_many({test_case.name: CachedTestCase(test_case.id, test_case.category, "submitted")})
+
+    make_authenticated_request(
+        lambda: test_client.put(
+            "/v1/test-executions/end-test",
+            json={
+                "ci_link": test_execution.ci_link,
+                "c3_link": "",
+                "test_results": [
+                    {
+                        "name": test_case.name,
+                        "status": "pass",
+                        "category": test_case.category,
+                        "template_id": "submitted",
+                        "comment": "",
+                        "io_log": "",
+                    }
+                ],
+            },
+        ),
+        Permission.change_test,
+    )
+
+    db_session.refresh(test_case)
+    assert test_case.template_id == "submitted"
+    enqueue_test_results_reindex.assert_called_once_with([test_case.id], [])
+
+
+def test_end_test_updates_search_entries(
+    test_client: TestClient,
+    generator: DataGenerator,
+    db_session: Session,
+    enqueue_test_results_reindex: MagicMock,
+):
+    artefact_build = generator.gen_artefact_build(generator.gen_artefact(StageName.beta))
+    environment = generator.gen_environment()
+    test_case = generator.gen_test_case(template_id="")
+    previous_execution = generator.gen_test_execution(artefact_build, environment, ci_link="http://localhost/1")
+    previous_result = generator.gen_test_result(test_case, previous_execution)
+    test_execution = generator.gen_test_execution(
+        artefact_build, environment, ci_link="http://localhost/2", status=TestExecutionStatus.IN_PROGRESS
+    )
+
+    make_authenticated_request(
+        lambda: test_client.put(
+            "/v1/test-executions/end-test",
+            json={
+                "ci_link": test_execution.ci_link,
+                "c3_link": "",
+                "test_results": [
+                    {
+                        "name": test_case.name,
+                        "status": "fail",
+                        "category": test_case.category,
+                        "template_id": "some template id",
+                        "comment": "",
+                        "io_log": "",
+                    }
+                ],
+            },
+        ),
+        Permission.change_test,
+    )
+
+    # Results of other executions are reindexed in the background
+    enqueue_test_results_reindex.assert_called_once_with([test_case.id], [])
+    reindex_test_results_batch(db_session, TestResult.test_case_id == test_case.id)
+    entries = db_session.scalars(
+        select(TestResultSearchEntry).order_by(TestResultSearchEntry.id).execution_options(populate_existing=True)
+    ).all()
+    assert [
+        (entry.id == previous_result.id, entry.template_id, entry.status, entry.execution_status) for entry in entries
+    ] == [
+        (True, "some template id", TestResultStatus.PASSED, TestExecutionStatus.NOT_STARTED),
+        (False, "some template id", TestResultStatus.FAILED, TestExecutionStatus.FAILED),
+    ]
+
+
 def test_apply_test_result_attachment_rules(test_client: TestClient, generator: DataGenerator):
     artefact = generator.gen_artefact(StageName.beta)
     artefact_build = generator.gen_artefact_build(artefact)
@@ -222,3 +350,101 @@ def test_apply_test_result_attachment_rules(test_client: TestClient, generator:
     assert response.status_code == 200
     assert test_execution.test_results[0].issue_attachments[0].issue_id == issue.id
     assert test_execution.test_results[0].issue_attachments[0].attachment_rule_id == attachment_rule_id
+
+
+def test_end_test_stream(test_client: TestClient, generator: DataGenerator):
+    artefact = generator.gen_artefact(StageName.beta)
+    artefact_build = generator.gen_artefact_build(artefact)
+    environment = generator.gen_environment()
+    test_execution = generator.gen_test_execution(artefact_build, environment, ci_link="http://localhost")
+    results = [
+        {
+            "name": "disk/stats_nvme0n1",
+            "template_id": "disk/stats_name",
+            "status": "pass",
+            "category": "disk",
+            "comment": "",
+            "io_log": "some log",
+        },
+        {"name": "camera/detect", "status": "fail", "category": "camera", "comment": "broken", "io_log": ""},
+    ]
+    lines = [{"ci_link": test_execution.ci_link, "c3_link": "http://c3.localhost", "checkbox_version": "3.3.0"}]
+
+    response = make_authenticated_request(
+        lambda: test_client.put(
+            "/v1/test-executions/end-test/stream",
+            content="\n".join(json.dumps(line) for line in [*lines, *results]),
+            headers={"Content-Type": "application/x-ndjson"},
+        ),
+        Permission.change_test,
+    )
+
+    assert response.status_code == 200
+    assert test_execution.status == TestExecutionStatus.FAILED
+    assert test_execution.c3_link == "http://c3.localhost"
+    assert test_execution.checkbox_version == "3.3.0"
+    assert [
+        (tr.test_case.name, tr.test_case.template_id, tr.test_case.category, tr.status, tr.comment, tr.io_log)
+        for tr in test_execution.test_results
+    ] == [
+        ("disk/stats_nvme0n1", "disk/stats_name", "disk", TestResultStatus.PASSED, "", "some log"),
+        ("camera/detect", "", "camera", TestResultStatus.FAILED, "broken", ""),
+    ]
+
+
+def test_end_test_stream_requires_header(test_client: TestClient):
+    response = make_authenticated_request(
+        lambda: test_client.put(
+            "/v1/test-executions/end-test/stream",
+            content="",
+            headers={"Content-Type": "application/x-ndjson"},
+        ),
+        Permission.change_test,
+    )
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", 1]
+
+
+# Results are also staged with COPY once there are enough of them
+@pytest.mark.parametrize("bulk_load_threshold", [TEST_RESULTS_BULK_LOAD_THRESHOLD, 1])
+def test_end_test_updates_results_in_place(
+    test_client: TestClient,
+    generator: DataGenerator,
+    db_session: Session,
+    monkeypatch: pytest.MonkeyPatch,
+    bulk_load_threshold: int,
+):
+    monkeypatch.setattr(logic, "TEST_RESULTS_BULK_LOAD_THRESHOLD", bulk_load_threshold)
+    artefact = generator.gen_artefact(StageName.beta)
+    artefact_build = generator.gen_artefact_build(artefact)
+    environment = generator.gen_environment()
+    test_execution = generator.gen_test_execution(artefact_build, environment, ci_link="http://localhost")
+
+    def end_test(*results: tuple[str, str]) -> None:
+        make_authenticated_request(
+            lambda: test_client.put(
+                "/v1/test-executions/end-test",
+                json={
+                    "ci_link": test_execution.ci_link,
+                    "test_results": [
+                        {"name": name, "status": status, "category": "", "comment": "", "io_log": ""}
+                        for name, status in results
+                    ],
+                },
+            ),
+            Permission.change_test,
+        )
+
+    end_test(("kept", "pass"), ("dropped", "fail"))
+    kept_id = test_execution.test_results[0].id
+
+    # Repeated test cases keep their last result
+    end_test(("kept", "fail"), ("kept", "pass"), ("added", "pass"))
+
+    db_session.expire_all()
+    assert [(tr.id == kept_id, tr.test_case.name, tr.status) for tr in test_execution.test_results] == [
+        (True, "kept", TestResultStatus.PASSED),
+        (False, "added", TestResultStatus.PASSED),
+    ]
+    assert test_execution.status == TestExecutionStatus.PASSED
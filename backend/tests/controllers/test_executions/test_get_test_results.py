@@ -16,6 +16,8 @@
 # ruff: noqa: F841 unused defined variables
 
 from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
 
 from test_observer.common.constants import PREVIOUS_TEST_RESULT_COUNT
 from test_observer.common.enums import Permission
@@ -75,7 +77,9 @@ def test_fetch_test_results(test_client: TestClient, generator: DataGenerator):
     assert json[0]["template_id"] == test_case.template_id
     assert json[0]["status"] == test_result_second.status.name
     assert json[0]["comment"] == test_result_second.comment
-    assert json[0]["io_log"] == test_result_second.io_log
+    assert json[0]["io_log_preview"] == test_result_second.io_log_preview
+    assert json[0]["io_log_size"] == test_result_second.io_log_size
+    assert json[0]["io_log"] is None
     assert json[0]["previous_results"] == [
         {
             "status": test_result_first.status,
@@ -131,7 +135,9 @@ def test_previous_results_shows_reruns(test_client: TestClient, generator: DataG
             "template_id": tc.template_id,
             "status": tr2.status.name,
             "comment": tr2.comment,
-            "io_log": tr2.io_log,
+            "io_log_preview": tr2.io_log_preview,
+            "io_log_size": tr2.io_log_size,
+            "io_log": None,
             "previous_results": [
                 {
                     "status": tr1.status,
@@ -177,7 +183,9 @@ def test_previous_results_orders_by_artefact(test_client: TestClient, generator:
             "template_id": tc.template_id,
             "status": tr2.status.name,
             "comment": tr2.comment,
-            "io_log": tr2.io_log,
+            "io_log_preview": tr2.io_log_preview,
+            "io_log_size": tr2.io_log_size,
+            "io_log": None,
             "previous_results": [
                 {
                     "status": tr1.status,
@@ -276,3 +284,32 @@ def test_attachment_rule_listed_in_issue_attachment(
             },
         }
     ]
+
+
+def test_fetch_test_results_with_io_log(test_client: TestClient, generator: DataGenerator, db_session: Session):
+    test_execution = generator.gen_test_execution(
+        generator.gen_artefact_build(generator.gen_artefact()), generator.gen_environment()
+    )
+    io_log = "line\n" * 100
+    generator.gen_test_result(generator.gen_test_case(), test_execution, io_log=io_log)
+    db_session.expire_all()
+    statements: list[str] = []
+    event.listen(db_session.connection(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    response = make_authenticated_request(
+        lambda: test_client.get(f"/v1/test-executions/{test_execution.id}/test-results"),
+        Permission.view_test,
+    )
+    assert not any("io_log.content" in statement for statement in statements)
+
+    response_with_io_log = make_authenticated_request(
+        lambda: test_client.get(
+            f"/v1/test-executions/{test_execution.id}/test-results", params={"include_io_log": True}
+        ),
+        Permission.view_test,
+    )
+
+    assert [(r["io_log_preview"], r["io_log_size"], r["io_log"]) for r in response.json()] == [
+        (io_log[:200], len(io_log), None)
+    ]
+    assert [r["io_log"] for r in response_with_io_log.json()] == [io_log]
@@ -0,0 +1,217 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from test_observer.common.enums import Permission
+from test_observer.controllers.test_executions import ingest_logic
+from test_observer.controllers.test_executions.ingest_logic import (
+    delete_expired_test_result_ingests,
+    drain_test_result_ingests_batch,
+)
+from test_observer.data_access.models import TestExecution, TestResultIngest
+from test_observer.data_access.models_enums import (
+    TestExecutionStatus,
+    TestResultIngestKind,
+    TestResultIngestStatus,
+    TestResultStatus,
+)
+from tests.conftest import make_authenticated_request
+
+
+@pytest.fixture
+def mock_drain() -> Iterator[MagicMock]:
+    with patch("test_observer.controllers.test_executions.ingest.enqueue_test_result_ingests_drain") as mock:
+        yield mock
+
+
+def _post_results_async(test_client: TestClient, test_execution_id: int, results: list[dict]) -> dict:
+    response = make_authenticated_request(
+        lambda: test_client.post(f"/v1/test-executions/{test_execution_id}/test-results/async", json=results),
+        Permission.change_test,
+    )
+    assert response.status_code == 202
+    return response.json()
+
+
+def _get_ingest(test_client: TestClient, ingest_id: int) -> dict:
+    response = make_authenticated_request(
+        lambda: test_client.get(f"/v1/test-executions/ingests/{ingest_id}"),
+        Permission.view_test,
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_post_results_async(
+    test_client: TestClient,
+    test_execution: TestExecution,
+    db_session: Session,
+    mock_drain: MagicMock,
+):
+    ingest = _post_results_async(test_client, test_execution.id, [{"name": "test", "status": "FAILED"}])
+
+    assert ingest["test_execution_id"] == test_execution.id
+    assert ingest["kind"] == TestResultIngestKind.TEST_RESULTS
+    assert ingest["status"] == TestResultIngestStatus.PENDING
+    assert ingest["test_results_count"] == 1
+    assert test_execution.test_results == []
+    mock_drain.assert_called_once_with()
+
+    assert drain_test_result_ingests_batch(db_session) == 1
+
+    assert _get_ingest(test_client, ingest["id"])["status"] == TestResultIngestStatus.COMPLETED
+    db_session.refresh(test_execution)
+    assert [(tr.test_case.name, tr.status) for tr in test_execution.test_results] == [("test", TestResultStatus.FAILED)]
+
+
+def test_post_results_async_missing_test_execution(test_client: TestClient, mock_drain: MagicMock):
+    response = make_authenticated_request(
+        lambda: test_client.post("/v1/test-executions/1/test-results/async", json=[]),
+        Permission.change_test,
+    )
+
+    assert response.status_code == 404
+    mock_drain.assert_not_called()
+
+
+@pytest.mark.usefixtures("mock_drain")
+def test_end_test_async(
+    test_client: TestClient,
+    test_execution: TestExecution,
+    db_session: Session,
+):
+    test_execution.ci_link = "http://localhost/1"
+    db_session.commit()
+
+    response = make_authenticated_request(
+        lambda: test_client.put(
+            "/v1/test-executions/end-test/async",
+            json={
+                "ci_link": test_execution.ci_link,
+                "checkbox_version": "3.3.0",
+                "test_results": [
+                    {"name": "test", "status": "pass", "category": "", "comment": "", "io_log": "log"},
+                ],
+            },
+        ),
+        Permission.change_test,
+    )
+
+    assert response.status_code == 202
+    assert response.json()["kind"] == TestResultIngestKind.END_TEST
+
+    drain_test_result_ingests_batch(db_session)
+
+    db_session.refresh(test_execution)
+    assert test_execution.status == TestExecutionStatus.PASSED
+    assert test_execution.checkbox_version == "3.3.0"
+    assert [(tr.test_case.name, tr.io_log) for tr in test_execution.test_results] == [("test", "log")]
+
+
+@pytest.mark.usefixtures("mock_drain")
+def test_drains_ingests_of_an_execution_in_order(
+    test_client: TestClient,
+    test_execution: TestExecution,
+    db_session: Session,
+):
+    first = _post_results_async(test_client, test_execution.id, [{"name": "test", "status": "FAILED"}])
+    second = _post_results_async(test_client, test_execution.id, [{"name": "test", "status": "PASSED"}])
+
+    # The second ingest waits for the first one to be stored
+    assert drain_test_result_ingests_batch(db_session) == 1
+    assert _get_ingest(test_client, second["id"])["status"] == TestResultIngestStatus.PENDING
+    assert drain_test_result_ingests_batch(db_session) == 1
+    assert drain_test_result_ingests_batch(db_session) == 0
+
+    assert _get_ingest(test_client, first["id"])["status"] == TestResultIngestStatus.COMPLETED
+    db_session.refresh(test_execution)
+    assert [tr.status for tr in test_execution.test_results] == [TestResultStatus.PASSED]
+
+
+def test_failed_ingest_does_not_hold_back_batch(
+    test_client: TestClient,
+    test_execution: TestExecution,
+    db_session: Session,
+):
+    failing = TestResultIngest(
+        test_execution_id=test_execution.id,
+        kind=TestResultIngestKind.TEST_RESULTS,
+        payload=b"not gzip",
+        test_results_count=1,
+    )
+    db_session.add(failing)
+    db_session.commit()
+
+    with patch("test_observer.controllers.test_executions.ingest.enqueue_test_result_ingests_drain"):
+        ingest = _post_results_async(test_client, test_execution.id, [{"name": "test", "status": "PASSED"}])
+
+    assert drain_test_result_ingests_batch(db_session) == 1
+    assert drain_test_result_ingests_batch(db_session) == 1
+
+    failed = _get_ingest(test_client, failing.id)
+    assert failed["status"] == TestResultIngestStatus.FAILED
+    assert failed["error"]
+    assert _get_ingest(test_client, ingest["id"])["status"] == TestResultIngestStatus.COMPLETED
+
+
+def test_deletes_expired_test_result_ingests(test_execution: TestExecution, db_session: Session):
+    ingests = {
+        status: TestResultIngest(
+            test_execution_id=test_execution.id,
+            kind=TestResultIngestKind.TEST_RESULTS,
+            payload=b"",
+            test_results_count=0,
+            status=status,
+        )
+        for status in TestResultIngestStatus
+    }
+    kept = TestResultIngest(
+        test_execution_id=test_execution.id,
+        kind=TestResultIngestKind.TEST_RESULTS,
+        payload=b"",
+        test_results_count=0,
+        status=TestResultIngestStatus.COMPLETED,
+    )
+    db_session.add_all([*ingests.values(), kept])
+    db_session.flush()
+    db_session.execute(
+        update(TestResultIngest)
+        .where(TestResultIngest.id.in_([ingest.id for ingest in ingests.values()]))
+        .values(updated_at=datetime.now() - ingest_logic.TEST_RESULT_INGEST_RETENTION - timedelta(days=1))
+    )
+
+    assert delete_expired_test_result_ingests(db_session) == 2
+
+    remaining = db_session.scalars(
+        select(TestResultIngest.id).where(TestResultIngest.test_execution_id == test_execution.id)
+    )
+    assert set(remaining) == {ingests[TestResultIngestStatus.PENDING].id, kept.id}
+
+
+def test_get_missing_ingest(test_client: TestClient):
+    response = make_authenticated_request(
+        lambda: test_client.get("/v1/test-executions/ingests/1"),
+        Permission.view_test,
+    )
+
+    assert response.status_code == 404
@@ -13,11 +13,22 @@
 # SPDX-FileCopyrightText: Copyright 2024 Canonical Ltd.
 # SPDX-License-Identifier: AGPL-3.0-only
 
+import json
+
 import pytest
 from fastapi.testclient import TestClient
+from httpx import Response
+from prometheus_client import REGISTRY
 
 from test_observer.common.enums import Permission
-from test_observer.data_access.models import TestExecution, TestResult
+from test_observer.common.ndjson import NDJSON_CHUNK_ROWS
+from test_observer.data_access.models import (
+    IssueTestResultAttachment,
+    IssueTestResultAttachmentRule,
+    TestExecution,
+    TestResult,
+)
+from test_observer.data_access.models_enums import TestResultStatus
 from tests.asserts import assert_fails_validation
 from tests.conftest import make_authenticated_request
 from tests.data_generator import DataGenerator
@@ -151,6 +162,58 @@ def test_overwrites_result_if_matching_case_name(test_client: TestClient, test_e
     _assert_results(request2, test_execution.test_results)
 
 
+def test_resubmission_keeps_results(test_client: TestClient, test_execution: TestExecution, generator: DataGenerator):
+    def post(request: list[dict[str, str]]) -> None:
+        make_authenticated_request(
+            lambda: test_client.post(f"/v1/test-executions/{test_execution.id}/test-results", json=request),
+            Permission.change_test,
+        )
+
+    post([{**minimum_result, "name": "unchanged"}, {**minimum_result, "name": "changed"}])
+    unchanged, changed = test_execution.test_results
+    issue = generator.gen_issue()
+    generator.db_session.add_all(
+        [IssueTestResultAttachment(issue=issue, test_result=test_result) for test_result in (unchanged, changed)]
+    )
+    generator.db_session.commit()
+
+    post([{**minimum_result, "name": "unchanged"}, {**minimum_result, "name": "changed", "status": "PASSED"}])
+
+    # The results were updated in place, behind the back of the loaded objects
+    generator.db_session.expire_all()
+    assert [(tr.id, tr.status) for tr in test_execution.test_results] == [
+        (unchanged.id, TestResultStatus.FAILED),
+        (changed.id, TestResultStatus.PASSED),
+    ]
+    # Only attachments made by attachment rules are reconsidered when a result changes
+    assert [len(tr.issue_attachments) for tr in test_execution.test_results] == [1, 1]
+
+
+def test_resubmission_reapplies_attachment_rules_to_changed_results(
+    test_client: TestClient, test_execution: TestExecution, generator: DataGenerator
+):
+    issue = generator.gen_issue()
+    rule = IssueTestResultAttachmentRule(issue=issue, test_result_statuses=[TestResultStatus.FAILED])
+    generator.db_session.add(rule)
+    generator.db_session.commit()
+
+    request1 = [{**minimum_result, "status": "FAILED"}]
+    request2 = [{**minimum_result, "status": "PASSED"}]
+
+    make_authenticated_request(
+        lambda: test_client.post(f"/v1/test-executions/{test_execution.id}/test-results", json=request1),
+        Permission.change_test,
+    )
+    make_authenticated_request(
+        lambda: test_client.post(f"/v1/test-executions/{test_execution.id}/test-results", json=request2),
+        Permission.change_test,
+    )
+
+    generator.db_session.expire_all()
+    assert test_execution.test_results[0].status == TestResultStatus.PASSED
+    assert test_execution.test_results[0].issue_attachments == []
+
+
 def test_apply_test_result_attachment_rules(
     test_client: TestClient, test_execution: TestExecution, generator: DataGenerator
 ):
@@ -179,3 +242,147 @@ def test_apply_test_result_attachment_rules(
     assert response.status_code == 200
     assert test_execution.test_results[0].issue_attachments[0].issue_id == issue.id
     assert test_execution.test_results[0].issue_attachments[0].attachment_rule_id == attachment_rule_id
+
+
+def test_keeps_last_result_of_repeated_case_name(test_client: TestClient, test_execution: TestExecution):
+    request = [
+        {**minimum_result, "name": "same", "status": "FAILED"},
+        {**minimum_result, "name": "other", "status": "PASSED"},
+        {**minimum_result, "name": "same", "status": "PASSED"},
+    ]
+
+    response = make_authenticated_request(
+        lambda: test_client.post(f"/v1/test-executions/{test_execution.id}/test-results", json=request),
+        Permission.change_test,
+    )
+
+    assert response.status_code == 200
+    _assert_results(request[1:], test_execution.test_results)
+
+
+def test_does_not_modify_existing_test_case(
+    test_client: TestClient, test_execution: TestExecution, generator: DataGenerator
+):
+    test_case = generator.gen_test_case(name="existing", category="original", template_id="original")
+
+    response = make_authenticated_request(
+        lambda: test_client.post(
+            f"/v1/test-executions/{test_execution.id}/test-results",
+            json=[{**maximum_result, "name": "existing"}],
+        ),
+        Permission.change_test,
+    )
+
+    assert response.status_code == 200
+    assert test_execution.test_results[0].test_case_id == test_case.id
+    assert test_case.category == "original"
+    assert test_case.template_id == "original"
+
+
+def test_apply_test_result_attachment_rules_to_batch(
+    test_client: TestClient, test_execution: TestExecution, generator: DataGenerator
+):
+    issue = generator.gen_issue()
+    first_rule = IssueTestResultAttachmentRule(issue=issue, test_result_statuses=[TestResultStatus.FAILED])
+    second_rule = IssueTestResultAttachmentRule(issue=issue, test_case_names=["test 1", "test 3"])
+    generator.db_session.add_all([first_rule, second_rule])
+    generator.db_session.commit()
+
+    request = [
+        {**minimum_result, "name": "test 1", "status": "FAILED"},
+        {**minimum_result, "name": "test 2", "status": "PASSED"},
+        {**minimum_result, "name": "test 3", "status": "PASSED"},
+    ]
+
+    response = make_authenticated_request(
+        lambda: test_client.post(f"/v1/test-executions/{test_execution.id}/test-results", json=request),
+        Permission.change_test,
+    )
+
+    assert response.status_code == 200
+    attachments = {
+        test_result.test_case.name: [attachment.attachment_rule_id for attachment in test_result.issue_attachments]
+        for test_result in test_execution.test_results
+    }
+    assert attachments == {
+        "test 1": [first_rule.id],
+        "test 2": [],
+        "test 3": [second_rule.id],
+    }
+
+
+def _post_results_stream(test_client: TestClient, test_execution_id: int, body: str) -> Response:
+    return make_authenticated_request(
+        lambda: test_client.post(
+            f"/v1/test-executions/{test_execution_id}/test-results/stream",
+            content=body,
+            headers={"Content-Type": "application/x-ndjson"},
+        ),
+        Permission.change_test,
+    )
+
+
+def test_stream_results(test_client: TestClient, test_execution: TestExecution):
+    request = [
+        maximum_result,
+        {**minimum_result, "name": "same", "status": "FAILED"},
+        {**minimum_result, "name": "same", "status": "PASSED"},
+    ]
+
+    response = _post_results_stream(test_client, test_execution.id, "\n".join(json.dumps(r) for r in request) + "\n")
+
+    assert response.status_code == 200
+    _assert_results([maximum_result, request[2]], test_execution.test_results)
+
+
+def test_stream_skips_blank_lines(test_client: TestClient, test_execution: TestExecution):
+    response = _post_results_stream(test_client, test_execution.id, f"\n{json.dumps(minimum_result)}\n\n")
+
+    assert response.status_code == 200
+    _assert_results([minimum_result], test_execution.test_results)
+
+
+def test_stream_missing_test_execution(test_client: TestClient):
+    response = _post_results_stream(test_client, 1, json.dumps(minimum_result))
+
+    assert response.status_code == 404
+
+
+def test_stream_requires_ndjson(test_client: TestClient, test_execution: TestExecution):
+    response = make_authenticated_request(
+        lambda: test_client.post(
+            f"/v1/test-executions/{test_execution.id}/test-results/stream",
+            json=[minimum_result],
+        ),
+        Permission.change_test,
+    )
+
+    assert response.status_code == 415
+
+
+def test_stream_invalid_line_stores_nothing(test_client: TestClient, test_execution: TestExecution):
+    body = "\n".join([json.dumps(minimum_result), json.dumps({"name": "no status"})])
+
+    response = _post_results_stream(test_client, test_execution.id, body)
+
+    assert_fails_validation(response, "status", "missing")
+    assert response.json()["detail"][0]["loc"] == ["body", 2, "status"]
+    assert test_execution.test_results == []
+
+
+def test_stream_counts_results_once_committed(test_client: TestClient, test_execution: TestExecution):
+    test_name = f"uncommitted {test_execution.id}"
+    # A whole chunk is stored before the invalid line is read
+    lines = [json.dumps({**minimum_result, "name": test_name})] * NDJSON_CHUNK_ROWS
+    lines.append(json.dumps({"name": "no status"}))
+
+    response = _post_results_stream(test_client, test_execution.id, "\n".join(lines))
+
+    assert response.status_code == 422
+    counted = [
+        sample
+        for metric in REGISTRY.collect()
+        for sample in metric.samples
+        if sample.labels.get("test_name") == test_name
+    ]
+    assert counted == []
@@ -114,11 +114,9 @@ class TestSearchTestExecutions:
         artefact = generator.gen_artefact(name=_uid("artefact"))
         build = generator.gen_artefact_build(artefact)
         env = generator.gen_environment()
-        tc = generator.gen_test_case(name=_uid("tc"))
-
         te = generator.gen_test_execution(build, env)
-        tr1 = generator.gen_test_result(tc, te)
-        tr2 = generator.gen_test_result(tc, te)
+        tr1 = generator.gen_test_result(generator.gen_test_case(name=_uid("tc")), te)
+        tr2 = generator.gen_test_result(generator.gen_test_case(name=_uid("tc")), te)
 
         response = make_authenticated_request(
             lambda: test_client.get(f"/v1/test-executions?test_result={tr1.id}"),
@@ -206,6 +204,43 @@ class TestSearchTestExecutions:
         assert data["offset"] == 0
         assert isinstance(data["count"], int)
 
+    def test_cursor_pagination(self, test_client: TestClient, generator: DataGenerator):
+        artefact = generator.gen_artefact(name=_uid("artefact"))
+        build = generator.gen_artefact_build(artefact)
+        env = generator.gen_environment()
+        tc = generator.gen_test_case(name=_uid("tc"))
+        same_time = datetime(2026, 1, 1)
+        test_executions = [
+            generator.gen_test_execution(build, env, created_at=created_at)
+            for created_at in [datetime(2025, 1, 1), same_time, same_time, datetime(2026, 6, 1)]
+        ]
+        for te in test_executions:
+            generator.gen_test_result(tc, te)
+
+        pages = []
+        params: dict[str, str | int] = {"artefacts": artefact.name, "limit": 2}
+        while True:
+            response = make_authenticated_request(
+                lambda: test_client.get("/v1/test-executions", params=params),
+                Permission.view_test,
+            )
+            data = response.json()
+            assert data["count"] == len(test_executions)
+            pages.append([item["id"] for item in data["test_executions"]])
+            if data["next_cursor"] is None:
+                break
+            params["cursor"] = data["next_cursor"]
+
+        ids = [te.id for te in test_executions]
+        assert pages == [[ids[3], ids[2]], [ids[1], ids[0]], []]
+
+    def test_invalid_cursor(self, test_client: TestClient):
+        response = make_authenticated_request(
+            lambda: test_client.get("/v1/test-executions", params={"cursor": "not a cursor"}),
+            Permission.view_test,
+        )
+        assert response.status_code == 422
+
     def test_no_test_result_filter_defaults_to_any(self, test_client: TestClient, generator: DataGenerator):
         """When test_result param is omitted, behaves like test_result=any."""
         artefact = generator.gen_artefact(name=_uid("artefact"))
@@ -385,12 +420,10 @@ class TestSearchTestExecutions:
         artefact = generator.gen_artefact(name=_uid("artefact"))
         build = generator.gen_artefact_build(artefact)
         env = generator.gen_environment()
-        tc = generator.gen_test_case(name=_uid("tc"))
-
         te = generator.gen_test_execution(build, env)
-        tr1 = generator.gen_test_result(tc, te)
-        tr2 = generator.gen_test_result(tc, te)
-        tr3 = generator.gen_test_result(tc, te)
+        tr1 = generator.gen_test_result(generator.gen_test_case(name=_uid("tc")), te)
+        tr2 = generator.gen_test_result(generator.gen_test_case(name=_uid("tc")), te)
+        tr3 = generator.gen_test_result(generator.gen_test_case(name=_uid("tc")), te)
 
         response = make_authenticated_request(
             lambda: test_client.get(f"/v1/test-executions?test_result={tr1.id}&test_result={tr2.id}"),
@@ -407,11 +440,10 @@ class TestSearchTestExecutions:
         artefact = generator.gen_artefact(name=_uid("artefact"))
         build = generator.gen_artefact_build(artefact)
         env = generator.gen_environment()
-        tc = generator.gen_test_case(name=_uid("tc"))
         te = generator.gen_test_execution(build, env)
 
         for _ in range(5):
-            generator.gen_test_result(tc, te)
+            generator.gen_test_result(generator.gen_test_case(name=_uid("tc")), te)
 
         response = make_authenticated_request(
             lambda: test_client.get(f"/v1/test-executions?artefacts={artefact.name}&limit=2"),
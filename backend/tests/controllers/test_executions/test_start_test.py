@@ -1342,6 +1342,33 @@ def test_with_ci_link_reuses_test_execution(execute: Execute):
     assert te1_id == te2_id
 
 
+def test_creates_relevant_links(execute: Execute, db_session: Session):
+    response = execute(
+        {
+            **snap_test_request,
+            "relevant_links": [
+                {"label": "Build Log", "url": "http://example.com/build-log"},
+                {"label": "Wiki", "url": "http://example.com/wiki"},
+            ],
+        }
+    )
+
+    test_execution = db_session.get(TestExecution, response.json()["id"])
+    assert test_execution
+    assert {(link.label, link.url) for link in test_execution.relevant_links} == {
+        ("Build Log", "http://example.com/build-log"),
+        ("Wiki", "http://example.com/wiki"),
+    }
+
+
+def test_snap_from_another_store_conflicts(execute: Execute):
+    execute(snap_test_request)
+
+    response = execute({**snap_test_request, "store": "other-store", "ci_link": "http://someother.link"})
+
+    assert response.status_code == 409
+
+
 def test_no_assignment_when_no_team_reviewers_available(
     db_session: Session, execute: Execute, generator: DataGenerator
 ):
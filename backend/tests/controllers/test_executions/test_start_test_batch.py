@@ -0,0 +1,203 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+from httpx import Response
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from test_observer.common.enums import Permission
+from test_observer.data_access.latest_test_executions import find_inconsistent_latest_test_executions
+from test_observer.data_access.models import LatestTestExecution, TestExecution
+from test_observer.data_access.models_enums import FamilyName, SnapStage, TestExecutionStatus
+from tests.conftest import make_authenticated_request
+from tests.data_generator import DataGenerator
+
+type Execute = Callable[[dict[str, Any]], Response]
+
+snap_artefact = {
+    "family": "snap",
+    "name": "core22",
+    "version": "abec123",
+    "revision": 123,
+    "track": "22",
+    "store": "ubuntu",
+    "arch": "arm64",
+    "execution_stage": SnapStage.beta,
+}
+
+
+@pytest.fixture
+def execute(test_client: TestClient) -> Execute:
+    def execute_helper(data: dict[str, Any]) -> Response:
+        return make_authenticated_request(
+            lambda: test_client.put("/v1/test-executions/start-test/batch", json=data),
+            Permission.change_test,
+        )
+
+    return execute_helper
+
+
+def test_starts_test_executions_in_request_order(execute: Execute, db_session: Session):
+    executions = [
+        {"environment": "cm3", "test_plan": "plan", "ci_link": "http://localhost/1"},
+        {"environment": "rpi4", "test_plan": "plan"},
+        {"environment": "cm3", "test_plan": "other plan", "initial_status": "NOT_STARTED"},
+        {"environment": "rpi4", "test_plan": "other plan", "ci_link": "http://localhost/2"},
+    ]
+
+    response = execute({"artefact": snap_artefact, "executions": executions})
+
+    assert response.status_code == 200
+    ids = response.json()
+    assert len(set(ids)) == len(executions)
+
+    test_executions = [db_session.get(TestExecution, test_execution_id) for test_execution_id in ids]
+    assert [(te.environment.name, te.test_plan.name, te.ci_link) for te in test_executions if te] == [
+        (execution["environment"], execution["test_plan"], execution.get("ci_link")) for execution in executions
+    ]
+    assert test_executions[2] and test_executions[2].status == TestExecutionStatus.NOT_STARTED
+
+    artefact_build = test_executions[0].artefact_build if test_executions[0] else None
+    assert artefact_build
+    assert {te.artefact_build_id for te in test_executions if te} == {artefact_build.id}
+    assert artefact_build.artefact.family == FamilyName.snap
+    assert artefact_build.architecture == "arm64"
+    assert {review.environment.name for review in artefact_build.environment_reviews} == {"cm3", "rpi4"}
+
+
+def test_matches_single_start_test(test_client: TestClient, execute: Execute):
+    single = make_authenticated_request(
+        lambda: test_client.put(
+            "/v1/test-executions/start-test",
+            json={**snap_artefact, "environment": "cm3", "test_plan": "plan", "ci_link": "http://localhost/1"},
+        ),
+        Permission.change_test,
+    )
+
+    response = execute(
+        {
+            "artefact": snap_artefact,
+            "executions": [
+                {"environment": "cm3", "test_plan": "plan", "ci_link": "http://localhost/1"},
+                {"environment": "cm3", "test_plan": "plan", "ci_link": "http://localhost/2"},
+            ],
+        }
+    )
+
+    ids = response.json()
+    assert ids[0] == single.json()["id"]
+    assert ids[1] != ids[0]
+
+
+def test_deletes_rerun_requests(execute: Execute, generator: DataGenerator, db_session: Session):
+    batch = {"artefact": snap_artefact, "executions": [{"environment": "cm3", "test_plan": "plan"}]}
+    test_execution = db_session.get(TestExecution, execute(batch).json()[0])
+    assert test_execution
+    generator.gen_rerun_request(test_execution)
+
+    execute(batch)
+
+    db_session.refresh(test_execution)
+    assert not test_execution.rerun_request
+
+
+def test_records_latest_test_executions(test_client: TestClient, execute: Execute, db_session: Session):
+    batch = {
+        "artefact": snap_artefact,
+        "executions": [
+            {"environment": "cm3", "test_plan": "plan", "ci_link": "http://localhost/1"},
+            {"environment": "cm3", "test_plan": "plan", "ci_link": "http://localhost/2"},
+            {"environment": "rpi4", "test_plan": "plan"},
+        ],
+    }
+    ids = execute(batch).json()
+
+    # Reusing an older execution through its ci_link keeps the newer one as latest
+    reused = make_authenticated_request(
+        lambda: test_client.put(
+            "/v1/test-executions/start-test",
+            json={**snap_artefact, "environment": "cm3", "test_plan": "plan", "ci_link": "http://localhost/1"},
+        ),
+        Permission.change_test,
+    )
+
+    assert reused.json()["id"] == ids[0]
+    assert set(db_session.scalars(select(LatestTestExecution.test_execution_id))) == {ids[1], ids[2]}
+    assert find_inconsistent_latest_test_executions(db_session) == []
+
+
+def test_creates_relevant_links(execute: Execute, db_session: Session):
+    response = execute(
+        {
+            "artefact": snap_artefact,
+            "executions": [
+                {
+                    "environment": "cm3",
+                    "test_plan": "plan",
+                    "relevant_links": [{"label": "Log", "url": "http://example.com/log"}],
+                },
+                {"environment": "rpi4", "test_plan": "plan"},
+            ],
+        }
+    )
+
+    first, second = (db_session.get(TestExecution, test_execution_id) for test_execution_id in response.json())
+    assert first and second
+    assert [(link.label, link.url) for link in first.relevant_links] == [("Log", "http://example.com/log")]
+    assert second.relevant_links == []
+
+
+def test_assigns_reviewer_once(execute: Execute, generator: DataGenerator, db_session: Session):
+    rule = generator.gen_artefact_matching_rule(family=FamilyName.snap)
+    team = generator.gen_team(name="reviewers", artefact_matching_rules=[rule])
+    reviewer = generator.gen_user(email="reviewer@example.com", teams=[team])
+
+    response = execute(
+        {
+            "artefact": {**snap_artefact, "needs_assignment": True},
+            "executions": [{"environment": f"env-{i}", "test_plan": "plan"} for i in range(3)],
+        }
+    )
+
+    test_execution = db_session.get(TestExecution, response.json()[0])
+    assert test_execution
+    artefact = test_execution.artefact_build.artefact
+    assert artefact.reviewers == [reviewer]
+    assert all(review.reviewers == [reviewer] for review in test_execution.artefact_build.environment_reviews)
+
+
+def test_rejects_duplicate_ci_links(execute: Execute):
+    response = execute(
+        {
+            "artefact": snap_artefact,
+            "executions": [
+                {"environment": "cm3", "test_plan": "plan", "ci_link": "http://localhost/1"},
+                {"environment": "rpi4", "test_plan": "plan", "ci_link": "http://localhost/1"},
+            ],
+        }
+    )
+
+    assert response.status_code == 422
+
+
+def test_requires_executions(execute: Execute):
+    response = execute({"artefact": snap_artefact, "executions": []})
+
+    assert response.status_code == 422
@@ -19,6 +19,7 @@ from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 
 from test_observer.common.enums import Permission
+from test_observer.data_access.models import TestExecution
 from test_observer.data_access.models_enums import StageName, TestExecutionStatus
 from tests.conftest import make_authenticated_request
 from tests.data_generator import DataGenerator
@@ -290,3 +291,80 @@ def test_post_status_update_appends_events(test_client: TestClient, generator: D
     assert len(test_execution.test_events) == 2
     assert test_execution.test_events[0].event_name == "started_setup"
     assert test_execution.test_events[1].event_name == "ended_setup"
+
+
+def _put_events(test_client: TestClient, test_execution_id: int, *events: tuple[str, str, str]) -> None:
+    response = make_authenticated_request(
+        lambda: test_client.put(
+            f"/v1/test-executions/{test_execution_id}/status_update",
+            json={
+                "events": [
+                    {"event_name": event_name, "timestamp": timestamp, "detail": detail}
+                    for event_name, timestamp, detail in events
+                ]
+            },
+        ),
+        Permission.change_test,
+    )
+    assert response.status_code == 200
+
+
+def test_status_update_only_writes_changed_events(
+    test_client: TestClient, test_execution: TestExecution, db_session: Session
+):
+    job_start = ("job_start", "2025-06-21T10:00:00", "http://resource")
+    setup = ("started_setup", "2025-06-21T10:01:00", "")
+    _put_events(test_client, test_execution.id, job_start, setup)
+    ids = {event.event_name: event.id for event in test_execution.test_events}
+
+    _put_events(test_client, test_execution.id, job_start, setup, ("job_end", "2025-06-21T10:02:00", "normal_exit"))
+
+    db_session.expire_all()
+    assert [(event.event_name, event.id == ids.get(event.event_name)) for event in test_execution.test_events] == [
+        ("job_start", True),
+        ("started_setup", True),
+        ("job_end", False),
+    ]
+    assert test_execution.resource_url == "http://resource"
+    assert test_execution.status == TestExecutionStatus.ENDED_PREMATURELY
+
+
+def test_status_update_replaces_events(test_client: TestClient, test_execution: TestExecution, db_session: Session):
+    _put_events(
+        test_client,
+        test_execution.id,
+        ("started_setup", "2025-06-21T10:01:00", ""),
+        ("ended_setup", "2025-06-21T10:02:00", ""),
+    )
+
+    _put_events(
+        test_client,
+        test_execution.id,
+        ("job_start", "2025-06-21T10:00:00", "http://resource"),
+        ("started_setup", "2025-06-21T10:01:00", "detail"),
+        ("started_setup", "2025-06-21T12:01:00+02:00", "repeated"),
+    )
+
+    db_session.expire_all()
+    assert [(event.event_name, event.detail) for event in test_execution.test_events] == [
+        ("job_start", "http://resource"),
+        ("started_setup", "repeated"),
+    ]
+    # Events added before the stored ones are processed along with them
+    assert test_execution.resource_url == "http://resource"
+    assert test_execution.status == TestExecutionStatus.NOT_STARTED
+
+
+def test_status_update_processes_events_in_request_order(
+    test_client: TestClient, test_execution: TestExecution, db_session: Session
+):
+    job_start = ("job_start", "2025-06-21T10:00:00", "http://resource")
+    setup = ("started_setup", "2025-06-21T10:01:00", "")
+    _put_events(test_client, test_execution.id, job_start, setup)
+
+    # Agent clocks can go backwards, the event sent last is still the last one
+    _put_events(test_client, test_execution.id, job_start, setup, ("job_end", "2025-06-21T09:00:00", "normal_exit"))
+
+    db_session.expire_all()
+    assert test_execution.resource_url == "http://resource"
+    assert test_execution.status == TestExecutionStatus.ENDED_PREMATURELY
@@ -19,10 +19,12 @@ from typing import Any
 import pytest
 from fastapi.testclient import TestClient
 from httpx import Response
+from sqlalchemy.orm import Session
 
 from test_observer.common.enums import Permission
 from test_observer.data_access.models import (
     TestExecution,
+    TestResultSearchEntry,
 )
 from test_observer.data_access.models_enums import TestExecutionStatus, TestResultStatus
 from tests.conftest import make_authenticated_request
@@ -111,6 +113,19 @@ def test_set_completed_status_with_failures(execute: Execute, test_execution: Te
     assert test_execution.status == TestExecutionStatus.FAILED
 
 
+def test_updates_search_entries_of_results(
+    execute: Execute, test_execution: TestExecution, generator: DataGenerator, db_session: Session
+):
+    test_result = generator.gen_test_result(generator.gen_test_case(), test_execution)
+
+    execute(test_execution.id, {"status": "COMPLETED"})
+
+    entry = db_session.get(TestResultSearchEntry, test_result.id)
+    assert entry
+    db_session.refresh(entry)
+    assert entry.execution_status == TestExecutionStatus.PASSED
+
+
 def test_set_completed_status_all_green(execute: Execute, test_execution: TestExecution, generator: DataGenerator):
     c = generator.gen_test_case()
     generator.gen_test_result(c, test_execution, TestResultStatus.PASSED)
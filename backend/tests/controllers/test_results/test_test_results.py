@@ -15,18 +15,22 @@
 
 import base64
 import uuid
-from datetime import datetime, timedelta
+from datetime import date, datetime, time, timedelta
 
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
 
 from test_observer.common.enums import Permission
+from test_observer.data_access.models import TestCase
 from test_observer.data_access.models_enums import (
     FamilyName,
     StageName,
     TestExecutionStatus,
     TestResultStatus,
 )
+from test_observer.data_access.test_result_rollups import roll_up_test_results
 from tests.conftest import make_authenticated_request
 from tests.data_generator import DataGenerator
 
@@ -87,7 +91,6 @@ class TestSearchTestResults:
         """Test that window function count matches actual number of results"""
         # Create multiple test results with specific family
         environment = generator.gen_environment()
-        test_case = generator.gen_test_case(name=generate_unique_name("window_count"))
         snap_artefact = generator.gen_artefact(family=FamilyName.snap, name=generate_unique_name("snap_artefact"))
         artefact_build = generator.gen_artefact_build(snap_artefact)
         test_execution = generator.gen_test_execution(artefact_build, environment)
@@ -95,7 +98,11 @@ class TestSearchTestResults:
         # Create test results
         test_results = []
         for _ in range(7):
-            test_results.append(generator.gen_test_result(test_case, test_execution))
+            test_results.append(
+                generator.gen_test_result(
+                    generator.gen_test_case(name=generate_unique_name("window_count")), test_execution
+                )
+            )
 
         response = make_authenticated_request(
             lambda: test_client.get("/v1/test-results?families=snap&limit=3"),
@@ -118,14 +125,13 @@ class TestSearchTestResults:
         """Test that pagination works correctly with window function"""
         # Create test data
         environment = generator.gen_environment()
-        test_case = generator.gen_test_case(name=generate_unique_name("pagination"))
         charm_artefact = generator.gen_artefact(family=FamilyName.charm, name=generate_unique_name("charm_artefact"))
         artefact_build = generator.gen_artefact_build(charm_artefact)
         test_execution = generator.gen_test_execution(artefact_build, environment)
 
         # Create 5 test results
         for _ in range(5):
-            generator.gen_test_result(test_case, test_execution)
+            generator.gen_test_result(generator.gen_test_case(name=generate_unique_name("pagination")), test_execution)
 
         # Test first page
         response1 = make_authenticated_request(
@@ -255,12 +261,15 @@ class TestSearchTestResults:
         """Test filtering by multiple issue IDs with window function"""
         # Create test data
         environment = generator.gen_environment()
-        test_case = generator.gen_test_case(name=generate_unique_name("multi_issues"))
         artefact = generator.gen_artefact(name=generate_unique_name("artefact"))
         artefact_build = generator.gen_artefact_build(artefact)
         test_execution = generator.gen_test_execution(artefact_build, environment)
-        test_result1 = generator.gen_test_result(test_case, test_execution)
-        test_result2 = generator.gen_test_result(test_case, test_execution)
+        test_result1 = generator.gen_test_result(
+            generator.gen_test_case(name=generate_unique_name("multi_issues")), test_execution
+        )
+        test_result2 = generator.gen_test_result(
+            generator.gen_test_case(name=generate_unique_name("multi_issues")), test_execution
+        )
 
         # Create issues and attach them to different test results via API
         issue1 = generator.gen_issue(key="123")
@@ -299,12 +308,15 @@ class TestSearchTestResults:
         """Test filtering by issues=any to find test results with any issue attached"""
         # Create test data
         environment = generator.gen_environment()
-        test_case = generator.gen_test_case(name=generate_unique_name("issues_any"))
         artefact = generator.gen_artefact(name=generate_unique_name("artefact"))
         artefact_build = generator.gen_artefact_build(artefact)
         test_execution = generator.gen_test_execution(artefact_build, environment)
-        test_result_with_issue = generator.gen_test_result(test_case, test_execution)
-        test_result_without_issue = generator.gen_test_result(test_case, test_execution)
+        test_result_with_issue = generator.gen_test_result(
+            generator.gen_test_case(name=generate_unique_name("issues_any")), test_execution
+        )
+        test_result_without_issue = generator.gen_test_result(
+            generator.gen_test_case(name=generate_unique_name("issues_any")), test_execution
+        )
 
         # Create an issue and attach it to one test result
         issue = generator.gen_issue()
@@ -335,12 +347,15 @@ class TestSearchTestResults:
         """Test filtering by issues=none (test results without any issue attached)"""
         # Create test data
         environment = generator.gen_environment()
-        test_case = generator.gen_test_case(name=generate_unique_name("issues_none"))
         artefact = generator.gen_artefact(name=generate_unique_name("artefact"))
         artefact_build = generator.gen_artefact_build(artefact)
         test_execution = generator.gen_test_execution(artefact_build, environment)
-        test_result_with_issue = generator.gen_test_result(test_case, test_execution)
-        test_result_without_issue = generator.gen_test_result(test_case, test_execution)
+        test_result_with_issue = generator.gen_test_result(
+            generator.gen_test_case(name=generate_unique_name("issues_none")), test_execution
+        )
+        test_result_without_issue = generator.gen_test_result(
+            generator.gen_test_case(name=generate_unique_name("issues_none")), test_execution
+        )
 
         # Create an issue and attach it to one test result
         issue = generator.gen_issue()
@@ -752,6 +767,87 @@ class TestSearchTestResults:
         assert data["count"] == 0
         assert data["test_results"] == []
 
+    def test_cursor_pagination(self, test_client: TestClient, generator: DataGenerator):
+        """Test paging through results with the cursor of the previous page"""
+        artefact = generator.gen_artefact(name=generate_unique_name("artefact"))
+        test_execution = generator.gen_test_execution(
+            generator.gen_artefact_build(artefact), generator.gen_environment()
+        )
+        # Results of a transaction share their created_at, so the cursor relies on ids to break ties
+        test_result_ids = [
+            generator.gen_test_result(generator.gen_test_case(name=generate_unique_name("cursor")), test_execution).id
+            for _ in range(5)
+        ]
+
+        pages = []
+        params: dict[str, str | int] = {"artefacts": artefact.name, "limit": 2}
+        while True:
+            response = make_authenticated_request(
+                lambda: test_client.get("/v1/test-results", params=params),
+                Permission.view_test,
+            )
+            data = response.json()
+            assert data["count"] == len(test_result_ids)
+            pages.append([tr["test_result"]["id"] for tr in data["test_results"]])
+            if data["next_cursor"] is None:
+                break
+            params["cursor"] = data["next_cursor"]
+
+        ids = test_result_ids[::-1]
+        assert pages == [ids[0:2], ids[2:4], ids[4:]]
+
+    def test_invalid_cursor(self, test_client: TestClient):
+        """Test that malformed cursors are rejected"""
+        response = make_authenticated_request(
+            lambda: test_client.get("/v1/test-results", params={"cursor": "bm90IGpzb24="}),
+            Permission.view_test,
+        )
+        assert response.status_code == 422
+
+    @pytest.mark.parametrize("count_mode", ["estimate", "none"])
+    def test_count_modes(self, test_client: TestClient, generator: DataGenerator, count_mode: str):
+        """Test that counts can be estimated or skipped"""
+        artefact = generator.gen_artefact(name=generate_unique_name("artefact"))
+        test_execution = generator.gen_test_execution(
+            generator.gen_artefact_build(artefact), generator.gen_environment()
+        )
+        generator.gen_test_result(generator.gen_test_case(), test_execution)
+
+        response = make_authenticated_request(
+            lambda: test_client.get("/v1/test-results", params={"artefacts": artefact.name, "count_mode": count_mode}),
+            Permission.view_test,
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["test_results"]) == 1
+        assert (data["count"] is None) == (count_mode == "none")
+
+    def test_filters_search_entries_without_joins(
+        self, test_client: TestClient, generator: DataGenerator, db_session: Session
+    ):
+        """Test that results are filtered in their search entries before loading the page"""
+        artefact = generator.gen_artefact(name=generate_unique_name("artefact"))
+        test_execution = generator.gen_test_execution(
+            generator.gen_artefact_build(artefact), generator.gen_environment()
+        )
+        generator.gen_test_result(generator.gen_test_case(), test_execution)
+
+        statements: list[str] = []
+        event.listen(db_session.connection(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+        response = make_authenticated_request(
+            lambda: test_client.get(
+                "/v1/test-results",
+                params={"artefacts": artefact.name, "environments": "laptop", "template_ids": "template"},
+            ),
+            Permission.view_test,
+        )
+
+        assert response.status_code == 200
+        searches = [statement for statement in statements if "FROM test_result_search" in statement]
+        assert searches
+        assert all("JOIN" not in statement for statement in searches)
+
     def test_pagination_limits(self, test_client: TestClient):
         """Test pagination parameter validation"""
         # Test maximum limit
@@ -1217,17 +1313,23 @@ class TestSearchTestResults:
     ):
         """The filter returns only results with the requested status"""
         env = generator.gen_environment()
-        tc = generator.gen_test_case(name=generate_unique_name(f"status_{status.value}"))
         artefact = generator.gen_artefact(name=generate_unique_name("artefact"))
         ab = generator.gen_artefact_build(artefact)
         te = generator.gen_test_execution(ab, env)
 
         # Create test result with matching status
-        tr_yes = generator.gen_test_result(tc, te, status=status)
+        tr_yes = generator.gen_test_result(
+            generator.gen_test_case(name=generate_unique_name(f"status_{status.value}")), te, status=status
+        )
 
         # Create test results with other statuses
         other_statuses = [s for s in TestResultStatus if s != status]
-        tr_no_list = [generator.gen_test_result(tc, te, status=other_status) for other_status in other_statuses]
+        tr_no_list = [
+            generator.gen_test_result(
+                generator.gen_test_case(name=generate_unique_name(f"status_{status.value}")), te, status=other_status
+            )
+            for other_status in other_statuses
+        ]
 
         resp = make_authenticated_request(
             lambda: test_client.get(f"/v1/test-results?test_result_statuses={status.value}"),
@@ -1250,15 +1352,20 @@ class TestSearchTestResults:
     def test_search_by_multiple_test_result_statuses(self, test_client: TestClient, generator: DataGenerator):
         """Test filtering by multiple test result statuses"""
         env = generator.gen_environment()
-        tc = generator.gen_test_case(name=generate_unique_name("multi_status"))
         artefact = generator.gen_artefact(name=generate_unique_name("artefact"))
         ab = generator.gen_artefact_build(artefact)
         te = generator.gen_test_execution(ab, env)
 
         # Create test results with different statuses
-        tr_passed = generator.gen_test_result(tc, te, status=TestResultStatus.PASSED)
-        tr_failed = generator.gen_test_result(tc, te, status=TestResultStatus.FAILED)
-        tr_skipped = generator.gen_test_result(tc, te, status=TestResultStatus.SKIPPED)
+        tr_passed = generator.gen_test_result(
+            generator.gen_test_case(name=generate_unique_name("multi_status")), te, status=TestResultStatus.PASSED
+        )
+        tr_failed = generator.gen_test_result(
+            generator.gen_test_case(name=generate_unique_name("multi_status")), te, status=TestResultStatus.FAILED
+        )
+        tr_skipped = generator.gen_test_result(
+            generator.gen_test_case(name=generate_unique_name("multi_status")), te, status=TestResultStatus.SKIPPED
+        )
 
         # Query for PASSED and FAILED
         resp = make_authenticated_request(
@@ -1385,24 +1492,39 @@ class TestSearchTestResults:
     def test_search_combined_result_and_execution_statuses(self, test_client: TestClient, generator: DataGenerator):
         """Test filtering by both test result and test execution statuses"""
         env = generator.gen_environment()
-        tc = generator.gen_test_case(name=generate_unique_name("combined_statuses"))
         artefact = generator.gen_artefact(name=generate_unique_name("artefact"))
         ab = generator.gen_artefact_build(artefact)
 
         # Create combinations of result and execution statuses
         # Match both filters
         te_passed = generator.gen_test_execution(ab, env, status=TestExecutionStatus.PASSED)
-        tr_passed_passed = generator.gen_test_result(tc, te_passed, status=TestResultStatus.PASSED)
+        tr_passed_passed = generator.gen_test_result(
+            generator.gen_test_case(name=generate_unique_name("combined_statuses")),
+            te_passed,
+            status=TestResultStatus.PASSED,
+        )
 
         # Match execution status but not result status
-        tr_failed_passed = generator.gen_test_result(tc, te_passed, status=TestResultStatus.FAILED)
+        tr_failed_passed = generator.gen_test_result(
+            generator.gen_test_case(name=generate_unique_name("combined_statuses")),
+            te_passed,
+            status=TestResultStatus.FAILED,
+        )
 
         # Match result status but not execution status
         te_failed = generator.gen_test_execution(ab, env, status=TestExecutionStatus.FAILED)
-        tr_passed_failed = generator.gen_test_result(tc, te_failed, status=TestResultStatus.PASSED)
+        tr_passed_failed = generator.gen_test_result(
+            generator.gen_test_case(name=generate_unique_name("combined_statuses")),
+            te_failed,
+            status=TestResultStatus.PASSED,
+        )
 
         # Match neither
-        tr_failed_failed = generator.gen_test_result(tc, te_failed, status=TestResultStatus.FAILED)
+        tr_failed_failed = generator.gen_test_result(
+            generator.gen_test_case(name=generate_unique_name("combined_statuses")),
+            te_failed,
+            status=TestResultStatus.FAILED,
+        )
 
         # Query for PASSED result status and PASSED execution status
         resp = make_authenticated_request(
@@ -1436,12 +1558,11 @@ class TestSearchTestResults:
         """count reflects total results, limit and offset echo back the used values"""
         unique_marker = uuid.uuid4().hex[:8]
         environment = generator.gen_environment()
-        test_case = generator.gen_test_case(name=generate_unique_name("meta"))
         artefact = generator.gen_artefact(name=f"meta_artefact_{unique_marker}")
         artefact_build = generator.gen_artefact_build(artefact)
         test_execution = generator.gen_test_execution(artefact_build, environment)
         for _ in range(5):
-            generator.gen_test_result(test_case, test_execution)
+            generator.gen_test_result(generator.gen_test_case(name=generate_unique_name("meta")), test_execution)
 
         response = make_authenticated_request(
             lambda: test_client.get(f"/v1/test-results?artefacts={artefact.name}&limit=2&offset=1"),
@@ -1455,6 +1576,71 @@ class TestSearchTestResults:
         assert data["offset"] == 1
         assert len(data["test_results"]) == 2
 
+    def test_search_includes_io_log_when_requested(self, test_client: TestClient, generator: DataGenerator):
+        """Test that the whole io_log is only returned when requested"""
+        test_case = generator.gen_test_case(name=generate_unique_name("io_log"))
+        artefact_build = generator.gen_artefact_build(generator.gen_artefact(name=generate_unique_name("artefact")))
+        test_execution = generator.gen_test_execution(artefact_build, generator.gen_environment())
+        generator.gen_test_result(test_case, test_execution, io_log="x" * 1000)
+
+        def search(include_io_log: bool) -> dict:
+            response = make_authenticated_request(
+                lambda: test_client.get(
+                    "/v1/test-results",
+                    params={"test_cases": [test_case.name], "include_io_log": include_io_log},
+                ),
+                Permission.view_test,
+            )
+            return response.json()["test_results"][0]["test_result"]
+
+        without_io_log = search(include_io_log=False)
+        assert (without_io_log["io_log_preview"], without_io_log["io_log_size"]) == ("x" * 200, 1000)
+        assert without_io_log["io_log"] is None
+        assert search(include_io_log=True)["io_log"] == "x" * 1000
+
+    def test_search_by_log_query_highlights_matches(self, test_client: TestClient, generator: DataGenerator):
+        """Test that log_query finds words in sequence in comments and io_logs and highlights them"""
+        oops = uuid.uuid4().hex
+        artefact = generator.gen_artefact(name=generate_unique_name("artefact"))
+        artefact_build = generator.gen_artefact_build(artefact)
+        test_execution = generator.gen_test_execution(artefact_build, generator.gen_environment())
+        in_io_log = generator.gen_test_result(
+            generator.gen_test_case(name=generate_unique_name("io_log")),
+            test_execution,
+            io_log=f"booting\nBUG: kernel NULL pointer dereference {oops}\nhalted",
+        )
+        in_comment = generator.gen_test_result(
+            generator.gen_test_case(name=generate_unique_name("comment")),
+            test_execution,
+            comment=f"Kernel null pointer dereference {oops} again",
+        )
+        generator.gen_test_result(
+            generator.gen_test_case(name=generate_unique_name("unordered")),
+            test_execution,
+            io_log=f"pointer NULL kernel dereference {oops}",
+        )
+
+        response = make_authenticated_request(
+            lambda: test_client.get(
+                "/v1/test-results",
+                params={"artefacts": [artefact.name], "log_query": f" kernel NULL pointer dereference {oops} "},
+            ),
+            Permission.view_test,
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["count"] == 2
+        results = {item["test_result"]["id"]: item for item in data["test_results"]}
+        assert results.keys() == {in_io_log.id, in_comment.id}
+        assert results[in_io_log.id]["test_result"]["io_log"] is None
+        assert results[in_io_log.id]["log_highlights"] == [
+            f"booting\nBUG: <b>kernel</b> <b>NULL</b> <b>pointer</b> <b>dereference</b> <b>{oops}</b>\nhalted"
+        ]
+        assert results[in_comment.id]["log_highlights"] == [
+            f"<b>Kernel</b> <b>null</b> <b>pointer</b> <b>dereference</b> <b>{oops}</b> again"
+        ]
+
 
 class TestWindowFunctionSpecific:
     """Test class specifically for window function behavior and edge cases"""
@@ -1492,14 +1678,13 @@ class TestWindowFunctionSpecific:
         """Test window function with various pagination edge cases"""
         # Create test data
         environment = generator.gen_environment()
-        test_case = generator.gen_test_case(name=generate_unique_name("edge_cases"))
         artefact = generator.gen_artefact(name=generate_unique_name("edge_artefact"))
         artefact_build = generator.gen_artefact_build(artefact)
         test_execution = generator.gen_test_execution(artefact_build, environment)
 
         # Create 10 test results
         for _ in range(10):
-            generator.gen_test_result(test_case, test_execution)
+            generator.gen_test_result(generator.gen_test_case(name=generate_unique_name("edge_cases")), test_execution)
 
         # Test if offset is at exact boundary
         response = make_authenticated_request(
@@ -1771,3 +1956,157 @@ class TestWindowFunctionSpecific:
         result_ids = [tr["test_result"]["id"] for tr in data["test_results"]]
         assert tr1.id in result_ids
         assert tr2.id in result_ids
+
+
+class TestGetTestResultIoLog:
+    """Test class for the endpoint getting the io_log of a test result"""
+
+    IO_LOG = "".join(f"line {i}\n" for i in range(1000))
+
+    @pytest.fixture
+    def test_result_id(self, generator: DataGenerator) -> int:
+        artefact_build = generator.gen_artefact_build(generator.gen_artefact(name=generate_unique_name("artefact")))
+        test_execution = generator.gen_test_execution(artefact_build, generator.gen_environment())
+        return generator.gen_test_result(generator.gen_test_case(), test_execution, io_log=self.IO_LOG).id
+
+    def test_gets_whole_io_log(self, test_client: TestClient, test_result_id: int):
+        response = make_authenticated_request(
+            lambda: test_client.get(f"/v1/test-results/{test_result_id}/io-log"),
+            Permission.view_test,
+        )
+
+        assert response.status_code == 200
+        assert response.text == self.IO_LOG
+        assert response.headers["content-type"] == "text/plain; charset=utf-8"
+        assert response.headers["accept-ranges"] == "bytes"
+
+    def test_gzips_whole_io_log_when_accepted(self, test_client: TestClient, test_result_id: int):
+        response = make_authenticated_request(
+            lambda: test_client.get(f"/v1/test-results/{test_result_id}/io-log", headers={"Accept-Encoding": "gzip"}),
+            Permission.view_test,
+        )
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert int(response.headers["content-length"]) < len(self.IO_LOG)
+        assert response.text == self.IO_LOG
+
+    @pytest.mark.parametrize(
+        ("range_header", "start", "end"),
+        [("bytes=0-9", 0, 9), ("bytes=100-", 100, None), ("bytes=-50", -50, None), ("bytes=10-999999", 10, None)],
+    )
+    def test_gets_range_of_io_log(
+        self, test_client: TestClient, test_result_id: int, range_header: str, start: int, end: int | None
+    ):
+        response = make_authenticated_request(
+            lambda: test_client.get(f"/v1/test-results/{test_result_id}/io-log", headers={"Range": range_header}),
+            Permission.view_test,
+        )
+
+        expected = self.IO_LOG.encode()[start : end + 1 if end is not None else None]
+        first = start % len(self.IO_LOG)
+        assert response.status_code == 206
+        assert response.content == expected
+        assert response.headers["content-range"] == f"bytes {first}-{first + len(expected) - 1}/{len(self.IO_LOG)}"
+        assert "content-encoding" not in response.headers
+
+    def test_rejects_range_outside_io_log(self, test_client: TestClient, test_result_id: int):
+        response = make_authenticated_request(
+            lambda: test_client.get(
+                f"/v1/test-results/{test_result_id}/io-log", headers={"Range": f"bytes={len(self.IO_LOG)}-"}
+            ),
+            Permission.view_test,
+        )
+
+        assert response.status_code == 416
+        assert response.headers["content-range"] == f"bytes */{len(self.IO_LOG)}"
+
+    def test_ignores_multiple_ranges(self, test_client: TestClient, test_result_id: int):
+        response = make_authenticated_request(
+            lambda: test_client.get(f"/v1/test-results/{test_result_id}/io-log", headers={"Range": "bytes=0-1,5-6"}),
+            Permission.view_test,
+        )
+
+        assert (response.status_code, response.text) == (200, self.IO_LOG)
+
+    def test_missing_test_result(self, test_client: TestClient):
+        response = make_authenticated_request(
+            lambda: test_client.get("/v1/test-results/0/io-log"),
+            Permission.view_test,
+        )
+
+        assert response.status_code == 404
+
+
+class TestGetTestResultsSummary:
+    """Test class for the test results summary endpoint"""
+
+    @pytest.fixture
+    def day(self, db_session: Session, generator: DataGenerator) -> date:
+        """Day of results of two families, an environment and two test cases, all counted"""
+        day = date.today() - timedelta(days=1)
+        environment = generator.gen_environment()
+        test_cases = [generator.gen_test_case(name=name) for name in ["summary_a", "summary_b"]]
+        for family, statuses in [
+            (FamilyName.snap, [TestResultStatus.PASSED, TestResultStatus.FAILED]),
+            (FamilyName.deb, [TestResultStatus.PASSED, TestResultStatus.SKIPPED]),
+        ]:
+            artefact = generator.gen_artefact(family=family, name=f"summary-{family}")
+            test_execution = generator.gen_test_execution(generator.gen_artefact_build(artefact), environment)
+            for test_case, status in zip(test_cases, statuses, strict=True):
+                generator.gen_test_result(test_case, test_execution, status, created_at=datetime.combine(day, time(12)))
+        while roll_up_test_results(db_session):
+            pass
+        db_session.commit()
+        return day
+
+    def _get_summary(self, test_client: TestClient, params: dict) -> dict:
+        response = make_authenticated_request(
+            lambda: test_client.get("/v1/test-results/summary", params=params),
+            Permission.view_test,
+        )
+        assert response.status_code == 200
+        return response.json()
+
+    def test_counts_all_results(self, test_client: TestClient, day: date):
+        data = self._get_summary(test_client, {"start_date": day.isoformat()})
+
+        assert data["counted_until"] is not None
+        assert data["groups"] == [
+            {
+                "day": None,
+                "family": None,
+                "artefact_id": None,
+                "environment_id": None,
+                "test_case_id": None,
+                "passed": 2,
+                "failed": 1,
+                "skipped": 1,
+            }
+        ]
+
+    def test_groups_by_day_and_family(self, test_client: TestClient, day: date):
+        data = self._get_summary(
+            test_client,
+            {"start_date": (day - timedelta(days=3)).isoformat(), "group_by": ["day", "family"]},
+        )
+
+        counts = [(g["day"], g["family"], g["passed"], g["failed"], g["skipped"]) for g in data["groups"]]
+        assert counts == [(day.isoformat(), "snap", 1, 1, 0), (day.isoformat(), "deb", 1, 0, 1)]
+
+    def test_groups_by_test_case(self, test_client: TestClient, db_session: Session, day: date):
+        data = self._get_summary(
+            test_client,
+            {"start_date": day.isoformat(), "families": ["snap"], "group_by": ["test_case"]},
+        )
+
+        names = dict(db_session.execute(select(TestCase.id, TestCase.name)).tuples().all())
+        counts = [(names[g["test_case_id"]], g["passed"], g["failed"]) for g in data["groups"]]
+        assert sorted(counts) == [("summary_a", 1, 0), ("summary_b", 0, 1)]
+
+    def test_excludes_days_out_of_range(self, test_client: TestClient, day: date):
+        data = self._get_summary(
+            test_client,
+            {"start_date": (day - timedelta(days=3)).isoformat(), "end_date": (day - timedelta(days=1)).isoformat()},
+        )
+
+        assert [(g["passed"], g["failed"], g["skipped"]) for g in data["groups"]] == [(0, 0, 0)]
@@ -553,3 +553,16 @@ def test_delete_user_idempotent(test_client: TestClient):
     )
 
     assert response.status_code == 204
+
+
+def test_get_users_search_ranks_prefix_matches_first(test_client: TestClient, generator: DataGenerator):
+    generator.gen_user(name="Bob Hannah", email="bob@example.com", launchpad_handle=None)
+    generator.gen_user(name="Yann Smith", email="annie@example.com", launchpad_handle="yann")
+
+    response = make_authenticated_request(
+        lambda: test_client.get("/v1/users", params={"q": "ann"}),
+        Permission.view_user,
+    )
+
+    assert response.status_code == 200
+    assert [user["name"] for user in response.json()["users"]] == ["Yann Smith", "Bob Hannah"]
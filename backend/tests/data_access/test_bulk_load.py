@@ -0,0 +1,118 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+from datetime import datetime
+
+import pytest
+from pytest import MonkeyPatch
+from sqlalchemy import select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from test_observer.data_access import bulk_load
+from test_observer.data_access.bulk_load import staged_rows
+from test_observer.data_access.models import TestEvent, TestExecution, TestResult
+from test_observer.data_access.models_enums import TestResultStatus
+from tests.data_generator import DataGenerator
+
+EVENT_COLUMNS = ["test_execution_id", "event_name", "timestamp", "detail"]
+
+
+def test_stages_and_merges_rows(db_session: Session, test_execution: TestExecution):
+    rows = [
+        {
+            "test_execution_id": test_execution.id,
+            "event_name": f"event_{i}",
+            "timestamp": datetime(2026, 1, 1, 0, 0, i),
+            "detail": "",
+        }
+        for i in range(3)
+    ]
+
+    with staged_rows(db_session, TestEvent, EVENT_COLUMNS, rows) as staging:
+        db_session.execute(insert(TestEvent).from_select(EVENT_COLUMNS, select(staging).order_by(staging.c.timestamp)))
+
+    db_session.expire_all()
+    assert [(e.event_name, e.timestamp) for e in test_execution.test_events] == [
+        (row["event_name"], row["timestamp"]) for row in rows
+    ]
+    assert all(e.created_at is not None for e in test_execution.test_events)
+
+
+def test_round_trips_special_values(db_session: Session, generator: DataGenerator, test_execution: TestExecution):
+    test_case = generator.gen_test_case()
+    comment = "tab\there\nnew line\r\\N back\\slash é"
+    row = {
+        "test_execution_id": test_execution.id,
+        "test_case_id": test_case.id,
+        "status": TestResultStatus.SKIPPED,
+        "comment": comment,
+        "io_log_preview": "",
+    }
+
+    with staged_rows(db_session, TestResult, list(row), [row]) as staging:
+        db_session.execute(insert(TestResult).from_select(list(row), select(staging)))
+
+    test_result = db_session.scalars(select(TestResult).where(TestResult.test_case_id == test_case.id)).one()
+    assert (test_result.status, test_result.comment, test_result.io_log) == (TestResultStatus.SKIPPED, comment, "")
+
+
+def test_copies_nulls(db_session: Session, test_execution: TestExecution):
+    rows = [{"test_execution_id": test_execution.id, "event_name": None, "timestamp": None, "detail": None}]
+
+    with staged_rows(db_session, TestEvent, EVENT_COLUMNS, rows) as staging:
+        assert db_session.execute(select(staging)).all() == [(test_execution.id, None, None, None)]
+
+
+def test_sends_rows_in_chunks(db_session: Session, test_execution: TestExecution, monkeypatch: MonkeyPatch):
+    monkeypatch.setattr(bulk_load, "COPY_CHUNK_BYTES", 100)
+    rows = [
+        {"test_execution_id": test_execution.id, "event_name": "e", "timestamp": datetime(2026, 1, 1), "detail": ""}
+        for _ in range(50)
+    ]
+
+    with staged_rows(db_session, TestEvent, EVENT_COLUMNS, iter(rows)) as staging:
+        assert len(db_session.execute(select(staging)).all()) == len(rows)
+
+
+def test_drops_staging_table(db_session: Session):
+    with staged_rows(db_session, TestEvent, EVENT_COLUMNS, []) as staging:
+        pass
+
+    assert db_session.scalar(text(f"SELECT to_regclass('{staging.name}')")) is None
+
+
+def test_staging_table_is_rolled_back(db_session: Session, test_execution: TestExecution):
+    rows = [{"test_execution_id": test_execution.id, "event_name": "e", "timestamp": "not a time", "detail": ""}]
+
+    with (
+        pytest.raises(Exception, match="invalid input syntax"),
+        staged_rows(db_session, TestEvent, EVENT_COLUMNS, rows),
+    ):
+        pass
+
+    db_session.rollback()
+    with staged_rows(db_session, TestEvent, EVENT_COLUMNS, []):
+        pass
+
+
+def test_drops_staging_table_when_block_raises(db_session: Session):
+    with pytest.raises(ValueError), staged_rows(db_session, TestEvent, EVENT_COLUMNS, []) as staging:
+        raise ValueError
+
+    # The transaction is still usable and the table can be staged again
+    assert db_session.scalar(text(f"SELECT to_regclass('{staging.name}')")) is None
+    with staged_rows(db_session, TestEvent, EVENT_COLUMNS, []):
+        pass
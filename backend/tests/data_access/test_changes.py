@@ -0,0 +1,115 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import Engine, delete, func, select, text, update
+from sqlalchemy.orm import Session
+
+from test_observer.data_access.changes import CHANGE_RETENTION, delete_expired_changes, get_changes
+from test_observer.data_access.models import ChangeRecord, IssueTestResultAttachment, TestExecution
+from test_observer.data_access.models_enums import ChangeEntity, ChangeOperation, StageName
+from tests.data_generator import DataGenerator
+
+
+def _recorded(changes: list[ChangeRecord]) -> list[tuple[ChangeEntity, int, int | None, ChangeOperation]]:
+    return [(c.entity, c.entity_id, c.parent_id, c.operation) for c in changes]
+
+
+def test_records_changes_with_their_parent(db_session: Session, generator: DataGenerator):
+    artefact = generator.gen_artefact(StageName.beta)
+    build = generator.gen_artefact_build(artefact)
+    environment = generator.gen_environment()
+    test_execution = generator.gen_test_execution(build, environment)
+    test_result = generator.gen_test_result(generator.gen_test_case(), test_execution)
+    review = generator.gen_artefact_build_environment_review(build, environment)
+    attachment = IssueTestResultAttachment(issue=generator.gen_issue(), test_result=test_result)
+    db_session.add(attachment)
+    db_session.commit()
+
+    changes, _ = get_changes(db_session, (0, 0), 100)
+
+    assert _recorded(changes) == [
+        (ChangeEntity.ARTEFACT, artefact.id, None, ChangeOperation.CREATED),
+        (ChangeEntity.ARTEFACT_BUILD, build.id, artefact.id, ChangeOperation.CREATED),
+        (ChangeEntity.TEST_EXECUTION, test_execution.id, build.id, ChangeOperation.CREATED),
+        (ChangeEntity.TEST_RESULT, test_result.id, test_execution.id, ChangeOperation.CREATED),
+        (ChangeEntity.ENVIRONMENT_REVIEW, review.id, build.id, ChangeOperation.CREATED),
+        (ChangeEntity.ISSUE_ATTACHMENT, attachment.id, test_result.id, ChangeOperation.CREATED),
+    ]
+
+
+def test_records_bulk_updates_and_deletes(db_session: Session, generator: DataGenerator, test_execution: TestExecution):
+    test_results = [generator.gen_test_result(generator.gen_test_case(name=name), test_execution) for name in "ab"]
+    test_execution_id, artefact_build_id = test_execution.id, test_execution.artefact_build_id
+    _, position = get_changes(db_session, (0, 0), 100)
+
+    db_session.execute(update(TestExecution).where(TestExecution.id == test_execution.id).values(ci_link="link"))
+    db_session.execute(delete(TestExecution).where(TestExecution.id == test_execution.id))
+
+    changes, _ = get_changes(db_session, position, 100)
+    assert _recorded(changes) == [
+        (ChangeEntity.TEST_EXECUTION, test_execution_id, artefact_build_id, ChangeOperation.UPDATED),
+        (ChangeEntity.TEST_EXECUTION, test_execution_id, artefact_build_id, ChangeOperation.DELETED),
+        # Deleted by cascade
+        *[(ChangeEntity.TEST_RESULT, r.id, test_execution_id, ChangeOperation.DELETED) for r in test_results],
+    ]
+
+
+def test_pages_through_changes(db_session: Session, generator: DataGenerator):
+    artefacts = [generator.gen_artefact(StageName.beta, name=f"artefact-{i}") for i in range(5)]
+
+    first_page, position = get_changes(db_session, (0, 0), 3)
+    second_page, position = get_changes(db_session, position, 3)
+
+    assert [c.entity_id for c in first_page + second_page] == [a.id for a in artefacts]
+    assert get_changes(db_session, position, 3) == ([], position)
+
+
+def test_does_not_pass_changes_of_running_transactions(db_session: Session, db_engine: Engine):
+    with db_engine.connect() as other:
+        other.execute(
+            text(
+                "INSERT INTO change_record "
+                "(transaction_id, entity, entity_id, operation, created_at, updated_at) "
+                "VALUES (pg_current_xact_id()::text::bigint, 'ARTEFACT', 0, 'CREATED', now(), now())"
+            )
+        )
+        _, position = get_changes(db_session, (0, 0), 100)
+        other.commit()
+
+        try:
+            changes, _ = get_changes(db_session, position, 100)
+            assert _recorded(changes) == [(ChangeEntity.ARTEFACT, 0, None, ChangeOperation.CREATED)]
+        finally:
+            other.execute(delete(ChangeRecord).where(ChangeRecord.entity_id == 0))
+            other.commit()
+
+
+def test_deletes_expired_changes(db_session: Session, generator: DataGenerator):
+    expired = generator.gen_artefact(StageName.beta, name="expired")
+    kept = generator.gen_artefact(StageName.beta, name="kept")
+    db_session.execute(
+        update(ChangeRecord)
+        .where(ChangeRecord.entity_id == expired.id)
+        .values(created_at=datetime.now() - CHANGE_RETENTION - timedelta(days=1))
+    )
+
+    assert delete_expired_changes(db_session) == 1
+
+    remaining = db_session.scalars(select(ChangeRecord.entity_id).where(ChangeRecord.entity == ChangeEntity.ARTEFACT))
+    assert list(remaining) == [kept.id]
+    assert db_session.scalar(select(func.count()).select_from(ChangeRecord)) == 1
@@ -0,0 +1,63 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+import pytest
+from sqlalchemy import String, any_, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.orm import Session
+
+from test_observer.data_access.conflicts import insert_or_select, rows_in_lock_order
+from test_observer.data_access.models import TestCase
+
+
+def _select_ids(db: Session, names: list[str]) -> dict[str, int]:
+    stmt = select(TestCase.name, TestCase.id).where(TestCase.name == any_(literal(names, ARRAY(String))))
+    return dict(db.execute(stmt).tuples().all())
+
+
+def test_orders_rows_by_key():
+    assert rows_in_lock_order({"b": {"name": "b"}, "a": {"name": "a"}}) == [{"name": "a"}, {"name": "b"}]
+
+
+def test_selects_rows_inserted_concurrently(db_session: Session):
+    # Stored by another transaction after the caller looked for it
+    concurrent = TestCase(name="concurrent", category="", template_id="")
+    db_session.add(concurrent)
+    db_session.flush()
+
+    inserted, inserted_concurrently = insert_or_select(
+        db_session,
+        insert(TestCase).on_conflict_do_nothing(index_elements=["name"]).returning(TestCase.name, TestCase.id),
+        {name: {"name": name, "category": "", "template_id": ""} for name in ("new", "concurrent")},
+        lambda row: row.id,
+        lambda names: _select_ids(db_session, names),
+    )
+
+    assert inserted == _select_ids(db_session, ["new"])
+    assert inserted_concurrently == {"concurrent": concurrent.id}
+
+
+@pytest.mark.parametrize(("in_lock_order", "names"), [(True, ["a", "b"]), (False, ["b", "a"])])
+def test_inserts_rows_in_lock_order_unless_told_otherwise(db_session: Session, in_lock_order: bool, names: list[str]):
+    inserted, _ = insert_or_select(
+        db_session,
+        insert(TestCase).on_conflict_do_nothing(index_elements=["name"]).returning(TestCase.name, TestCase.id),
+        {name: {"name": name, "category": "", "template_id": ""} for name in ("b", "a")},
+        lambda row: row.id,
+        lambda names: _select_ids(db_session, names),
+        in_lock_order=in_lock_order,
+    )
+
+    assert sorted(inserted, key=inserted.__getitem__) == names
@@ -0,0 +1,72 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+import pytest
+from sqlalchemy import Select, event, select
+from sqlalchemy.orm import Session
+
+from test_observer.common.constants import CountMode
+from test_observer.data_access.counts import CountCache, count_rows
+from test_observer.data_access.models import TestCase
+from tests.data_generator import DataGenerator
+
+
+@pytest.fixture
+def test_case_query(generator: DataGenerator) -> Select:
+    for i in range(3):
+        generator.gen_test_case(name=f"counted {i}", category="counted")
+    return select(TestCase.id).where(TestCase.category == "counted")
+
+
+def test_counts_exactly(db_session: Session, test_case_query: Select):
+    assert count_rows(db_session, test_case_query, CountMode.EXACT) == 3
+
+
+def test_reuses_exact_counts(db_session: Session, generator: DataGenerator, test_case_query: Select):
+    count_rows(db_session, test_case_query)
+    generator.gen_test_case(name="counted later", category="counted")
+    statements: list[str] = []
+    event.listen(db_session.connection(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    assert count_rows(db_session, test_case_query) == 3
+    assert statements == []
+    assert count_rows(db_session, test_case_query.where(TestCase.name != "")) == 4
+
+
+def test_estimates_count(db_session: Session, test_case_query: Select):
+    assert isinstance(count_rows(db_session, test_case_query, CountMode.ESTIMATE), int)
+
+
+def test_skips_count(db_session: Session, test_case_query: Select):
+    statements: list[str] = []
+    event.listen(db_session.connection(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    assert count_rows(db_session, test_case_query, CountMode.NONE) is None
+    assert statements == []
+
+
+def test_expires_counts():
+    cache = CountCache(ttl=0, max_size=10)
+    cache.put(("query", "params"), 1)
+
+    assert cache.get(("query", "params")) is None
+
+
+def test_evicts_oldest_counts():
+    cache = CountCache(ttl=60, max_size=2)
+    for i in range(3):
+        cache.put((f"query {i}", ""), i)
+
+    assert [cache.get((f"query {i}", "")) for i in range(3)] == [None, 1, 2]
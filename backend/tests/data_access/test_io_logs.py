@@ -0,0 +1,71 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from test_observer.data_access.io_logs import (
+    IO_LOG_PREVIEW_LENGTH,
+    delete_unreferenced_io_logs,
+    io_log_preview,
+    store_io_logs,
+)
+from test_observer.data_access.models import IoLog, TestExecution
+from tests.data_generator import DataGenerator
+
+
+def test_stores_identical_io_logs_once(db_session: Session):
+    first = store_io_logs(db_session, ["log", "other log"])
+    second = store_io_logs(db_session, ["log", "log"])
+
+    assert second == {"log": first["log"]}
+    assert db_session.scalar(select(func.count()).select_from(IoLog)) == 2
+
+
+def test_compresses_io_logs(db_session: Session):
+    io_log = "repeated line\n" * 1000
+    io_log_id = store_io_logs(db_session, [io_log])[io_log]
+
+    stored = db_session.get_one(IoLog, io_log_id)
+
+    assert stored.text == io_log
+    assert stored.size == len(io_log)
+    assert len(stored.content) < len(io_log) / 10
+
+
+def test_does_not_store_empty_io_logs(db_session: Session):
+    assert store_io_logs(db_session, [""]) == {}
+
+
+def test_previews_start_of_io_log():
+    assert io_log_preview("short") == "short"
+    assert io_log_preview("x" * 1000) == "x" * IO_LOG_PREVIEW_LENGTH
+
+
+def test_results_read_their_io_log(generator: DataGenerator, test_execution: TestExecution):
+    test_result = generator.gen_test_result(generator.gen_test_case(), test_execution, io_log="log")
+
+    assert (test_result.io_log, test_result.io_log_preview) == ("log", "log")
+
+
+def test_deletes_only_unreferenced_io_logs(
+    db_session: Session, generator: DataGenerator, test_execution: TestExecution
+):
+    test_result = generator.gen_test_result(generator.gen_test_case(), test_execution, io_log="kept")
+    store_io_logs(db_session, ["deleted"])
+
+    assert delete_unreferenced_io_logs(db_session) == 1
+    assert delete_unreferenced_io_logs(db_session) == 0
+    assert db_session.scalars(select(IoLog.id)).all() == [test_result.io_log_id]
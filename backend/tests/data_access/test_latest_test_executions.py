@@ -0,0 +1,83 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from test_observer.data_access.latest_test_executions import (
+    InconsistentGroup,
+    backfill_latest_test_executions,
+    find_inconsistent_latest_test_executions,
+    record_latest_test_executions,
+)
+from test_observer.data_access.models import LatestTestExecution, TestExecution
+from tests.data_generator import DataGenerator
+
+
+def _recorded(db_session: Session) -> set[int]:
+    return set(db_session.scalars(select(LatestTestExecution.test_execution_id)))
+
+
+def test_records_newest_execution_of_every_group(db_session: Session, generator: DataGenerator):
+    artefact_build = generator.gen_artefact_build(generator.gen_artefact())
+    environment = generator.gen_environment()
+    first = generator.gen_test_execution(artefact_build, environment)
+    second = generator.gen_test_execution(artefact_build, environment)
+    other_plan = generator.gen_test_execution(artefact_build, environment, test_plan="Other plan")
+
+    assert _recorded(db_session) == {second.id, other_plan.id}
+
+    record_latest_test_executions(db_session, [first.id])
+
+    assert _recorded(db_session) == {second.id, other_plan.id}
+
+
+def test_finds_and_backfills_inconsistent_groups(db_session: Session, generator: DataGenerator):
+    artefact_build = generator.gen_artefact_build(generator.gen_artefact())
+    environment = generator.gen_environment()
+    first = generator.gen_test_execution(artefact_build, environment)
+    second = generator.gen_test_execution(artefact_build, environment)
+    other_plan = generator.gen_test_execution(artefact_build, environment, test_plan="Other plan")
+
+    db_session.execute(
+        update(LatestTestExecution)
+        .where(LatestTestExecution.test_execution_id == second.id)
+        .values(test_execution_id=first.id)
+    )
+    db_session.execute(delete(LatestTestExecution).where(LatestTestExecution.test_execution_id == other_plan.id))
+
+    assert set(find_inconsistent_latest_test_executions(db_session)) == {
+        InconsistentGroup(second.test_plan_id, artefact_build.id, environment.id, second.id, first.id),
+        InconsistentGroup(other_plan.test_plan_id, artefact_build.id, environment.id, other_plan.id, None),
+    }
+
+    backfill_latest_test_executions(db_session)
+
+    assert find_inconsistent_latest_test_executions(db_session) == []
+    assert _recorded(db_session) == {second.id, other_plan.id}
+
+
+def test_deleting_latest_execution_leaves_group_inconsistent(db_session: Session, generator: DataGenerator):
+    artefact_build = generator.gen_artefact_build(generator.gen_artefact())
+    environment = generator.gen_environment()
+    first = generator.gen_test_execution(artefact_build, environment)
+    second = generator.gen_test_execution(artefact_build, environment)
+
+    db_session.execute(delete(TestExecution).where(TestExecution.id == second.id))
+
+    assert [group.latest_test_execution_id for group in find_inconsistent_latest_test_executions(db_session)] == [
+        first.id
+    ]
@@ -0,0 +1,115 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+import json
+
+from pytest import MonkeyPatch
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from test_observer.data_access import log_search
+from test_observer.data_access.counts import Explain
+from test_observer.data_access.log_search import (
+    IO_LOG_SEARCHED_LENGTH,
+    highlight_matches,
+    highlight_test_results,
+    io_log_search_chunks,
+    matching_test_results,
+)
+from test_observer.data_access.models import TestExecution
+from tests.data_generator import DataGenerator
+
+
+def test_splits_io_logs_into_overlapping_chunks(monkeypatch: MonkeyPatch):
+    monkeypatch.setattr(log_search, "IO_LOG_SEARCHED_LENGTH", 10)
+    monkeypatch.setattr(log_search, "IO_LOG_SEARCH_CHUNK_LENGTH", 4)
+    monkeypatch.setattr(log_search, "IO_LOG_SEARCH_CHUNK_OVERLAP", 1)
+
+    assert io_log_search_chunks("abc\x00defghi") == ["abcde", "efghi", "i"]
+    assert io_log_search_chunks("0123456789" + "skipped" + "abcdefghij") == [
+        "01234",
+        "45678",
+        "89",
+        "abcde",
+        "efghi",
+        "ij",
+    ]
+
+
+def test_matches_words_in_sequence(db_session: Session, generator: DataGenerator, test_execution: TestExecution):
+    in_comment = generator.gen_test_result(generator.gen_test_case(name="a"), test_execution, comment="Disk FULL now")
+    in_io_log = generator.gen_test_result(generator.gen_test_case(name="b"), test_execution, io_log="disk: full")
+    generator.gen_test_result(generator.gen_test_case(name="c"), test_execution, io_log="full disk")
+    in_last_chunk = generator.gen_test_result(
+        generator.gen_test_case(name="d"), test_execution, io_log="x " * 100_000 + "disk full"
+    )
+    long_io_log = "x " * IO_LOG_SEARCHED_LENGTH
+    generator.gen_test_result(
+        generator.gen_test_case(name="e"), test_execution, io_log=long_io_log + "disk full" + long_io_log
+    )
+
+    assert db_session.scalars(matching_test_results("disk full")).all() == [
+        in_last_chunk.id,
+        in_io_log.id,
+        in_comment.id,
+    ]
+
+
+def test_considers_most_recent_matches_only(
+    db_session: Session, generator: DataGenerator, test_execution: TestExecution, monkeypatch: MonkeyPatch
+):
+    generator.gen_test_result(generator.gen_test_case(name="a"), test_execution, comment="timeout")
+    latest = generator.gen_test_result(generator.gen_test_case(name="b"), test_execution, comment="timeout")
+    monkeypatch.setattr(log_search, "LOG_QUERY_MAX_MATCHES", 1)
+
+    assert db_session.scalars(matching_test_results("timeout")).all() == [latest.id]
+
+
+def test_searches_through_indexes(db_session: Session):
+    # Leaves bitmap scans, which need an index condition
+    db_session.execute(text("SET LOCAL enable_seqscan = off"))
+    db_session.execute(text("SET LOCAL enable_indexscan = off"))
+
+    plan = json.dumps(db_session.execute(Explain(matching_test_results("disk full"))).scalar_one())
+
+    assert "test_result_comment_search_ix" in plan
+    assert "io_log_search_chunk_search_vector_ix" in plan
+
+
+def test_highlights_matches(db_session: Session):
+    assert highlight_matches(db_session, "disk full", ["", "no match", "it's a disk full error"]) == [
+        [],
+        [],
+        ["<b>disk</b> <b>full</b> error"],
+    ]
+
+
+def test_highlights_first_matching_chunk_of_io_logs(
+    db_session: Session, generator: DataGenerator, test_execution: TestExecution
+):
+    in_io_log = generator.gen_test_result(
+        generator.gen_test_case(name="a"),
+        test_execution,
+        comment="disk full",
+        io_log="x " * 20_000 + "disk full once" + " x" * 20_000 + "disk full twice",
+    )
+    no_io_log = generator.gen_test_result(generator.gen_test_case(name="b"), test_execution, comment="disk full")
+
+    highlights = highlight_test_results(db_session, "disk full", [in_io_log, no_io_log])
+
+    assert highlights == {
+        in_io_log.id: ["<b>disk</b> <b>full</b>", "<b>disk</b> <b>full</b> once"],
+        no_io_log.id: ["<b>disk</b> <b>full</b>"],
+    }
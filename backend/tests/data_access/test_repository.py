@@ -25,6 +25,7 @@ from test_observer.data_access.models import TestCase
 from test_observer.data_access.repository import (
     create_test_execution_relevant_link,
     get_or_create,
+    get_or_create_test_cases,
 )
 from tests.data_generator import DataGenerator
 
@@ -177,3 +178,39 @@ def test_get_or_create_does_not_commit(
     # Query again - should not find the instance since it wasn't committed
     not_found = db_session.query(TestCase).filter_by(name=test_case_name, category=test_case_category).first()
     assert not_found is None
+
+
+def test_get_or_create_test_cases(db_session: Session):
+    """Test that get_or_create_test_cases resolves existing and new test cases at once."""
+
+    # Arrange
+    existing = TestCase(name="existing", category="old category", template_id="old template")
+    db_session.add(existing)
+    db_session.commit()
+
+    # Act
+    result = get_or_create_test_cases(
+        db_session,
+        [
+            {"name": "existing", "category": "new category", "template_id": "new template"},
+            {"name": "new", "category": "other category"},
+            {"name": "new", "category": "category", "template_id": "template"},
+        ],
+    )
+
+    # Assert
+    assert result.keys() == {"existing", "new"}
+    assert result["existing"] == existing.id
+
+    db_session.refresh(existing)
+    assert existing.category == "old category"
+    assert existing.template_id == "old template"
+
+    new = db_session.get(TestCase, result["new"])
+    assert new is not None
+    assert new.category == "category"
+    assert new.template_id == "template"
+
+
+def test_get_or_create_test_cases_empty(db_session: Session):
+    assert get_or_create_test_cases(db_session, []) == {}
@@ -0,0 +1,86 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from test_observer.common.metrics import test_case_cache_lookups
+from test_observer.data_access.models import TestCase
+from test_observer.data_access.repository import resolve_test_cases
+from test_observer.data_access.test_case_cache import CachedTestCase, TestCaseCache, test_case_cache
+
+
+def _lookups(result: str) -> float:
+    return test_case_cache_lookups.labels(result=result)._value.get()
+
+
+def test_evicts_least_recently_used():
+    cache = TestCaseCache(max_size=2)
+    cache.put_many({"a": CachedTestCase(1, "", ""), "b": CachedTestCase(2, "", "")})
+
+    cache.get_many(["a"])
+    cache.put_many({"c": CachedTestCase(3, "", "")})
+
+    assert cache.get_many(["a", "b", "c"]) == {"a": CachedTestCase(1, "", ""), "c": CachedTestCase(3, "", "")}
+    assert len(cache) == 2
+
+
+def test_counts_hits_and_misses():
+    cache = TestCaseCache(max_size=10)
+    cache.put_many({"a": CachedTestCase(1, "", "")})
+    hits, misses = _lookups("hit"), _lookups("miss")
+
+    cache.get_many(["a", "b", "c"])
+
+    assert (_lookups("hit") - hits, _lookups("miss") - misses) == (1, 2)
+
+
+def test_caches_resolved_test_cases_on_commit(db_session: Session):
+    existing = TestCase(name="existing", category="category", template_id="template")
+    db_session.add(existing)
+    db_session.flush()
+
+    resolved = resolve_test_cases(db_session, [{"name": "existing"}, {"name": "new", "category": "new category"}])
+    assert test_case_cache.get_many(resolved) == {}
+
+    db_session.commit()
+
+    assert test_case_cache.get_many(resolved) == resolved
+    assert resolved["existing"] == CachedTestCase(existing.id, "category", "template")
+    assert resolved["new"].category == "new category"
+
+
+def test_discards_test_cases_rolled_back(db_session: Session):
+    with db_session.begin_nested() as savepoint:
+        resolve_test_cases(db_session, [{"name": "new"}])
+        savepoint.rollback()
+
+    db_session.commit()
+
+    assert test_case_cache.get_many(["new"]) == {}
+
+
+def test_resolves_cached_test_cases_without_queries(db_session: Session):
+    resolve_test_cases(db_session, [{"name": "a"}, {"name": "b"}])
+    db_session.commit()
+
+    statements: list[str] = []
+    connection = db_session.connection()
+    event.listen(connection, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    resolved = resolve_test_cases(db_session, [{"name": "a"}, {"name": "b"}])
+
+    assert resolved.keys() == {"a", "b"}
+    assert statements == []
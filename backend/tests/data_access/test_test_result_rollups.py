@@ -0,0 +1,162 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+
+from datetime import date, datetime, time, timedelta
+
+import pytest
+from pytest import MonkeyPatch
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from test_observer.data_access import test_result_rollups
+from test_observer.data_access.models import TestExecution, TestResultDailyRollup, TestResultDailySummary
+from test_observer.data_access.models_enums import TestResultStatus
+from test_observer.data_access.test_result_rollups import (
+    ROLLUP_SETTLE_DELAY,
+    get_test_result_rollups_watermark,
+    rebuild_test_result_rollups,
+    roll_up_test_results,
+)
+from tests.data_generator import DataGenerator
+
+
+@pytest.fixture
+def now(db_session: Session) -> datetime:
+    return db_session.execute(select(func.localtimestamp())).scalar_one()
+
+
+def _rollup(db_session: Session) -> list[tuple]:
+    return [
+        tuple(row)
+        for row in db_session.execute(
+            select(
+                TestResultDailyRollup.day,
+                TestResultDailyRollup.test_case_id,
+                TestResultDailyRollup.status,
+                TestResultDailyRollup.count,
+            ).order_by(TestResultDailyRollup.day, TestResultDailyRollup.test_case_id, TestResultDailyRollup.status)
+        )
+    ]
+
+
+def _summary(db_session: Session) -> list[tuple]:
+    return [
+        tuple(row)
+        for row in db_session.execute(
+            select(TestResultDailySummary.day, TestResultDailySummary.status, TestResultDailySummary.count).order_by(
+                TestResultDailySummary.day, TestResultDailySummary.status
+            )
+        )
+    ]
+
+
+def _roll_up_all(db_session: Session) -> None:
+    while roll_up_test_results(db_session):
+        pass
+
+
+def test_counts_settled_results(
+    db_session: Session, generator: DataGenerator, test_execution: TestExecution, now: datetime
+):
+    a, b = generator.gen_test_case(name="a"), generator.gen_test_case(name="b")
+    created_at = now - 2 * ROLLUP_SETTLE_DELAY
+    generator.gen_test_result(a, test_execution, TestResultStatus.PASSED, created_at=created_at)
+    generator.gen_test_result(b, test_execution, TestResultStatus.FAILED, created_at=created_at)
+    # Too recent to be counted
+    generator.gen_test_result(generator.gen_test_case(name="c"), test_execution, created_at=now)
+
+    assert not roll_up_test_results(db_session)
+
+    day = created_at.date()
+    assert _rollup(db_session) == [(day, a.id, TestResultStatus.PASSED, 1), (day, b.id, TestResultStatus.FAILED, 1)]
+    assert _summary(db_session) == [(day, TestResultStatus.PASSED, 1), (day, TestResultStatus.FAILED, 1)]
+    summary = db_session.scalars(select(TestResultDailySummary)).first()
+    assert summary is not None
+    assert (summary.family, summary.artefact_id, summary.environment_id) == (
+        test_execution.artefact_build.artefact.family,
+        test_execution.artefact_build.artefact_id,
+        test_execution.environment_id,
+    )
+    assert get_test_result_rollups_watermark(db_session) == now - ROLLUP_SETTLE_DELAY
+
+
+def test_adds_results_created_since_last_run(
+    db_session: Session,
+    generator: DataGenerator,
+    test_execution: TestExecution,
+    now: datetime,
+    monkeypatch: MonkeyPatch,
+):
+    monkeypatch.setattr(test_result_rollups, "ROLLUP_WINDOW", timedelta(hours=1))
+    day = now.date() - timedelta(days=2)
+    test_case = generator.gen_test_case()
+    other_execution = generator.gen_test_execution(test_execution.artefact_build, test_execution.environment)
+    generator.gen_test_result(test_case, test_execution, created_at=datetime.combine(day, time(1)))
+    assert roll_up_test_results(db_session)
+
+    generator.gen_test_result(test_case, other_execution, created_at=datetime.combine(day, time(3)))
+    # Older than the watermark, so only counted when rebuilding
+    generator.gen_test_result(generator.gen_test_case(name="late"), test_execution, created_at=now - timedelta(days=5))
+    _roll_up_all(db_session)
+
+    assert _rollup(db_session) == [(day, test_case.id, TestResultStatus.PASSED, 2)]
+    assert _summary(db_session) == [(day, TestResultStatus.PASSED, 2)]
+
+
+def test_counts_a_day_of_results_per_call(
+    db_session: Session, generator: DataGenerator, test_execution: TestExecution, now: datetime
+):
+    first = datetime.combine(now.date() - timedelta(days=30), time(12))
+    days = [first, first + timedelta(hours=20), first + timedelta(days=27)]
+    for i, created_at in enumerate(days):
+        generator.gen_test_result(generator.gen_test_case(name=str(i)), test_execution, created_at=created_at)
+
+    # The first two results are a day apart at most, then the gap until the last is skipped
+    assert roll_up_test_results(db_session)
+    assert [count for *_, count in _summary(db_session)] == [1, 1]
+    assert roll_up_test_results(db_session)
+    assert not roll_up_test_results(db_session)
+
+    assert _summary(db_session) == [
+        (days[0].date(), TestResultStatus.PASSED, 1),
+        (days[1].date(), TestResultStatus.PASSED, 1),
+        (days[2].date(), TestResultStatus.PASSED, 1),
+    ]
+
+
+def test_rebuilds_changed_and_deleted_results(
+    db_session: Session, generator: DataGenerator, test_execution: TestExecution, now: datetime
+):
+    old, recent = now - timedelta(days=10), now - timedelta(days=2)
+    a, b, c = (generator.gen_test_case(name=name) for name in "abc")
+    generator.gen_test_result(a, test_execution, created_at=old)
+    changed = generator.gen_test_result(b, test_execution, created_at=recent)
+    deleted = generator.gen_test_result(c, test_execution, created_at=recent)
+    _roll_up_all(db_session)
+
+    changed.status = TestResultStatus.FAILED
+    db_session.delete(deleted)
+    db_session.flush()
+    rebuild_test_result_rollups(db_session, date.today() - timedelta(days=7))
+
+    assert _rollup(db_session) == [
+        (old.date(), a.id, TestResultStatus.PASSED, 1),
+        (recent.date(), b.id, TestResultStatus.FAILED, 1),
+    ]
+    assert _summary(db_session) == [
+        (old.date(), TestResultStatus.PASSED, 1),
+        (recent.date(), TestResultStatus.FAILED, 1),
+    ]
@@ -0,0 +1,167 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+from datetime import timedelta
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.orm import Session
+
+from test_observer.data_access.models import (
+    Artefact,
+    ArtefactBuild,
+    RollupWatermark,
+    TestCase,
+    TestExecution,
+    TestResult,
+    TestResultSearchEntry,
+)
+from test_observer.data_access.models_enums import FamilyName, TestExecutionStatus, TestResultStatus
+from test_observer.data_access.test_result_search import (
+    REPAIR_WATERMARK,
+    index_test_results,
+    reindex_test_results_batch,
+    select_changes_to_repair,
+    set_repair_watermark,
+)
+from tests.data_generator import DataGenerator
+
+
+def test_copies_searchable_fields(db_session: Session, generator: DataGenerator):
+    artefact = generator.gen_artefact(name="core", version="1.0", track="22", family=FamilyName.snap)
+    test_execution = generator.gen_test_execution(
+        generator.gen_artefact_build(artefact), generator.gen_environment(name="laptop")
+    )
+    test_case = generator.gen_test_case(name="camera/detect", template_id="camera/detect_{name}")
+    test_result = generator.gen_test_result(test_case, test_execution, status=TestResultStatus.FAILED)
+
+    entry = db_session.get(TestResultSearchEntry, test_result.id)
+
+    assert entry
+    assert (
+        entry.created_at,
+        entry.test_execution_id,
+        entry.test_case_id,
+        entry.artefact_id,
+        entry.family,
+        entry.artefact_name,
+        entry.artefact_version,
+        entry.artefact_stage,
+        entry.artefact_track,
+        entry.artefact_archived,
+        entry.environment_name,
+        entry.test_case_name,
+        entry.template_id,
+        entry.status,
+        entry.execution_status,
+    ) == (
+        test_result.created_at,
+        test_execution.id,
+        test_case.id,
+        artefact.id,
+        FamilyName.snap,
+        "core",
+        "1.0",
+        artefact.stage,
+        "22",
+        False,
+        "laptop",
+        "camera/detect",
+        "camera/detect_{name}",
+        TestResultStatus.FAILED,
+        test_execution.status,
+    )
+
+
+def test_rewrites_entries_with_pending_changes(
+    db_session: Session, generator: DataGenerator, test_execution: TestExecution
+):
+    test_result = generator.gen_test_result(generator.gen_test_case(), test_execution)
+
+    test_execution.artefact_build.artefact.archived = True
+    test_execution.status = TestExecutionStatus.FAILED
+    index_test_results(db_session, ArtefactBuild.artefact_id == test_execution.artefact_build.artefact_id)
+
+    entry = db_session.get(TestResultSearchEntry, test_result.id)
+    assert entry
+    db_session.refresh(entry)
+    assert (entry.artefact_archived, entry.execution_status) == (True, TestExecutionStatus.FAILED)
+
+
+def test_entries_are_deleted_with_their_result(
+    db_session: Session, generator: DataGenerator, test_execution: TestExecution
+):
+    test_result = generator.gen_test_result(generator.gen_test_case(), test_execution)
+
+    db_session.execute(delete(TestResult).where(TestResult.id == test_result.id))
+
+    assert db_session.get(TestResultSearchEntry, test_result.id, populate_existing=True) is None
+
+
+def test_reindexes_in_batches(db_session: Session, generator: DataGenerator, test_execution: TestExecution):
+    test_results = [generator.gen_test_result(generator.gen_test_case(name=name), test_execution) for name in "abc"]
+    test_execution.artefact_build.artefact.archived = True
+    where = ArtefactBuild.artefact_id == test_execution.artefact_build.artefact_id
+
+    def archived() -> list[bool]:
+        return list(
+            db_session.scalars(
+                select(TestResultSearchEntry.artefact_archived)
+                .order_by(TestResultSearchEntry.id)
+                .execution_options(populate_existing=True)
+            )
+        )
+
+    assert reindex_test_results_batch(db_session, where, batch_size=2) == test_results[1].id
+    assert archived() == [True, True, False]
+    assert reindex_test_results_batch(db_session, where, test_results[1].id, batch_size=2) == test_results[2].id
+    assert archived() == [True, True, True]
+    assert reindex_test_results_batch(db_session, where, test_results[2].id, batch_size=2) is None
+
+
+def test_first_repair_starts_from_now(db_session: Session, generator: DataGenerator):
+    generator.gen_test_case()
+
+    test_case_ids, artefact_ids, up_to = select_changes_to_repair(db_session)
+
+    assert (test_case_ids, artefact_ids) == ([], [])
+    watermark = db_session.scalars(
+        select(RollupWatermark.watermark).where(RollupWatermark.name == REPAIR_WATERMARK)
+    ).one()
+    assert watermark == up_to
+
+
+def test_repairs_changes_since_watermark(db_session: Session, generator: DataGenerator):
+    repaired_test_case, changed_test_case, _ = (generator.gen_test_case(name=name) for name in "abc")
+    artefact = generator.gen_artefact()
+    select_changes_to_repair(db_session)
+
+    now = func.localtimestamp()
+    db_session.execute(update(RollupWatermark).values(watermark=now - timedelta(minutes=30)))
+    db_session.execute(
+        update(TestCase).where(TestCase.id == repaired_test_case.id).values(updated_at=now - timedelta(minutes=40))
+    )
+    db_session.execute(
+        update(TestCase).where(TestCase.id == changed_test_case.id).values(updated_at=now - timedelta(minutes=20))
+    )
+    db_session.execute(
+        update(Artefact).where(Artefact.id == artefact.id).values(updated_at=now - timedelta(minutes=20))
+    )
+
+    test_case_ids, artefact_ids, up_to = select_changes_to_repair(db_session)
+
+    assert (test_case_ids, artefact_ids) == ([changed_test_case.id], [artefact.id])
+
+    set_repair_watermark(db_session, up_to)
+    assert select_changes_to_repair(db_session)[:2] == ([], [])
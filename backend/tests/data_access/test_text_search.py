@@ -0,0 +1,56 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from test_observer.data_access.models import TestCase
+from test_observer.data_access.text_search import complete, contains, relevance_order
+from tests.data_generator import DataGenerator
+
+
+def test_contains_matches_wildcards_literally(db_session: Session, generator: DataGenerator):
+    for name in ["disk_read", "disk-read", "disk/read_100%", "disk/read_1000"]:
+        generator.gen_test_case(name=name)
+
+    def search(term: str) -> list[str]:
+        return list(
+            db_session.scalars(select(TestCase.name).where(contains(TestCase.name, term)).order_by(TestCase.name))
+        )
+
+    assert search("K_R") == ["disk_read"]
+    assert search("0%") == ["disk/read_100%"]
+
+
+def test_ranks_prefix_matches_then_closest(db_session: Session, generator: DataGenerator):
+    for name in ["wifi/scan/connect", "wifi/scan", "bluetooth/scan", "bluetooth/scan/all"]:
+        generator.gen_test_case(name=name)
+
+    query = (
+        select(TestCase.name)
+        .where(contains(TestCase.name, "scan"))
+        .order_by(*relevance_order(db_session, [TestCase.name], "wifi/scan"), TestCase.name)
+    )
+
+    assert db_session.scalars(query).all()[:2] == ["wifi/scan", "wifi/scan/connect"]
+
+
+def test_completes_shortest_names_first(db_session: Session, generator: DataGenerator):
+    for name in ["camera/detect", "Camera/capture/jpeg", "camera/capture", "audio/camera"]:
+        generator.gen_test_case(name=name)
+
+    assert complete(db_session, TestCase.name, "cam", 2) == ["camera/detect", "camera/capture"]
+    assert complete(db_session, TestCase.name, "camera/cap", 10) == ["camera/capture", "Camera/capture/jpeg"]
@@ -18,6 +18,8 @@ from datetime import date, datetime
 from sqlalchemy.orm import Session
 
 from test_observer.common.enums import Permission
+from test_observer.data_access.io_logs import io_log_preview, store_io_logs
+from test_observer.data_access.latest_test_executions import record_latest_test_executions
 from test_observer.data_access.models import (
     Application,
     Artefact,
@@ -50,6 +52,7 @@ from test_observer.data_access.models_enums import (
     TestExecutionStatus,
     TestResultStatus,
 )
+from test_observer.data_access.test_result_search import index_test_results
 
 DEFAULT_ARCHITECTURE = "amd64"
 
@@ -307,7 +310,10 @@ class DataGenerator:
             test_plan=test_plan_obj,
             execution_metadata=execution_metadata_rows,
         )
-        self._add_object(test_execution)
+        self.db_session.add(test_execution)
+        self.db_session.flush()
+        record_latest_test_executions(self.db_session, [test_execution.id])
+        self.db_session.commit()
         return test_execution
 
     def gen_test_case(
@@ -331,15 +337,22 @@ class DataGenerator:
         status: TestResultStatus = TestResultStatus.PASSED,
         comment: str = "",
         io_log: str = "",
+        created_at: datetime | None = None,
     ) -> TestResult:
         test_result = TestResult(
             test_case=test_case,
             test_execution=test_execution,
             status=status,
             comment=comment,
-            io_log=io_log,
+            io_log_id=store_io_logs(self.db_session, [io_log]).get(io_log),
+            io_log_preview=io_log_preview(io_log),
         )
-        self._add_object(test_result)
+        if created_at is not None:
+            test_result.created_at = created_at
+        self.db_session.add(test_result)
+        self.db_session.flush()
+        index_test_results(self.db_session, TestResult.id == test_result.id)
+        self.db_session.commit()
         return test_result
 
     def gen_rerun_request(self, test_execution: TestExecution, priority: int = 0) -> TestExecutionRerunRequest:
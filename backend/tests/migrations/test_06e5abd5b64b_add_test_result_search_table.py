@@ -0,0 +1,132 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+
+"""Tests for migration 06e5abd5b64b: Add test result search table"""
+
+from collections.abc import Generator
+from urllib.parse import urlparse, urlunparse
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import Engine, create_engine, text
+from sqlalchemy_utils import create_database, database_exists, drop_database  # type: ignore[import-untyped]
+
+PREVIOUS_REV = "e7717ed539d4"
+TARGET_REV = "06e5abd5b64b"
+
+
+@pytest.fixture
+def migration_context(db_url: str) -> Generator[tuple[Engine, Config], None, None]:
+    parsed = urlparse(db_url)
+    test_db_url = urlunparse(
+        (parsed.scheme, parsed.netloc, "/test_migration_result_search", parsed.params, parsed.query, parsed.fragment)
+    )
+
+    if database_exists(test_db_url):
+        drop_database(test_db_url)
+    create_database(test_db_url)
+
+    try:
+        engine = create_engine(test_db_url)
+        alembic_config = Config("alembic.ini")
+        alembic_config.set_main_option("sqlalchemy.url", test_db_url)
+
+        yield engine, alembic_config
+
+    finally:
+        engine.dispose()
+        if database_exists(test_db_url):
+            drop_database(test_db_url)
+
+
+def test_upgrade_backfills_search_entries(migration_context: tuple[Engine, Config]) -> None:
+    engine, alembic_config = migration_context
+
+    command.upgrade(alembic_config, PREVIOUS_REV)
+
+    with engine.begin() as conn:
+        test_result_id = conn.execute(
+            text("""
+            WITH artefact AS (
+                INSERT INTO artefact (
+                    name, version, family, status, repo, os, release, track, store, series, stage,
+                    source, comment, branch, image_url, owner, sha256, created_at, updated_at
+                )
+                VALUES (
+                    'core', '1', 'snap', 'UNDECIDED', '', '', '', 'latest', 'ubuntu', '', 'beta',
+                    '', '', '', '', '', '', NOW(), NOW()
+                )
+                RETURNING id
+            ), artefact_build AS (
+                INSERT INTO artefact_build (artefact_id, architecture, created_at, updated_at)
+                SELECT id, 'amd64', NOW(), NOW() FROM artefact
+                RETURNING id
+            ), environment AS (
+                INSERT INTO environment (name, architecture, created_at, updated_at)
+                VALUES ('laptop', 'amd64', NOW(), NOW())
+                RETURNING id
+            ), test_plan AS (
+                INSERT INTO test_plan (name) VALUES ('plan') RETURNING id
+            ), test_execution AS (
+                INSERT INTO test_execution
+                    (environment_id, artefact_build_id, test_plan_id, status, created_at, updated_at)
+                SELECT environment.id, artefact_build.id, test_plan.id, 'PASSED', NOW(), NOW()
+                FROM environment, artefact_build, test_plan
+                RETURNING id
+            ), test_case AS (
+                INSERT INTO test_case (name, category, template_id, created_at, updated_at)
+                VALUES ('camera/detect', '', 'camera/{name}', NOW(), NOW())
+                RETURNING id
+            )
+            INSERT INTO test_result
+                (test_execution_id, test_case_id, status, comment, io_log_preview, created_at, updated_at)
+            SELECT test_execution.id, test_case.id, 'FAILED', '', '', NOW(), NOW()
+            FROM test_execution, test_case
+            RETURNING id
+            """)
+        ).scalar_one()
+
+    command.upgrade(alembic_config, TARGET_REV)
+
+    with engine.connect() as conn:
+        entries = conn.execute(
+            text("""
+            SELECT id, family, artefact_name, artefact_stage, artefact_track, environment_name,
+                test_case_name, template_id, status, execution_status
+            FROM test_result_search
+            """)
+        ).all()
+
+    assert [tuple(entry) for entry in entries] == [
+        (
+            test_result_id,
+            "snap",
+            "core",
+            "beta",
+            "latest",
+            "laptop",
+            "camera/detect",
+            "camera/{name}",
+            "FAILED",
+            "PASSED",
+        )
+    ]
+
+    command.downgrade(alembic_config, PREVIOUS_REV)
+
+    with engine.connect() as conn:
+        assert conn.scalar(text("SELECT to_regclass('test_result_search')")) is None
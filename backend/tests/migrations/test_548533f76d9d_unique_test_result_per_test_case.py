@@ -0,0 +1,123 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Tests for migration 548533f76d9d: Add unique test result per test case"""
+
+from collections.abc import Generator
+from urllib.parse import urlparse, urlunparse
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import Engine, create_engine, text
+from sqlalchemy_utils import create_database, database_exists, drop_database  # type: ignore[import-untyped]
+
+PREVIOUS_REV = "91e4be09c422"
+TARGET_REV = "548533f76d9d"
+
+
+@pytest.fixture
+def migration_context(db_url: str) -> Generator[tuple[Engine, Config], None, None]:
+    parsed = urlparse(db_url)
+    test_db_url = urlunparse(
+        (parsed.scheme, parsed.netloc, "/test_migration_unique_result", parsed.params, parsed.query, parsed.fragment)
+    )
+
+    if database_exists(test_db_url):
+        drop_database(test_db_url)
+    create_database(test_db_url)
+
+    try:
+        engine = create_engine(test_db_url)
+        alembic_config = Config("alembic.ini")
+        alembic_config.set_main_option("sqlalchemy.url", test_db_url)
+
+        yield engine, alembic_config
+
+    finally:
+        engine.dispose()
+        if database_exists(test_db_url):
+            drop_database(test_db_url)
+
+
+def test_upgrade_keeps_last_result_per_test_case(migration_context: tuple[Engine, Config]) -> None:
+    engine, alembic_config = migration_context
+
+    command.upgrade(alembic_config, PREVIOUS_REV)
+
+    with engine.begin() as conn:
+        test_execution_id = conn.execute(
+            text("""
+            WITH artefact AS (
+                INSERT INTO artefact (
+                    name, version, family, status, repo, os, release, track, store, series, stage,
+                    source, comment, branch, image_url, owner, sha256, created_at, updated_at
+                )
+                VALUES (
+                    'core', '1', 'snap', 'UNDECIDED', '', '', '', 'latest', 'ubuntu', '', 'beta',
+                    '', '', '', '', '', '', NOW(), NOW()
+                )
+                RETURNING id
+            ), artefact_build AS (
+                INSERT INTO artefact_build (artefact_id, architecture, created_at, updated_at)
+                SELECT id, 'amd64', NOW(), NOW() FROM artefact
+                RETURNING id
+            ), environment AS (
+                INSERT INTO environment (name, architecture, created_at, updated_at)
+                VALUES ('laptop', 'amd64', NOW(), NOW())
+                RETURNING id
+            ), test_plan AS (
+                INSERT INTO test_plan (name) VALUES ('plan') RETURNING id
+            )
+            INSERT INTO test_execution
+                (environment_id, artefact_build_id, test_plan_id, status, created_at, updated_at)
+            SELECT environment.id, artefact_build.id, test_plan.id, 'PASSED', NOW(), NOW()
+            FROM environment, artefact_build, test_plan
+            RETURNING id
+            """)
+        ).scalar_one()
+        test_case_ids = (
+            conn.execute(
+                text("""
+                INSERT INTO test_case (name, category, created_at, updated_at)
+                VALUES ('repeated', '', NOW(), NOW()), ('single', '', NOW(), NOW())
+                RETURNING id
+                """)
+            )
+            .scalars()
+            .all()
+        )
+        for test_case_id, status in [
+            (test_case_ids[0], "FAILED"),
+            (test_case_ids[1], "PASSED"),
+            (test_case_ids[0], "PASSED"),
+        ]:
+            conn.execute(
+                text("""
+                INSERT INTO test_result
+                    (test_execution_id, test_case_id, status, comment, io_log, created_at, updated_at)
+                VALUES (:test_execution_id, :test_case_id, :status, '', '', NOW(), NOW())
+                """),
+                {"test_execution_id": test_execution_id, "test_case_id": test_case_id, "status": status},
+            )
+
+    command.upgrade(alembic_config, TARGET_REV)
+
+    with engine.connect() as conn:
+        results = conn.execute(text("SELECT test_case_id, status FROM test_result ORDER BY id")).all()
+
+    assert [tuple(result) for result in results] == [(test_case_ids[1], "PASSED"), (test_case_ids[0], "PASSED")]
+
+    command.downgrade(alembic_config, PREVIOUS_REV)
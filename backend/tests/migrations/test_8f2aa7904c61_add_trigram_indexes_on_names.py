@@ -0,0 +1,86 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+
+"""Tests for migration 8f2aa7904c61: Add trigram indexes on names"""
+
+from collections.abc import Generator
+from urllib.parse import urlparse, urlunparse
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import Engine, create_engine, text
+from sqlalchemy_utils import create_database, database_exists, drop_database  # type: ignore[import-untyped]
+
+PREVIOUS_REV = "06e5abd5b64b"
+TARGET_REV = "8f2aa7904c61"
+
+
+@pytest.fixture
+def migration_context(db_url: str) -> Generator[tuple[Engine, Config], None, None]:
+    parsed = urlparse(db_url)
+    test_db_url = urlunparse(
+        (parsed.scheme, parsed.netloc, "/test_migration_trigram_indexes", parsed.params, parsed.query, parsed.fragment)
+    )
+
+    if database_exists(test_db_url):
+        drop_database(test_db_url)
+    create_database(test_db_url)
+
+    try:
+        engine = create_engine(test_db_url)
+        alembic_config = Config("alembic.ini")
+        alembic_config.set_main_option("sqlalchemy.url", test_db_url)
+
+        yield engine, alembic_config
+
+    finally:
+        engine.dispose()
+        if database_exists(test_db_url):
+            drop_database(test_db_url)
+
+
+def _trigram_indexes(engine: Engine) -> set[str]:
+    with engine.connect() as conn:
+        return set(conn.scalars(text("SELECT indexname FROM pg_indexes WHERE indexname LIKE '%\\_trgm\\_ix'")))
+
+
+def test_creates_indexes_where_pg_trgm_is_available(migration_context: tuple[Engine, Config]) -> None:
+    engine, alembic_config = migration_context
+    command.upgrade(alembic_config, PREVIOUS_REV)
+    with engine.connect() as conn:
+        available = conn.scalar(text("SELECT EXISTS (SELECT FROM pg_available_extensions WHERE name = 'pg_trgm')"))
+
+    command.upgrade(alembic_config, TARGET_REV)
+
+    expected = {
+        "artefact_name_trgm_ix",
+        "test_case_name_trgm_ix",
+        "environment_name_trgm_ix",
+        "app_user_name_trgm_ix",
+        "app_user_email_trgm_ix",
+        "app_user_launchpad_handle_trgm_ix",
+    }
+    assert _trigram_indexes(engine) == (expected if available else set())
+
+
+def test_downgrade_drops_indexes(migration_context: tuple[Engine, Config]) -> None:
+    engine, alembic_config = migration_context
+    command.upgrade(alembic_config, TARGET_REV)
+
+    command.downgrade(alembic_config, PREVIOUS_REV)
+
+    assert _trigram_indexes(engine) == set()
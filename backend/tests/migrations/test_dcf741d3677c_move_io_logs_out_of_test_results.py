@@ -0,0 +1,126 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Tests for migration dcf741d3677c: Move io_logs out of test results"""
+
+from collections.abc import Generator
+from urllib.parse import urlparse, urlunparse
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import Engine, create_engine, text
+from sqlalchemy_utils import create_database, database_exists, drop_database  # type: ignore[import-untyped]
+
+PREVIOUS_REV = "2efdefd2050b"
+TARGET_REV = "dcf741d3677c"
+
+
+@pytest.fixture
+def migration_context(db_url: str) -> Generator[tuple[Engine, Config], None, None]:
+    parsed = urlparse(db_url)
+    test_db_url = urlunparse(
+        (parsed.scheme, parsed.netloc, "/test_migration_io_log", parsed.params, parsed.query, parsed.fragment)
+    )
+
+    if database_exists(test_db_url):
+        drop_database(test_db_url)
+    create_database(test_db_url)
+
+    try:
+        engine = create_engine(test_db_url)
+        alembic_config = Config("alembic.ini")
+        alembic_config.set_main_option("sqlalchemy.url", test_db_url)
+
+        yield engine, alembic_config
+
+    finally:
+        engine.dispose()
+        if database_exists(test_db_url):
+            drop_database(test_db_url)
+
+
+def test_upgrade_moves_identical_io_logs_to_one_row(migration_context: tuple[Engine, Config]) -> None:
+    engine, alembic_config = migration_context
+    long_io_log = "line\n" * 100
+
+    command.upgrade(alembic_config, PREVIOUS_REV)
+
+    with engine.begin() as conn:
+        test_execution_id = conn.execute(
+            text("""
+            WITH artefact AS (
+                INSERT INTO artefact (
+                    name, version, family, status, repo, os, release, track, store, series, stage,
+                    source, comment, branch, image_url, owner, sha256, created_at, updated_at
+                )
+                VALUES (
+                    'core', '1', 'snap', 'UNDECIDED', '', '', '', 'latest', 'ubuntu', '', 'beta',
+                    '', '', '', '', '', '', NOW(), NOW()
+                )
+                RETURNING id
+            ), artefact_build AS (
+                INSERT INTO artefact_build (artefact_id, architecture, created_at, updated_at)
+                SELECT id, 'amd64', NOW(), NOW() FROM artefact
+                RETURNING id
+            ), environment AS (
+                INSERT INTO environment (name, architecture, created_at, updated_at)
+                VALUES ('laptop', 'amd64', NOW(), NOW())
+                RETURNING id
+            ), test_plan AS (
+                INSERT INTO test_plan (name) VALUES ('plan') RETURNING id
+            )
+            INSERT INTO test_execution
+                (environment_id, artefact_build_id, test_plan_id, status, created_at, updated_at)
+            SELECT environment.id, artefact_build.id, test_plan.id, 'PASSED', NOW(), NOW()
+            FROM environment, artefact_build, test_plan
+            RETURNING id
+            """)
+        ).scalar_one()
+        for name, io_log in [("first", long_io_log), ("second", long_io_log), ("empty", "")]:
+            conn.execute(
+                text("""
+                WITH test_case AS (
+                    INSERT INTO test_case (name, category, created_at, updated_at)
+                    VALUES (:name, '', NOW(), NOW())
+                    RETURNING id
+                )
+                INSERT INTO test_result
+                    (test_execution_id, test_case_id, status, comment, io_log, created_at, updated_at)
+                SELECT :test_execution_id, test_case.id, 'PASSED', '', :io_log, NOW(), NOW()
+                FROM test_case
+                """),
+                {"test_execution_id": test_execution_id, "name": name, "io_log": io_log},
+            )
+
+    command.upgrade(alembic_config, TARGET_REV)
+
+    with engine.connect() as conn:
+        results = conn.execute(text("SELECT io_log_id, io_log_preview FROM test_result ORDER BY id")).all()
+        io_logs = conn.execute(text("SELECT id, size FROM io_log")).all()
+
+    assert [tuple(io_log) for io_log in io_logs] == [(results[0].io_log_id, len(long_io_log))]
+    assert [tuple(result) for result in results] == [
+        (io_logs[0].id, long_io_log[:200]),
+        (io_logs[0].id, long_io_log[:200]),
+        (None, ""),
+    ]
+
+    command.downgrade(alembic_config, PREVIOUS_REV)
+
+    with engine.connect() as conn:
+        restored = conn.scalars(text("SELECT io_log FROM test_result ORDER BY id")).all()
+
+    assert restored == [long_io_log, long_io_log, ""]
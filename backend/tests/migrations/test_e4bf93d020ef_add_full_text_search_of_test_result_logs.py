@@ -0,0 +1,96 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+
+"""Tests for migration e4bf93d020ef: Add full-text search of test result logs"""
+
+import hashlib
+import zlib
+from collections.abc import Generator
+from urllib.parse import urlparse, urlunparse
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import Engine, create_engine, text
+from sqlalchemy_utils import create_database, database_exists, drop_database  # type: ignore[import-untyped]
+
+PREVIOUS_REV = "8f2aa7904c61"
+TARGET_REV = "e4bf93d020ef"
+
+
+@pytest.fixture
+def migration_context(db_url: str) -> Generator[tuple[Engine, Config], None, None]:
+    parsed = urlparse(db_url)
+    test_db_url = urlunparse(
+        (parsed.scheme, parsed.netloc, "/test_migration_log_search", parsed.params, parsed.query, parsed.fragment)
+    )
+
+    if database_exists(test_db_url):
+        drop_database(test_db_url)
+    create_database(test_db_url)
+
+    try:
+        engine = create_engine(test_db_url)
+        alembic_config = Config("alembic.ini")
+        alembic_config.set_main_option("sqlalchemy.url", test_db_url)
+
+        yield engine, alembic_config
+
+    finally:
+        engine.dispose()
+        if database_exists(test_db_url):
+            drop_database(test_db_url)
+
+
+def test_upgrade_indexes_existing_io_logs(migration_context: tuple[Engine, Config]) -> None:
+    engine, alembic_config = migration_context
+
+    command.upgrade(alembic_config, PREVIOUS_REV)
+
+    io_logs = ["Kernel panic - not syncing", "x " * 100_000 + "kernel panic", "all good"]
+    with engine.begin() as conn:
+        for io_log in io_logs:
+            conn.execute(
+                text("""
+                INSERT INTO io_log (digest, content, size, created_at, updated_at)
+                VALUES (:digest, :content, :size, NOW(), NOW())
+                """),
+                {
+                    "digest": hashlib.sha256(io_log.encode()).digest(),
+                    "content": zlib.compress(io_log.encode()),
+                    "size": len(io_log.encode()),
+                },
+            )
+
+    command.upgrade(alembic_config, TARGET_REV)
+
+    with engine.connect() as conn:
+        matching = conn.scalars(
+            text("""
+            SELECT DISTINCT io_log.size, io_log.id FROM io_log
+            JOIN io_log_search_chunk ON io_log_search_chunk.io_log_id = io_log.id
+            WHERE search_vector @@ phraseto_tsquery('simple', 'kernel panic')
+            ORDER BY io_log.id
+            """)
+        ).all()
+
+    assert matching == [len(io_logs[0]), len(io_logs[1])]
+
+    command.downgrade(alembic_config, PREVIOUS_REV)
+
+    with engine.connect() as conn:
+        assert conn.scalar(text("SELECT to_regclass('io_log_search_chunk')")) is None
+        assert conn.scalar(text("SELECT to_regclass('test_result_comment_search_ix')")) is None
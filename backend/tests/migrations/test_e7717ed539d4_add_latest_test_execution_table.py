@@ -0,0 +1,106 @@
+# Copyright 2026 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License version 3, as
+# published by the Free Software Foundation.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-FileCopyrightText: Copyright 2026 Canonical Ltd.
+# SPDX-License-Identifier: AGPL-3.0-only
+
+
+"""Tests for migration e7717ed539d4: Add latest test execution table"""
+
+from collections.abc import Generator
+from urllib.parse import urlparse, urlunparse
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import Engine, create_engine, text
+from sqlalchemy_utils import create_database, database_exists, drop_database  # type: ignore[import-untyped]
+
+PREVIOUS_REV = "1335f293f1be"
+TARGET_REV = "e7717ed539d4"
+
+
+@pytest.fixture
+def migration_context(db_url: str) -> Generator[tuple[Engine, Config], None, None]:
+    parsed = urlparse(db_url)
+    test_db_url = urlunparse(
+        (parsed.scheme, parsed.netloc, "/test_migration_latest_execution", parsed.params, parsed.query, parsed.fragment)
+    )
+
+    if database_exists(test_db_url):
+        drop_database(test_db_url)
+    create_database(test_db_url)
+
+    try:
+        engine = create_engine(test_db_url)
+        alembic_config = Config("alembic.ini")
+        alembic_config.set_main_option("sqlalchemy.url", test_db_url)
+
+        yield engine, alembic_config
+
+    finally:
+        engine.dispose()
+        if database_exists(test_db_url):
+            drop_database(test_db_url)
+
+
+def test_upgrade_backfills_latest_execution_of_every_group(migration_context: tuple[Engine, Config]) -> None:
+    engine, alembic_config = migration_context
+
+    command.upgrade(alembic_config, PREVIOUS_REV)
+
+    with engine.begin() as conn:
+        test_execution_ids = conn.scalars(
+            text("""
+            WITH artefact AS (
+                INSERT INTO artefact (
+                    name, version, family, status, repo, os, release, track, store, series, stage,
+                    source, comment, branch, image_url, owner, sha256, created_at, updated_at
+                )
+                VALUES (
+                    'core', '1', 'snap', 'UNDECIDED', '', '', '', 'latest', 'ubuntu', '', 'beta',
+                    '', '', '', '', '', '', NOW(), NOW()
+                )
+                RETURNING id
+            ), artefact_build AS (
+                INSERT INTO artefact_build (artefact_id, architecture, created_at, updated_at)
+                SELECT id, 'amd64', NOW(), NOW() FROM artefact
+                RETURNING id
+            ), environment AS (
+                INSERT INTO environment (name, architecture, created_at, updated_at)
+                VALUES ('laptop', 'amd64', NOW(), NOW()), ('desktop', 'amd64', NOW(), NOW())
+                RETURNING id, name
+            ), test_plan AS (
+                INSERT INTO test_plan (name) VALUES ('plan') RETURNING id
+            )
+            INSERT INTO test_execution
+                (environment_id, artefact_build_id, test_plan_id, status, created_at, updated_at)
+            SELECT environment.id, artefact_build.id, test_plan.id, 'PASSED', NOW(), NOW()
+            FROM environment, artefact_build, test_plan, generate_series(1, 2)
+            ORDER BY environment.name
+            RETURNING id
+            """)
+        ).all()
+
+    command.upgrade(alembic_config, TARGET_REV)
+
+    with engine.connect() as conn:
+        latest = conn.scalars(text("SELECT test_execution_id FROM latest_test_execution ORDER BY 1")).all()
+
+    # Two executions per environment, the desktop ones inserted first
+    assert len(test_execution_ids) == 4
+    assert latest == [max(test_execution_ids[:2]), max(test_execution_ids[2:])]
+
+    command.downgrade(alembic_config, PREVIOUS_REV)
+
+    with engine.connect() as conn:
+        assert conn.scalar(text("SELECT to_regclass('latest_test_execution')")) is None
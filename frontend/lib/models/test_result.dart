@@ -50,7 +50,8 @@ abstract class TestResult with _$TestResult {
     @Default('') String category,
     @Default('') String comment,
     @JsonKey(name: 'template_id') @Default('') String templateId,
-    @JsonKey(name: 'io_log') @Default('') String ioLog,
+    @JsonKey(name: 'io_log_preview') @Default('') String ioLogPreview,
+    @JsonKey(name: 'io_log_size') @Default(0) int ioLogSize,
     @JsonKey(name: 'previous_results')
     @Default([])
     List<PreviousTestResult> previousResults,
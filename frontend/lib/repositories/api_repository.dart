@@ -117,6 +117,14 @@ class ApiRepository {
     return testResults;
   }
 
+  Future<String> getTestResultIoLog(int testResultId) async {
+    final response = await dio.get(
+      '/v1/test-results/$testResultId/io-log',
+      options: Options(responseType: ResponseType.plain),
+    );
+    return response.data;
+  }
+
   Future<List<TestEvent>> getTestExecutionEvents(int testExecutionId) async {
     final response =
         await dio.get('/v1/test-executions/$testExecutionId/status_update');
@@ -21,6 +21,7 @@ import 'package:dartx/dartx.dart';
 
 import '../../models/test_result.dart';
 import '../../providers/artefact.dart';
+import '../../providers/test_result_io_log.dart';
 import '../../providers/test_result_issues.dart';
 import '../../routing.dart';
 import '../expandable.dart';
@@ -123,22 +124,40 @@ class _TestResultOutputExpandable extends StatelessWidget {
             title: const Text('Comment'),
             subtitle: Text(testResult.comment),
           ),
-        if (testResult.ioLog != '')
+        if (testResult.ioLogSize > 0)
           YaruTile(
             title: const Text('IO Log'),
-            subtitle: Text(
-              testResult.ioLog,
-              style: const TextStyle(
-                fontFamily: 'UbuntuMono',
-                fontSize: 12,
-              ),
-            ),
+            subtitle: _TestResultIoLog(testResultId: testResult.id),
           ),
       ],
     );
   }
 }
 
+class _TestResultIoLog extends ConsumerWidget {
+  const _TestResultIoLog({required this.testResultId});
+
+  final int testResultId;
+
+  @override
+  Widget build(BuildContext context, WidgetRef ref) {
+    // Only fetched once the details are expanded, as io_logs can be large
+    final ioLog = ref.watch(testResultIoLogProvider(testResultId));
+
+    return ioLog.when(
+      data: (ioLog) => Text(
+        ioLog,
+        style: const TextStyle(
+          fontFamily: 'UbuntuMono',
+          fontSize: 12,
+        ),
+      ),
+      loading: () => const Center(child: YaruCircularProgressIndicator()),
+      error: (error, stack) => Text('Error loading IO log: $error'),
+    );
+  }
+}
+
 class _PreviousTestResultsWidget extends ConsumerWidget {
   const _PreviousTestResultsWidget({
     required this.artefactId,
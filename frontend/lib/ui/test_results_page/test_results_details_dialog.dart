@@ -14,12 +14,14 @@
 // SPDX-License-Identifier: GPL-3.0-only
 
 import 'package:flutter/material.dart';
+import 'package:flutter_riverpod/flutter_riverpod.dart';
 import 'package:go_router/go_router.dart';
 import 'package:yaru/yaru.dart';
 import 'package:url_launcher/url_launcher.dart';
 
 import '../../models/detailed_test_results.dart';
 import '../../models/family_name.dart';
+import '../../providers/test_result_io_log.dart';
 import '../../routing.dart';
 import '../execution_metadata.dart';
 import '../date_time.dart';
@@ -209,12 +211,12 @@ class _DialogContent extends StatelessWidget {
             ],
 
             // IO Log if present
-            if (result.testResult.ioLog.isNotEmpty) ...[
+            if (result.testResult.ioLogSize > 0) ...[
               const SizedBox(height: 16),
               _DialogSection(
                 title: 'IO Log',
                 children: [
-                  _LogContainer(logContent: result.testResult.ioLog),
+                  _IoLog(testResultId: result.testResult.id),
                 ],
               ),
             ],
@@ -358,6 +360,21 @@ class _DetailRow extends StatelessWidget {
   }
 }
 
+class _IoLog extends ConsumerWidget {
+  final int testResultId;
+
+  const _IoLog({required this.testResultId});
+
+  @override
+  Widget build(BuildContext context, WidgetRef ref) {
+    return ref.watch(testResultIoLogProvider(testResultId)).when(
+          data: (ioLog) => _LogContainer(logContent: ioLog),
+          loading: () => const Center(child: YaruCircularProgressIndicator()),
+          error: (error, stack) => Text('Error loading IO log: $error'),
+        );
+  }
+}
+
 class _LogContainer extends StatelessWidget {
   final String logContent;
 
@@ -182,6 +182,9 @@ resource "juju_application" "pg" {
     # Log when queries wait for locks
     # Helps identify blocking queries
     logging_log_lock_waits = true
+
+    # Trigram indexes serving substring searches on names
+    plugin_pg_trgm_enable = true
   }
 }
 
@@ -208,6 +211,9 @@ resource "juju_application" "backup-restoring-db" {
     # Log when queries wait for locks
     # Helps identify blocking queries
     logging_log_lock_waits = true
+
+    # Trigram indexes serving substring searches on names
+    plugin_pg_trgm_enable = true
   }
 }
 
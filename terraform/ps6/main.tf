@@ -117,6 +117,9 @@ resource "juju_application" "pg" {
     # Log when queries wait for locks
     # Helps identify blocking queries
     logging_log_lock_waits = true
+
+    # Trigram indexes serving substring searches on names
+    plugin_pg_trgm_enable = true
   }
 
   storage_directives = {